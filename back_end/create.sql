@@ -7,7 +7,9 @@ use tm;
 create table school (
 	id INT AUTO_INCREMENT PRIMARY KEY,
     name VARCHAR(100) NOT NULL,
-    address VARCHAR(100) NOT NULL
+    address VARCHAR(100) NOT NULL,
+
+    INDEX school_name (name)
 );
 
 -- Player information
@@ -19,7 +21,9 @@ create table player (
 
     school_id_FK INT,
     FOREIGN KEY(school_id_FK) REFERENCES school(id)
-        ON UPDATE CASCADE ON DELETE RESTRICT
+        ON UPDATE CASCADE ON DELETE RESTRICT,
+
+    INDEX player_name (name)
 );
 
 -- Tournament information
@@ -28,8 +32,9 @@ create table tournament(
     name VARCHAR(50) NOT NULL,
     date DATE NOT NULL,
     time TIME NOT NULL,
-    address VARCHAR(100) NOT NULL
+    address VARCHAR(100) NOT NULL,
 
+    INDEX tournament_date_time (date, time)
 );
 
 -- A competitive division within a tournament
@@ -59,7 +64,9 @@ create table team (
     FOREIGN KEY (player1_id_FK) REFERENCES player(id)
 		ON UPDATE CASCADE ON DELETE RESTRICT,
     FOREIGN KEY (player2_id_FK) REFERENCES player(id)
-		ON UPDATE CASCADE ON DELETE RESTRICT
+		ON UPDATE CASCADE ON DELETE RESTRICT,
+
+    INDEX team_division_name (division_id_FK, name)
 );
 
 -- General match data
@@ -83,7 +90,15 @@ create table match_data (
     
     division_id_FK INT NOT NULL,
     FOREIGN KEY (division_id_FK) REFERENCES division(id)
-		ON UPDATE CASCADE ON DELETE CASCADE
+		ON UPDATE CASCADE ON DELETE CASCADE,
+
+    -- Games won by each team, maintained by the game_data triggers
+    team1_games_won INT NOT NULL DEFAULT 0,
+    team2_games_won INT NOT NULL DEFAULT 0,
+
+    -- Court and start time, assigned by the court scheduler
+    court INT,
+    start_time DATETIME
 );
 
 -- Game data within a match
@@ -94,9 +109,87 @@ create table game_data (
     
     match_id_FK INT NOT NULL,
     FOREIGN KEY (match_id_FK) REFERENCES match_data(id)
-		ON UPDATE CASCADE ON DELETE CASCADE
+		ON UPDATE CASCADE ON DELETE CASCADE,
+
+    -- Games won per match are counted from this index alone
+    INDEX game_match_scores (match_id_FK, team1_score, team2_score)
+);
+
+-- A match of a division's elimination bracket, made before its teams are known
+create table bracket_match (
+	id INT AUTO_INCREMENT PRIMARY KEY,
+
+    division_id_FK INT NOT NULL,
+    FOREIGN KEY (division_id_FK) REFERENCES division(id)
+		ON UPDATE CASCADE ON DELETE CASCADE,
+
+    -- W for the winners bracket, L for the losers bracket and F for the grand final of a double elimination
+    bracket CHAR(1) NOT NULL,
+    round INT NOT NULL,
+    position INT NOT NULL,
+
+    play_to INT NOT NULL,
+    hard_cap INT,
+    best_of INT NOT NULL,
+
+    -- A side is ready once its team is placed, a ready side without a team is a bye
+    team1_id_FK INT,
+    team2_id_FK INT,
+    team1_ready BOOLEAN NOT NULL DEFAULT FALSE,
+    team2_ready BOOLEAN NOT NULL DEFAULT FALSE,
+
+    FOREIGN KEY (team1_id_FK) REFERENCES team(id)
+		ON UPDATE CASCADE ON DELETE RESTRICT,
+    FOREIGN KEY (team2_id_FK) REFERENCES team(id)
+		ON UPDATE CASCADE ON DELETE RESTRICT,
+
+    -- The match played, created once both teams are known
+    match_id_FK INT UNIQUE,
+    FOREIGN KEY (match_id_FK) REFERENCES match_data(id)
+		ON UPDATE CASCADE ON DELETE SET NULL,
+
+    -- Set once the match is won, played or on a bye, and once its winner and loser are placed
+    decided BOOLEAN NOT NULL DEFAULT FALSE,
+    placed BOOLEAN NOT NULL DEFAULT FALSE,
+    winner_id_FK INT,
+    loser_id_FK INT,
+
+    FOREIGN KEY (winner_id_FK) REFERENCES team(id)
+		ON UPDATE CASCADE ON DELETE RESTRICT,
+    FOREIGN KEY (loser_id_FK) REFERENCES team(id)
+		ON UPDATE CASCADE ON DELETE RESTRICT,
+
+    -- The bracket matches the winner and loser play next and their side there, rows of the same bracket
+    winner_to INT,
+    winner_side INT,
+    loser_to INT,
+    loser_side INT,
+
+    UNIQUE INDEX bracket_position (division_id_FK, bracket, round, position),
+    INDEX bracket_winner_to (winner_to),
+    INDEX bracket_loser_to (loser_to)
 );
 
+-- Change counter of each division, bumped by the match_data and game_data triggers so clients can poll for changes
+create table division_version (
+	division_id_FK INT PRIMARY KEY,
+    FOREIGN KEY (division_id_FK) REFERENCES division(id)
+		ON UPDATE CASCADE ON DELETE CASCADE,
+
+    version BIGINT NOT NULL DEFAULT 0
+);
+
+-- Migrations from back_end/migrations applied to the schema, this file already has the listed ones
+create table schema_migration (
+	version INT PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    applied_at DATETIME NOT NULL
+);
+
+INSERT INTO schema_migration (version, name, applied_at) VALUES
+    (1, 'lookup_indexes', NOW()), (2, 'division_versions', NOW()), (3, 'match_tallies', NOW()),
+    (4, 'court_times', NOW()), (5, 'procedures', NOW()), (6, 'brackets', NOW()), (7, 'team_versions', NOW());
+
 
 
 
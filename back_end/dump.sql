@@ -17,6 +17,62 @@ USE `tm`;
 /*!40101 SET @OLD_SQL_MODE=@@SQL_MODE, SQL_MODE='NO_AUTO_VALUE_ON_ZERO' */;
 /*!40111 SET @OLD_SQL_NOTES=@@SQL_NOTES, SQL_NOTES=0 */;
 
+--
+-- Table structure for table `bracket_match`
+--
+
+DROP TABLE IF EXISTS `bracket_match`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `bracket_match` (
+  `id` int NOT NULL AUTO_INCREMENT,
+  `division_id_FK` int NOT NULL,
+  `bracket` char(1) NOT NULL,
+  `round` int NOT NULL,
+  `position` int NOT NULL,
+  `play_to` int NOT NULL,
+  `hard_cap` int DEFAULT NULL,
+  `best_of` int NOT NULL,
+  `team1_id_FK` int DEFAULT NULL,
+  `team2_id_FK` int DEFAULT NULL,
+  `team1_ready` tinyint(1) NOT NULL DEFAULT '0',
+  `team2_ready` tinyint(1) NOT NULL DEFAULT '0',
+  `match_id_FK` int DEFAULT NULL,
+  `decided` tinyint(1) NOT NULL DEFAULT '0',
+  `placed` tinyint(1) NOT NULL DEFAULT '0',
+  `winner_id_FK` int DEFAULT NULL,
+  `loser_id_FK` int DEFAULT NULL,
+  `winner_to` int DEFAULT NULL,
+  `winner_side` int DEFAULT NULL,
+  `loser_to` int DEFAULT NULL,
+  `loser_side` int DEFAULT NULL,
+  PRIMARY KEY (`id`),
+  UNIQUE KEY `bracket_position` (`division_id_FK`,`bracket`,`round`,`position`),
+  UNIQUE KEY `match_id_FK` (`match_id_FK`),
+  KEY `team1_id_FK` (`team1_id_FK`),
+  KEY `team2_id_FK` (`team2_id_FK`),
+  KEY `winner_id_FK` (`winner_id_FK`),
+  KEY `loser_id_FK` (`loser_id_FK`),
+  KEY `bracket_winner_to` (`winner_to`),
+  KEY `bracket_loser_to` (`loser_to`),
+  CONSTRAINT `bracket_match_ibfk_1` FOREIGN KEY (`division_id_FK`) REFERENCES `division` (`id`) ON DELETE CASCADE ON UPDATE CASCADE,
+  CONSTRAINT `bracket_match_ibfk_2` FOREIGN KEY (`team1_id_FK`) REFERENCES `team` (`id`) ON DELETE RESTRICT ON UPDATE CASCADE,
+  CONSTRAINT `bracket_match_ibfk_3` FOREIGN KEY (`team2_id_FK`) REFERENCES `team` (`id`) ON DELETE RESTRICT ON UPDATE CASCADE,
+  CONSTRAINT `bracket_match_ibfk_4` FOREIGN KEY (`match_id_FK`) REFERENCES `match_data` (`id`) ON DELETE SET NULL ON UPDATE CASCADE,
+  CONSTRAINT `bracket_match_ibfk_5` FOREIGN KEY (`winner_id_FK`) REFERENCES `team` (`id`) ON DELETE RESTRICT ON UPDATE CASCADE,
+  CONSTRAINT `bracket_match_ibfk_6` FOREIGN KEY (`loser_id_FK`) REFERENCES `team` (`id`) ON DELETE RESTRICT ON UPDATE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
+--
+-- Dumping data for table `bracket_match`
+--
+
+LOCK TABLES `bracket_match` WRITE;
+/*!40000 ALTER TABLE `bracket_match` DISABLE KEYS */;
+/*!40000 ALTER TABLE `bracket_match` ENABLE KEYS */;
+UNLOCK TABLES;
+
 --
 -- Table structure for table `division`
 --
@@ -46,6 +102,30 @@ INSERT INTO `division` VALUES (1,'Division A','Cool division',4,1),(2,'Division
 /*!40000 ALTER TABLE `division` ENABLE KEYS */;
 UNLOCK TABLES;
 
+--
+-- Table structure for table `division_version`
+--
+
+DROP TABLE IF EXISTS `division_version`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `division_version` (
+  `division_id_FK` int NOT NULL,
+  `version` bigint NOT NULL DEFAULT '0',
+  PRIMARY KEY (`division_id_FK`),
+  CONSTRAINT `division_version_ibfk_1` FOREIGN KEY (`division_id_FK`) REFERENCES `division` (`id`) ON DELETE CASCADE ON UPDATE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
+--
+-- Dumping data for table `division_version`
+--
+
+LOCK TABLES `division_version` WRITE;
+/*!40000 ALTER TABLE `division_version` DISABLE KEYS */;
+/*!40000 ALTER TABLE `division_version` ENABLE KEYS */;
+UNLOCK TABLES;
+
 --
 -- Table structure for table `game_data`
 --
@@ -60,6 +140,7 @@ CREATE TABLE `game_data` (
   `match_id_FK` int NOT NULL,
   PRIMARY KEY (`id`),
   KEY `match_id_FK` (`match_id_FK`),
+  KEY `game_match_scores` (`match_id_FK`,`team1_score`,`team2_score`),
   CONSTRAINT `game_data_ibfk_1` FOREIGN KEY (`match_id_FK`) REFERENCES `match_data` (`id`) ON DELETE CASCADE ON UPDATE CASCADE
 ) ENGINE=InnoDB AUTO_INCREMENT=26 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
@@ -83,7 +164,86 @@ UNLOCK TABLES;
 /*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
 DELIMITER ;;
 /*!50003 CREATE*/ /*!50017 DEFINER=`root`@`localhost`*/ /*!50003 TRIGGER `update_match_on_update_game` AFTER UPDATE ON `game_data` FOR EACH ROW BEGIN
-    CALL update_match_winner(NEW.match_id_FK);
+    -- Moves the game's win, if any, from its old result to its new one
+    IF OLD.match_id_FK <> NEW.match_id_FK
+        OR IFNULL(SIGN(OLD.team1_score - OLD.team2_score), 0) <> IFNULL(SIGN(NEW.team1_score - NEW.team2_score), 0) THEN
+        UPDATE match_data
+        SET team1_games_won = team1_games_won - IFNULL(OLD.team1_score > OLD.team2_score, 0),
+            team2_games_won = team2_games_won - IFNULL(OLD.team2_score > OLD.team1_score, 0)
+        WHERE id = OLD.match_id_FK;
+
+        UPDATE match_data
+        SET team1_games_won = team1_games_won + IFNULL(NEW.team1_score > NEW.team2_score, 0),
+            team2_games_won = team2_games_won + IFNULL(NEW.team2_score > NEW.team1_score, 0)
+        WHERE id = NEW.match_id_FK;
+
+        -- Batched score updates set @skip_match_winner and recompute the winner once afterwards
+        IF @skip_match_winner IS NULL THEN
+            CALL update_match_winner(NEW.match_id_FK);
+            IF OLD.match_id_FK <> NEW.match_id_FK THEN
+                CALL update_match_winner(OLD.match_id_FK);
+            END IF;
+        END IF;
+    ELSE
+        -- Match updates bump the division's change counter, scores that leave the tallies alone bump it here
+        CALL bump_match_division_version(NEW.match_id_FK);
+    END IF;
+END */;;
+DELIMITER ;
+/*!50003 SET sql_mode              = @saved_sql_mode */ ;
+/*!50003 SET character_set_client  = @saved_cs_client */ ;
+/*!50003 SET character_set_results = @saved_cs_results */ ;
+/*!50003 SET collation_connection  = @saved_col_connection */ ;
+/*!50003 SET @saved_cs_client      = @@character_set_client */ ;
+/*!50003 SET @saved_cs_results     = @@character_set_results */ ;
+/*!50003 SET @saved_col_connection = @@collation_connection */ ;
+/*!50003 SET character_set_client  = utf8mb4 */ ;
+/*!50003 SET character_set_results = utf8mb4 */ ;
+/*!50003 SET collation_connection  = utf8mb4_0900_ai_ci */ ;
+/*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
+/*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
+DELIMITER ;;
+/*!50003 CREATE*/ /*!50017 DEFINER=`root`@`localhost`*/ /*!50003 TRIGGER `tally_match_on_insert_game` AFTER INSERT ON `game_data` FOR EACH ROW BEGIN
+    IF NEW.team1_score <> NEW.team2_score THEN
+        UPDATE match_data
+        SET team1_games_won = team1_games_won + (NEW.team1_score > NEW.team2_score),
+            team2_games_won = team2_games_won + (NEW.team2_score > NEW.team1_score)
+        WHERE id = NEW.match_id_FK;
+
+        IF @skip_match_winner IS NULL THEN
+            CALL update_match_winner(NEW.match_id_FK);
+        END IF;
+    ELSE
+        CALL bump_match_division_version(NEW.match_id_FK);
+    END IF;
+END */;;
+DELIMITER ;
+/*!50003 SET sql_mode              = @saved_sql_mode */ ;
+/*!50003 SET character_set_client  = @saved_cs_client */ ;
+/*!50003 SET character_set_results = @saved_cs_results */ ;
+/*!50003 SET collation_connection  = @saved_col_connection */ ;
+/*!50003 SET @saved_cs_client      = @@character_set_client */ ;
+/*!50003 SET @saved_cs_results     = @@character_set_results */ ;
+/*!50003 SET @saved_col_connection = @@collation_connection */ ;
+/*!50003 SET character_set_client  = utf8mb4 */ ;
+/*!50003 SET character_set_results = utf8mb4 */ ;
+/*!50003 SET collation_connection  = utf8mb4_0900_ai_ci */ ;
+/*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
+/*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
+DELIMITER ;;
+/*!50003 CREATE*/ /*!50017 DEFINER=`root`@`localhost`*/ /*!50003 TRIGGER `tally_match_on_delete_game` AFTER DELETE ON `game_data` FOR EACH ROW BEGIN
+    IF OLD.team1_score <> OLD.team2_score THEN
+        UPDATE match_data
+        SET team1_games_won = team1_games_won - (OLD.team1_score > OLD.team2_score),
+            team2_games_won = team2_games_won - (OLD.team2_score > OLD.team1_score)
+        WHERE id = OLD.match_id_FK;
+
+        IF @skip_match_winner IS NULL THEN
+            CALL update_match_winner(OLD.match_id_FK);
+        END IF;
+    ELSE
+        CALL bump_match_division_version(OLD.match_id_FK);
+    END IF;
 END */;;
 DELIMITER ;
 /*!50003 SET sql_mode              = @saved_sql_mode */ ;
@@ -107,6 +267,10 @@ CREATE TABLE `match_data` (
   `team2_id_FK` int NOT NULL,
   `winner_id_FK` int DEFAULT NULL,
   `division_id_FK` int NOT NULL,
+  `team1_games_won` int NOT NULL DEFAULT '0',
+  `team2_games_won` int NOT NULL DEFAULT '0',
+  `court` int DEFAULT NULL,
+  `start_time` datetime DEFAULT NULL,
   PRIMARY KEY (`id`),
   KEY `team1_id_FK` (`team1_id_FK`),
   KEY `team2_id_FK` (`team2_id_FK`),
@@ -125,7 +289,7 @@ CREATE TABLE `match_data` (
 
 LOCK TABLES `match_data` WRITE;
 /*!40000 ALTER TABLE `match_data` DISABLE KEYS */;
-INSERT INTO `match_data` VALUES (1,21,25,3,1,2,NULL,2),(2,21,25,5,2,3,NULL,2),(3,21,25,5,3,4,NULL,2),(4,21,25,3,5,6,NULL,2),(5,21,25,3,1,4,NULL,2),(6,21,25,3,2,5,NULL,2),(7,21,25,3,3,6,NULL,2);
+INSERT INTO `match_data` VALUES (1,21,25,3,1,2,NULL,2,0,0,NULL,NULL),(2,21,25,5,2,3,NULL,2,0,0,NULL,NULL),(3,21,25,5,3,4,NULL,2,0,0,NULL,NULL),(4,21,25,3,5,6,NULL,2,0,0,NULL,NULL),(5,21,25,3,1,4,NULL,2,0,0,NULL,NULL),(6,21,25,3,2,5,NULL,2,0,0,NULL,NULL),(7,21,25,3,3,6,NULL,2,0,0,NULL,NULL);
 /*!40000 ALTER TABLE `match_data` ENABLE KEYS */;
 UNLOCK TABLES;
 /*!50003 SET @saved_cs_client      = @@character_set_client */ ;
@@ -141,10 +305,52 @@ DELIMITER ;;
     DECLARE games INT;
     SET games = NEW.best_of;
 
-    WHILE games > 0 DO
-        INSERT INTO game_data (team1_score, team2_score, match_id_FK) VALUES (0, 0, NEW.id);
-        SET games = games - 1;
-    END WHILE;
+    -- Bulk schedule creation sets @skip_create_games and inserts the games itself
+    IF @skip_create_games IS NULL THEN
+        WHILE games > 0 DO
+            INSERT INTO game_data (team1_score, team2_score, match_id_FK) VALUES (0, 0, NEW.id);
+            SET games = games - 1;
+        END WHILE;
+    END IF;
+
+    CALL bump_division_version(NEW.division_id_FK);
+END */;;
+DELIMITER ;
+/*!50003 SET sql_mode              = @saved_sql_mode */ ;
+/*!50003 SET character_set_client  = @saved_cs_client */ ;
+/*!50003 SET character_set_results = @saved_cs_results */ ;
+/*!50003 SET collation_connection  = @saved_col_connection */ ;
+/*!50003 SET @saved_cs_client      = @@character_set_client */ ;
+/*!50003 SET @saved_cs_results     = @@character_set_results */ ;
+/*!50003 SET @saved_col_connection = @@collation_connection */ ;
+/*!50003 SET character_set_client  = utf8mb4 */ ;
+/*!50003 SET character_set_results = utf8mb4 */ ;
+/*!50003 SET collation_connection  = utf8mb4_0900_ai_ci */ ;
+/*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
+/*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
+DELIMITER ;;
+/*!50003 CREATE*/ /*!50017 DEFINER=`root`@`localhost`*/ /*!50003 TRIGGER `bump_division_on_update_match` AFTER UPDATE ON `match_data` FOR EACH ROW BEGIN
+    CALL bump_division_version(NEW.division_id_FK);
+    IF OLD.division_id_FK <> NEW.division_id_FK THEN
+        CALL bump_division_version(OLD.division_id_FK);
+    END IF;
+END */;;
+DELIMITER ;
+/*!50003 SET sql_mode              = @saved_sql_mode */ ;
+/*!50003 SET character_set_client  = @saved_cs_client */ ;
+/*!50003 SET character_set_results = @saved_cs_results */ ;
+/*!50003 SET collation_connection  = @saved_col_connection */ ;
+/*!50003 SET @saved_cs_client      = @@character_set_client */ ;
+/*!50003 SET @saved_cs_results     = @@character_set_results */ ;
+/*!50003 SET @saved_col_connection = @@collation_connection */ ;
+/*!50003 SET character_set_client  = utf8mb4 */ ;
+/*!50003 SET character_set_results = utf8mb4 */ ;
+/*!50003 SET collation_connection  = utf8mb4_0900_ai_ci */ ;
+/*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
+/*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
+DELIMITER ;;
+/*!50003 CREATE*/ /*!50017 DEFINER=`root`@`localhost`*/ /*!50003 TRIGGER `bump_division_on_delete_match` AFTER DELETE ON `match_data` FOR EACH ROW BEGIN
+    CALL bump_division_version(OLD.division_id_FK);
 END */;;
 DELIMITER ;
 /*!50003 SET sql_mode              = @saved_sql_mode */ ;
@@ -167,6 +373,7 @@ CREATE TABLE `player` (
   `school_id_FK` int DEFAULT NULL,
   PRIMARY KEY (`id`),
   KEY `school_id_FK` (`school_id_FK`),
+  KEY `player_name` (`name`),
   CONSTRAINT `player_ibfk_1` FOREIGN KEY (`school_id_FK`) REFERENCES `school` (`id`) ON DELETE RESTRICT ON UPDATE CASCADE
 ) ENGINE=InnoDB AUTO_INCREMENT=10 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
@@ -181,6 +388,31 @@ INSERT INTO `player` VALUES (1,'John','2001-01-01','213-481-4123',1),(2,'Bob','2
 /*!40000 ALTER TABLE `player` ENABLE KEYS */;
 UNLOCK TABLES;
 
+--
+-- Table structure for table `schema_migration`
+--
+
+DROP TABLE IF EXISTS `schema_migration`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `schema_migration` (
+  `version` int NOT NULL,
+  `name` varchar(100) NOT NULL,
+  `applied_at` datetime NOT NULL,
+  PRIMARY KEY (`version`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
+--
+-- Dumping data for table `schema_migration`
+--
+
+LOCK TABLES `schema_migration` WRITE;
+/*!40000 ALTER TABLE `schema_migration` DISABLE KEYS */;
+INSERT INTO `schema_migration` VALUES (1,'lookup_indexes','2026-10-18 00:00:00'),(2,'division_versions','2026-10-18 00:00:00'),(3,'match_tallies','2026-10-18 00:00:00'),(4,'court_times','2026-10-18 00:00:00'),(5,'procedures','2026-10-18 00:00:00'),(6,'brackets','2026-10-18 00:00:00'),(7,'team_versions','2026-10-18 00:00:00');
+/*!40000 ALTER TABLE `schema_migration` ENABLE KEYS */;
+UNLOCK TABLES;
+
 --
 -- Table structure for table `school`
 --
@@ -192,7 +424,8 @@ CREATE TABLE `school` (
   `id` int NOT NULL AUTO_INCREMENT,
   `name` varchar(100) NOT NULL,
   `address` varchar(100) NOT NULL,
-  PRIMARY KEY (`id`)
+  PRIMARY KEY (`id`),
+  KEY `school_name` (`name`)
 ) ENGINE=InnoDB AUTO_INCREMENT=3 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
 
@@ -223,6 +456,7 @@ CREATE TABLE `team` (
   KEY `division_id_FK` (`division_id_FK`),
   KEY `player1_id_FK` (`player1_id_FK`),
   KEY `player2_id_FK` (`player2_id_FK`),
+  KEY `team_division_name` (`division_id_FK`,`name`),
   CONSTRAINT `team_ibfk_1` FOREIGN KEY (`division_id_FK`) REFERENCES `division` (`id`) ON DELETE CASCADE ON UPDATE CASCADE,
   CONSTRAINT `team_ibfk_2` FOREIGN KEY (`player1_id_FK`) REFERENCES `player` (`id`) ON DELETE RESTRICT ON UPDATE CASCADE,
   CONSTRAINT `team_ibfk_3` FOREIGN KEY (`player2_id_FK`) REFERENCES `player` (`id`) ON DELETE RESTRICT ON UPDATE CASCADE
@@ -238,6 +472,60 @@ LOCK TABLES `team` WRITE;
 INSERT INTO `team` VALUES (1,'The Boys',2,1,2),(2,'Folks',2,3,4),(3,'Hmmm',2,5,6),(4,'Wonners',2,1,4),(5,'Ahhh',2,7,8),(6,'Losers',2,4,9);
 /*!40000 ALTER TABLE `team` ENABLE KEYS */;
 UNLOCK TABLES;
+/*!50003 SET @saved_cs_client      = @@character_set_client */ ;
+/*!50003 SET @saved_cs_results     = @@character_set_results */ ;
+/*!50003 SET @saved_col_connection = @@collation_connection */ ;
+/*!50003 SET character_set_client  = utf8mb4 */ ;
+/*!50003 SET character_set_results = utf8mb4 */ ;
+/*!50003 SET collation_connection  = utf8mb4_0900_ai_ci */ ;
+/*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
+/*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
+DELIMITER ;;
+/*!50003 CREATE*/ /*!50017 DEFINER=`root`@`localhost`*/ /*!50003 TRIGGER `bump_division_on_insert_team` AFTER INSERT ON `team` FOR EACH ROW BEGIN
+    CALL bump_division_version(NEW.division_id_FK);
+END */;;
+DELIMITER ;
+/*!50003 SET sql_mode              = @saved_sql_mode */ ;
+/*!50003 SET character_set_client  = @saved_cs_client */ ;
+/*!50003 SET character_set_results = @saved_cs_results */ ;
+/*!50003 SET collation_connection  = @saved_col_connection */ ;
+/*!50003 SET @saved_cs_client      = @@character_set_client */ ;
+/*!50003 SET @saved_cs_results     = @@character_set_results */ ;
+/*!50003 SET @saved_col_connection = @@collation_connection */ ;
+/*!50003 SET character_set_client  = utf8mb4 */ ;
+/*!50003 SET character_set_results = utf8mb4 */ ;
+/*!50003 SET collation_connection  = utf8mb4_0900_ai_ci */ ;
+/*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
+/*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
+DELIMITER ;;
+/*!50003 CREATE*/ /*!50017 DEFINER=`root`@`localhost`*/ /*!50003 TRIGGER `bump_division_on_update_team` AFTER UPDATE ON `team` FOR EACH ROW BEGIN
+    CALL bump_division_version(NEW.division_id_FK);
+    IF OLD.division_id_FK <> NEW.division_id_FK THEN
+        CALL bump_division_version(OLD.division_id_FK);
+    END IF;
+END */;;
+DELIMITER ;
+/*!50003 SET sql_mode              = @saved_sql_mode */ ;
+/*!50003 SET character_set_client  = @saved_cs_client */ ;
+/*!50003 SET character_set_results = @saved_cs_results */ ;
+/*!50003 SET collation_connection  = @saved_col_connection */ ;
+/*!50003 SET @saved_cs_client      = @@character_set_client */ ;
+/*!50003 SET @saved_cs_results     = @@character_set_results */ ;
+/*!50003 SET @saved_col_connection = @@collation_connection */ ;
+/*!50003 SET character_set_client  = utf8mb4 */ ;
+/*!50003 SET character_set_results = utf8mb4 */ ;
+/*!50003 SET collation_connection  = utf8mb4_0900_ai_ci */ ;
+/*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
+/*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
+DELIMITER ;;
+/*!50003 CREATE*/ /*!50017 DEFINER=`root`@`localhost`*/ /*!50003 TRIGGER `bump_division_on_delete_team` AFTER DELETE ON `team` FOR EACH ROW BEGIN
+    CALL bump_division_version(OLD.division_id_FK);
+END */;;
+DELIMITER ;
+/*!50003 SET sql_mode              = @saved_sql_mode */ ;
+/*!50003 SET character_set_client  = @saved_cs_client */ ;
+/*!50003 SET character_set_results = @saved_cs_results */ ;
+/*!50003 SET collation_connection  = @saved_col_connection */ ;
 
 --
 -- Table structure for table `tournament`
@@ -252,7 +540,8 @@ CREATE TABLE `tournament` (
   `date` date NOT NULL,
   `time` time NOT NULL,
   `address` varchar(100) NOT NULL,
-  PRIMARY KEY (`id`)
+  PRIMARY KEY (`id`),
+  KEY `tournament_date_time` (`date`,`time`)
 ) ENGINE=InnoDB AUTO_INCREMENT=4 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
 
@@ -273,7 +562,7 @@ UNLOCK TABLES;
 --
 -- Dumping routines for database 'tm'
 --
-/*!50003 DROP PROCEDURE IF EXISTS `get_columns_from_table` */;
+/*!50003 DROP PROCEDURE IF EXISTS `advance_bracket` */;
 /*!50003 SET @saved_cs_client      = @@character_set_client */ ;
 /*!50003 SET @saved_cs_results     = @@character_set_results */ ;
 /*!50003 SET @saved_col_connection = @@collation_connection */ ;
@@ -283,19 +572,25 @@ UNLOCK TABLES;
 /*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
 /*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
 DELIMITER ;;
-CREATE DEFINER=`root`@`localhost` PROCEDURE `get_columns_from_table`(IN tab_name VARCHAR(255), db_name VARCHAR(255))
+CREATE DEFINER=`root`@`localhost` PROCEDURE `advance_bracket`(IN m_id INT)
 BEGIN
-    SELECT COLUMN_NAME, DATA_TYPE, COLUMN_KEY, IS_NULLABLE
-	FROM INFORMATION_SCHEMA.COLUMNS
-	WHERE TABLE_NAME = tab_name and TABLE_SCHEMA = db_name
-    ORDER BY ORDINAL_POSITION;
+    DECLARE bracket_division INT;
+
+    SET bracket_division = (SELECT division_id_FK FROM bracket_match WHERE match_id_FK = m_id);
+    IF bracket_division IS NULL THEN
+        SELECT 0 as created_matches;
+    ELSE
+        -- A winner entered on the match itself, as for a forfeit, is placed here, the game triggers place the others
+        CALL place_bracket_teams(bracket_division);
+        CALL create_bracket_matches(bracket_division);
+    END IF;
 END ;;
 DELIMITER ;
 /*!50003 SET sql_mode              = @saved_sql_mode */ ;
 /*!50003 SET character_set_client  = @saved_cs_client */ ;
 /*!50003 SET character_set_results = @saved_cs_results */ ;
 /*!50003 SET collation_connection  = @saved_col_connection */ ;
-/*!50003 DROP PROCEDURE IF EXISTS `get_players_from_school` */;
+/*!50003 DROP PROCEDURE IF EXISTS `backfill_match_tallies` */;
 /*!50003 SET @saved_cs_client      = @@character_set_client */ ;
 /*!50003 SET @saved_cs_results     = @@character_set_results */ ;
 /*!50003 SET @saved_col_connection = @@collation_connection */ ;
@@ -305,16 +600,33 @@ DELIMITER ;
 /*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
 /*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
 DELIMITER ;;
-CREATE DEFINER=`root`@`localhost` PROCEDURE `get_players_from_school`(IN s_id INT)
+CREATE DEFINER=`root`@`localhost` PROCEDURE `backfill_match_tallies`()
 BEGIN
-    SELECT * FROM player WHERE school_id_FK = s_id;
+    UPDATE match_data as md
+    LEFT JOIN (
+        SELECT match_id_FK,
+               SUM(IFNULL(team1_score > team2_score, 0)) as team1_wins,
+               SUM(IFNULL(team2_score > team1_score, 0)) as team2_wins
+        FROM game_data
+        GROUP BY match_id_FK
+    ) as gd ON gd.match_id_FK = md.id
+    SET md.team1_games_won = IFNULL(gd.team1_wins, 0),
+        md.team2_games_won = IFNULL(gd.team2_wins, 0),
+        md.winner_id_FK = CASE
+            WHEN IFNULL(gd.team1_wins, 0) > md.best_of DIV 2 THEN md.team1_id_FK
+            WHEN IFNULL(gd.team2_wins, 0) > md.best_of DIV 2 THEN md.team2_id_FK
+            -- Winners entered by hand stand as in update_match_winner
+            WHEN md.winner_id_FK = md.team1_id_FK AND IFNULL(gd.team1_wins, 0) < IFNULL(gd.team2_wins, 0) THEN NULL
+            WHEN md.winner_id_FK = md.team2_id_FK AND IFNULL(gd.team2_wins, 0) < IFNULL(gd.team1_wins, 0) THEN NULL
+            ELSE md.winner_id_FK
+        END;
 END ;;
 DELIMITER ;
 /*!50003 SET sql_mode              = @saved_sql_mode */ ;
 /*!50003 SET character_set_client  = @saved_cs_client */ ;
 /*!50003 SET character_set_results = @saved_cs_results */ ;
 /*!50003 SET collation_connection  = @saved_col_connection */ ;
-/*!50003 DROP PROCEDURE IF EXISTS `update_match_winner` */;
+/*!50003 DROP PROCEDURE IF EXISTS `bump_division_version` */;
 /*!50003 SET @saved_cs_client      = @@character_set_client */ ;
 /*!50003 SET @saved_cs_results     = @@character_set_results */ ;
 /*!50003 SET @saved_col_connection = @@collation_connection */ ;
@@ -324,40 +636,17 @@ DELIMITER ;
 /*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
 /*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
 DELIMITER ;;
-CREATE DEFINER=`root`@`localhost` PROCEDURE `update_match_winner`(IN m_id INT)
+CREATE DEFINER=`root`@`localhost` PROCEDURE `bump_division_version`(IN d_id INT)
 BEGIN
-	DECLARE team1_wins INT;
-    DECLARE team2_wins INT;
-	DECLARE best_of INT;
-
-    SELECT count(*) INTO team1_wins
-    FROM game_data as gd
-    WHERE gd.match_id_FK = m_id and gd.team1_score > gd.team2_score;
-
-    SELECT count(*) INTO team2_wins
-    FROM game_data as gd
-    WHERE gd.match_id_FK = m_id and gd.team2_score > gd.team1_score;
-
-	SELECT best_of INTO best_of
-    FROM match_data as md
-    WHERE md.id = m_id;
-
-    IF team1_wins = CEIL(best_of) THEN
-        UPDATE match_data as md
-        SET md.winner_id_FK = md.team1_id_FK
-        WHERE md.id = m_id;
-    ELSEIF team2_wins = CEIL(best_of) THEN
-        UPDATE match_data as md
-        SET md.winner_id_FK = md.team2_id_FK
-        WHERE md.id = m_id;
-    END IF;
+	INSERT INTO division_version (division_id_FK, version) VALUES (d_id, 1)
+	ON DUPLICATE KEY UPDATE version = version + 1;
 END ;;
 DELIMITER ;
 /*!50003 SET sql_mode              = @saved_sql_mode */ ;
 /*!50003 SET character_set_client  = @saved_cs_client */ ;
 /*!50003 SET character_set_results = @saved_cs_results */ ;
 /*!50003 SET collation_connection  = @saved_col_connection */ ;
-/*!50003 DROP PROCEDURE IF EXISTS `view_all_division_matches` */;
+/*!50003 DROP PROCEDURE IF EXISTS `bump_match_division_version` */;
 /*!50003 SET @saved_cs_client      = @@character_set_client */ ;
 /*!50003 SET @saved_cs_results     = @@character_set_results */ ;
 /*!50003 SET @saved_col_connection = @@collation_connection */ ;
@@ -367,16 +656,18 @@ DELIMITER ;
 /*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
 /*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
 DELIMITER ;;
-CREATE DEFINER=`root`@`localhost` PROCEDURE `view_all_division_matches`(IN d_id INT)
+CREATE DEFINER=`root`@`localhost` PROCEDURE `bump_match_division_version`(IN m_id INT)
 BEGIN
-	SELECT * FROM match_data WHERE division_id_FK = d_id;
+	INSERT INTO division_version (division_id_FK, version)
+	SELECT division_id_FK, 1 FROM match_data WHERE id = m_id
+	ON DUPLICATE KEY UPDATE version = version + 1;
 END ;;
 DELIMITER ;
 /*!50003 SET sql_mode              = @saved_sql_mode */ ;
 /*!50003 SET character_set_client  = @saved_cs_client */ ;
 /*!50003 SET character_set_results = @saved_cs_results */ ;
 /*!50003 SET collation_connection  = @saved_col_connection */ ;
-/*!50003 DROP PROCEDURE IF EXISTS `view_all_division_teams` */;
+/*!50003 DROP PROCEDURE IF EXISTS `create_bracket_matches` */;
 /*!50003 SET @saved_cs_client      = @@character_set_client */ ;
 /*!50003 SET @saved_cs_results     = @@character_set_results */ ;
 /*!50003 SET @saved_col_connection = @@collation_connection */ ;
@@ -386,16 +677,42 @@ DELIMITER ;
 /*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
 /*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
 DELIMITER ;;
-CREATE DEFINER=`root`@`localhost` PROCEDURE `view_all_division_teams`(IN d_id INT)
+CREATE DEFINER=`root`@`localhost` PROCEDURE `create_bracket_matches`(IN d_id INT)
 BEGIN
-	SELECT * FROM team WHERE division_id_FK = d_id;
+    DECLARE done BOOLEAN DEFAULT FALSE;
+    DECLARE bm_id INT;
+    DECLARE created INT DEFAULT 0;
+    DECLARE ready_matches CURSOR FOR
+        SELECT id FROM bracket_match
+        WHERE division_id_FK = d_id AND match_id_FK IS NULL AND NOT decided
+            AND team1_id_FK IS NOT NULL AND team2_id_FK IS NOT NULL
+        ORDER BY id;
+    DECLARE CONTINUE HANDLER FOR NOT FOUND SET done = TRUE;
+
+    OPEN ready_matches;
+    create_loop: LOOP
+        FETCH ready_matches INTO bm_id;
+        IF done THEN
+            LEAVE create_loop;
+        END IF;
+
+        -- The match's games are created by its insert trigger
+        INSERT INTO match_data (play_to, hard_cap, best_of, team1_id_FK, team2_id_FK, division_id_FK)
+        SELECT play_to, hard_cap, best_of, team1_id_FK, team2_id_FK, division_id_FK
+        FROM bracket_match WHERE id = bm_id;
+        UPDATE bracket_match SET match_id_FK = LAST_INSERT_ID() WHERE id = bm_id;
+        SET created = created + 1;
+    END LOOP;
+    CLOSE ready_matches;
+
+    SELECT created as created_matches;
 END ;;
 DELIMITER ;
 /*!50003 SET sql_mode              = @saved_sql_mode */ ;
 /*!50003 SET character_set_client  = @saved_cs_client */ ;
 /*!50003 SET character_set_results = @saved_cs_results */ ;
 /*!50003 SET collation_connection  = @saved_col_connection */ ;
-/*!50003 DROP PROCEDURE IF EXISTS `view_all_match_games` */;
+/*!50003 DROP PROCEDURE IF EXISTS `export_tournament_results` */;
 /*!50003 SET @saved_cs_client      = @@character_set_client */ ;
 /*!50003 SET @saved_cs_results     = @@character_set_results */ ;
 /*!50003 SET @saved_col_connection = @@collation_connection */ ;
@@ -405,16 +722,30 @@ DELIMITER ;
 /*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
 /*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
 DELIMITER ;;
-CREATE DEFINER=`root`@`localhost` PROCEDURE `view_all_match_games`(IN m_id INT)
+CREATE DEFINER=`root`@`localhost` PROCEDURE `export_tournament_results`(IN to_id INT)
 BEGIN
-	SELECT * FROM game_data WHERE match_id_FK = m_id;
+	SELECT tn.id as tournament_id, tn.name as tournament, tn.date, tn.time, tn.address,
+	       dv.id as division_id, dv.name as division,
+	       md.id as match_id, md.play_to, md.hard_cap, md.best_of,
+	       t1.name as team1, t2.name as team2, w.name as winner,
+	       md.team1_games_won, md.team2_games_won,
+	       gd.id as game_id, gd.team1_score, gd.team2_score
+	FROM tournament as tn
+	JOIN division as dv ON dv.tournament_id_FK = tn.id
+	JOIN match_data as md ON md.division_id_FK = dv.id
+	JOIN team as t1 ON t1.id = md.team1_id_FK
+	JOIN team as t2 ON t2.id = md.team2_id_FK
+	LEFT JOIN team as w ON w.id = md.winner_id_FK
+	LEFT JOIN game_data as gd ON gd.match_id_FK = md.id
+	WHERE to_id IS NULL OR tn.id = to_id
+	ORDER BY tn.id, dv.id, md.id, gd.id;
 END ;;
 DELIMITER ;
 /*!50003 SET sql_mode              = @saved_sql_mode */ ;
 /*!50003 SET character_set_client  = @saved_cs_client */ ;
 /*!50003 SET character_set_results = @saved_cs_results */ ;
 /*!50003 SET collation_connection  = @saved_col_connection */ ;
-/*!50003 DROP PROCEDURE IF EXISTS `view_all_players` */;
+/*!50003 DROP PROCEDURE IF EXISTS `get_columns_from_schema` */;
 /*!50003 SET @saved_cs_client      = @@character_set_client */ ;
 /*!50003 SET @saved_cs_results     = @@character_set_results */ ;
 /*!50003 SET @saved_col_connection = @@collation_connection */ ;
@@ -424,16 +755,19 @@ DELIMITER ;
 /*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
 /*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
 DELIMITER ;;
-CREATE DEFINER=`root`@`localhost` PROCEDURE `view_all_players`()
+CREATE DEFINER=`root`@`localhost` PROCEDURE `get_columns_from_schema`(IN db_name VARCHAR(255))
 BEGIN
-	SELECT * FROM player;
+    SELECT TABLE_NAME, COLUMN_NAME, DATA_TYPE, COLUMN_KEY, IS_NULLABLE
+	FROM INFORMATION_SCHEMA.COLUMNS
+	WHERE TABLE_SCHEMA = db_name
+    ORDER BY TABLE_NAME, ORDINAL_POSITION;
 END ;;
 DELIMITER ;
 /*!50003 SET sql_mode              = @saved_sql_mode */ ;
 /*!50003 SET character_set_client  = @saved_cs_client */ ;
 /*!50003 SET character_set_results = @saved_cs_results */ ;
 /*!50003 SET collation_connection  = @saved_col_connection */ ;
-/*!50003 DROP PROCEDURE IF EXISTS `view_all_schools` */;
+/*!50003 DROP PROCEDURE IF EXISTS `get_columns_from_table` */;
 /*!50003 SET @saved_cs_client      = @@character_set_client */ ;
 /*!50003 SET @saved_cs_results     = @@character_set_results */ ;
 /*!50003 SET @saved_col_connection = @@collation_connection */ ;
@@ -443,16 +777,19 @@ DELIMITER ;
 /*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
 /*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
 DELIMITER ;;
-CREATE DEFINER=`root`@`localhost` PROCEDURE `view_all_schools`()
+CREATE DEFINER=`root`@`localhost` PROCEDURE `get_columns_from_table`(IN tab_name VARCHAR(255), db_name VARCHAR(255))
 BEGIN
-    SELECT * FROM school;
+    SELECT COLUMN_NAME, DATA_TYPE, COLUMN_KEY, IS_NULLABLE
+	FROM INFORMATION_SCHEMA.COLUMNS
+	WHERE TABLE_NAME = tab_name and TABLE_SCHEMA = db_name
+    ORDER BY ORDINAL_POSITION;
 END ;;
 DELIMITER ;
 /*!50003 SET sql_mode              = @saved_sql_mode */ ;
 /*!50003 SET character_set_client  = @saved_cs_client */ ;
 /*!50003 SET character_set_results = @saved_cs_results */ ;
 /*!50003 SET collation_connection  = @saved_col_connection */ ;
-/*!50003 DROP PROCEDURE IF EXISTS `view_all_team_players` */;
+/*!50003 DROP PROCEDURE IF EXISTS `get_division_bracket` */;
 /*!50003 SET @saved_cs_client      = @@character_set_client */ ;
 /*!50003 SET @saved_cs_results     = @@character_set_results */ ;
 /*!50003 SET @saved_col_connection = @@collation_connection */ ;
@@ -462,20 +799,20 @@ DELIMITER ;
 /*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
 /*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
 DELIMITER ;;
-CREATE DEFINER=`root`@`localhost` PROCEDURE `view_all_team_players`(IN te_id INT)
+CREATE DEFINER=`root`@`localhost` PROCEDURE `get_division_bracket`(IN d_id INT)
 BEGIN
-    SELECT * FROM player WHERE id in
-    (SELECT player1_id_FK as ids FROM team WHERE id = te_id
-    UNION
-    SELECT player2_id_FK as ids FROM team WHERE id = te_id);
-
+    SELECT bm.*, md.team1_games_won, md.team2_games_won
+    FROM bracket_match as bm
+    LEFT JOIN match_data as md ON md.id = bm.match_id_FK
+    WHERE bm.division_id_FK = d_id
+    ORDER BY bm.id;
 END ;;
 DELIMITER ;
 /*!50003 SET sql_mode              = @saved_sql_mode */ ;
 /*!50003 SET character_set_client  = @saved_cs_client */ ;
 /*!50003 SET character_set_results = @saved_cs_results */ ;
 /*!50003 SET collation_connection  = @saved_col_connection */ ;
-/*!50003 DROP PROCEDURE IF EXISTS `view_all_tournaments` */;
+/*!50003 DROP PROCEDURE IF EXISTS `get_division_snapshot` */;
 /*!50003 SET @saved_cs_client      = @@character_set_client */ ;
 /*!50003 SET @saved_cs_results     = @@character_set_results */ ;
 /*!50003 SET @saved_col_connection = @@collation_connection */ ;
@@ -485,16 +822,29 @@ DELIMITER ;
 /*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
 /*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
 DELIMITER ;;
-CREATE DEFINER=`root`@`localhost` PROCEDURE `view_all_tournaments`()
+CREATE DEFINER=`root`@`localhost` PROCEDURE `get_division_snapshot`(IN d_id INT)
 BEGIN
-	SELECT * FROM tournament;
+	SELECT * FROM division WHERE id = d_id;
+
+	SELECT * FROM team WHERE division_id_FK = d_id ORDER BY id;
+
+	SELECT p.* FROM team as t JOIN player as p ON p.id = t.player1_id_FK WHERE t.division_id_FK = d_id
+	UNION
+	SELECT p.* FROM team as t JOIN player as p ON p.id = t.player2_id_FK WHERE t.division_id_FK = d_id;
+
+	SELECT * FROM match_data WHERE division_id_FK = d_id ORDER BY id;
+
+	SELECT gd.* FROM game_data as gd
+	JOIN match_data as md ON md.id = gd.match_id_FK
+	WHERE md.division_id_FK = d_id
+	ORDER BY gd.match_id_FK, gd.id;
 END ;;
 DELIMITER ;
 /*!50003 SET sql_mode              = @saved_sql_mode */ ;
 /*!50003 SET character_set_client  = @saved_cs_client */ ;
 /*!50003 SET character_set_results = @saved_cs_results */ ;
 /*!50003 SET collation_connection  = @saved_col_connection */ ;
-/*!50003 DROP PROCEDURE IF EXISTS `view_all_tournament_divisions` */;
+/*!50003 DROP PROCEDURE IF EXISTS `get_division_versions` */;
 /*!50003 SET @saved_cs_client      = @@character_set_client */ ;
 /*!50003 SET @saved_cs_results     = @@character_set_results */ ;
 /*!50003 SET @saved_col_connection = @@collation_connection */ ;
@@ -504,16 +854,16 @@ DELIMITER ;
 /*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
 /*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
 DELIMITER ;;
-CREATE DEFINER=`root`@`localhost` PROCEDURE `view_all_tournament_divisions`(IN to_id INT)
+CREATE DEFINER=`root`@`localhost` PROCEDURE `get_division_versions`()
 BEGIN
-	SELECT * FROM division WHERE tournament_id_FK = to_id;
+	SELECT division_id_FK, version FROM division_version;
 END ;;
 DELIMITER ;
 /*!50003 SET sql_mode              = @saved_sql_mode */ ;
 /*!50003 SET character_set_client  = @saved_cs_client */ ;
 /*!50003 SET character_set_results = @saved_cs_results */ ;
 /*!50003 SET collation_connection  = @saved_col_connection */ ;
-/*!50003 DROP PROCEDURE IF EXISTS `view_specific_division` */;
+/*!50003 DROP PROCEDURE IF EXISTS `get_match_length_history` */;
 /*!50003 SET @saved_cs_client      = @@character_set_client */ ;
 /*!50003 SET @saved_cs_results     = @@character_set_results */ ;
 /*!50003 SET @saved_col_connection = @@collation_connection */ ;
@@ -523,16 +873,25 @@ DELIMITER ;
 /*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
 /*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
 DELIMITER ;;
-CREATE DEFINER=`root`@`localhost` PROCEDURE `view_specific_division`(IN to_id INT)
+CREATE DEFINER=`root`@`localhost` PROCEDURE `get_match_length_history`()
 BEGIN
-	SELECT * FROM team WHERE id = to_id;
+    SELECT md.play_to, md.hard_cap, AVG(gd.team1_score + gd.team2_score) as points
+    FROM game_data as gd
+    JOIN match_data as md ON md.id = gd.match_id_FK
+    WHERE md.winner_id_FK IS NOT NULL AND gd.team1_score <> gd.team2_score
+    GROUP BY md.play_to, md.hard_cap;
+
+    SELECT best_of, AVG(team1_games_won + team2_games_won) as games
+    FROM match_data
+    WHERE winner_id_FK IS NOT NULL
+    GROUP BY best_of;
 END ;;
 DELIMITER ;
 /*!50003 SET sql_mode              = @saved_sql_mode */ ;
 /*!50003 SET character_set_client  = @saved_cs_client */ ;
 /*!50003 SET character_set_results = @saved_cs_results */ ;
 /*!50003 SET collation_connection  = @saved_col_connection */ ;
-/*!50003 DROP PROCEDURE IF EXISTS `view_specific_game` */;
+/*!50003 DROP PROCEDURE IF EXISTS `get_match_rating` */;
 /*!50003 SET @saved_cs_client      = @@character_set_client */ ;
 /*!50003 SET @saved_cs_results     = @@character_set_results */ ;
 /*!50003 SET @saved_col_connection = @@collation_connection */ ;
@@ -542,16 +901,22 @@ DELIMITER ;
 /*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
 /*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
 DELIMITER ;;
-CREATE DEFINER=`root`@`localhost` PROCEDURE `view_specific_game`(IN g_id INT)
+CREATE DEFINER=`root`@`localhost` PROCEDURE `get_match_rating`(IN m_id INT)
 BEGIN
-	SELECT * FROM game_data WHERE id = g_id;
+    SELECT md.id, md.team1_id_FK, md.team2_id_FK, md.winner_id_FK, md.team1_games_won, md.team2_games_won,
+           t1.player1_id_FK as team1_player1, t1.player2_id_FK as team1_player2,
+           t2.player1_id_FK as team2_player1, t2.player2_id_FK as team2_player2
+    FROM match_data as md
+    JOIN team as t1 ON t1.id = md.team1_id_FK
+    JOIN team as t2 ON t2.id = md.team2_id_FK
+    WHERE md.id = m_id;
 END ;;
 DELIMITER ;
 /*!50003 SET sql_mode              = @saved_sql_mode */ ;
 /*!50003 SET character_set_client  = @saved_cs_client */ ;
 /*!50003 SET character_set_results = @saved_cs_results */ ;
 /*!50003 SET collation_connection  = @saved_col_connection */ ;
-/*!50003 DROP PROCEDURE IF EXISTS `view_specific_match` */;
+/*!50003 DROP PROCEDURE IF EXISTS `get_players_from_school` */;
 /*!50003 SET @saved_cs_client      = @@character_set_client */ ;
 /*!50003 SET @saved_cs_results     = @@character_set_results */ ;
 /*!50003 SET @saved_col_connection = @@collation_connection */ ;
@@ -561,16 +926,16 @@ DELIMITER ;
 /*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
 /*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
 DELIMITER ;;
-CREATE DEFINER=`root`@`localhost` PROCEDURE `view_specific_match`(IN m_id INT)
+CREATE DEFINER=`root`@`localhost` PROCEDURE `get_players_from_school`(IN s_id INT)
 BEGIN
-	SELECT * FROM match_data WHERE id = m_id;
+    SELECT * FROM player WHERE school_id_FK = s_id;
 END ;;
 DELIMITER ;
 /*!50003 SET sql_mode              = @saved_sql_mode */ ;
 /*!50003 SET character_set_client  = @saved_cs_client */ ;
 /*!50003 SET character_set_results = @saved_cs_results */ ;
 /*!50003 SET collation_connection  = @saved_col_connection */ ;
-/*!50003 DROP PROCEDURE IF EXISTS `view_specific_player` */;
+/*!50003 DROP PROCEDURE IF EXISTS `get_rating_history` */;
 /*!50003 SET @saved_cs_client      = @@character_set_client */ ;
 /*!50003 SET @saved_cs_results     = @@character_set_results */ ;
 /*!50003 SET @saved_col_connection = @@collation_connection */ ;
@@ -580,16 +945,25 @@ DELIMITER ;
 /*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
 /*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
 DELIMITER ;;
-CREATE DEFINER=`root`@`localhost` PROCEDURE `view_specific_player`(IN p_id INT)
+CREATE DEFINER=`root`@`localhost` PROCEDURE `get_rating_history`()
 BEGIN
-	SELECT * FROM player WHERE id = p_id;
+    SELECT md.id, md.team1_id_FK, md.team2_id_FK, md.winner_id_FK, md.team1_games_won, md.team2_games_won,
+           t1.player1_id_FK as team1_player1, t1.player2_id_FK as team1_player2,
+           t2.player1_id_FK as team2_player1, t2.player2_id_FK as team2_player2
+    FROM match_data as md
+    JOIN division as dv ON dv.id = md.division_id_FK
+    JOIN tournament as tn ON tn.id = dv.tournament_id_FK
+    JOIN team as t1 ON t1.id = md.team1_id_FK
+    JOIN team as t2 ON t2.id = md.team2_id_FK
+    WHERE md.winner_id_FK IS NOT NULL
+    ORDER BY tn.date, tn.time, tn.id, md.id;
 END ;;
 DELIMITER ;
 /*!50003 SET sql_mode              = @saved_sql_mode */ ;
 /*!50003 SET character_set_client  = @saved_cs_client */ ;
 /*!50003 SET character_set_results = @saved_cs_results */ ;
 /*!50003 SET collation_connection  = @saved_col_connection */ ;
-/*!50003 DROP PROCEDURE IF EXISTS `view_specific_school` */;
+/*!50003 DROP PROCEDURE IF EXISTS `get_search_entries` */;
 /*!50003 SET @saved_cs_client      = @@character_set_client */ ;
 /*!50003 SET @saved_cs_results     = @@character_set_results */ ;
 /*!50003 SET @saved_col_connection = @@collation_connection */ ;
@@ -599,16 +973,24 @@ DELIMITER ;
 /*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
 /*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
 DELIMITER ;;
-CREATE DEFINER=`root`@`localhost` PROCEDURE `view_specific_school`(IN s_id INT)
+CREATE DEFINER=`root`@`localhost` PROCEDURE `get_search_entries`()
 BEGIN
-	SELECT * FROM school WHERE id = s_id;
+	SELECT 'school' as kind, id, name, NULL as school_id, NULL as phone_number,
+	       NULL as player1_id, NULL as player2_id
+	FROM school
+	UNION ALL
+	SELECT 'player', id, name, school_id_FK, phone_number, NULL, NULL
+	FROM player
+	UNION ALL
+	SELECT 'team', id, name, NULL, NULL, player1_id_FK, player2_id_FK
+	FROM team;
 END ;;
 DELIMITER ;
 /*!50003 SET sql_mode              = @saved_sql_mode */ ;
 /*!50003 SET character_set_client  = @saved_cs_client */ ;
 /*!50003 SET character_set_results = @saved_cs_results */ ;
 /*!50003 SET collation_connection  = @saved_col_connection */ ;
-/*!50003 DROP PROCEDURE IF EXISTS `view_specific_tournament` */;
+/*!50003 DROP PROCEDURE IF EXISTS `get_tournament_matches` */;
 /*!50003 SET @saved_cs_client      = @@character_set_client */ ;
 /*!50003 SET @saved_cs_results     = @@character_set_results */ ;
 /*!50003 SET @saved_col_connection = @@collation_connection */ ;
@@ -618,9 +1000,478 @@ DELIMITER ;
 /*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
 /*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
 DELIMITER ;;
-CREATE DEFINER=`root`@`localhost` PROCEDURE `view_specific_tournament`(IN to_id INT)
+CREATE DEFINER=`root`@`localhost` PROCEDURE `get_tournament_matches`(IN to_id INT)
 BEGIN
-	SELECT * FROM tournament WHERE id = to_id;
+    SELECT md.*, t1.player1_id_FK as team1_player1, t1.player2_id_FK as team1_player2,
+           t2.player1_id_FK as team2_player1, t2.player2_id_FK as team2_player2
+    FROM match_data as md
+    JOIN division as dv ON dv.id = md.division_id_FK
+    JOIN team as t1 ON t1.id = md.team1_id_FK
+    JOIN team as t2 ON t2.id = md.team2_id_FK
+    WHERE dv.tournament_id_FK = to_id
+    ORDER BY md.id;
+END ;;
+DELIMITER ;
+/*!50003 SET sql_mode              = @saved_sql_mode */ ;
+/*!50003 SET character_set_client  = @saved_cs_client */ ;
+/*!50003 SET character_set_results = @saved_cs_results */ ;
+/*!50003 SET collation_connection  = @saved_col_connection */ ;
+/*!50003 DROP PROCEDURE IF EXISTS `place_bracket_teams` */;
+/*!50003 SET @saved_cs_client      = @@character_set_client */ ;
+/*!50003 SET @saved_cs_results     = @@character_set_results */ ;
+/*!50003 SET @saved_col_connection = @@collation_connection */ ;
+/*!50003 SET character_set_client  = utf8mb4 */ ;
+/*!50003 SET character_set_results = utf8mb4 */ ;
+/*!50003 SET collation_connection  = utf8mb4_0900_ai_ci */ ;
+/*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
+/*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
+DELIMITER ;;
+CREATE DEFINER=`root`@`localhost` PROCEDURE `place_bracket_teams`(IN d_id INT)
+BEGIN
+    DECLARE byes_decided INT DEFAULT 1;
+
+    -- Played matches are decided by their winner
+    UPDATE bracket_match as bm
+    JOIN match_data as md ON md.id = bm.match_id_FK
+    SET bm.winner_id_FK = md.winner_id_FK,
+        bm.loser_id_FK = IF(md.winner_id_FK = md.team1_id_FK, md.team2_id_FK, md.team1_id_FK),
+        bm.decided = TRUE
+    WHERE bm.division_id_FK = d_id AND NOT bm.decided AND md.winner_id_FK IS NOT NULL;
+
+    WHILE byes_decided > 0 DO
+        -- Every side is fed by one match, so each update sets a side from one row at most
+        UPDATE bracket_match as nm
+        JOIN bracket_match as bm ON bm.winner_to = nm.id AND bm.winner_side = 1
+        SET nm.team1_id_FK = bm.winner_id_FK, nm.team1_ready = TRUE
+        WHERE bm.division_id_FK = d_id AND bm.decided AND NOT bm.placed;
+
+        UPDATE bracket_match as nm
+        JOIN bracket_match as bm ON bm.winner_to = nm.id AND bm.winner_side = 2
+        SET nm.team2_id_FK = bm.winner_id_FK, nm.team2_ready = TRUE
+        WHERE bm.division_id_FK = d_id AND bm.decided AND NOT bm.placed;
+
+        UPDATE bracket_match as nm
+        JOIN bracket_match as bm ON bm.loser_to = nm.id AND bm.loser_side = 1
+        SET nm.team1_id_FK = bm.loser_id_FK, nm.team1_ready = TRUE
+        WHERE bm.division_id_FK = d_id AND bm.decided AND NOT bm.placed;
+
+        UPDATE bracket_match as nm
+        JOIN bracket_match as bm ON bm.loser_to = nm.id AND bm.loser_side = 2
+        SET nm.team2_id_FK = bm.loser_id_FK, nm.team2_ready = TRUE
+        WHERE bm.division_id_FK = d_id AND bm.decided AND NOT bm.placed;
+
+        UPDATE bracket_match SET placed = TRUE WHERE division_id_FK = d_id AND decided AND NOT placed;
+
+        -- A match with a bye sends its team on as the winner and a bye as the loser, two byes send two byes
+        UPDATE bracket_match
+        SET winner_id_FK = IFNULL(team1_id_FK, team2_id_FK), loser_id_FK = NULL, decided = TRUE
+        WHERE division_id_FK = d_id AND NOT decided AND team1_ready AND team2_ready
+            AND (team1_id_FK IS NULL OR team2_id_FK IS NULL);
+        SET byes_decided = ROW_COUNT();
+    END WHILE;
+END ;;
+DELIMITER ;
+/*!50003 SET sql_mode              = @saved_sql_mode */ ;
+/*!50003 SET character_set_client  = @saved_cs_client */ ;
+/*!50003 SET character_set_results = @saved_cs_results */ ;
+/*!50003 SET collation_connection  = @saved_col_connection */ ;
+/*!50003 DROP PROCEDURE IF EXISTS `update_match_winner` */;
+/*!50003 SET @saved_cs_client      = @@character_set_client */ ;
+/*!50003 SET @saved_cs_results     = @@character_set_results */ ;
+/*!50003 SET @saved_col_connection = @@collation_connection */ ;
+/*!50003 SET character_set_client  = utf8mb4 */ ;
+/*!50003 SET character_set_results = utf8mb4 */ ;
+/*!50003 SET collation_connection  = utf8mb4_0900_ai_ci */ ;
+/*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
+/*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
+DELIMITER ;;
+CREATE DEFINER=`root`@`localhost` PROCEDURE `update_match_winner`(IN m_id INT)
+BEGIN
+    DECLARE bracket_division INT;
+
+    -- A team wins the match once it has won the majority of its games. Without a majority, a winner entered by
+    -- hand for a forfeit or retirement stands, unless its team has won fewer games than the other
+    UPDATE match_data as md
+    SET md.winner_id_FK = CASE
+        WHEN md.team1_games_won > md.best_of DIV 2 THEN md.team1_id_FK
+        WHEN md.team2_games_won > md.best_of DIV 2 THEN md.team2_id_FK
+        WHEN md.winner_id_FK = md.team1_id_FK AND md.team1_games_won < md.team2_games_won THEN NULL
+        WHEN md.winner_id_FK = md.team2_id_FK AND md.team2_games_won < md.team1_games_won THEN NULL
+        ELSE md.winner_id_FK
+    END
+    WHERE md.id = m_id;
+
+    -- A bracket match's winner and loser go straight to their next bracket matches. The game triggers call
+    -- this and can not insert games, so the next matches themselves are created by advance_bracket
+    SET bracket_division = (SELECT division_id_FK FROM bracket_match WHERE match_id_FK = m_id);
+    IF bracket_division IS NOT NULL THEN
+        CALL place_bracket_teams(bracket_division);
+    END IF;
+END ;;
+DELIMITER ;
+/*!50003 SET sql_mode              = @saved_sql_mode */ ;
+/*!50003 SET character_set_client  = @saved_cs_client */ ;
+/*!50003 SET character_set_results = @saved_cs_results */ ;
+/*!50003 SET collation_connection  = @saved_col_connection */ ;
+/*!50003 DROP PROCEDURE IF EXISTS `view_all_division_games` */;
+/*!50003 SET @saved_cs_client      = @@character_set_client */ ;
+/*!50003 SET @saved_cs_results     = @@character_set_results */ ;
+/*!50003 SET @saved_col_connection = @@collation_connection */ ;
+/*!50003 SET character_set_client  = utf8mb4 */ ;
+/*!50003 SET character_set_results = utf8mb4 */ ;
+/*!50003 SET collation_connection  = utf8mb4_0900_ai_ci */ ;
+/*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
+/*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
+DELIMITER ;;
+CREATE DEFINER=`root`@`localhost` PROCEDURE `view_all_division_games`(IN d_id INT)
+BEGIN
+	SELECT gd.* FROM game_data as gd
+	JOIN match_data as md ON md.id = gd.match_id_FK
+	WHERE md.division_id_FK = d_id;
+END ;;
+DELIMITER ;
+/*!50003 SET sql_mode              = @saved_sql_mode */ ;
+/*!50003 SET character_set_client  = @saved_cs_client */ ;
+/*!50003 SET character_set_results = @saved_cs_results */ ;
+/*!50003 SET collation_connection  = @saved_col_connection */ ;
+/*!50003 DROP PROCEDURE IF EXISTS `view_all_division_matches` */;
+/*!50003 SET @saved_cs_client      = @@character_set_client */ ;
+/*!50003 SET @saved_cs_results     = @@character_set_results */ ;
+/*!50003 SET @saved_col_connection = @@collation_connection */ ;
+/*!50003 SET character_set_client  = utf8mb4 */ ;
+/*!50003 SET character_set_results = utf8mb4 */ ;
+/*!50003 SET collation_connection  = utf8mb4_0900_ai_ci */ ;
+/*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
+/*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
+DELIMITER ;;
+CREATE DEFINER=`root`@`localhost` PROCEDURE `view_all_division_matches`(IN d_id INT)
+BEGIN
+	SELECT * FROM match_data WHERE division_id_FK = d_id;
+END ;;
+DELIMITER ;
+/*!50003 SET sql_mode              = @saved_sql_mode */ ;
+/*!50003 SET character_set_client  = @saved_cs_client */ ;
+/*!50003 SET character_set_results = @saved_cs_results */ ;
+/*!50003 SET collation_connection  = @saved_col_connection */ ;
+/*!50003 DROP PROCEDURE IF EXISTS `view_all_division_teams` */;
+/*!50003 SET @saved_cs_client      = @@character_set_client */ ;
+/*!50003 SET @saved_cs_results     = @@character_set_results */ ;
+/*!50003 SET @saved_col_connection = @@collation_connection */ ;
+/*!50003 SET character_set_client  = utf8mb4 */ ;
+/*!50003 SET character_set_results = utf8mb4 */ ;
+/*!50003 SET collation_connection  = utf8mb4_0900_ai_ci */ ;
+/*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
+/*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
+DELIMITER ;;
+CREATE DEFINER=`root`@`localhost` PROCEDURE `view_all_division_teams`(IN d_id INT)
+BEGIN
+	SELECT * FROM team WHERE division_id_FK = d_id;
+END ;;
+DELIMITER ;
+/*!50003 SET sql_mode              = @saved_sql_mode */ ;
+/*!50003 SET character_set_client  = @saved_cs_client */ ;
+/*!50003 SET character_set_results = @saved_cs_results */ ;
+/*!50003 SET collation_connection  = @saved_col_connection */ ;
+/*!50003 DROP PROCEDURE IF EXISTS `view_all_match_games` */;
+/*!50003 SET @saved_cs_client      = @@character_set_client */ ;
+/*!50003 SET @saved_cs_results     = @@character_set_results */ ;
+/*!50003 SET @saved_col_connection = @@collation_connection */ ;
+/*!50003 SET character_set_client  = utf8mb4 */ ;
+/*!50003 SET character_set_results = utf8mb4 */ ;
+/*!50003 SET collation_connection  = utf8mb4_0900_ai_ci */ ;
+/*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
+/*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
+DELIMITER ;;
+CREATE DEFINER=`root`@`localhost` PROCEDURE `view_all_match_games`(IN m_id INT)
+BEGIN
+	SELECT * FROM game_data WHERE match_id_FK = m_id;
+END ;;
+DELIMITER ;
+/*!50003 SET sql_mode              = @saved_sql_mode */ ;
+/*!50003 SET character_set_client  = @saved_cs_client */ ;
+/*!50003 SET character_set_results = @saved_cs_results */ ;
+/*!50003 SET collation_connection  = @saved_col_connection */ ;
+/*!50003 DROP PROCEDURE IF EXISTS `view_all_players` */;
+/*!50003 SET @saved_cs_client      = @@character_set_client */ ;
+/*!50003 SET @saved_cs_results     = @@character_set_results */ ;
+/*!50003 SET @saved_col_connection = @@collation_connection */ ;
+/*!50003 SET character_set_client  = utf8mb4 */ ;
+/*!50003 SET character_set_results = utf8mb4 */ ;
+/*!50003 SET collation_connection  = utf8mb4_0900_ai_ci */ ;
+/*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
+/*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
+DELIMITER ;;
+CREATE DEFINER=`root`@`localhost` PROCEDURE `view_all_players`()
+BEGIN
+	SELECT * FROM player;
+END ;;
+DELIMITER ;
+/*!50003 SET sql_mode              = @saved_sql_mode */ ;
+/*!50003 SET character_set_client  = @saved_cs_client */ ;
+/*!50003 SET character_set_results = @saved_cs_results */ ;
+/*!50003 SET collation_connection  = @saved_col_connection */ ;
+/*!50003 DROP PROCEDURE IF EXISTS `view_all_schools` */;
+/*!50003 SET @saved_cs_client      = @@character_set_client */ ;
+/*!50003 SET @saved_cs_results     = @@character_set_results */ ;
+/*!50003 SET @saved_col_connection = @@collation_connection */ ;
+/*!50003 SET character_set_client  = utf8mb4 */ ;
+/*!50003 SET character_set_results = utf8mb4 */ ;
+/*!50003 SET collation_connection  = utf8mb4_0900_ai_ci */ ;
+/*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
+/*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
+DELIMITER ;;
+CREATE DEFINER=`root`@`localhost` PROCEDURE `view_all_schools`()
+BEGIN
+    SELECT * FROM school;
+END ;;
+DELIMITER ;
+/*!50003 SET sql_mode              = @saved_sql_mode */ ;
+/*!50003 SET character_set_client  = @saved_cs_client */ ;
+/*!50003 SET character_set_results = @saved_cs_results */ ;
+/*!50003 SET collation_connection  = @saved_col_connection */ ;
+/*!50003 DROP PROCEDURE IF EXISTS `view_all_team_players` */;
+/*!50003 SET @saved_cs_client      = @@character_set_client */ ;
+/*!50003 SET @saved_cs_results     = @@character_set_results */ ;
+/*!50003 SET @saved_col_connection = @@collation_connection */ ;
+/*!50003 SET character_set_client  = utf8mb4 */ ;
+/*!50003 SET character_set_results = utf8mb4 */ ;
+/*!50003 SET collation_connection  = utf8mb4_0900_ai_ci */ ;
+/*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
+/*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
+DELIMITER ;;
+CREATE DEFINER=`root`@`localhost` PROCEDURE `view_all_team_players`(IN te_id INT)
+BEGIN
+    SELECT p.* FROM team as t JOIN player as p ON p.id = t.player1_id_FK WHERE t.id = te_id
+    UNION
+    SELECT p.* FROM team as t JOIN player as p ON p.id = t.player2_id_FK WHERE t.id = te_id;
+END ;;
+DELIMITER ;
+/*!50003 SET sql_mode              = @saved_sql_mode */ ;
+/*!50003 SET character_set_client  = @saved_cs_client */ ;
+/*!50003 SET character_set_results = @saved_cs_results */ ;
+/*!50003 SET collation_connection  = @saved_col_connection */ ;
+/*!50003 DROP PROCEDURE IF EXISTS `view_all_tournaments` */;
+/*!50003 SET @saved_cs_client      = @@character_set_client */ ;
+/*!50003 SET @saved_cs_results     = @@character_set_results */ ;
+/*!50003 SET @saved_col_connection = @@collation_connection */ ;
+/*!50003 SET character_set_client  = utf8mb4 */ ;
+/*!50003 SET character_set_results = utf8mb4 */ ;
+/*!50003 SET collation_connection  = utf8mb4_0900_ai_ci */ ;
+/*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
+/*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
+DELIMITER ;;
+CREATE DEFINER=`root`@`localhost` PROCEDURE `view_all_tournaments`()
+BEGIN
+	SELECT * FROM tournament;
+END ;;
+DELIMITER ;
+/*!50003 SET sql_mode              = @saved_sql_mode */ ;
+/*!50003 SET character_set_client  = @saved_cs_client */ ;
+/*!50003 SET character_set_results = @saved_cs_results */ ;
+/*!50003 SET collation_connection  = @saved_col_connection */ ;
+/*!50003 DROP PROCEDURE IF EXISTS `view_all_tournament_divisions` */;
+/*!50003 SET @saved_cs_client      = @@character_set_client */ ;
+/*!50003 SET @saved_cs_results     = @@character_set_results */ ;
+/*!50003 SET @saved_col_connection = @@collation_connection */ ;
+/*!50003 SET character_set_client  = utf8mb4 */ ;
+/*!50003 SET character_set_results = utf8mb4 */ ;
+/*!50003 SET collation_connection  = utf8mb4_0900_ai_ci */ ;
+/*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
+/*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
+DELIMITER ;;
+CREATE DEFINER=`root`@`localhost` PROCEDURE `view_all_tournament_divisions`(IN to_id INT)
+BEGIN
+	SELECT * FROM division WHERE tournament_id_FK = to_id;
+END ;;
+DELIMITER ;
+/*!50003 SET sql_mode              = @saved_sql_mode */ ;
+/*!50003 SET character_set_client  = @saved_cs_client */ ;
+/*!50003 SET character_set_results = @saved_cs_results */ ;
+/*!50003 SET collation_connection  = @saved_col_connection */ ;
+/*!50003 DROP PROCEDURE IF EXISTS `view_division_teams_page` */;
+/*!50003 SET @saved_cs_client      = @@character_set_client */ ;
+/*!50003 SET @saved_cs_results     = @@character_set_results */ ;
+/*!50003 SET @saved_col_connection = @@collation_connection */ ;
+/*!50003 SET character_set_client  = utf8mb4 */ ;
+/*!50003 SET character_set_results = utf8mb4 */ ;
+/*!50003 SET collation_connection  = utf8mb4_0900_ai_ci */ ;
+/*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
+/*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
+DELIMITER ;;
+CREATE DEFINER=`root`@`localhost` PROCEDURE `view_division_teams_page`(IN d_id INT, after_id INT, page_limit INT)
+BEGIN
+	SELECT * FROM team WHERE division_id_FK = d_id AND id > after_id ORDER BY id LIMIT page_limit;
+END ;;
+DELIMITER ;
+/*!50003 SET sql_mode              = @saved_sql_mode */ ;
+/*!50003 SET character_set_client  = @saved_cs_client */ ;
+/*!50003 SET character_set_results = @saved_cs_results */ ;
+/*!50003 SET collation_connection  = @saved_col_connection */ ;
+/*!50003 DROP PROCEDURE IF EXISTS `view_players_page` */;
+/*!50003 SET @saved_cs_client      = @@character_set_client */ ;
+/*!50003 SET @saved_cs_results     = @@character_set_results */ ;
+/*!50003 SET @saved_col_connection = @@collation_connection */ ;
+/*!50003 SET character_set_client  = utf8mb4 */ ;
+/*!50003 SET character_set_results = utf8mb4 */ ;
+/*!50003 SET collation_connection  = utf8mb4_0900_ai_ci */ ;
+/*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
+/*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
+DELIMITER ;;
+CREATE DEFINER=`root`@`localhost` PROCEDURE `view_players_page`(IN after_id INT, page_limit INT)
+BEGIN
+	SELECT * FROM player WHERE id > after_id ORDER BY id LIMIT page_limit;
+END ;;
+DELIMITER ;
+/*!50003 SET sql_mode              = @saved_sql_mode */ ;
+/*!50003 SET character_set_client  = @saved_cs_client */ ;
+/*!50003 SET character_set_results = @saved_cs_results */ ;
+/*!50003 SET collation_connection  = @saved_col_connection */ ;
+/*!50003 DROP PROCEDURE IF EXISTS `view_schools_page` */;
+/*!50003 SET @saved_cs_client      = @@character_set_client */ ;
+/*!50003 SET @saved_cs_results     = @@character_set_results */ ;
+/*!50003 SET @saved_col_connection = @@collation_connection */ ;
+/*!50003 SET character_set_client  = utf8mb4 */ ;
+/*!50003 SET character_set_results = utf8mb4 */ ;
+/*!50003 SET collation_connection  = utf8mb4_0900_ai_ci */ ;
+/*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
+/*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
+DELIMITER ;;
+CREATE DEFINER=`root`@`localhost` PROCEDURE `view_schools_page`(IN after_id INT, page_limit INT)
+BEGIN
+	SELECT * FROM school WHERE id > after_id ORDER BY id LIMIT page_limit;
+END ;;
+DELIMITER ;
+/*!50003 SET sql_mode              = @saved_sql_mode */ ;
+/*!50003 SET character_set_client  = @saved_cs_client */ ;
+/*!50003 SET character_set_results = @saved_cs_results */ ;
+/*!50003 SET collation_connection  = @saved_col_connection */ ;
+/*!50003 DROP PROCEDURE IF EXISTS `view_specific_division` */;
+/*!50003 SET @saved_cs_client      = @@character_set_client */ ;
+/*!50003 SET @saved_cs_results     = @@character_set_results */ ;
+/*!50003 SET @saved_col_connection = @@collation_connection */ ;
+/*!50003 SET character_set_client  = utf8mb4 */ ;
+/*!50003 SET character_set_results = utf8mb4 */ ;
+/*!50003 SET collation_connection  = utf8mb4_0900_ai_ci */ ;
+/*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
+/*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
+DELIMITER ;;
+CREATE DEFINER=`root`@`localhost` PROCEDURE `view_specific_division`(IN to_id INT)
+BEGIN
+	SELECT * FROM team WHERE id = to_id;
+END ;;
+DELIMITER ;
+/*!50003 SET sql_mode              = @saved_sql_mode */ ;
+/*!50003 SET character_set_client  = @saved_cs_client */ ;
+/*!50003 SET character_set_results = @saved_cs_results */ ;
+/*!50003 SET collation_connection  = @saved_col_connection */ ;
+/*!50003 DROP PROCEDURE IF EXISTS `view_specific_game` */;
+/*!50003 SET @saved_cs_client      = @@character_set_client */ ;
+/*!50003 SET @saved_cs_results     = @@character_set_results */ ;
+/*!50003 SET @saved_col_connection = @@collation_connection */ ;
+/*!50003 SET character_set_client  = utf8mb4 */ ;
+/*!50003 SET character_set_results = utf8mb4 */ ;
+/*!50003 SET collation_connection  = utf8mb4_0900_ai_ci */ ;
+/*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
+/*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
+DELIMITER ;;
+CREATE DEFINER=`root`@`localhost` PROCEDURE `view_specific_game`(IN g_id INT)
+BEGIN
+	SELECT * FROM game_data WHERE id = g_id;
+END ;;
+DELIMITER ;
+/*!50003 SET sql_mode              = @saved_sql_mode */ ;
+/*!50003 SET character_set_client  = @saved_cs_client */ ;
+/*!50003 SET character_set_results = @saved_cs_results */ ;
+/*!50003 SET collation_connection  = @saved_col_connection */ ;
+/*!50003 DROP PROCEDURE IF EXISTS `view_specific_match` */;
+/*!50003 SET @saved_cs_client      = @@character_set_client */ ;
+/*!50003 SET @saved_cs_results     = @@character_set_results */ ;
+/*!50003 SET @saved_col_connection = @@collation_connection */ ;
+/*!50003 SET character_set_client  = utf8mb4 */ ;
+/*!50003 SET character_set_results = utf8mb4 */ ;
+/*!50003 SET collation_connection  = utf8mb4_0900_ai_ci */ ;
+/*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
+/*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
+DELIMITER ;;
+CREATE DEFINER=`root`@`localhost` PROCEDURE `view_specific_match`(IN m_id INT)
+BEGIN
+	SELECT * FROM match_data WHERE id = m_id;
+END ;;
+DELIMITER ;
+/*!50003 SET sql_mode              = @saved_sql_mode */ ;
+/*!50003 SET character_set_client  = @saved_cs_client */ ;
+/*!50003 SET character_set_results = @saved_cs_results */ ;
+/*!50003 SET collation_connection  = @saved_col_connection */ ;
+/*!50003 DROP PROCEDURE IF EXISTS `view_specific_player` */;
+/*!50003 SET @saved_cs_client      = @@character_set_client */ ;
+/*!50003 SET @saved_cs_results     = @@character_set_results */ ;
+/*!50003 SET @saved_col_connection = @@collation_connection */ ;
+/*!50003 SET character_set_client  = utf8mb4 */ ;
+/*!50003 SET character_set_results = utf8mb4 */ ;
+/*!50003 SET collation_connection  = utf8mb4_0900_ai_ci */ ;
+/*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
+/*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
+DELIMITER ;;
+CREATE DEFINER=`root`@`localhost` PROCEDURE `view_specific_player`(IN p_id INT)
+BEGIN
+	SELECT * FROM player WHERE id = p_id;
+END ;;
+DELIMITER ;
+/*!50003 SET sql_mode              = @saved_sql_mode */ ;
+/*!50003 SET character_set_client  = @saved_cs_client */ ;
+/*!50003 SET character_set_results = @saved_cs_results */ ;
+/*!50003 SET collation_connection  = @saved_col_connection */ ;
+/*!50003 DROP PROCEDURE IF EXISTS `view_specific_school` */;
+/*!50003 SET @saved_cs_client      = @@character_set_client */ ;
+/*!50003 SET @saved_cs_results     = @@character_set_results */ ;
+/*!50003 SET @saved_col_connection = @@collation_connection */ ;
+/*!50003 SET character_set_client  = utf8mb4 */ ;
+/*!50003 SET character_set_results = utf8mb4 */ ;
+/*!50003 SET collation_connection  = utf8mb4_0900_ai_ci */ ;
+/*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
+/*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
+DELIMITER ;;
+CREATE DEFINER=`root`@`localhost` PROCEDURE `view_specific_school`(IN s_id INT)
+BEGIN
+	SELECT * FROM school WHERE id = s_id;
+END ;;
+DELIMITER ;
+/*!50003 SET sql_mode              = @saved_sql_mode */ ;
+/*!50003 SET character_set_client  = @saved_cs_client */ ;
+/*!50003 SET character_set_results = @saved_cs_results */ ;
+/*!50003 SET collation_connection  = @saved_col_connection */ ;
+/*!50003 DROP PROCEDURE IF EXISTS `view_specific_tournament` */;
+/*!50003 SET @saved_cs_client      = @@character_set_client */ ;
+/*!50003 SET @saved_cs_results     = @@character_set_results */ ;
+/*!50003 SET @saved_col_connection = @@collation_connection */ ;
+/*!50003 SET character_set_client  = utf8mb4 */ ;
+/*!50003 SET character_set_results = utf8mb4 */ ;
+/*!50003 SET collation_connection  = utf8mb4_0900_ai_ci */ ;
+/*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
+/*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
+DELIMITER ;;
+CREATE DEFINER=`root`@`localhost` PROCEDURE `view_specific_tournament`(IN to_id INT)
+BEGIN
+	SELECT * FROM tournament WHERE id = to_id;
+END ;;
+DELIMITER ;
+/*!50003 SET sql_mode              = @saved_sql_mode */ ;
+/*!50003 SET character_set_client  = @saved_cs_client */ ;
+/*!50003 SET character_set_results = @saved_cs_results */ ;
+/*!50003 SET collation_connection  = @saved_col_connection */ ;
+/*!50003 DROP PROCEDURE IF EXISTS `view_tournaments_page` */;
+/*!50003 SET @saved_cs_client      = @@character_set_client */ ;
+/*!50003 SET @saved_cs_results     = @@character_set_results */ ;
+/*!50003 SET @saved_col_connection = @@collation_connection */ ;
+/*!50003 SET character_set_client  = utf8mb4 */ ;
+/*!50003 SET character_set_results = utf8mb4 */ ;
+/*!50003 SET collation_connection  = utf8mb4_0900_ai_ci */ ;
+/*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
+/*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
+DELIMITER ;;
+CREATE DEFINER=`root`@`localhost` PROCEDURE `view_tournaments_page`(IN after_id INT, page_limit INT)
+BEGIN
+	SELECT * FROM tournament WHERE id > after_id ORDER BY id LIMIT page_limit;
 END ;;
 DELIMITER ;
 /*!50003 SET sql_mode              = @saved_sql_mode */ ;
@@ -0,0 +1,39 @@
+-- Indexes for name lookups, for tournaments in date order and for counting games won per match,
+-- and procedures that read a team's players with primary key lookups instead of a subquery
+
+CREATE INDEX player_name ON player (name);
+CREATE INDEX school_name ON school (name);
+CREATE INDEX team_division_name ON team (division_id_FK, name);
+CREATE INDEX tournament_date_time ON tournament (date, time);
+CREATE INDEX game_match_scores ON game_data (match_id_FK, team1_score, team2_score);
+
+drop procedure if exists view_all_team_players;
+DELIMITER //
+create procedure view_all_team_players(IN te_id INT)
+BEGIN
+    SELECT p.* FROM team as t JOIN player as p ON p.id = t.player1_id_FK WHERE t.id = te_id
+    UNION
+    SELECT p.* FROM team as t JOIN player as p ON p.id = t.player2_id_FK WHERE t.id = te_id;
+END //
+DELIMITER ;
+
+drop procedure if exists get_division_snapshot;
+DELIMITER //
+create procedure get_division_snapshot(IN d_id INT)
+BEGIN
+	SELECT * FROM division WHERE id = d_id;
+
+	SELECT * FROM team WHERE division_id_FK = d_id ORDER BY id;
+
+	SELECT p.* FROM team as t JOIN player as p ON p.id = t.player1_id_FK WHERE t.division_id_FK = d_id
+	UNION
+	SELECT p.* FROM team as t JOIN player as p ON p.id = t.player2_id_FK WHERE t.division_id_FK = d_id;
+
+	SELECT * FROM match_data WHERE division_id_FK = d_id ORDER BY id;
+
+	SELECT gd.* FROM game_data as gd
+	JOIN match_data as md ON md.id = gd.match_id_FK
+	WHERE md.division_id_FK = d_id
+	ORDER BY gd.match_id_FK, gd.id;
+END //
+DELIMITER ;
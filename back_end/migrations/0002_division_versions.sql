@@ -0,0 +1,87 @@
+-- Per-division change counters that clients poll to reload only the divisions changed elsewhere, bumped by the
+-- match_data triggers here and by the game_data triggers from 0003
+
+CREATE TABLE division_version (
+	division_id_FK INT PRIMARY KEY,
+    FOREIGN KEY (division_id_FK) REFERENCES division(id)
+		ON UPDATE CASCADE ON DELETE CASCADE,
+
+    version BIGINT NOT NULL DEFAULT 0
+);
+
+-- Gets the change counter of every division with changed matches or games, polled by clients
+drop procedure if exists get_division_versions;
+DELIMITER //
+create procedure get_division_versions()
+BEGIN
+	SELECT division_id_FK, version FROM division_version;
+END //
+DELIMITER ;
+
+-- Bumps a division's change counter
+drop procedure if exists bump_division_version;
+DELIMITER //
+create procedure bump_division_version(IN d_id INT)
+BEGIN
+	INSERT INTO division_version (division_id_FK, version) VALUES (d_id, 1)
+	ON DUPLICATE KEY UPDATE version = version + 1;
+END //
+DELIMITER ;
+
+-- Bumps the change counter of a match's division
+drop procedure if exists bump_match_division_version;
+DELIMITER //
+create procedure bump_match_division_version(IN m_id INT)
+BEGIN
+	INSERT INTO division_version (division_id_FK, version)
+	SELECT division_id_FK, 1 FROM match_data WHERE id = m_id
+	ON DUPLICATE KEY UPDATE version = version + 1;
+END //
+DELIMITER ;
+
+-- Create games based on match info
+drop trigger if exists create_games_on_new_match;
+delimiter //
+create trigger create_games_on_new_match
+	after insert on match_data
+    for each row
+BEGIN
+    DECLARE games INT;
+    SET games = NEW.best_of;
+
+    -- Bulk schedule creation sets @skip_create_games and inserts the games itself
+    IF @skip_create_games IS NULL THEN
+        WHILE games > 0 DO
+            INSERT INTO game_data (team1_score, team2_score, match_id_FK) VALUES (0, 0, NEW.id);
+            SET games = games - 1;
+        END WHILE;
+    END IF;
+
+    CALL bump_division_version(NEW.division_id_FK);
+END //
+delimiter ;
+
+-- Bump the division's change counter on match update
+drop trigger if exists bump_division_on_update_match;
+delimiter //
+create trigger bump_division_on_update_match
+	after update on match_data
+    for each row
+BEGIN
+    CALL bump_division_version(NEW.division_id_FK);
+    IF OLD.division_id_FK <> NEW.division_id_FK THEN
+        CALL bump_division_version(OLD.division_id_FK);
+    END IF;
+END //
+delimiter ;
+
+-- Bump the division's change counter on match delete
+drop trigger if exists bump_division_on_delete_match;
+delimiter //
+create trigger bump_division_on_delete_match
+	after delete on match_data
+    for each row
+BEGIN
+    CALL bump_division_version(OLD.division_id_FK);
+END //
+delimiter ;
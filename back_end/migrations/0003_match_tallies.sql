@@ -0,0 +1,131 @@
+-- Games won by each team of a match, kept by the game_data triggers so a winner is found without counting games,
+-- and filled in for the matches already played
+
+ALTER TABLE match_data
+    ADD COLUMN team1_games_won INT NOT NULL DEFAULT 0,
+    ADD COLUMN team2_games_won INT NOT NULL DEFAULT 0;
+
+-- Update match info
+drop procedure if exists update_match_winner;
+DELIMITER //
+create procedure update_match_winner(IN m_id INT)
+BEGIN
+    -- A team wins the match once it has won the majority of its games. Without a majority, a winner entered by
+    -- hand for a forfeit or retirement stands, unless its team has won fewer games than the other
+    UPDATE match_data as md
+    SET md.winner_id_FK = CASE
+        WHEN md.team1_games_won > md.best_of DIV 2 THEN md.team1_id_FK
+        WHEN md.team2_games_won > md.best_of DIV 2 THEN md.team2_id_FK
+        WHEN md.winner_id_FK = md.team1_id_FK AND md.team1_games_won < md.team2_games_won THEN NULL
+        WHEN md.winner_id_FK = md.team2_id_FK AND md.team2_games_won < md.team1_games_won THEN NULL
+        ELSE md.winner_id_FK
+    END
+    WHERE md.id = m_id;
+END //
+DELIMITER ;
+
+-- Recounts every match's games won and winner from its games
+drop procedure if exists backfill_match_tallies;
+DELIMITER //
+create procedure backfill_match_tallies()
+BEGIN
+    UPDATE match_data as md
+    LEFT JOIN (
+        SELECT match_id_FK,
+               SUM(IFNULL(team1_score > team2_score, 0)) as team1_wins,
+               SUM(IFNULL(team2_score > team1_score, 0)) as team2_wins
+        FROM game_data
+        GROUP BY match_id_FK
+    ) as gd ON gd.match_id_FK = md.id
+    SET md.team1_games_won = IFNULL(gd.team1_wins, 0),
+        md.team2_games_won = IFNULL(gd.team2_wins, 0),
+        md.winner_id_FK = CASE
+            WHEN IFNULL(gd.team1_wins, 0) > md.best_of DIV 2 THEN md.team1_id_FK
+            WHEN IFNULL(gd.team2_wins, 0) > md.best_of DIV 2 THEN md.team2_id_FK
+            -- Winners entered by hand stand as in update_match_winner
+            WHEN md.winner_id_FK = md.team1_id_FK AND IFNULL(gd.team1_wins, 0) < IFNULL(gd.team2_wins, 0) THEN NULL
+            WHEN md.winner_id_FK = md.team2_id_FK AND IFNULL(gd.team2_wins, 0) < IFNULL(gd.team1_wins, 0) THEN NULL
+            ELSE md.winner_id_FK
+        END;
+END //
+DELIMITER ;
+
+-- Update match games won and winner on game update
+drop trigger if exists update_match_on_update_game;
+delimiter //
+create trigger update_match_on_update_game
+	after update on game_data
+    for each row
+BEGIN
+    -- Moves the game's win, if any, from its old result to its new one
+    IF OLD.match_id_FK <> NEW.match_id_FK
+        OR IFNULL(SIGN(OLD.team1_score - OLD.team2_score), 0) <> IFNULL(SIGN(NEW.team1_score - NEW.team2_score), 0) THEN
+        UPDATE match_data
+        SET team1_games_won = team1_games_won - IFNULL(OLD.team1_score > OLD.team2_score, 0),
+            team2_games_won = team2_games_won - IFNULL(OLD.team2_score > OLD.team1_score, 0)
+        WHERE id = OLD.match_id_FK;
+
+        UPDATE match_data
+        SET team1_games_won = team1_games_won + IFNULL(NEW.team1_score > NEW.team2_score, 0),
+            team2_games_won = team2_games_won + IFNULL(NEW.team2_score > NEW.team1_score, 0)
+        WHERE id = NEW.match_id_FK;
+
+        -- Batched score updates set @skip_match_winner and recompute the winner once afterwards
+        IF @skip_match_winner IS NULL THEN
+            CALL update_match_winner(NEW.match_id_FK);
+            IF OLD.match_id_FK <> NEW.match_id_FK THEN
+                CALL update_match_winner(OLD.match_id_FK);
+            END IF;
+        END IF;
+    ELSE
+        -- Match updates bump the division's change counter, scores that leave the tallies alone bump it here
+        CALL bump_match_division_version(NEW.match_id_FK);
+    END IF;
+END //
+delimiter ;
+
+-- Update match games won and winner on game insert
+drop trigger if exists tally_match_on_insert_game;
+delimiter //
+create trigger tally_match_on_insert_game
+	after insert on game_data
+    for each row
+BEGIN
+    IF NEW.team1_score <> NEW.team2_score THEN
+        UPDATE match_data
+        SET team1_games_won = team1_games_won + (NEW.team1_score > NEW.team2_score),
+            team2_games_won = team2_games_won + (NEW.team2_score > NEW.team1_score)
+        WHERE id = NEW.match_id_FK;
+
+        IF @skip_match_winner IS NULL THEN
+            CALL update_match_winner(NEW.match_id_FK);
+        END IF;
+    ELSE
+        CALL bump_match_division_version(NEW.match_id_FK);
+    END IF;
+END //
+delimiter ;
+
+-- Update match games won and winner on game delete
+drop trigger if exists tally_match_on_delete_game;
+delimiter //
+create trigger tally_match_on_delete_game
+	after delete on game_data
+    for each row
+BEGIN
+    IF OLD.team1_score <> OLD.team2_score THEN
+        UPDATE match_data
+        SET team1_games_won = team1_games_won - (OLD.team1_score > OLD.team2_score),
+            team2_games_won = team2_games_won - (OLD.team2_score > OLD.team1_score)
+        WHERE id = OLD.match_id_FK;
+
+        IF @skip_match_winner IS NULL THEN
+            CALL update_match_winner(OLD.match_id_FK);
+        END IF;
+    ELSE
+        CALL bump_match_division_version(OLD.match_id_FK);
+    END IF;
+END //
+delimiter ;
+
+CALL backfill_match_tallies();
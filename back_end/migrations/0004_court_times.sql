@@ -0,0 +1,40 @@
+-- Court and start time of each match, assigned by the court scheduler, and the procedures it reads matches and
+-- past match lengths with
+
+ALTER TABLE match_data
+    ADD COLUMN court INT,
+    ADD COLUMN start_time DATETIME;
+
+-- Gets every match of a tournament with its teams' players, for court scheduling
+drop procedure if exists get_tournament_matches;
+DELIMITER //
+create procedure get_tournament_matches(IN to_id INT)
+BEGIN
+    SELECT md.*, t1.player1_id_FK as team1_player1, t1.player2_id_FK as team1_player2,
+           t2.player1_id_FK as team2_player1, t2.player2_id_FK as team2_player2
+    FROM match_data as md
+    JOIN division as dv ON dv.id = md.division_id_FK
+    JOIN team as t1 ON t1.id = md.team1_id_FK
+    JOIN team as t2 ON t2.id = md.team2_id_FK
+    WHERE dv.tournament_id_FK = to_id
+    ORDER BY md.id;
+END //
+DELIMITER ;
+
+-- Gets the mean points of a decided game by format, and the mean games of a decided match by best of
+drop procedure if exists get_match_length_history;
+DELIMITER //
+create procedure get_match_length_history()
+BEGIN
+    SELECT md.play_to, md.hard_cap, AVG(gd.team1_score + gd.team2_score) as points
+    FROM game_data as gd
+    JOIN match_data as md ON md.id = gd.match_id_FK
+    WHERE md.winner_id_FK IS NOT NULL AND gd.team1_score <> gd.team2_score
+    GROUP BY md.play_to, md.hard_cap;
+
+    SELECT best_of, AVG(team1_games_won + team2_games_won) as games
+    FROM match_data
+    WHERE winner_id_FK IS NOT NULL
+    GROUP BY best_of;
+END //
+DELIMITER ;
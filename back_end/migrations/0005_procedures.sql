@@ -0,0 +1,134 @@
+-- Procedures the front end gained before schema migrations were kept: schema columns, paged grids, search,
+-- division games, result export and rating history
+
+-- Gets all columns from every table in a database
+drop procedure if exists get_columns_from_schema;
+DELIMITER //
+create procedure get_columns_from_schema(IN db_name VARCHAR(255))
+BEGIN
+    SELECT TABLE_NAME, COLUMN_NAME, DATA_TYPE, COLUMN_KEY, IS_NULLABLE
+	FROM INFORMATION_SCHEMA.COLUMNS
+	WHERE TABLE_SCHEMA = db_name
+    ORDER BY TABLE_NAME, ORDINAL_POSITION;
+END //
+DELIMITER ;
+
+-- Gets a page of school info ordered by id, starting after a given id
+drop procedure if exists view_schools_page;
+DELIMITER //
+create procedure view_schools_page(IN after_id INT, page_limit INT)
+BEGIN
+	SELECT * FROM school WHERE id > after_id ORDER BY id LIMIT page_limit;
+END //
+DELIMITER ;
+
+-- Gets a page of player info ordered by id, starting after a given id
+drop procedure if exists view_players_page;
+DELIMITER //
+create procedure view_players_page(IN after_id INT, page_limit INT)
+BEGIN
+	SELECT * FROM player WHERE id > after_id ORDER BY id LIMIT page_limit;
+END //
+DELIMITER ;
+
+-- Gets a page of tournament info ordered by id, starting after a given id
+drop procedure if exists view_tournaments_page;
+DELIMITER //
+create procedure view_tournaments_page(IN after_id INT, page_limit INT)
+BEGIN
+	SELECT * FROM tournament WHERE id > after_id ORDER BY id LIMIT page_limit;
+END //
+DELIMITER ;
+
+-- Gets a page of team info for a specific division ordered by id, starting after a given id
+drop procedure if exists view_division_teams_page;
+DELIMITER //
+create procedure view_division_teams_page(IN d_id INT, after_id INT, page_limit INT)
+BEGIN
+	SELECT * FROM team WHERE division_id_FK = d_id AND id > after_id ORDER BY id LIMIT page_limit;
+END //
+DELIMITER ;
+
+-- Gets all game info for a specific division
+drop procedure if exists view_all_division_games;
+DELIMITER //
+create procedure view_all_division_games(IN d_id INT)
+BEGIN
+	SELECT gd.* FROM game_data as gd
+	JOIN match_data as md ON md.id = gd.match_id_FK
+	WHERE md.division_id_FK = d_id;
+END //
+DELIMITER ;
+
+-- Gets the name, school and phone of every school, player and team, schools first, for the search index
+drop procedure if exists get_search_entries;
+DELIMITER //
+create procedure get_search_entries()
+BEGIN
+	SELECT 'school' as kind, id, name, NULL as school_id, NULL as phone_number,
+	       NULL as player1_id, NULL as player2_id
+	FROM school
+	UNION ALL
+	SELECT 'player', id, name, school_id_FK, phone_number, NULL, NULL
+	FROM player
+	UNION ALL
+	SELECT 'team', id, name, NULL, NULL, player1_id_FK, player2_id_FK
+	FROM team;
+END //
+DELIMITER ;
+
+-- Gets every game result of a tournament, or of all tournaments when to_id is NULL, in tournament order
+drop procedure if exists export_tournament_results;
+DELIMITER //
+create procedure export_tournament_results(IN to_id INT)
+BEGIN
+	SELECT tn.id as tournament_id, tn.name as tournament, tn.date, tn.time, tn.address,
+	       dv.id as division_id, dv.name as division,
+	       md.id as match_id, md.play_to, md.hard_cap, md.best_of,
+	       t1.name as team1, t2.name as team2, w.name as winner,
+	       md.team1_games_won, md.team2_games_won,
+	       gd.id as game_id, gd.team1_score, gd.team2_score
+	FROM tournament as tn
+	JOIN division as dv ON dv.tournament_id_FK = tn.id
+	JOIN match_data as md ON md.division_id_FK = dv.id
+	JOIN team as t1 ON t1.id = md.team1_id_FK
+	JOIN team as t2 ON t2.id = md.team2_id_FK
+	LEFT JOIN team as w ON w.id = md.winner_id_FK
+	LEFT JOIN game_data as gd ON gd.match_id_FK = md.id
+	WHERE to_id IS NULL OR tn.id = to_id
+	ORDER BY tn.id, dv.id, md.id, gd.id;
+END //
+DELIMITER ;
+
+-- Gets every decided match with its teams' players, in the order it was played, replayed to compute ratings
+drop procedure if exists get_rating_history;
+DELIMITER //
+create procedure get_rating_history()
+BEGIN
+    SELECT md.id, md.team1_id_FK, md.team2_id_FK, md.winner_id_FK, md.team1_games_won, md.team2_games_won,
+           t1.player1_id_FK as team1_player1, t1.player2_id_FK as team1_player2,
+           t2.player1_id_FK as team2_player1, t2.player2_id_FK as team2_player2
+    FROM match_data as md
+    JOIN division as dv ON dv.id = md.division_id_FK
+    JOIN tournament as tn ON tn.id = dv.tournament_id_FK
+    JOIN team as t1 ON t1.id = md.team1_id_FK
+    JOIN team as t2 ON t2.id = md.team2_id_FK
+    WHERE md.winner_id_FK IS NOT NULL
+    ORDER BY tn.date, tn.time, tn.id, md.id;
+END //
+DELIMITER ;
+
+-- Gets a match with its teams' players, to rate it once it is decided
+drop procedure if exists get_match_rating;
+DELIMITER //
+create procedure get_match_rating(IN m_id INT)
+BEGIN
+    SELECT md.id, md.team1_id_FK, md.team2_id_FK, md.winner_id_FK, md.team1_games_won, md.team2_games_won,
+           t1.player1_id_FK as team1_player1, t1.player2_id_FK as team1_player2,
+           t2.player1_id_FK as team2_player1, t2.player2_id_FK as team2_player2
+    FROM match_data as md
+    JOIN team as t1 ON t1.id = md.team1_id_FK
+    JOIN team as t2 ON t2.id = md.team2_id_FK
+    WHERE md.id = m_id;
+END //
+DELIMITER ;
@@ -0,0 +1,194 @@
+-- Elimination brackets: bracket matches made before their teams are known, and procedures that place
+-- each decided bracket match's winner and loser in their next matches and create those once ready
+
+CREATE TABLE bracket_match (
+	id INT AUTO_INCREMENT PRIMARY KEY,
+
+    division_id_FK INT NOT NULL,
+    FOREIGN KEY (division_id_FK) REFERENCES division(id)
+		ON UPDATE CASCADE ON DELETE CASCADE,
+
+    -- W for the winners bracket, L for the losers bracket and F for the grand final of a double elimination
+    bracket CHAR(1) NOT NULL,
+    round INT NOT NULL,
+    position INT NOT NULL,
+
+    play_to INT NOT NULL,
+    hard_cap INT,
+    best_of INT NOT NULL,
+
+    -- A side is ready once its team is placed, a ready side without a team is a bye
+    team1_id_FK INT,
+    team2_id_FK INT,
+    team1_ready BOOLEAN NOT NULL DEFAULT FALSE,
+    team2_ready BOOLEAN NOT NULL DEFAULT FALSE,
+
+    FOREIGN KEY (team1_id_FK) REFERENCES team(id)
+		ON UPDATE CASCADE ON DELETE RESTRICT,
+    FOREIGN KEY (team2_id_FK) REFERENCES team(id)
+		ON UPDATE CASCADE ON DELETE RESTRICT,
+
+    -- The match played, created once both teams are known
+    match_id_FK INT UNIQUE,
+    FOREIGN KEY (match_id_FK) REFERENCES match_data(id)
+		ON UPDATE CASCADE ON DELETE SET NULL,
+
+    -- Set once the match is won, played or on a bye, and once its winner and loser are placed
+    decided BOOLEAN NOT NULL DEFAULT FALSE,
+    placed BOOLEAN NOT NULL DEFAULT FALSE,
+    winner_id_FK INT,
+    loser_id_FK INT,
+
+    FOREIGN KEY (winner_id_FK) REFERENCES team(id)
+		ON UPDATE CASCADE ON DELETE RESTRICT,
+    FOREIGN KEY (loser_id_FK) REFERENCES team(id)
+		ON UPDATE CASCADE ON DELETE RESTRICT,
+
+    -- The bracket matches the winner and loser play next and their side there, rows of the same bracket
+    winner_to INT,
+    winner_side INT,
+    loser_to INT,
+    loser_side INT,
+
+    UNIQUE INDEX bracket_position (division_id_FK, bracket, round, position),
+    INDEX bracket_winner_to (winner_to),
+    INDEX bracket_loser_to (loser_to)
+);
+
+drop procedure if exists update_match_winner;
+DELIMITER //
+create procedure update_match_winner(IN m_id INT)
+BEGIN
+    DECLARE bracket_division INT;
+
+    -- A team wins the match once it has won the majority of its games. Without a majority, a winner entered by
+    -- hand for a forfeit or retirement stands, unless its team has won fewer games than the other
+    UPDATE match_data as md
+    SET md.winner_id_FK = CASE
+        WHEN md.team1_games_won > md.best_of DIV 2 THEN md.team1_id_FK
+        WHEN md.team2_games_won > md.best_of DIV 2 THEN md.team2_id_FK
+        WHEN md.winner_id_FK = md.team1_id_FK AND md.team1_games_won < md.team2_games_won THEN NULL
+        WHEN md.winner_id_FK = md.team2_id_FK AND md.team2_games_won < md.team1_games_won THEN NULL
+        ELSE md.winner_id_FK
+    END
+    WHERE md.id = m_id;
+
+    -- A bracket match's winner and loser go straight to their next bracket matches. The game triggers call
+    -- this and can not insert games, so the next matches themselves are created by advance_bracket
+    SET bracket_division = (SELECT division_id_FK FROM bracket_match WHERE match_id_FK = m_id);
+    IF bracket_division IS NOT NULL THEN
+        CALL place_bracket_teams(bracket_division);
+    END IF;
+END //
+DELIMITER ;
+
+drop procedure if exists get_division_bracket;
+DELIMITER //
+create procedure get_division_bracket(IN d_id INT)
+BEGIN
+    SELECT bm.*, md.team1_games_won, md.team2_games_won
+    FROM bracket_match as bm
+    LEFT JOIN match_data as md ON md.id = bm.match_id_FK
+    WHERE bm.division_id_FK = d_id
+    ORDER BY bm.id;
+END //
+DELIMITER ;
+
+drop procedure if exists place_bracket_teams;
+DELIMITER //
+create procedure place_bracket_teams(IN d_id INT)
+BEGIN
+    DECLARE byes_decided INT DEFAULT 1;
+
+    -- Played matches are decided by their winner
+    UPDATE bracket_match as bm
+    JOIN match_data as md ON md.id = bm.match_id_FK
+    SET bm.winner_id_FK = md.winner_id_FK,
+        bm.loser_id_FK = IF(md.winner_id_FK = md.team1_id_FK, md.team2_id_FK, md.team1_id_FK),
+        bm.decided = TRUE
+    WHERE bm.division_id_FK = d_id AND NOT bm.decided AND md.winner_id_FK IS NOT NULL;
+
+    WHILE byes_decided > 0 DO
+        -- Every side is fed by one match, so each update sets a side from one row at most
+        UPDATE bracket_match as nm
+        JOIN bracket_match as bm ON bm.winner_to = nm.id AND bm.winner_side = 1
+        SET nm.team1_id_FK = bm.winner_id_FK, nm.team1_ready = TRUE
+        WHERE bm.division_id_FK = d_id AND bm.decided AND NOT bm.placed;
+
+        UPDATE bracket_match as nm
+        JOIN bracket_match as bm ON bm.winner_to = nm.id AND bm.winner_side = 2
+        SET nm.team2_id_FK = bm.winner_id_FK, nm.team2_ready = TRUE
+        WHERE bm.division_id_FK = d_id AND bm.decided AND NOT bm.placed;
+
+        UPDATE bracket_match as nm
+        JOIN bracket_match as bm ON bm.loser_to = nm.id AND bm.loser_side = 1
+        SET nm.team1_id_FK = bm.loser_id_FK, nm.team1_ready = TRUE
+        WHERE bm.division_id_FK = d_id AND bm.decided AND NOT bm.placed;
+
+        UPDATE bracket_match as nm
+        JOIN bracket_match as bm ON bm.loser_to = nm.id AND bm.loser_side = 2
+        SET nm.team2_id_FK = bm.loser_id_FK, nm.team2_ready = TRUE
+        WHERE bm.division_id_FK = d_id AND bm.decided AND NOT bm.placed;
+
+        UPDATE bracket_match SET placed = TRUE WHERE division_id_FK = d_id AND decided AND NOT placed;
+
+        -- A match with a bye sends its team on as the winner and a bye as the loser, two byes send two byes
+        UPDATE bracket_match
+        SET winner_id_FK = IFNULL(team1_id_FK, team2_id_FK), loser_id_FK = NULL, decided = TRUE
+        WHERE division_id_FK = d_id AND NOT decided AND team1_ready AND team2_ready
+            AND (team1_id_FK IS NULL OR team2_id_FK IS NULL);
+        SET byes_decided = ROW_COUNT();
+    END WHILE;
+END //
+DELIMITER ;
+
+drop procedure if exists create_bracket_matches;
+DELIMITER //
+create procedure create_bracket_matches(IN d_id INT)
+BEGIN
+    DECLARE done BOOLEAN DEFAULT FALSE;
+    DECLARE bm_id INT;
+    DECLARE created INT DEFAULT 0;
+    DECLARE ready_matches CURSOR FOR
+        SELECT id FROM bracket_match
+        WHERE division_id_FK = d_id AND match_id_FK IS NULL AND NOT decided
+            AND team1_id_FK IS NOT NULL AND team2_id_FK IS NOT NULL
+        ORDER BY id;
+    DECLARE CONTINUE HANDLER FOR NOT FOUND SET done = TRUE;
+
+    OPEN ready_matches;
+    create_loop: LOOP
+        FETCH ready_matches INTO bm_id;
+        IF done THEN
+            LEAVE create_loop;
+        END IF;
+
+        -- The match's games are created by its insert trigger
+        INSERT INTO match_data (play_to, hard_cap, best_of, team1_id_FK, team2_id_FK, division_id_FK)
+        SELECT play_to, hard_cap, best_of, team1_id_FK, team2_id_FK, division_id_FK
+        FROM bracket_match WHERE id = bm_id;
+        UPDATE bracket_match SET match_id_FK = LAST_INSERT_ID() WHERE id = bm_id;
+        SET created = created + 1;
+    END LOOP;
+    CLOSE ready_matches;
+
+    SELECT created as created_matches;
+END //
+DELIMITER ;
+
+drop procedure if exists advance_bracket;
+DELIMITER //
+create procedure advance_bracket(IN m_id INT)
+BEGIN
+    DECLARE bracket_division INT;
+
+    SET bracket_division = (SELECT division_id_FK FROM bracket_match WHERE match_id_FK = m_id);
+    IF bracket_division IS NULL THEN
+        SELECT 0 as created_matches;
+    ELSE
+        -- A winner entered on the match itself, as for a forfeit, is placed here, the game triggers place the others
+        CALL place_bracket_teams(bracket_division);
+        CALL create_bracket_matches(bracket_division);
+    END IF;
+END //
+DELIMITER ;
@@ -0,0 +1,38 @@
+-- Triggers that bump a division's change counter when its teams change, so clients and the scoreboard
+-- reload a team registered, renamed or removed before any of the division's matches change
+
+-- Bump the division's change counter on team insert, so its standings and team names reload
+drop trigger if exists bump_division_on_insert_team;
+delimiter //
+create trigger bump_division_on_insert_team
+	after insert on team
+    for each row
+BEGIN
+    CALL bump_division_version(NEW.division_id_FK);
+END //
+delimiter ;
+
+-- Bump the division's change counter on team update
+drop trigger if exists bump_division_on_update_team;
+delimiter //
+create trigger bump_division_on_update_team
+	after update on team
+    for each row
+BEGIN
+    CALL bump_division_version(NEW.division_id_FK);
+    IF OLD.division_id_FK <> NEW.division_id_FK THEN
+        CALL bump_division_version(OLD.division_id_FK);
+    END IF;
+END //
+delimiter ;
+
+-- Bump the division's change counter on team delete
+drop trigger if exists bump_division_on_delete_team;
+delimiter //
+create trigger bump_division_on_delete_team
+	after delete on team
+    for each row
+BEGIN
+    CALL bump_division_version(OLD.division_id_FK);
+END //
+delimiter ;
@@ -16,6 +16,39 @@ DELIMITER ;
 
 call get_columns_from_table('team', 'tm');
 
+-- Gets all columns from every table in a database
+drop procedure if exists get_columns_from_schema;
+DELIMITER //
+create procedure get_columns_from_schema(IN db_name VARCHAR(255))
+BEGIN
+    SELECT TABLE_NAME, COLUMN_NAME, DATA_TYPE, COLUMN_KEY, IS_NULLABLE
+	FROM INFORMATION_SCHEMA.COLUMNS
+	WHERE TABLE_SCHEMA = db_name
+    ORDER BY TABLE_NAME, ORDINAL_POSITION;
+END //
+DELIMITER ;
+
+call get_columns_from_schema('tm');
+
+-- Gets the name, school and phone of every school, player and team, schools first, for the search index
+drop procedure if exists get_search_entries;
+DELIMITER //
+create procedure get_search_entries()
+BEGIN
+	SELECT 'school' as kind, id, name, NULL as school_id, NULL as phone_number,
+	       NULL as player1_id, NULL as player2_id
+	FROM school
+	UNION ALL
+	SELECT 'player', id, name, school_id_FK, phone_number, NULL, NULL
+	FROM player
+	UNION ALL
+	SELECT 'team', id, name, NULL, NULL, player1_id_FK, player2_id_FK
+	FROM team;
+END //
+DELIMITER ;
+
+call get_search_entries();
+
 -- SCHOOL PROCEDURES
 
 -- Gets all school info
@@ -29,6 +62,17 @@ DELIMITER ;
 
 call view_all_schools();
 
+-- Gets a page of school info ordered by id, starting after a given id
+drop procedure if exists view_schools_page;
+DELIMITER //
+create procedure view_schools_page(IN after_id INT, page_limit INT)
+BEGIN
+	SELECT * FROM school WHERE id > after_id ORDER BY id LIMIT page_limit;
+END //
+DELIMITER ;
+
+call view_schools_page(0, 100);
+
 -- Gets specific school info
 drop procedure if exists view_specific_school;
 DELIMITER //
@@ -65,6 +109,17 @@ DELIMITER ;
 
 call view_all_players();
 
+-- Gets a page of player info ordered by id, starting after a given id
+drop procedure if exists view_players_page;
+DELIMITER //
+create procedure view_players_page(IN after_id INT, page_limit INT)
+BEGIN
+	SELECT * FROM player WHERE id > after_id ORDER BY id LIMIT page_limit;
+END //
+DELIMITER ;
+
+call view_players_page(0, 100);
+
 -- Gets specific player info
 drop procedure if exists view_specific_player;
 DELIMITER //
@@ -81,11 +136,9 @@ drop procedure if exists view_all_team_players;
 DELIMITER //
 create procedure view_all_team_players(IN te_id INT)
 BEGIN
-    SELECT * FROM player WHERE id in
-    (SELECT player1_id_FK as ids FROM team WHERE id = te_id
+    SELECT p.* FROM team as t JOIN player as p ON p.id = t.player1_id_FK WHERE t.id = te_id
     UNION
-    SELECT player2_id_FK as ids FROM team WHERE id = te_id);
-
+    SELECT p.* FROM team as t JOIN player as p ON p.id = t.player2_id_FK WHERE t.id = te_id;
 END //
 DELIMITER ;
 
@@ -105,6 +158,17 @@ DELIMITER ;
 
 call view_all_tournaments();
 
+-- Gets a page of tournament info ordered by id, starting after a given id
+drop procedure if exists view_tournaments_page;
+DELIMITER //
+create procedure view_tournaments_page(IN after_id INT, page_limit INT)
+BEGIN
+	SELECT * FROM tournament WHERE id > after_id ORDER BY id LIMIT page_limit;
+END //
+DELIMITER ;
+
+call view_tournaments_page(0, 100);
+
 -- Gets specific tournament info
 drop procedure if exists view_specific_tournament;
 DELIMITER //
@@ -116,6 +180,31 @@ DELIMITER ;
 
 call view_specific_tournament(2);
 
+-- Gets every game result of a tournament, or of all tournaments when to_id is NULL, in tournament order
+drop procedure if exists export_tournament_results;
+DELIMITER //
+create procedure export_tournament_results(IN to_id INT)
+BEGIN
+	SELECT tn.id as tournament_id, tn.name as tournament, tn.date, tn.time, tn.address,
+	       dv.id as division_id, dv.name as division,
+	       md.id as match_id, md.play_to, md.hard_cap, md.best_of,
+	       t1.name as team1, t2.name as team2, w.name as winner,
+	       md.team1_games_won, md.team2_games_won,
+	       gd.id as game_id, gd.team1_score, gd.team2_score
+	FROM tournament as tn
+	JOIN division as dv ON dv.tournament_id_FK = tn.id
+	JOIN match_data as md ON md.division_id_FK = dv.id
+	JOIN team as t1 ON t1.id = md.team1_id_FK
+	JOIN team as t2 ON t2.id = md.team2_id_FK
+	LEFT JOIN team as w ON w.id = md.winner_id_FK
+	LEFT JOIN game_data as gd ON gd.match_id_FK = md.id
+	WHERE to_id IS NULL OR tn.id = to_id
+	ORDER BY tn.id, dv.id, md.id, gd.id;
+END //
+DELIMITER ;
+
+call export_tournament_results(1);
+
 
 -- DIVISION PROCEDURES
 
@@ -141,6 +230,62 @@ DELIMITER ;
 
 call view_specific_division(2);
 
+-- Gets a division with its teams, their players, its matches and their games, one result set each
+drop procedure if exists get_division_snapshot;
+DELIMITER //
+create procedure get_division_snapshot(IN d_id INT)
+BEGIN
+	SELECT * FROM division WHERE id = d_id;
+
+	SELECT * FROM team WHERE division_id_FK = d_id ORDER BY id;
+
+	SELECT p.* FROM team as t JOIN player as p ON p.id = t.player1_id_FK WHERE t.division_id_FK = d_id
+	UNION
+	SELECT p.* FROM team as t JOIN player as p ON p.id = t.player2_id_FK WHERE t.division_id_FK = d_id;
+
+	SELECT * FROM match_data WHERE division_id_FK = d_id ORDER BY id;
+
+	SELECT gd.* FROM game_data as gd
+	JOIN match_data as md ON md.id = gd.match_id_FK
+	WHERE md.division_id_FK = d_id
+	ORDER BY gd.match_id_FK, gd.id;
+END //
+DELIMITER ;
+
+call get_division_snapshot(2);
+
+-- Gets the change counter of every division with changed matches or games, polled by clients
+drop procedure if exists get_division_versions;
+DELIMITER //
+create procedure get_division_versions()
+BEGIN
+	SELECT division_id_FK, version FROM division_version;
+END //
+DELIMITER ;
+
+call get_division_versions();
+
+-- Bumps a division's change counter
+drop procedure if exists bump_division_version;
+DELIMITER //
+create procedure bump_division_version(IN d_id INT)
+BEGIN
+	INSERT INTO division_version (division_id_FK, version) VALUES (d_id, 1)
+	ON DUPLICATE KEY UPDATE version = version + 1;
+END //
+DELIMITER ;
+
+-- Bumps the change counter of a match's division
+drop procedure if exists bump_match_division_version;
+DELIMITER //
+create procedure bump_match_division_version(IN m_id INT)
+BEGIN
+	INSERT INTO division_version (division_id_FK, version)
+	SELECT division_id_FK, 1 FROM match_data WHERE id = m_id
+	ON DUPLICATE KEY UPDATE version = version + 1;
+END //
+DELIMITER ;
+
 
 -- TEAM PROCEDURES
 
@@ -155,6 +300,17 @@ DELIMITER ;
 
 call view_all_division_teams(2);
 
+-- Gets a page of team info for a specific division ordered by id, starting after a given id
+drop procedure if exists view_division_teams_page;
+DELIMITER //
+create procedure view_division_teams_page(IN d_id INT, after_id INT, page_limit INT)
+BEGIN
+	SELECT * FROM team WHERE division_id_FK = d_id AND id > after_id ORDER BY id LIMIT page_limit;
+END //
+DELIMITER ;
+
+call view_division_teams_page(2, 0, 100);
+
 -- Gets specific team info
 drop procedure if exists view_specific_division;
 DELIMITER //
@@ -196,34 +352,259 @@ drop procedure if exists update_match_winner;
 DELIMITER //
 create procedure update_match_winner(IN m_id INT)
 BEGIN
-	DECLARE team1_wins INT;
-    DECLARE team2_wins INT;
-	DECLARE best_of INT;
+    DECLARE bracket_division INT;
+
+    -- A team wins the match once it has won the majority of its games. Without a majority, a winner entered by
+    -- hand for a forfeit or retirement stands, unless its team has won fewer games than the other
+    UPDATE match_data as md
+    SET md.winner_id_FK = CASE
+        WHEN md.team1_games_won > md.best_of DIV 2 THEN md.team1_id_FK
+        WHEN md.team2_games_won > md.best_of DIV 2 THEN md.team2_id_FK
+        WHEN md.winner_id_FK = md.team1_id_FK AND md.team1_games_won < md.team2_games_won THEN NULL
+        WHEN md.winner_id_FK = md.team2_id_FK AND md.team2_games_won < md.team1_games_won THEN NULL
+        ELSE md.winner_id_FK
+    END
+    WHERE md.id = m_id;
 
-    SELECT count(*) INTO team1_wins
-    FROM game_data as gd
-    WHERE gd.match_id_FK = m_id and gd.team1_score > gd.team2_score;
+    -- A bracket match's winner and loser go straight to their next bracket matches. The game triggers call
+    -- this and can not insert games, so the next matches themselves are created by advance_bracket
+    SET bracket_division = (SELECT division_id_FK FROM bracket_match WHERE match_id_FK = m_id);
+    IF bracket_division IS NOT NULL THEN
+        CALL place_bracket_teams(bracket_division);
+    END IF;
+END //
+DELIMITER ;
 
-    SELECT count(*) INTO team2_wins
-    FROM game_data as gd
-    WHERE gd.match_id_FK = m_id and gd.team2_score > gd.team1_score;
+-- Recounts every match's games won and winner from its games
+drop procedure if exists backfill_match_tallies;
+DELIMITER //
+create procedure backfill_match_tallies()
+BEGIN
+    UPDATE match_data as md
+    LEFT JOIN (
+        SELECT match_id_FK,
+               SUM(IFNULL(team1_score > team2_score, 0)) as team1_wins,
+               SUM(IFNULL(team2_score > team1_score, 0)) as team2_wins
+        FROM game_data
+        GROUP BY match_id_FK
+    ) as gd ON gd.match_id_FK = md.id
+    SET md.team1_games_won = IFNULL(gd.team1_wins, 0),
+        md.team2_games_won = IFNULL(gd.team2_wins, 0),
+        md.winner_id_FK = CASE
+            WHEN IFNULL(gd.team1_wins, 0) > md.best_of DIV 2 THEN md.team1_id_FK
+            WHEN IFNULL(gd.team2_wins, 0) > md.best_of DIV 2 THEN md.team2_id_FK
+            -- Winners entered by hand stand as in update_match_winner
+            WHEN md.winner_id_FK = md.team1_id_FK AND IFNULL(gd.team1_wins, 0) < IFNULL(gd.team2_wins, 0) THEN NULL
+            WHEN md.winner_id_FK = md.team2_id_FK AND IFNULL(gd.team2_wins, 0) < IFNULL(gd.team1_wins, 0) THEN NULL
+            ELSE md.winner_id_FK
+        END;
+END //
+DELIMITER ;
 
-	SELECT best_of INTO best_of
+call backfill_match_tallies();
+
+-- Gets every decided match with its teams' players, in the order it was played, replayed to compute ratings
+drop procedure if exists get_rating_history;
+DELIMITER //
+create procedure get_rating_history()
+BEGIN
+    SELECT md.id, md.team1_id_FK, md.team2_id_FK, md.winner_id_FK, md.team1_games_won, md.team2_games_won,
+           t1.player1_id_FK as team1_player1, t1.player2_id_FK as team1_player2,
+           t2.player1_id_FK as team2_player1, t2.player2_id_FK as team2_player2
     FROM match_data as md
+    JOIN division as dv ON dv.id = md.division_id_FK
+    JOIN tournament as tn ON tn.id = dv.tournament_id_FK
+    JOIN team as t1 ON t1.id = md.team1_id_FK
+    JOIN team as t2 ON t2.id = md.team2_id_FK
+    WHERE md.winner_id_FK IS NOT NULL
+    ORDER BY tn.date, tn.time, tn.id, md.id;
+END //
+DELIMITER ;
+
+call get_rating_history();
+
+-- Gets a match with its teams' players, to rate it once it is decided
+drop procedure if exists get_match_rating;
+DELIMITER //
+create procedure get_match_rating(IN m_id INT)
+BEGIN
+    SELECT md.id, md.team1_id_FK, md.team2_id_FK, md.winner_id_FK, md.team1_games_won, md.team2_games_won,
+           t1.player1_id_FK as team1_player1, t1.player2_id_FK as team1_player2,
+           t2.player1_id_FK as team2_player1, t2.player2_id_FK as team2_player2
+    FROM match_data as md
+    JOIN team as t1 ON t1.id = md.team1_id_FK
+    JOIN team as t2 ON t2.id = md.team2_id_FK
     WHERE md.id = m_id;
+END //
+DELIMITER ;
+
+call get_match_rating(1);
+
+-- Gets every match of a tournament with its teams' players, for court scheduling
+drop procedure if exists get_tournament_matches;
+DELIMITER //
+create procedure get_tournament_matches(IN to_id INT)
+BEGIN
+    SELECT md.*, t1.player1_id_FK as team1_player1, t1.player2_id_FK as team1_player2,
+           t2.player1_id_FK as team2_player1, t2.player2_id_FK as team2_player2
+    FROM match_data as md
+    JOIN division as dv ON dv.id = md.division_id_FK
+    JOIN team as t1 ON t1.id = md.team1_id_FK
+    JOIN team as t2 ON t2.id = md.team2_id_FK
+    WHERE dv.tournament_id_FK = to_id
+    ORDER BY md.id;
+END //
+DELIMITER ;
+
+call get_tournament_matches(1);
+
+-- Gets the mean points of a decided game by format, and the mean games of a decided match by best of
+drop procedure if exists get_match_length_history;
+DELIMITER //
+create procedure get_match_length_history()
+BEGIN
+    SELECT md.play_to, md.hard_cap, AVG(gd.team1_score + gd.team2_score) as points
+    FROM game_data as gd
+    JOIN match_data as md ON md.id = gd.match_id_FK
+    WHERE md.winner_id_FK IS NOT NULL AND gd.team1_score <> gd.team2_score
+    GROUP BY md.play_to, md.hard_cap;
+
+    SELECT best_of, AVG(team1_games_won + team2_games_won) as games
+    FROM match_data
+    WHERE winner_id_FK IS NOT NULL
+    GROUP BY best_of;
+END //
+DELIMITER ;
+
+call get_match_length_history();
+
+
+-- BRACKET PROCEDURES
+
+-- Gets a division's bracket matches in bracket order, with the games won of those played
+drop procedure if exists get_division_bracket;
+DELIMITER //
+create procedure get_division_bracket(IN d_id INT)
+BEGIN
+    SELECT bm.*, md.team1_games_won, md.team2_games_won
+    FROM bracket_match as bm
+    LEFT JOIN match_data as md ON md.id = bm.match_id_FK
+    WHERE bm.division_id_FK = d_id
+    ORDER BY bm.id;
+END //
+DELIMITER ;
+
+call get_division_bracket(1);
+
+-- Places the winner and loser of every decided match of a division's bracket in their next bracket matches.
+-- An empty side that is ready is a bye: its match is won by the other team without being played
+drop procedure if exists place_bracket_teams;
+DELIMITER //
+create procedure place_bracket_teams(IN d_id INT)
+BEGIN
+    DECLARE byes_decided INT DEFAULT 1;
+
+    -- Played matches are decided by their winner
+    UPDATE bracket_match as bm
+    JOIN match_data as md ON md.id = bm.match_id_FK
+    SET bm.winner_id_FK = md.winner_id_FK,
+        bm.loser_id_FK = IF(md.winner_id_FK = md.team1_id_FK, md.team2_id_FK, md.team1_id_FK),
+        bm.decided = TRUE
+    WHERE bm.division_id_FK = d_id AND NOT bm.decided AND md.winner_id_FK IS NOT NULL;
+
+    WHILE byes_decided > 0 DO
+        -- Every side is fed by one match, so each update sets a side from one row at most
+        UPDATE bracket_match as nm
+        JOIN bracket_match as bm ON bm.winner_to = nm.id AND bm.winner_side = 1
+        SET nm.team1_id_FK = bm.winner_id_FK, nm.team1_ready = TRUE
+        WHERE bm.division_id_FK = d_id AND bm.decided AND NOT bm.placed;
+
+        UPDATE bracket_match as nm
+        JOIN bracket_match as bm ON bm.winner_to = nm.id AND bm.winner_side = 2
+        SET nm.team2_id_FK = bm.winner_id_FK, nm.team2_ready = TRUE
+        WHERE bm.division_id_FK = d_id AND bm.decided AND NOT bm.placed;
+
+        UPDATE bracket_match as nm
+        JOIN bracket_match as bm ON bm.loser_to = nm.id AND bm.loser_side = 1
+        SET nm.team1_id_FK = bm.loser_id_FK, nm.team1_ready = TRUE
+        WHERE bm.division_id_FK = d_id AND bm.decided AND NOT bm.placed;
+
+        UPDATE bracket_match as nm
+        JOIN bracket_match as bm ON bm.loser_to = nm.id AND bm.loser_side = 2
+        SET nm.team2_id_FK = bm.loser_id_FK, nm.team2_ready = TRUE
+        WHERE bm.division_id_FK = d_id AND bm.decided AND NOT bm.placed;
+
+        UPDATE bracket_match SET placed = TRUE WHERE division_id_FK = d_id AND decided AND NOT placed;
+
+        -- A match with a bye sends its team on as the winner and a bye as the loser, two byes send two byes
+        UPDATE bracket_match
+        SET winner_id_FK = IFNULL(team1_id_FK, team2_id_FK), loser_id_FK = NULL, decided = TRUE
+        WHERE division_id_FK = d_id AND NOT decided AND team1_ready AND team2_ready
+            AND (team1_id_FK IS NULL OR team2_id_FK IS NULL);
+        SET byes_decided = ROW_COUNT();
+    END WHILE;
+END //
+DELIMITER ;
+
+call place_bracket_teams(1);
+
+-- Creates the match of every bracket match of a division whose two teams are known, returns how many it created
+drop procedure if exists create_bracket_matches;
+DELIMITER //
+create procedure create_bracket_matches(IN d_id INT)
+BEGIN
+    DECLARE done BOOLEAN DEFAULT FALSE;
+    DECLARE bm_id INT;
+    DECLARE created INT DEFAULT 0;
+    DECLARE ready_matches CURSOR FOR
+        SELECT id FROM bracket_match
+        WHERE division_id_FK = d_id AND match_id_FK IS NULL AND NOT decided
+            AND team1_id_FK IS NOT NULL AND team2_id_FK IS NOT NULL
+        ORDER BY id;
+    DECLARE CONTINUE HANDLER FOR NOT FOUND SET done = TRUE;
+
+    OPEN ready_matches;
+    create_loop: LOOP
+        FETCH ready_matches INTO bm_id;
+        IF done THEN
+            LEAVE create_loop;
+        END IF;
+
+        -- The match's games are created by its insert trigger
+        INSERT INTO match_data (play_to, hard_cap, best_of, team1_id_FK, team2_id_FK, division_id_FK)
+        SELECT play_to, hard_cap, best_of, team1_id_FK, team2_id_FK, division_id_FK
+        FROM bracket_match WHERE id = bm_id;
+        UPDATE bracket_match SET match_id_FK = LAST_INSERT_ID() WHERE id = bm_id;
+        SET created = created + 1;
+    END LOOP;
+    CLOSE ready_matches;
+
+    SELECT created as created_matches;
+END //
+DELIMITER ;
 
-    IF team1_wins = CEIL(best_of) THEN
-        UPDATE match_data as md
-        SET md.winner_id_FK = md.team1_id_FK
-        WHERE md.id = m_id;
-    ELSEIF team2_wins = CEIL(best_of) THEN
-        UPDATE match_data as md
-        SET md.winner_id_FK = md.team2_id_FK
-        WHERE md.id = m_id;
+call create_bracket_matches(1);
+
+-- Creates the bracket matches completed by a match's result, after update_match_winner placed it
+drop procedure if exists advance_bracket;
+DELIMITER //
+create procedure advance_bracket(IN m_id INT)
+BEGIN
+    DECLARE bracket_division INT;
+
+    SET bracket_division = (SELECT division_id_FK FROM bracket_match WHERE match_id_FK = m_id);
+    IF bracket_division IS NULL THEN
+        SELECT 0 as created_matches;
+    ELSE
+        -- A winner entered on the match itself, as for a forfeit, is placed here, the game triggers place the others
+        CALL place_bracket_teams(bracket_division);
+        CALL create_bracket_matches(bracket_division);
     END IF;
 END //
 DELIMITER ;
 
+call advance_bracket(1);
+
 
 -- GAME PROCEDURES
 
@@ -238,6 +619,19 @@ DELIMITER ;
 
 call view_all_match_games(2);
 
+-- Gets all game info for a specific division
+drop procedure if exists view_all_division_games;
+DELIMITER //
+create procedure view_all_division_games(IN d_id INT)
+BEGIN
+	SELECT gd.* FROM game_data as gd
+	JOIN match_data as md ON md.id = gd.match_id_FK
+	WHERE md.division_id_FK = d_id;
+END //
+DELIMITER ;
+
+call view_all_division_games(2);
+
 -- Gets specific game info
 drop procedure if exists view_specific_game;
 DELIMITER //
@@ -250,6 +644,45 @@ DELIMITER ;
 call view_specific_game(3);
 
 
+-- TEAM TRIGGERS
+
+-- Bump the division's change counter on team insert, so its standings and team names reload
+drop trigger if exists bump_division_on_insert_team;
+delimiter //
+create trigger bump_division_on_insert_team
+	after insert on team
+    for each row
+BEGIN
+    CALL bump_division_version(NEW.division_id_FK);
+END //
+delimiter ;
+
+-- Bump the division's change counter on team update
+drop trigger if exists bump_division_on_update_team;
+delimiter //
+create trigger bump_division_on_update_team
+	after update on team
+    for each row
+BEGIN
+    CALL bump_division_version(NEW.division_id_FK);
+    IF OLD.division_id_FK <> NEW.division_id_FK THEN
+        CALL bump_division_version(OLD.division_id_FK);
+    END IF;
+END //
+delimiter ;
+
+-- Bump the division's change counter on team delete
+drop trigger if exists bump_division_on_delete_team;
+delimiter //
+create trigger bump_division_on_delete_team
+	after delete on team
+    for each row
+BEGIN
+    CALL bump_division_version(OLD.division_id_FK);
+END //
+delimiter ;
+
+
 -- MATCH TRIGGERS
 
 -- Create games based on match info
@@ -262,23 +695,120 @@ BEGIN
     DECLARE games INT;
     SET games = NEW.best_of;
 
-    WHILE games > 0 DO
-        INSERT INTO game_data (team1_score, team2_score, match_id_FK) VALUES (0, 0, NEW.id);
-        SET games = games - 1;
-    END WHILE;
+    -- Bulk schedule creation sets @skip_create_games and inserts the games itself
+    IF @skip_create_games IS NULL THEN
+        WHILE games > 0 DO
+            INSERT INTO game_data (team1_score, team2_score, match_id_FK) VALUES (0, 0, NEW.id);
+            SET games = games - 1;
+        END WHILE;
+    END IF;
+
+    CALL bump_division_version(NEW.division_id_FK);
+END //
+delimiter ;
+
+-- Bump the division's change counter on match update
+drop trigger if exists bump_division_on_update_match;
+delimiter //
+create trigger bump_division_on_update_match
+	after update on match_data
+    for each row
+BEGIN
+    CALL bump_division_version(NEW.division_id_FK);
+    IF OLD.division_id_FK <> NEW.division_id_FK THEN
+        CALL bump_division_version(OLD.division_id_FK);
+    END IF;
+END //
+delimiter ;
+
+-- Bump the division's change counter on match delete
+drop trigger if exists bump_division_on_delete_match;
+delimiter //
+create trigger bump_division_on_delete_match
+	after delete on match_data
+    for each row
+BEGIN
+    CALL bump_division_version(OLD.division_id_FK);
 END //
 delimiter ;
 
 
 -- GAME TRIGGERS
 
--- Update match winner on game update
+-- Update match games won and winner on game update
 drop trigger if exists update_match_on_update_game;
 delimiter //
 create trigger update_match_on_update_game
 	after update on game_data
     for each row
 BEGIN
-    CALL update_match_winner(NEW.match_id_FK);
+    -- Moves the game's win, if any, from its old result to its new one
+    IF OLD.match_id_FK <> NEW.match_id_FK
+        OR IFNULL(SIGN(OLD.team1_score - OLD.team2_score), 0) <> IFNULL(SIGN(NEW.team1_score - NEW.team2_score), 0) THEN
+        UPDATE match_data
+        SET team1_games_won = team1_games_won - IFNULL(OLD.team1_score > OLD.team2_score, 0),
+            team2_games_won = team2_games_won - IFNULL(OLD.team2_score > OLD.team1_score, 0)
+        WHERE id = OLD.match_id_FK;
+
+        UPDATE match_data
+        SET team1_games_won = team1_games_won + IFNULL(NEW.team1_score > NEW.team2_score, 0),
+            team2_games_won = team2_games_won + IFNULL(NEW.team2_score > NEW.team1_score, 0)
+        WHERE id = NEW.match_id_FK;
+
+        -- Batched score updates set @skip_match_winner and recompute the winner once afterwards
+        IF @skip_match_winner IS NULL THEN
+            CALL update_match_winner(NEW.match_id_FK);
+            IF OLD.match_id_FK <> NEW.match_id_FK THEN
+                CALL update_match_winner(OLD.match_id_FK);
+            END IF;
+        END IF;
+    ELSE
+        -- Match updates bump the division's change counter, scores that leave the tallies alone bump it here
+        CALL bump_match_division_version(NEW.match_id_FK);
+    END IF;
+END //
+delimiter ;
+
+-- Update match games won and winner on game insert
+drop trigger if exists tally_match_on_insert_game;
+delimiter //
+create trigger tally_match_on_insert_game
+	after insert on game_data
+    for each row
+BEGIN
+    IF NEW.team1_score <> NEW.team2_score THEN
+        UPDATE match_data
+        SET team1_games_won = team1_games_won + (NEW.team1_score > NEW.team2_score),
+            team2_games_won = team2_games_won + (NEW.team2_score > NEW.team1_score)
+        WHERE id = NEW.match_id_FK;
+
+        IF @skip_match_winner IS NULL THEN
+            CALL update_match_winner(NEW.match_id_FK);
+        END IF;
+    ELSE
+        CALL bump_match_division_version(NEW.match_id_FK);
+    END IF;
+END //
+delimiter ;
+
+-- Update match games won and winner on game delete
+drop trigger if exists tally_match_on_delete_game;
+delimiter //
+create trigger tally_match_on_delete_game
+	after delete on game_data
+    for each row
+BEGIN
+    IF OLD.team1_score <> OLD.team2_score THEN
+        UPDATE match_data
+        SET team1_games_won = team1_games_won - (OLD.team1_score > OLD.team2_score),
+            team2_games_won = team2_games_won - (OLD.team2_score > OLD.team1_score)
+        WHERE id = OLD.match_id_FK;
+
+        IF @skip_match_winner IS NULL THEN
+            CALL update_match_winner(OLD.match_id_FK);
+        END IF;
+    ELSE
+        CALL bump_match_division_version(OLD.match_id_FK);
+    END IF;
 END //
 delimiter ;
\ No newline at end of file
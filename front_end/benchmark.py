@@ -0,0 +1,425 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark suite.
+
+Fills an empty tm database with a seeded synthetic data set at a chosen
+scale, then times each stored procedure, the data layer behind the pages
+and, where Tk can open a display (e.g. under Xvfb), each page constructor.
+Results are written as JSON so runs on different commits can be compared:
+
+    python3 benchmark.py generate --user USER --scale large
+    python3 benchmark.py run --user USER --pages --output before.json
+    python3 benchmark.py run --user USER --pages --compare before.json
+
+With --sqlite PATH instead of --user both run on a local SQLite copy of
+the schema, without a MySQL server.
+"""
+import argparse
+import datetime
+import getpass
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+import model
+import offline
+import pool
+import pymysql
+import schedule
+import search
+from snapshot import DivisionSnapshot
+from standings import Standings
+
+# Data set sizes, tournaments hold divisions of round-robin teams and every match is best of best_of games
+scales = {
+    "small": {"tournaments": 5, "divisions": 2, "teams": 8, "schools": 20, "players": 500, "best_of": 3},
+    "medium": {"tournaments": 25, "divisions": 4, "teams": 12, "schools": 100, "players": 10000, "best_of": 3},
+    # 100 tournaments, 50k players and about 200k games
+    "large": {"tournaments": 100, "divisions": 4, "teams": 19, "schools": 300, "players": 50000, "best_of": 3},
+}
+
+# Share of tournaments whose matches are played, the rest are upcoming with unplayed games
+played_share = 0.8
+
+# Rows per multi-row insert
+generate_chunk_size = 1000
+
+# Timed runs of each benchmark, and the median slowdown reported as a regression when above timer noise
+default_repeat = 5
+regression_ratio = 1.2
+regression_min_ms = 0.5
+
+# Stored procedures timed, with the sample ids their arguments are taken from
+procedure_args = {
+    "get_columns_from_schema": lambda ids: (ids["db_name"],),
+    "get_columns_from_table": lambda ids: ("match_data", ids["db_name"]),
+    "get_search_entries": lambda ids: (),
+    "view_all_schools": lambda ids: (),
+    "view_schools_page": lambda ids: (0, ids["page_size"]),
+    "view_specific_school": lambda ids: (ids["s_id"],),
+    "get_players_from_school": lambda ids: (ids["s_id"],),
+    "view_all_players": lambda ids: (),
+    "view_players_page": lambda ids: (0, ids["page_size"]),
+    "view_specific_player": lambda ids: (ids["p_id"],),
+    "view_all_team_players": lambda ids: (ids["te_id"],),
+    "view_all_tournaments": lambda ids: (),
+    "view_tournaments_page": lambda ids: (0, ids["page_size"]),
+    "view_specific_tournament": lambda ids: (ids["to_id"],),
+    "export_tournament_results": lambda ids: (ids["to_id"],),
+    "view_all_tournament_divisions": lambda ids: (ids["to_id"],),
+    "view_specific_division": lambda ids: (ids["d_id"],),
+    "get_division_snapshot": lambda ids: (ids["d_id"],),
+    "view_all_division_teams": lambda ids: (ids["d_id"],),
+    "view_division_teams_page": lambda ids: (ids["d_id"], 0, ids["page_size"]),
+    "view_all_division_matches": lambda ids: (ids["d_id"],),
+    "view_all_division_games": lambda ids: (ids["d_id"],),
+    "view_specific_match": lambda ids: (ids["m_id"],),
+    "view_all_match_games": lambda ids: (ids["m_id"],),
+    "view_specific_game": lambda ids: (ids["g_id"],),
+}
+
+# Pages timed from construction until all their queries are shown
+page_names = ("Homepage", "Tournaments", "Tournament", "Division", "Match", "Team", "Players", "Player",
+              "Schools", "School")
+
+
+class Generator:
+    """
+    Represents the synthetic data set of a scale and seed.
+
+    The same scale and seed always give the same rows, ids included.
+    """
+
+    def __init__(self, scale, seed):
+        self.sizes = scales[scale]
+        self.rng = random.Random(seed)
+
+    def generate(self, cur):
+        """
+        Inserts the data set into an empty database on cur, returns the row count of each table.
+        """
+        for table_name in offline.tables:
+            cur.execute(f"SELECT COUNT(*) AS count FROM {table_name}")
+            if cur.fetchone()["count"]:
+                raise RuntimeError(f"{table_name} has rows, generate fills an empty database (see --reset).")
+
+        sizes = self.sizes
+        rng = self.rng
+        counts = {}
+        schools = [(s_id, f"School {s_id}", f"{rng.randint(1, 999)} Campus Road")
+                   for s_id in range(1, sizes["schools"] + 1)]
+        counts["school"] = self.insert(cur, "school", ("id", "name", "address"), schools)
+
+        first_names = ("Alex", "Bo", "Casey", "Dana", "Eli", "Fran", "Gus", "Hana", "Ivan", "Jo", "Kim", "Lee")
+        players = [(p_id, f"{rng.choice(first_names)} {p_id}",
+                    datetime.date(rng.randint(1990, 2008), rng.randint(1, 12), rng.randint(1, 28)).isoformat(),
+                    f"{rng.randint(200, 999)}-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+                    rng.randint(1, sizes["schools"]))
+                   for p_id in range(1, sizes["players"] + 1)]
+        counts["player"] = self.insert(cur, "player", ("id", "name", "dob", "phone_number", "school_id_FK"), players)
+
+        tournaments, divisions, teams, matches, games = [], [], [], [], []
+        best_of = sizes["best_of"]
+        played = round(sizes["tournaments"] * played_share)
+        for to_id in range(1, sizes["tournaments"] + 1):
+            tournaments.append((to_id, f"Tournament {to_id}",
+                                datetime.date(2020, 1, 1) + datetime.timedelta(days=7 * to_id),
+                                f"{rng.randint(8, 17):02d}:{rng.choice((0, 30)):02d}:00", f"Venue {to_id}"))
+            # A player plays for one team per tournament
+            entrants = iter(rng.sample(range(1, sizes["players"] + 1), 2 * sizes["divisions"] * sizes["teams"]))
+            for _ in range(sizes["divisions"]):
+                d_id = len(divisions) + 1
+                divisions.append((d_id, f"Division {d_id}", "Generated division", sizes["teams"], to_id))
+                team_ids = []
+                for _ in range(sizes["teams"]):
+                    te_id = len(teams) + 1
+                    teams.append((te_id, f"Team {te_id}", d_id, next(entrants), next(entrants)))
+                    team_ids.append(te_id)
+                for team1, team2 in (pair for pairs in schedule.round_robin(team_ids) for pair in pairs):
+                    m_id = len(matches) + 1
+                    matches.append((m_id, 21, 25, best_of, team1, team2, d_id))
+                    for team1_score, team2_score in self.scores(best_of, to_id <= played):
+                        games.append((len(games) + 1, team1_score, team2_score, m_id))
+
+        counts["tournament"] = self.insert(cur, "tournament", ("id", "name", "date", "time", "address"), tournaments)
+        counts["division"] = self.insert(cur, "division", ("id", "name", "description", "max_teams",
+                                                           "tournament_id_FK"), divisions)
+        counts["team"] = self.insert(cur, "team", ("id", "name", "division_id_FK", "player1_id_FK", "player2_id_FK"),
+                                     teams)
+        # Games are inserted with their scores, and the insert trigger tallies them onto their matches
+        cur.execute("SET @skip_create_games = 1")
+        counts["match_data"] = self.insert(cur, "match_data", ("id", "play_to", "hard_cap", "best_of",
+                                                               "team1_id_FK", "team2_id_FK", "division_id_FK"),
+                                           matches)
+        cur.execute("SET @skip_create_games = NULL")
+        counts["game_data"] = self.insert(cur, "game_data", ("id", "team1_score", "team2_score", "match_id_FK"), games)
+        return counts
+
+    def scores(self, best_of, played):
+        """
+        Returns the scores of a match's games, unplayed games are 0 to 0.
+        """
+        if not played:
+            return [(0, 0)] * best_of
+        scores = []
+        won = [0, 0]
+        while max(won) <= best_of // 2:
+            winner = self.rng.randint(0, 1)
+            won[winner] += 1
+            loser_score = self.rng.randint(5, 19)
+            scores.append((21, loser_score) if winner == 0 else (loser_score, 21))
+        return scores + [(0, 0)] * (best_of - len(scores))
+
+    @staticmethod
+    def insert(cur, table_name, columns, rows):
+        sql = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+        for start in range(0, len(rows), generate_chunk_size):
+            cur.executemany(sql, rows[start:start + generate_chunk_size])
+            cur.connection.commit()
+        return len(rows)
+
+
+def reset(cur):
+    """
+    Deletes every row, brackets and then matches first so MySQL cascades to their games without firing the game
+    triggers.
+    """
+    for table_name in ("bracket_match", "match_data", "game_data", "team", "division", "tournament", "player",
+                       "school"):
+        cur.execute(f"DELETE FROM {table_name}")
+    cur.connection.commit()
+
+
+def sample_ids(cur, rng):
+    """
+    Picks a played match at random, with its division, tournament, a team, player and school that belong together.
+    """
+    cur.execute("SELECT MAX(id) AS max_id FROM match_data WHERE winner_id_FK IS NOT NULL")
+    max_id = cur.fetchone()["max_id"]
+    if max_id is None:
+        raise RuntimeError("The database has no played matches, run generate first.")
+    cur.execute("SELECT * FROM match_data WHERE id >= %s AND winner_id_FK IS NOT NULL ORDER BY id LIMIT 1",
+                (rng.randint(1, max_id),))
+    match = cur.fetchone()
+    cur.execute("SELECT tournament_id_FK FROM division WHERE id = %s", (match["division_id_FK"],))
+    to_id = cur.fetchone()["tournament_id_FK"]
+    cur.execute("SELECT * FROM team WHERE id = %s", (match["team1_id_FK"],))
+    team = cur.fetchone()
+    cur.execute("SELECT * FROM player WHERE id = %s", (team["player1_id_FK"],))
+    player = cur.fetchone()
+    cur.execute("SELECT MIN(id) AS g_id FROM game_data WHERE match_id_FK = %s", (match["id"],))
+    g_id = cur.fetchone()["g_id"]
+    return {"to_id": to_id, "d_id": match["division_id_FK"], "m_id": match["id"], "g_id": g_id,
+            "te_id": team["id"], "p_id": player["id"], "s_id": player["school_id_FK"]}
+
+
+def measure(run, repeat):
+    """
+    Times run() repeat times after a warm-up call, returns its timings in milliseconds and its row count.
+    """
+    rows = run()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = run()
+        times.append((time.perf_counter() - start) * 1000)
+    return {"repeat": repeat, "min_ms": round(min(times), 3), "median_ms": round(statistics.median(times), 3),
+            "mean_ms": round(statistics.mean(times), 3), "rows": rows}
+
+
+def call_procedure(cur, name, args):
+    cur.callproc(name, args)
+    rows = len(cur.fetchall())
+    while cur.nextset():
+        rows += len(cur.fetchall())
+    return rows
+
+
+def time_procedures(cur, ids, repeat):
+    return {f"procedure:{name}": measure(lambda: call_procedure(cur, name, args(ids)), repeat)
+            for name, args in procedure_args.items()}
+
+
+def time_data_layer(cur, ids, repeat):
+    """
+    Times what the pages do with their rows once read, without Tk.
+    """
+    results = {}
+
+    def load_snapshot():
+        division_snapshot = DivisionSnapshot.load(cur, ids["d_id"], model.IdentityMap())
+        return len(division_snapshot.teams) + len(division_snapshot.matches) + len(division_snapshot.games)
+    results["data:division_snapshot"] = measure(load_snapshot, repeat)
+
+    division_snapshot = DivisionSnapshot.load(cur, ids["d_id"], model.IdentityMap())
+
+    def build_standings():
+        division_standings = Standings(division_snapshot.teams, list(division_snapshot.matches.values()),
+                                       list(division_snapshot.games.values()))
+        return len(division_standings.ranking())
+    results["data:standings"] = measure(build_standings, repeat)
+
+    def load_index():
+        return len(search.SearchIndex.load(cur).entries)
+    results["data:search_index"] = measure(load_index, repeat)
+
+    index = search.SearchIndex.load(cur)
+    results["data:search_query"] = measure(lambda: len(index.search("jo", limit=8)), repeat)
+    results["data:search_fuzzy_query"] = measure(lambda: len(index.search("tornament", limit=8)), repeat)
+    return results
+
+
+def time_pages(connect, store, ids, repeat):
+    """
+    Times each page from construction until its queries are shown, returns {} when Tk has no display.
+    """
+    import tkinter as tk
+    import main
+
+    # Finished queries are picked up right away rather than on the app's polling interval
+    main.loader_poll_ms = 1
+    try:
+        app = main.App()
+    except tk.TclError as e:
+        print(f"Skipping pages, Tk could not start: {e}", file=sys.stderr)
+        return {}
+    app.withdraw()
+    if connect is not None:
+        app.pool = pool.ConnectionPool(connect)
+    else:
+        app.store = store
+    for name in main.App.id_names:
+        setattr(app, name, ids[name])
+    app.schema.load()
+
+    results = {}
+    try:
+        for page_name in page_names:
+            page_type = getattr(main, page_name)
+
+            def build():
+                # Pages read through the app's caches, which start empty as after login
+                app.snapshots.invalidate()
+                app.standings.clear()
+                frame = page_type(parent=app.container, controller=app)
+                while frame.pending or app.loader.jobs:
+                    app.update()
+                count = len(frame.winfo_children())
+                frame.destroy()
+                return count
+            results[f"page:{page_name}"] = measure(build, repeat)
+    finally:
+        app.destroy()
+    return results
+
+
+def commit_id():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, ratio=regression_ratio):
+    """
+    Prints each benchmark's median against a baseline run's, returns the names that slowed down past ratio.
+    """
+    regressions = []
+    for name, result in results.items():
+        before = baseline["results"].get(name)
+        if before is None:
+            print(f"{name:45} {result['median_ms']:>10.3f} ms  (new)", file=sys.stderr)
+            continue
+        change = result["median_ms"] / before["median_ms"] if before["median_ms"] else 1.0
+        flag = ""
+        if change > ratio and result["median_ms"] - before["median_ms"] > regression_min_ms:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:45} {before['median_ms']:>10.3f} -> {result['median_ms']:>10.3f} ms  x{change:.2f}{flag}",
+              file=sys.stderr)
+    return regressions
+
+
+def benchmark_command():
+    from main import host, db_name, grid_page_size
+
+    parser = argparse.ArgumentParser(description="Generate a synthetic data set and time the app against it.")
+    parser.add_argument("command", choices=("generate", "run"))
+    backend = parser.add_mutually_exclusive_group(required=True)
+    backend.add_argument("--user", help="MySQL user")
+    backend.add_argument("--sqlite", metavar="PATH", help="use a SQLite copy of the schema instead of MySQL")
+    parser.add_argument("--scale", choices=sorted(scales), default="small")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--reset", action="store_true", help="delete all rows before generating")
+    parser.add_argument("--repeat", type=int, default=default_repeat)
+    parser.add_argument("--pages", action="store_true", help="also time page construction, needs a display")
+    parser.add_argument("--output", help="file to write the results to, stdout when left out")
+    parser.add_argument("--compare", metavar="BASELINE", help="results of an earlier run to compare with")
+    args = parser.parse_args()
+
+    if args.user is not None:
+        password = getpass.getpass()
+
+        def connect():
+            return pymysql.connect(host=host, user=args.user, password=password, db=db_name, charset='utf8mb4',
+                                   cursorclass=pymysql.cursors.DictCursor, autocommit=True)
+        cnx = connect()
+        store = None
+    else:
+        connect = None
+        store = offline.LocalStore(args.sqlite, outbox=False)
+        cnx = offline.LocalConnection(store)
+
+    try:
+        cur = cnx.cursor()
+        if args.command == "generate":
+            if args.reset:
+                reset(cur)
+            start = time.perf_counter()
+            try:
+                counts = Generator(args.scale, args.seed).generate(cur)
+            except RuntimeError as e:
+                print(e, file=sys.stderr)
+                return 1
+            print(f"Generated {counts} in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+            return 0
+
+        ids = sample_ids(cur, random.Random(args.seed))
+        results = time_procedures(cur, dict(ids, db_name=db_name, page_size=grid_page_size), args.repeat)
+        results.update(time_data_layer(cur, ids, args.repeat))
+        counts = {}
+        for table_name in offline.tables:
+            cur.execute(f"SELECT COUNT(*) AS count FROM {table_name}")
+            counts[table_name] = cur.fetchone()["count"]
+    finally:
+        if args.user is not None:
+            cnx.close()
+    if args.pages:
+        results.update(time_pages(connect, store, ids, args.repeat))
+
+    report = {"commit": commit_id(), "created": datetime.datetime.now().isoformat(timespec="seconds"),
+              "python": platform.python_version(), "backend": "mysql" if args.user is not None else "sqlite",
+              "seed": args.seed, "counts": counts, "sample_ids": ids, "results": results}
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(results, json.load(file))
+        if regressions:
+            print(f"{len(regressions)} benchmarks slowed down by more than x{regression_ratio}.", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(benchmark_command())
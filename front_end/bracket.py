@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+Elimination brackets.
+
+Seeds a division's teams by rating and creates its single or double
+elimination bracket as bracket_match rows, one per bracket match, made
+before their teams are known. Seeds are placed so the top seeds meet last
+and a bracket short of a power of two gives its byes to the top seeds.
+
+The database advances the bracket: update_match_winner places a decided
+bracket match's winner, and in a double elimination its loser, in their next
+bracket matches, and advance_bracket creates each match whose two teams are
+then known, first placing a winner entered on the match itself. A match with
+a bye is won without being played.
+"""
+from ratings import initial_rating
+
+# Names of the last winners bracket rounds, the final first
+round_names = ("final", "semifinal", "quarterfinal")
+
+
+def seed_positions(size):
+    """
+    Returns the seeds of a bracket of size lines in line order, seed 1 and 2 meeting in the final.
+    """
+    seeds = [1]
+    while len(seeds) < size:
+        count = len(seeds) * 2
+        seeds = [seed for top in seeds for seed in (top, count + 1 - top)]
+    return seeds
+
+
+def seed_teams(teams, engine=None):
+    """
+    Returns the ids of the teams in seed order, highest rated first, unrated teams in id order.
+    """
+    def rating(team):
+        if engine is None:
+            return initial_rating
+        return engine.team((team.player1_id_FK, team.player2_id_FK))
+    return [team.id for team in sorted(teams, key=lambda team: (-rating(team), team.id))]
+
+
+def bracket_matches(team_ids, double=False):
+    """
+    Returns the bracket matches of the seeded teams, winners bracket first.
+
+    Each is a dict of its bracket, round and position, its first round
+    teams, and the indexes of the matches its winner and loser go to with
+    their side there. A double elimination's losers bracket alternates
+    between rounds among its own teams and rounds that take in the losers of
+    the next winners bracket round, and its winner meets the winners
+    bracket's in the grand final.
+    """
+    if len(team_ids) < 2:
+        raise ValueError("A bracket needs at least two teams.")
+    rounds = (len(team_ids) - 1).bit_length()
+    size = 2 ** rounds
+    lines = [team_ids[seed - 1] if seed <= len(team_ids) else None for seed in seed_positions(size)]
+
+    matches = []
+    indexes = {}
+
+    def add(bracket, round_number, count):
+        for position in range(count):
+            indexes[bracket, round_number, position] = len(matches)
+            matches.append({"bracket": bracket, "round": round_number, "position": position, "team1": None,
+                            "team2": None, "ready": False, "winner_to": None, "winner_side": None,
+                            "loser_to": None, "loser_side": None})
+
+    def link(source, outcome, target, side):
+        matches[indexes[source]][f"{outcome}_to"] = indexes[target]
+        matches[indexes[source]][f"{outcome}_side"] = side
+
+    for round_number in range(1, rounds + 1):
+        add("W", round_number, size >> round_number)
+    for round_number in range(1, rounds):
+        for position in range(size >> round_number):
+            link(("W", round_number, position), "winner", ("W", round_number + 1, position // 2), position % 2 + 1)
+
+    # The first round holds the seeded lines, an empty line is a bye
+    for position in range(size >> 1):
+        match = matches[indexes["W", 1, position]]
+        match["team1"], match["team2"], match["ready"] = lines[2 * position], lines[2 * position + 1], True
+
+    if not double:
+        return matches
+
+    # Losers bracket round 2r - 2 takes in the losers of winners bracket round r, the first pairs round 1's
+    loser_rounds = 2 * rounds - 2
+    for loser_round in range(1, loser_rounds + 1):
+        add("L", loser_round, size >> (loser_round + 1) // 2 + 1)
+    add("F", 1, 1)
+    if rounds == 1:
+        link(("W", 1, 0), "loser", ("F", 1, 0), 2)
+    else:
+        for position in range(size >> 1):
+            link(("W", 1, position), "loser", ("L", 1, position // 2), position % 2 + 1)
+    for round_number in range(2, rounds + 1):
+        count = size >> round_number
+        for position in range(count):
+            # Every other round takes its losers in reverse, so teams that met are kept apart longer
+            target = count - 1 - position if round_number % 2 == 0 else position
+            link(("W", round_number, position), "loser", ("L", 2 * round_number - 2, target), 2)
+    for loser_round in range(1, loser_rounds):
+        for position in range(size >> (loser_round + 1) // 2 + 1):
+            if loser_round % 2:
+                link(("L", loser_round, position), "winner", ("L", loser_round + 1, position), 1)
+            else:
+                link(("L", loser_round, position), "winner", ("L", loser_round + 1, position // 2), position % 2 + 1)
+    link(("W", rounds, 0), "winner", ("F", 1, 0), 1)
+    if loser_rounds:
+        link(("L", loser_rounds, 0), "winner", ("F", 1, 0), 2)
+    return matches
+
+
+def create_bracket(cur, d_id, matches, play_to, hard_cap, best_of):
+    """
+    Writes a division's bracket matches in place of its current bracket, and the matches ready to play.
+
+    Runs on a cursor inside a transaction. Matches created for an earlier
+    bracket are kept. Returns the number of matches created.
+    """
+    cur.execute("DELETE FROM bracket_match WHERE division_id_FK = %s", (d_id,))
+    # Rows are linked once every row has its id
+    bm_ids = []
+    for match in matches:
+        cur.execute("INSERT INTO bracket_match (division_id_FK, bracket, round, position, play_to, hard_cap, best_of, "
+                    "team1_id_FK, team2_id_FK, team1_ready, team2_ready) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, "
+                    "%s, %s)",
+                    (d_id, match["bracket"], match["round"], match["position"], play_to, hard_cap, best_of,
+                     match["team1"], match["team2"], match["ready"], match["ready"]))
+        bm_ids.append(cur.lastrowid)
+    cur.executemany("UPDATE bracket_match SET winner_to = %s, winner_side = %s, loser_to = %s, loser_side = %s "
+                    "WHERE id = %s",
+                    [(None if match["winner_to"] is None else bm_ids[match["winner_to"]], match["winner_side"],
+                      None if match["loser_to"] is None else bm_ids[match["loser_to"]], match["loser_side"], bm_id)
+                     for match, bm_id in zip(matches, bm_ids)
+                     if match["winner_to"] is not None or match["loser_to"] is not None])
+
+    # Teams with a first round bye go on at once
+    cur.callproc("place_bracket_teams", (d_id,))
+    cur.callproc("create_bracket_matches", (d_id,))
+    created = cur.fetchone()["created_matches"]
+    while cur.nextset():
+        pass
+    return created
+
+
+def advance_bracket(cur, m_id):
+    """
+    Places a bracket match's result and creates the bracket matches whose teams it completed, returns how many.
+
+    Does nothing for a match outside a bracket. Offline the call is queued and
+    the matches are created once it reaches the database.
+    """
+    cur.callproc("advance_bracket", (m_id,))
+    row = cur.fetchone()
+    while cur.nextset():
+        pass
+    return row["created_matches"] if row else 0
+
+
+def round_name(bracket, round_number, rounds, double):
+    """
+    Returns the name of a bracket round, rounds being the number of winners bracket rounds.
+    """
+    if bracket == "F":
+        return "Grand final"
+    if bracket == "L":
+        return f"Losers round {round_number}"
+    from_last = rounds - round_number
+    name = round_names[from_last] if from_last < len(round_names) else f"round {round_number}"
+    return f"Winners {name}" if double else name.capitalize()
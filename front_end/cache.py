@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""
+Procedure result cache.
+
+A read-through cache of the view_* procedures' result sets, keyed by
+procedure name and arguments. Each entry is tagged with the tables its
+procedure reads, so a write drops exactly the entries that depend on the
+written tables. Entries also expire after a while, for changes made by
+other clients, and the least recently used entries are dropped beyond a
+size bound.
+"""
+import collections
+import threading
+import time
+
+# Entries kept, and seconds before an entry is read again from the database
+cache_size = 256
+cache_ttl = 30
+
+# Procedures whose results are cached, with the tables they read
+procedure_tables = {
+    "view_all_schools": {"school"},
+    "view_schools_page": {"school"},
+    "view_specific_school": {"school"},
+    "get_players_from_school": {"player"},
+    "view_all_players": {"player"},
+    "view_players_page": {"player"},
+    "view_specific_player": {"player"},
+    "view_all_team_players": {"team", "player"},
+    "view_all_tournaments": {"tournament"},
+    "view_tournaments_page": {"tournament"},
+    "view_specific_tournament": {"tournament"},
+    "view_all_tournament_divisions": {"division"},
+    "view_specific_division": {"division"},
+    "view_all_division_teams": {"team"},
+    "view_division_teams_page": {"team"},
+    "view_all_division_matches": {"match_data"},
+    "view_specific_match": {"match_data"},
+    "view_all_match_games": {"game_data"},
+    "view_all_division_games": {"game_data", "match_data"},
+    "view_specific_game": {"game_data"},
+}
+
+
+class ResultCache:
+    """
+    Represents the cached procedure results of a session.
+
+    Cached rows are shared between readers and must not be changed.
+    """
+
+    def __init__(self, size=cache_size, ttl=cache_ttl, clock=time.monotonic):
+        self.size = size
+        self.ttl = ttl
+        self.clock = clock
+        self.lock = threading.Lock()
+        # Result sets and expiry time by (procedure, args), least recently used first
+        self.entries = collections.OrderedDict()
+        self.table_keys = collections.defaultdict(set)
+        # Bumped on every write to a table, results read before it are not kept
+        self.versions = collections.Counter()
+        self.hits = 0
+        self.misses = 0
+
+    def cursor(self, cur):
+        return CachingCursor(cur, self)
+
+    def get(self, name, args):
+        """
+        Returns the cached result sets of a call, or None and counts a miss.
+        """
+        key = (name, args)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[1] > self.clock():
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                self.drop(key)
+            self.misses += 1
+            return None
+
+    def versions_of(self, name):
+        with self.lock:
+            return tuple(self.versions[table_name] for table_name in procedure_tables[name])
+
+    def put(self, name, args, result_sets, versions):
+        """
+        Caches a call's result sets, unless one of its tables was written since versions were taken.
+        """
+        key = (name, args)
+        with self.lock:
+            if versions != tuple(self.versions[table_name] for table_name in procedure_tables[name]):
+                return
+            if key in self.entries:
+                self.drop(key)
+            self.entries[key] = (result_sets, self.clock() + self.ttl)
+            for table_name in procedure_tables[name]:
+                self.table_keys[table_name].add(key)
+            while len(self.entries) > self.size:
+                self.drop(next(iter(self.entries)))
+
+    def drop(self, key):
+        del self.entries[key]
+        for table_name in procedure_tables[key[0]]:
+            self.table_keys[table_name].discard(key)
+
+    def invalidate(self, table_names):
+        """
+        Drops the entries that read any of the written tables.
+        """
+        with self.lock:
+            for table_name in table_names:
+                self.versions[table_name] += 1
+                for key in list(self.table_keys.pop(table_name, ())):
+                    if key in self.entries:
+                        self.drop(key)
+
+    def clear(self):
+        with self.lock:
+            for table_name in list(self.versions) + list(self.table_keys):
+                self.versions[table_name] += 1
+            self.entries.clear()
+            self.table_keys.clear()
+
+    def stats(self):
+        with self.lock:
+            calls = self.hits + self.misses
+            return {"entries": len(self.entries), "hits": self.hits, "misses": self.misses,
+                    "hit_rate": self.hits / calls if calls else None}
+
+
+class CachingCursor:
+    """
+    A cursor that answers cached procedure calls from the cache.
+
+    Everything else is passed through to the wrapped cursor.
+    """
+
+    def __init__(self, cur, cache):
+        self.cur = cur
+        self.cache = cache
+        # The cached result sets being read, None while reading from the wrapped cursor
+        self.result_sets = None
+        self.rows = None
+        self.position = 0
+
+    def __getattr__(self, name):
+        return getattr(self.cur, name)
+
+    def execute(self, query, args=None):
+        self.result_sets = None
+        return self.cur.execute(query, args)
+
+    def executemany(self, query, args):
+        self.result_sets = None
+        return self.cur.executemany(query, args)
+
+    def callproc(self, procname, args=()):
+        self.result_sets = None
+        if procname not in procedure_tables:
+            return self.cur.callproc(procname, args)
+
+        key_args = tuple(args)
+        result_sets = self.cache.get(procname, key_args)
+        if result_sets is None:
+            versions = self.cache.versions_of(procname)
+            self.cur.callproc(procname, args)
+            result_sets = [tuple(self.cur.fetchall())]
+            while self.cur.nextset():
+                result_sets.append(tuple(self.cur.fetchall()))
+            self.cache.put(procname, key_args, result_sets, versions)
+        self.show(list(result_sets))
+        return args
+
+    def show(self, result_sets):
+        self.result_sets = result_sets
+        self.rows = self.result_sets.pop(0)
+        self.position = 0
+
+    @property
+    def rowcount(self):
+        return len(self.rows) if self.result_sets is not None else self.cur.rowcount
+
+    def nextset(self):
+        if self.result_sets is None:
+            return self.cur.nextset()
+        if not self.result_sets:
+            return None
+        self.show(self.result_sets)
+        return True
+
+    def fetchone(self):
+        if self.result_sets is None:
+            return self.cur.fetchone()
+        if self.position >= len(self.rows):
+            return None
+        self.position += 1
+        return self.rows[self.position - 1]
+
+    def fetchmany(self, size=1):
+        if self.result_sets is None:
+            return self.cur.fetchmany(size)
+        rows = list(self.rows[self.position:self.position + size])
+        self.position += len(rows)
+        return rows
+
+    def fetchall(self):
+        if self.result_sets is None:
+            return self.cur.fetchall()
+        rows = list(self.rows[self.position:])
+        self.position = len(self.rows)
+        return rows
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+Query plan regression check.
+
+Runs EXPLAIN FORMAT=JSON on every statement of every stored procedure,
+with arguments taken from sample rows, and fails when a plan reads a table
+with a full table scan, other than in the procedures meant to read whole
+tables. The optimizer scans small tables whatever their indexes, so run it
+against a scaled data set:
+
+    python3 benchmark.py generate --user USER --scale medium
+    python3 explain.py --user USER --output plans.json
+"""
+import argparse
+import getpass
+import json
+import random
+import re
+import sys
+
+import pymysql
+
+from benchmark import sample_ids
+
+# Procedures that read every row of some of their tables, whose full scans are expected
+full_scan_procedures = {
+    "get_columns_from_table", "get_columns_from_schema", "get_search_entries", "view_all_schools", "view_all_players",
+    "view_all_tournaments", "get_division_versions", "backfill_match_tallies", "get_rating_history",
+    "get_match_length_history",
+}
+
+# Statements that EXPLAIN can show a plan for
+explainable = re.compile(r"(SELECT|INSERT|UPDATE|DELETE|REPLACE|WITH)\b", re.I)
+
+# Control flow and cursor declarations a statement can follow in a procedure body, left out to explain the statement
+control_flow = re.compile(r"^(?:(?:\w+:\s*)?(?:LOOP|REPEAT)\s+|WHILE\b.*?\bDO\s+|(?:ELSE)?IF\b.*?\bTHEN\s+|ELSE\s+|"
+                          r"DECLARE\s+\w+\s+CURSOR\s+FOR\s+)", re.I | re.S)
+
+# Local variables a procedure declares, which are explained with this value
+local_value = 1
+
+# Rows per page for the paging procedures' page_limit
+page_limit = 100
+
+
+def procedure_statements(cur, db_name):
+    """
+    Returns the parameter names, local variable names and statements of every stored procedure, by procedure name.
+    """
+    cur.execute("SELECT ROUTINE_NAME, ROUTINE_DEFINITION FROM information_schema.ROUTINES "
+                "WHERE ROUTINE_SCHEMA = %s AND ROUTINE_TYPE = 'PROCEDURE' ORDER BY ROUTINE_NAME", (db_name,))
+    definitions = {row["ROUTINE_NAME"]: row["ROUTINE_DEFINITION"] for row in cur.fetchall()}
+    cur.execute("SELECT SPECIFIC_NAME, PARAMETER_NAME FROM information_schema.PARAMETERS "
+                "WHERE SPECIFIC_SCHEMA = %s AND ROUTINE_TYPE = 'PROCEDURE' AND PARAMETER_NAME IS NOT NULL "
+                "ORDER BY SPECIFIC_NAME, ORDINAL_POSITION", (db_name,))
+    parameters = {}
+    for row in cur.fetchall():
+        parameters.setdefault(row["SPECIFIC_NAME"], []).append(row["PARAMETER_NAME"])
+
+    procedures = {}
+    for name, definition in definitions.items():
+        body = re.sub(r"--[^\n]*", "", definition or "")
+        body = re.sub(r"^\s*BEGIN\b|\bEND\s*$", "", body.strip(), flags=re.I)
+        statements = [control_flow.sub("", statement.strip()) for statement in body.split(";")]
+        variables = re.findall(r"\bDECLARE\s+(?!CONTINUE\b|EXIT\b)(\w+)\s+(?!CURSOR\b)", body, re.I)
+        procedures[name] = (parameters.get(name, []), variables, [statement for statement in statements
+                                                                   if explainable.match(statement)])
+    return procedures
+
+
+def parameter_values(ids, db_name):
+    """
+    Returns the value passed for each parameter name the procedures use.
+    """
+    values = dict(ids)
+    values.update({"after_id": 0, "page_limit": page_limit, "tab_name": "match_data", "db_name": db_name})
+    return values
+
+
+def table_accesses(plan):
+    """
+    Yields the table access of every base table in a JSON plan, derived and temporary tables left out.
+    """
+    if isinstance(plan, dict):
+        if "access_type" in plan and "table_name" in plan and "materialized_from_subquery" not in plan \
+                and not plan["table_name"].startswith("<"):
+            yield plan
+        for value in plan.values():
+            yield from table_accesses(value)
+    elif isinstance(plan, list):
+        for value in plan:
+            yield from table_accesses(value)
+
+
+def explain_procedures(cur, db_name, ids):
+    """
+    Explains every statement of every procedure.
+
+    Returns the plans by procedure, and a line per full table scan outside full_scan_procedures. Empty tables,
+    such as brackets in a generated data set, are scanned whatever their indexes and are not reported.
+    """
+    values = parameter_values(ids, db_name)
+    cur.execute("SELECT TABLE_NAME FROM information_schema.TABLES WHERE TABLE_SCHEMA = %s AND TABLE_ROWS = 0",
+                (db_name,))
+    empty_tables = {row["TABLE_NAME"] for row in cur.fetchall()}
+    plans = {}
+    failures = []
+    for name, (parameters, variables, statements) in procedure_statements(cur, db_name).items():
+        plans[name] = []
+        for statement in statements:
+            sql = statement
+            for parameter in parameters:
+                sql = re.sub(rf"\b{parameter}\b", cur.connection.literal(values[parameter]), sql)
+            for variable in variables:
+                sql = re.sub(rf"\b{variable}\b", cur.connection.literal(local_value), sql)
+            cur.execute("EXPLAIN FORMAT=JSON " + sql)
+            plan = json.loads(next(iter(cur.fetchone().values())))
+            accesses = [{"table": access["table_name"], "access_type": access["access_type"],
+                         "key": access.get("key"), "rows": access.get("rows_examined_per_scan")}
+                        for access in table_accesses(plan)]
+            plans[name].append({"statement": " ".join(statement.split()), "accesses": accesses, "plan": plan})
+            if name not in full_scan_procedures:
+                for access in accesses:
+                    if access["access_type"] == "ALL" and access["table"] not in empty_tables:
+                        failures.append(f"{name}: full scan of {access['table']} ({access['rows']} rows) in "
+                                        f"{' '.join(statement.split())[:80]}")
+    return plans, failures
+
+
+def explain_command():
+    from main import host, db_name
+
+    parser = argparse.ArgumentParser(description="Check the stored procedures' query plans for full table scans.")
+    parser.add_argument("--user", required=True)
+    parser.add_argument("--seed", type=int, default=1, help="seed for picking the sample rows")
+    parser.add_argument("--output", help="file to write the plans to as JSON")
+    args = parser.parse_args()
+
+    cnx = pymysql.connect(host=host, user=args.user, password=getpass.getpass(),
+                          db=db_name, charset='utf8mb4', cursorclass=pymysql.cursors.DictCursor)
+    try:
+        with cnx.cursor() as cur:
+            plans, failures = explain_procedures(cur, db_name, sample_ids(cur, random.Random(args.seed)))
+    finally:
+        cnx.close()
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(plans, file, indent=2, default=str)
+    statement_count = sum(len(statements) for statements in plans.values())
+    print(f"Explained {statement_count} statements of {len(plans)} procedures.")
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    explain_command()
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+Tournament results export.
+
+Streams tournament → division → match → game results from an unbuffered
+server-side cursor through a generator pipeline into CSV or JSON files, so
+memory use does not grow with the number of games exported.
+
+Run from the command line with:
+    python3 exporter.py --user USER [--tournament ID] results.csv|results.json
+"""
+import argparse
+import csv
+import datetime
+import decimal
+import getpass
+import itertools
+import json
+import os
+
+import pymysql
+
+# Rows read from the server at a time
+export_batch_size = 1000
+
+# Columns of each level of the JSON export, the last level holds the games
+tournament_fields = ("tournament_id", "tournament", "date", "time", "address")
+division_fields = ("division_id", "division")
+match_fields = ("match_id", "play_to", "hard_cap", "best_of", "team1", "team2", "winner",
+                "team1_games_won", "team2_games_won")
+game_fields = ("game_id", "team1_score", "team2_score")
+export_fields = tournament_fields + division_fields + match_fields + game_fields
+
+
+def stream_results(cnx, to_id=None):
+    """
+    Yields every result row of a tournament, or of all tournaments, without holding the result set.
+    """
+    cur = cnx.cursor(pymysql.cursors.SSDictCursor)
+    try:
+        cur.callproc("export_tournament_results", (to_id,))
+        while True:
+            rows = cur.fetchmany(export_batch_size)
+            if not rows:
+                break
+            yield from rows
+    finally:
+        # Closing reads off whatever is left, freeing the connection for the next query
+        cur.close()
+
+
+def plain_value(value):
+    # Dates, times and decimals as the text MySQL shows them
+    if isinstance(value, datetime.timedelta):
+        minutes, seconds = divmod(int(value.total_seconds()), 60)
+        hours, minutes = divmod(minutes, 60)
+        return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+    if isinstance(value, (datetime.date, decimal.Decimal)):
+        return str(value)
+    return value
+
+
+def plain_rows(rows):
+    for row in rows:
+        yield {field: plain_value(row[field]) for field in export_fields}
+
+
+def write_csv(rows, file):
+    """
+    Writes one line per game, with its match, division and tournament repeated on each.
+    """
+    writer = csv.DictWriter(file, fieldnames=export_fields)
+    writer.writeheader()
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def write_json(rows, file):
+    """
+    Writes tournaments holding their divisions, matches and games, one object at a time.
+    """
+    count = 0
+    levels = ((tournament_fields, "divisions"), (division_fields, "matches"), (match_fields, "games"))
+
+    def write_level(rows, depth):
+        nonlocal count
+        fields, children = levels[depth]
+        file.write("[")
+        key = fields[0]
+        for index, (_, group) in enumerate(itertools.groupby(rows, key=lambda row: row[key])):
+            first = next(group)
+            header = json.dumps({field: first[field] for field in fields})
+            file.write(("," if index else "") + header[:-1] + f', "{children}": ')
+            group = itertools.chain((first,), group)
+            if depth + 1 < len(levels):
+                write_level(group, depth + 1)
+            else:
+                file.write("[")
+                written = 0
+                for row in group:
+                    count += 1
+                    # A match without games has a single row with no game
+                    if row["game_id"] is not None:
+                        file.write(("," if written else "") + json.dumps({field: row[field] for field in game_fields}))
+                        written += 1
+                file.write("]")
+            file.write("}")
+        file.write("]")
+
+    write_level(rows, 0)
+    file.write("\n")
+    return count
+
+
+def export_results(cnx, path, to_id=None):
+    """
+    Writes the results to path as JSON for a .json path and CSV otherwise, returns the number of rows read.
+    """
+    write = write_json if os.path.splitext(path)[1].lower() == '.json' else write_csv
+    rows = stream_results(cnx, to_id)
+    try:
+        with open(path, 'w', newline='', encoding='utf-8') as file:
+            return write(plain_rows(rows), file)
+    finally:
+        rows.close()
+
+
+def export_command():
+    from main import host, db_name
+
+    parser = argparse.ArgumentParser(description="Export tournament results to CSV or JSON.")
+    parser.add_argument("path", help="file to write, .json for JSON and CSV otherwise")
+    parser.add_argument("--user", required=True)
+    parser.add_argument("--tournament", type=int, help="id of the tournament to export, all when left out")
+    args = parser.parse_args()
+
+    cnx = pymysql.connect(host=host, user=args.user, password=getpass.getpass(),
+                          db=db_name, charset='utf8mb4')
+    try:
+        count = export_results(cnx, args.path, args.tournament)
+    finally:
+        cnx.close()
+    print(f"Exported {count} rows to {args.path}")
+
+
+if __name__ == "__main__":
+    export_command()
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""
+Bulk registration import.
+
+Streams school, player and team rows from CSV or JSON files into the
+database. Rows are checked with the same rules as the forms, foreign keys
+are resolved through in-memory lookup maps, and valid rows are inserted in
+chunks that are committed as they go. A bad row is reported and skipped
+without aborting the rest of the file.
+"""
+import csv
+import json
+import os
+
+import pymysql
+
+from validation import input_requirement
+
+# Rows inserted per executemany and committed together
+import_chunk_size = 500
+
+# Tables that foreign keys can refer to by name, with their name column
+lookup_columns = {
+    "school": "name",
+    "player": "name",
+    "division": "name",
+}
+
+# Per table, the foreign key columns that can be given by name instead, and the table they refer to
+reference_columns = {
+    "school": {},
+    "player": {"school_id_FK": ("school", "school")},
+    "team": {"division_id_FK": ("division", "division"),
+             "player1_id_FK": ("player1", "player"),
+             "player2_id_FK": ("player2", "player")},
+}
+
+
+def read_rows(path):
+    """
+    Yields (line number, row) pairs from a CSV file with a header, a JSON list or a JSON lines file.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, newline='', encoding='utf-8') as file:
+        if extension == '.csv':
+            reader = csv.DictReader(file)
+            for row in reader:
+                yield reader.line_num, row
+        elif extension == '.json':
+            for number, row in enumerate(json.load(file), start=1):
+                yield number, row
+        elif extension in ('.jsonl', '.ndjson'):
+            for number, line in enumerate(file, start=1):
+                if line.strip():
+                    yield number, json.loads(line)
+        else:
+            raise ValueError(f"{extension or path} files can not be imported, use .csv, .json or .jsonl.")
+
+
+class Lookup:
+    """
+    The ids of a table's rows, and the ids its rows can be found by name with.
+    """
+
+    def __init__(self, table_name):
+        self.table_name = table_name
+        self.ids = set()
+        self.names = {}
+        self.ambiguous = set()
+
+    def load(self, cur):
+        cur.execute(f"SELECT id, {lookup_columns[self.table_name]} AS lookup_name FROM {self.table_name}")
+        for row in cur.fetchall():
+            self.add(row["id"], row["lookup_name"])
+
+    def add(self, row_id, name):
+        self.ids.add(row_id)
+        if name in self.names and self.names[name] != row_id:
+            self.ambiguous.add(name)
+        self.names[name] = row_id
+
+    def resolve(self, value, by_name):
+        """
+        Returns the id for an id or a name, raises LookupError when there is not exactly one.
+        """
+        if not by_name:
+            if int(value) not in self.ids:
+                raise LookupError(f"no {self.table_name} has id {value}")
+            return int(value)
+        if value in self.ambiguous:
+            raise LookupError(f"several {self.table_name} rows are named {value}, give the id instead")
+        if value not in self.names:
+            raise LookupError(f"no {self.table_name} is named {value}")
+        return self.names[value]
+
+
+class ImportReport:
+    """
+    The outcome of an import: rows inserted and (line number, message) pairs for rows skipped.
+    """
+
+    def __init__(self, table_name):
+        self.table_name = table_name
+        self.inserted = 0
+        self.errors = []
+
+    def summary(self, max_errors=10):
+        lines = [f"Imported {self.inserted} {self.table_name} rows, skipped {len(self.errors)}."]
+        for number, message in self.errors[:max_errors]:
+            lines.append(f"Row {number}: {message}")
+        if len(self.errors) > max_errors:
+            lines.append(f"... and {len(self.errors) - max_errors} more.")
+        return "\n".join(lines)
+
+
+class Importer:
+    """
+    Imports rows into one table on a cursor, committing every chunk.
+
+    columns is the table's column metadata, and defaults fills in values a
+    row leaves out, such as the division a team import is for.
+    """
+
+    def __init__(self, cur, table_name, columns, defaults=None, chunk_size=import_chunk_size):
+        if table_name not in reference_columns:
+            raise ValueError(f"{table_name} rows can not be imported.")
+        self.cur = cur
+        self.table_name = table_name
+        self.columns = [column for column in columns if column["COLUMN_KEY"] != "PRI"]
+        self.defaults = defaults or {}
+        self.chunk_size = chunk_size
+        self.references = reference_columns[table_name]
+        self.lookups = {}
+        for _, referred_table in self.references.values():
+            if referred_table not in self.lookups:
+                self.lookups[referred_table] = Lookup(referred_table)
+                self.lookups[referred_table].load(cur)
+
+        names = [column["COLUMN_NAME"] for column in self.columns]
+        self.sql = f"INSERT INTO {table_name} ({', '.join(names)}) VALUES ({', '.join(['%s'] * len(names))})"
+        self.report = ImportReport(table_name)
+
+    def import_rows(self, rows):
+        """
+        Imports (line number, row) pairs and returns the ImportReport.
+        """
+        chunk = []
+        for number, row in rows:
+            try:
+                chunk.append((number, self.parse(row)))
+            except (LookupError, ValueError) as e:
+                self.report.errors.append((number, str(e)))
+                continue
+            if len(chunk) == self.chunk_size:
+                self.insert(chunk)
+                chunk = []
+        if chunk:
+            self.insert(chunk)
+        return self.report
+
+    def parse(self, row):
+        """
+        Returns a row's values in column order, raises ValueError or LookupError for an invalid row.
+        """
+        row = {key.strip(): "" if value is None else str(value).strip() for key, value in row.items() if key}
+        values = []
+        for column in self.columns:
+            field = column["COLUMN_NAME"]
+            value = row.get(field, "")
+            by_name = False
+            if value == "" and field in self.references:
+                value = row.get(self.references[field][0], "")
+                by_name = value != ""
+            if value == "" and field in self.defaults:
+                value = str(self.defaults[field])
+
+            if not by_name:
+                requirement = input_requirement(column, value)
+                if requirement != '':
+                    raise ValueError(f"{field} {requirement}")
+            if value == "":
+                values.append(None)
+            elif field in self.references:
+                values.append(self.lookups[self.references[field][1]].resolve(value, by_name))
+            else:
+                values.append(value)
+        return values
+
+    def insert(self, chunk):
+        cnx = self.cur.connection
+        cur = self.cur
+        cnx.begin()
+        try:
+            cur.executemany(self.sql, [values for _, values in chunk])
+            inserted = len(chunk)
+        except pymysql.MySQLError:
+            # Find the failing rows one at a time, a failed statement leaves the others in place
+            cnx.rollback()
+            cnx.begin()
+            inserted = 0
+            for number, values in chunk:
+                try:
+                    cur.execute(self.sql, values)
+                    inserted += 1
+                except pymysql.MySQLError as e:
+                    self.report.errors.append((number, f"{e.args[0]}: {e.args[-1]}"))
+        cnx.commit()
+        self.report.inserted += inserted
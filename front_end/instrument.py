@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+Query and page instrumentation.
+
+Times every cursor call and page build, keeping running totals per
+procedure, statement and page and the latest timings in a fixed-size ring
+buffer. Recording is a couple of clock reads and a dictionary update, so
+it stays on in production; the totals are shown in the app's performance
+panel or written to a JSON file.
+"""
+import collections
+import datetime
+import json
+import re
+import threading
+import time
+
+# Timings kept for percentiles and the JSON dump, older ones are dropped
+ring_size = 4096
+
+# Distinct statement texts whose names are remembered, f-string statements are named by their shape
+statement_cache_size = 1024
+
+
+def percentile(values, share):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(share * len(values)))]
+
+
+class Recorder:
+    """
+    Represents the timings of a session.
+
+    Timings are (kind, name, seconds, rows) with kind one of "procedure",
+    "statement", "frame" or "page", and are recorded from any thread.
+    """
+
+    def __init__(self, size=ring_size):
+        self.lock = threading.Lock()
+        self.events = collections.deque(maxlen=size)
+        # Calls, seconds, slowest call and rows by (kind, name)
+        self.totals = {}
+        self.statement_names = {}
+
+    def record(self, kind, name, seconds, rows=0):
+        key = (kind, name)
+        with self.lock:
+            self.events.append((time.time(), kind, name, seconds, rows))
+            total = self.totals.get(key)
+            if total is None:
+                self.totals[key] = [1, seconds, seconds, rows]
+            else:
+                total[0] += 1
+                total[1] += seconds
+                if seconds > total[2]:
+                    total[2] = seconds
+                total[3] += rows
+
+    def statement_name(self, sql):
+        """
+        Returns a statement's name, its text with numbers and quoted values replaced by ?.
+        """
+        name = self.statement_names.get(sql)
+        if name is None:
+            name = re.sub(r"'[^']*'|\"[^\"]*\"|\b\d+\b", "?", " ".join(sql.split()))
+            if len(self.statement_names) < statement_cache_size:
+                self.statement_names[sql] = name
+        return name
+
+    def cursor(self, cur):
+        return InstrumentedCursor(cur, self)
+
+    def reset(self):
+        with self.lock:
+            self.events.clear()
+            self.totals = {}
+
+    def stats(self):
+        """
+        Returns a row per procedure, statement and page, slowest in total first.
+        """
+        with self.lock:
+            totals = {key: list(total) for key, total in self.totals.items()}
+            events = list(self.events)
+
+        recent = collections.defaultdict(list)
+        for _, kind, name, seconds, _ in events:
+            recent[(kind, name)].append(seconds)
+
+        rows = []
+        for (kind, name), (calls, seconds, slowest, row_count) in totals.items():
+            durations = recent.get((kind, name))
+            rows.append({"kind": kind, "name": name, "calls": calls, "total_ms": round(seconds * 1000, 3),
+                         "mean_ms": round(seconds * 1000 / calls, 3), "max_ms": round(slowest * 1000, 3),
+                         "p95_ms": round(percentile(durations, 0.95) * 1000, 3) if durations else None,
+                         "rows": row_count})
+        rows.sort(key=lambda row: -row["total_ms"])
+        return rows
+
+    def dump(self, path):
+        """
+        Writes the totals and the timings in the ring buffer to a JSON file.
+        """
+        with self.lock:
+            events = list(self.events)
+        report = {"created": datetime.datetime.now().isoformat(timespec="seconds"), "stats": self.stats(),
+                  "events": [{"at": at, "kind": kind, "name": name, "ms": round(seconds * 1000, 3), "rows": rows}
+                             for at, kind, name, seconds, rows in events]}
+        with open(path, "w") as file:
+            json.dump(report, file, indent=2)
+        return len(events)
+
+
+class InstrumentedCursor:
+    """
+    A cursor whose execute, executemany and callproc calls are timed.
+
+    Everything else is passed through to the wrapped cursor.
+    """
+
+    def __init__(self, cur, recorder):
+        self.cur = cur
+        self.recorder = recorder
+
+    def __getattr__(self, name):
+        return getattr(self.cur, name)
+
+    def __iter__(self):
+        return iter(self.cur)
+
+    def execute(self, query, args=None):
+        start = time.perf_counter()
+        try:
+            return self.cur.execute(query, args)
+        finally:
+            self.recorder.record("statement", self.recorder.statement_name(query), time.perf_counter() - start,
+                                 max(self.cur.rowcount or 0, 0))
+
+    def executemany(self, query, args):
+        start = time.perf_counter()
+        try:
+            return self.cur.executemany(query, args)
+        finally:
+            self.recorder.record("statement", self.recorder.statement_name(query), time.perf_counter() - start,
+                                 max(self.cur.rowcount or 0, 0))
+
+    def callproc(self, procname, args=()):
+        start = time.perf_counter()
+        try:
+            return self.cur.callproc(procname, args)
+        finally:
+            # The row count of the procedure's first result set
+            self.recorder.record("procedure", procname, time.perf_counter() - start, max(self.cur.rowcount or 0, 0))
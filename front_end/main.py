@@ -1,24 +1,109 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+import bracket
+import cache
+import collections
+import concurrent.futures
+import contextlib
 import datetime
+import exporter
+import importer
+import instrument
 import math
+import model
+import offline
+import os
+import pool
 import pymysql
+import queue
+import ratings
+import schedule
+import search
+import standings
+from snapshot import DivisionSnapshot
+import threading
+import time
+import validation
 import tkinter as tk
 from tkinter import ttk
+from tkinter import filedialog
 from tkinter import font as tkfont
 from tkinter import messagebox
 
 host = 'localhost'
 db_name = 'tm'
 
+# Number of visited pages kept alive for back and forward navigation
+max_cached_frames = 8
+
+# Number of rows fetched at a time by paged grids
+grid_page_size = 200
+
+# Milliseconds between checks for finished background queries
+loader_poll_ms = 20
+
+# Background workers, which share the connection pool with the Tk thread
+loader_workers = 3
+
+# MySQL client errors for a connection the server has dropped, and for a server that can not be reached
+connection_lost_errors = (2006, 2013)
+unreachable_errors = (2003,) + connection_lost_errors
+
+# The local mirror used while the database is unreachable
+offline_store_path = os.path.join(os.path.expanduser("~"), ".tm_offline.db")
+
+# Milliseconds between attempts to sync offline changes, and seconds between refreshes of the mirror
+sync_interval_ms = 10000
+mirror_interval = 300
+
+# Columns maintained by the database's triggers, which forms never write
+derived_columns = {"team1_games_won", "team2_games_won"}
+
+# Foreign key entries with type-ahead from the search index, and the kind of row they refer to
+search_columns = {
+    "school_id_FK": "school",
+    "player1_id_FK": "player",
+    "player2_id_FK": "player",
+    "team1_id_FK": "team",
+    "team2_id_FK": "team",
+    "winner_id_FK": "team",
+}
+
+# Milliseconds between polls of the divisions' change counters
+version_poll_ms = 3000
+
+# Milliseconds between refreshes of the performance panel
+stats_refresh_ms = 1000
+
+# Number of type-ahead suggestions shown
+typeahead_limit = 8
+
+# Tables whose writes can change the match history, the ratings are then replayed again
+rated_tables = {"tournament", "division", "team", "match_data"}
+
+# Tables whose rows can change when a table is written, through triggers and cascades
+dependent_tables = {
+    "school": {"school", "player"},
+    "player": {"player", "team"},
+    "tournament": {"tournament", "division", "team", "match_data", "game_data", "bracket_match"},
+    "division": {"division", "team", "match_data", "game_data", "bracket_match"},
+    "team": {"team", "match_data", "game_data", "bracket_match"},
+    "match_data": {"match_data", "game_data", "bracket_match"},
+    "game_data": {"game_data", "match_data", "bracket_match"},
+    "bracket_match": {"bracket_match", "match_data", "game_data"},
+}
+
 
 class App(tk.Tk):
     """
     The Controller for the application.
 
-    Controls current page and holds database connection.
+    Controls current page and holds the database connection pool.
+    Keeps recently visited pages alive for back and forward navigation.
     """
 
+    id_names = ("to_id", "d_id", "te_id", "p_id", "s_id", "m_id")
+
     def __init__(self, *args, **kwargs):
         tk.Tk.__init__(self, *args, **kwargs)
         style = ttk.Style()
@@ -28,6 +113,14 @@ class App(tk.Tk):
         self.geometry('900x600')
         self.title_font = tkfont.Font(family='Helvetica', size=18, weight="bold", slant="italic")
 
+        menu_bar = tk.Menu(self)
+        file_menu = tk.Menu(menu_bar, tearoff=False)
+        file_menu.add_command(label="Export all results...", command=lambda: self.export_results())
+        file_menu.add_command(label="Sync now", command=lambda: self.sync(quiet=False))
+        file_menu.add_command(label="Performance...", command=lambda: PerformancePanel(self))
+        menu_bar.add_cascade(label="File", menu=file_menu)
+        self.config(menu=menu_bar)
+
         # The parent frame for all pages
         container = tk.Frame(self)
         container.pack(side="top", fill="both", expand=True)
@@ -39,9 +132,45 @@ class App(tk.Tk):
         frame = LoginPage(parent=container, controller=self)
         frame.grid(row=0, column=0, sticky="nsew")
         self.frame = frame
-        self.last_frame = None
 
-        self.cnx = None
+        # Cached pages, least recently shown first, and the navigation history
+        self.frames = collections.OrderedDict()
+        self.history = []
+        self.history_index = -1
+
+        # Timings of every query and page build
+        self.recorder = instrument.Recorder()
+        # Results of the view procedures, dropped as their tables are written
+        self.results = cache.ResultCache()
+
+        self.pool = None
+        # Reads and writes go to the local mirror while the database is unreachable
+        self.store = offline.LocalStore(offline_store_path)
+        self.offline = False
+        self.syncing = None
+        self.mirrored_at = None
+        self.schema = SchemaCache(self)
+        self.entities = model.IdentityMap()
+        self.snapshots = SnapshotCache(self.entities)
+        # Change counters of the divisions by division id as last polled, other clients' changes bump them
+        self.division_versions = None
+        self.polling_versions = False
+        self.loader = DataLoader(self, workers=loader_workers)
+
+        # Division standings by division id, kept current with game score deltas
+        self.standings = {}
+
+        # Player, team and school search, loaded in the background after login
+        self.search = None
+        self.search_generation = 0
+
+        # Player ratings, replayed from the match history on first use and again after writes reshape it
+        self.ratings = None
+        self.ratings_lock = threading.Lock()
+        self.unrated_matches = set()
+        self.ratings_stale = False
+        self.ratings_generation = 0
+        self.recomputing_ratings = False
 
         self.to_id = None
         self.d_id = None
@@ -50,15 +179,637 @@ class App(tk.Tk):
         self.s_id = None
         self.m_id = None
 
+    def frame_key(self, frame_type, ids=None):
+        if ids is None:
+            ids = self.ids()
+        return (frame_type,) + tuple(ids[name] for name in frame_type.state)
+
+    def ids(self):
+        return {name: getattr(self, name) for name in self.id_names}
+
+    @contextlib.contextmanager
+    def connection(self):
+        """
+        Yields the calling thread's pooled connection, or the local mirror's once the database is unreachable.
+        """
+        with contextlib.ExitStack() as stack:
+            cnx = None
+            if not self.offline and self.pool is not None:
+                try:
+                    cnx = stack.enter_context(self.pool.connection())
+                except pymysql.err.OperationalError as e:
+                    if e.args[0] not in unreachable_errors or not self.store.mirrored():
+                        raise
+                    self.offline = True
+            if cnx is None:
+                cnx = stack.enter_context(self.store.connection())
+            yield cnx
+
+    @contextlib.contextmanager
+    def cursor(self):
+        """
+        Yields a cursor on the calling thread's connection.
+        """
+        with self.connection() as cnx:
+            cur = cnx.cursor()
+            try:
+                yield self.recorder.cursor(self.results.cursor(cur))
+            finally:
+                cur.close()
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """
+        Yields a cursor whose statements are committed together, or rolled back on error.
+        """
+        with self.connection() as cnx:
+            cnx.begin()
+            cur = cnx.cursor()
+            try:
+                yield self.recorder.cursor(cur)
+                cnx.commit()
+            except Exception:
+                # A rollback on a dropped connection fails too, the write's own error is the one raised
+                with contextlib.suppress(Exception):
+                    cnx.rollback()
+                raise
+            finally:
+                cur.close()
+
+    def export_results(self, to_id=None):
+        """
+        Asks for a file and streams the results of a tournament, or of all tournaments, into it.
+        """
+        if self.pool is None and not self.offline:
+            messagebox.showerror("Error", "Log in before exporting results.")
+            return
+        path = filedialog.asksaveasfilename(title="Export results", defaultextension=".csv",
+                                            filetypes=[("CSV", "*.csv"), ("JSON", "*.json")])
+        if not path:
+            return
+        self.loader.submit(self, lambda cur: exporter.export_results(cur.connection, path, to_id),
+                           lambda count: messagebox.showinfo("Export", f"Exported {count} rows to {path}."))
+
+    def watch_connection(self):
+        """
+        Syncs offline changes while offline and refreshes the mirror now and then while online.
+        """
+        if self.offline or self.mirrored_at is None or time.monotonic() - self.mirrored_at > mirror_interval:
+            self.sync()
+        self.show_status()
+        self.after(sync_interval_ms, self.watch_connection)
+
+    def watch_divisions(self):
+        """
+        Polls the divisions' change counters and reloads the divisions whose counter moved.
+        """
+        if self.pool is not None and not self.offline and not self.polling_versions:
+            self.polling_versions = True
+            future = self.loader.submit(self, self.fetch_versions, self.apply_versions)
+            future.add_done_callback(lambda _: setattr(self, "polling_versions", False))
+        self.after(version_poll_ms, self.watch_divisions)
+
+    @staticmethod
+    def fetch_versions(cur):
+        # Polling is silent, a failed poll is retried on the next one
+        try:
+            cur.callproc("get_division_versions")
+            return {row["division_id_FK"]: row["version"] for row in cur.fetchall()}
+        except (pymysql.err.MySQLError, offline.OfflineError):
+            return None
+
+    def apply_versions(self, versions):
+        if versions is None:
+            return
+        previous, self.division_versions = self.division_versions, versions
+        if previous is None or self.offline:
+            return
+        changed = {d_id for d_id, version in versions.items() if previous.get(d_id) != version}
+        if changed:
+            self.divisions_changed(changed)
+
+    def divisions_changed(self, d_ids):
+        """
+        Reloads the teams, matches and games of divisions changed elsewhere, on every page showing them.
+        """
+        tables = {"team", "match_data", "game_data"}
+        self.results.invalidate(tables)
+        for d_id in d_ids:
+            self.snapshots.invalidate(d_id)
+            self.standings.pop(d_id, None)
+        for frame in self.frames.values():
+            if getattr(frame, "d_id", None) in d_ids:
+                if frame is self.frame:
+                    frame.load(tables)
+                else:
+                    frame.stale_tables |= tables
+
+    def sync(self, quiet=True):
+        """
+        Replays offline changes to the database and refreshes the mirror in the background.
+
+        A quiet sync only reports changes it could not apply, and no errors.
+        """
+        if self.pool is None or self.syncing is not None:
+            return
+        # The first sync of a session copies the whole database, later ones the divisions that changed
+        self.syncing = self.loader.executor.submit(self.replay_offline, self.mirrored_at is None)
+        self.after(loader_poll_ms, self.finish_sync, quiet)
+
+    def replay_offline(self, full):
+        report = offline.ReplayReport()
+        with self.pool.connection() as cnx:
+            # New queries go to the database, writes still running on the mirror are replayed in a later batch
+            self.offline = False
+            self.store.replay(cnx.cursor(), report=report)
+            # Rows are streamed into the mirror rather than read into memory
+            while not self.store.mirror(cnx.cursor(pymysql.cursors.SSDictCursor), db_name, full):
+                self.store.replay(cnx.cursor(), report=report)
+        return report
+
+    def finish_sync(self, quiet):
+        if not self.syncing.done():
+            self.after(loader_poll_ms, self.finish_sync, quiet)
+            return
+        future, self.syncing = self.syncing, None
+
+        error = future.exception()
+        if error is not None:
+            if isinstance(error, pymysql.err.OperationalError) and error.args[0] in unreachable_errors:
+                self.offline = self.store.mirrored()
+            if not quiet:
+                messagebox.showerror("Error", f"{error}")
+        else:
+            self.mirrored_at = time.monotonic()
+            report = future.result()
+            if report.applied or report.conflicts:
+                self.reload()
+            if report.conflicts:
+                messagebox.showwarning("Sync", report.summary())
+            elif not quiet:
+                messagebox.showinfo("Sync", report.summary())
+        self.show_status()
+
+    def show_status(self):
+        if self.offline:
+            self.title(f"Tournament Manager (offline, {self.store.pending()} changes to sync)")
+        else:
+            self.title('Tournament Manager')
+
+    def reload(self):
+        """
+        Reloads every page and cache, e.g. after offline changes reached the database.
+        """
+        self.results.clear()
+        self.snapshots.invalidate()
+        self.standings.clear()
+        self.load_search()
+        self.recompute_ratings()
+        tables = set(dependent_tables)
+        for frame in self.frames.values():
+            if frame is self.frame:
+                frame.load()
+            else:
+                frame.stale_tables |= tables
+
     def next_frame(self, frame_type):
-        self.last_frame = self.frame.__class__
-        frame = frame_type(parent=self.container, controller=self)
-        frame.grid(row=0, column=0, sticky="nsew")
-        self.frame.destroy()
-        self.frame = frame
+        del self.history[self.history_index + 1:]
+        self.history.append((frame_type, self.ids()))
+        self.history_index += 1
+        self.show_frame(frame_type)
+
+    def go_back(self):
+        if self.history_index > 0:
+            self.history_index -= 1
+            self.show_history()
+
+    def go_forward(self):
+        if self.history_index < len(self.history) - 1:
+            self.history_index += 1
+            self.show_history()
+
+    def show_history(self):
+        frame_type, ids = self.history[self.history_index]
+        for name, value in ids.items():
+            setattr(self, name, value)
+        self.show_frame(frame_type)
+
+    def show_frame(self, frame_type):
+        start = time.perf_counter()
+        key = self.frame_key(frame_type)
+        frame = self.frames.pop(key, None)
+        if frame is None:
+            frame = frame_type(parent=self.container, controller=self)
+        elif frame.stale_tables:
+            frame.load(frame.stale_tables)
+        self.frames[key] = frame
+
+        if frame is not self.frame:
+            frame.grid(row=0, column=0, sticky="nsew")
+            if isinstance(self.frame, Page):
+                self.frame.cancel()
+                self.frame.grid_remove()
+            else:
+                self.frame.destroy()
+            self.frame = frame
+
+        while len(self.frames) > max_cached_frames:
+            _, evicted = self.frames.popitem(last=False)
+            evicted.destroy()
+        self.recorder.record("frame", frame_type.__name__, time.perf_counter() - start)
+
+    def record_games(self, scores):
+        """
+        Applies committed (team1_score, team2_score, game id) changes to the loaded standings.
+        """
+        self.snapshots.apply_games(scores)
+        for division_standings in self.standings.values():
+            division_standings.apply_games(scores)
+
+    def invalidate(self, table_name):
+        self.results.invalidate(dependent_tables[table_name])
+        # Game scores arrive as deltas through record_games, any other write can reshape a division
+        if table_name != "game_data":
+            self.snapshots.invalidate()
+            self.standings.clear()
+        if table_name in rated_tables:
+            self.recompute_ratings()
+
+    def load_search(self):
+        self.search = None
+        self.search_generation += 1
+        generation = self.search_generation
+
+        def loaded(index):
+            # A newer load was started by a write made while this one ran
+            if generation == self.search_generation:
+                self.search = index
+
+        self.loader.submit(self, search.SearchIndex.load, loaded)
+
+    def rating_engine(self, cur):
+        """
+        Returns the ratings with the matches decided here since rated, replaying the match history on first use.
+        """
+        with self.ratings_lock:
+            if self.ratings is None:
+                self.ratings = ratings.RatingEngine.load(cur)
+            while self.unrated_matches:
+                cur.callproc("get_match_rating", (self.unrated_matches.pop(),))
+                for row in cur.fetchall():
+                    if not self.ratings.record(row):
+                        self.ratings_stale = True
+            return self.ratings
+
+    def rate_match(self, m_id):
+        """
+        Rates a match once its games decide it, after its games were written.
+        """
+        self.unrated_matches.add(m_id)
+        self.loader.submit(self, self.rating_engine, lambda _: self.ratings_changed())
+
+    def ratings_changed(self):
+        # A rated match whose result changed can only be rated again by replaying the history
+        if self.ratings_stale:
+            self.recompute_ratings()
+        else:
+            self.show_ratings()
+
+    def recompute_ratings(self):
+        """
+        Replays the match history again in the background, showing the current ratings meanwhile.
+        """
+        self.ratings_stale = False
+        if self.ratings is None:
+            return
+        self.ratings_generation += 1
+        if self.recomputing_ratings:
+            return
+        self.recomputing_ratings = True
+        generation = self.ratings_generation
+
+        def recomputed(engine):
+            with self.ratings_lock:
+                # Matches rated since the replay started may be missing from it, rating them again is harmless
+                self.unrated_matches |= self.ratings.recorded
+                self.ratings = engine
+            if generation != self.ratings_generation:
+                self.recompute_ratings()
+            self.show_ratings()
+
+        future = self.loader.submit(self, ratings.RatingEngine.load, recomputed)
+        future.add_done_callback(lambda _: setattr(self, "recomputing_ratings", False))
+
+    def show_ratings(self):
+        for frame in self.frames.values():
+            if frame is self.frame:
+                frame.load({"ratings"})
+            else:
+                frame.stale_tables.add("ratings")
+
+    def update_search(self, table_name, row_id=None, values=None):
+        """
+        Keeps the search index current after a write.
+
+        values holds a created or updated row's columns and is None for a delete, row_id is None for many rows.
+        """
+        if table_name in search.cascading_tables:
+            # Deleting a tournament or division deletes its teams
+            if values is None:
+                self.load_search()
+        elif table_name in search.indexed_tables:
+            if self.search is None or row_id is None:
+                self.load_search()
+            elif values is None:
+                self.search.remove(table_name, row_id)
+            else:
+                self.search.record(table_name, row_id, values)
+
+    def refresh(self, table_name):
+        self.invalidate(table_name)
+        tables = dependent_tables[table_name]
+        for frame in self.frames.values():
+            if frame is self.frame:
+                frame.load(tables)
+            else:
+                frame.stale_tables |= tables
+
+    def close_frame(self, table_name):
+        """
+        Leaves the current page for good, e.g. after its entity was deleted.
+        """
+        frame = self.frame
+        key = self.frame_key(frame.__class__)
+
+        history = []
+        history_index = self.history_index
+        for count, (frame_type, ids) in enumerate(self.history):
+            if self.frame_key(frame_type, ids) == key:
+                if count <= self.history_index:
+                    history_index -= 1
+            else:
+                history.append((frame_type, ids))
+        self.history = history
+        self.history_index = max(history_index, 0)
+
+        del self.frames[key]
+        frame.cancel()
+        self.invalidate(table_name)
+        for cached in self.frames.values():
+            cached.stale_tables |= dependent_tables[table_name]
+
+        if self.history:
+            self.show_history()
+        else:
+            self.next_frame(Homepage)
+        frame.destroy()
+
+
+class SchemaCache:
+    """
+    Represents the column metadata of every table in the database.
 
-    def refresh(self):
-        self.next_frame(self.frame.__class__)
+    Loads metadata once per session and shares it between all forms.
+    Call invalidate after a schema migration to reload it on next use.
+    """
+
+    def __init__(self, controller):
+        self.controller = controller
+        self.tables = None
+
+    def load(self):
+        with self.controller.cursor() as cur:
+            cur.callproc("get_columns_from_schema", (db_name,))
+            rows = cur.fetchall()
+
+        tables = {}
+        for row in rows:
+            tables.setdefault(row["TABLE_NAME"], []).append(row)
+        self.tables = tables
+
+    def invalidate(self):
+        self.tables = None
+
+    def columns(self, table_name):
+        if self.tables is None:
+            self.load()
+        return self.tables[table_name]
+
+
+class SnapshotCache:
+    """
+    Represents the loaded division snapshots.
+
+    Reads a division with one call and shares it between the division's pages.
+    Concurrent requests for the same division wait for a single load.
+    """
+
+    def __init__(self, entities):
+        self.entities = entities
+        self.lock = threading.Lock()
+        self.snapshots = {}
+        self.loading = {}
+        # Bumped on every change, loads that started before it are not kept
+        self.generation = 0
+
+    def get(self, cur, d_id):
+        """
+        Returns the division's snapshot, loading it on cur if it is not loaded.
+        """
+        with self.lock:
+            if d_id in self.snapshots:
+                return self.snapshots[d_id]
+            future = self.loading.get(d_id)
+            if future is None:
+                future = concurrent.futures.Future()
+                self.loading[d_id] = future
+                generation = self.generation
+            else:
+                generation = None
+        if generation is None:
+            return future.result()
+
+        try:
+            division_snapshot = DivisionSnapshot.load(cur, d_id, self.entities)
+        except BaseException as e:
+            with self.lock:
+                if self.loading.get(d_id) is future:
+                    del self.loading[d_id]
+            future.set_exception(e)
+            raise
+
+        with self.lock:
+            if self.loading.get(d_id) is future:
+                del self.loading[d_id]
+            if generation == self.generation:
+                self.snapshots[d_id] = division_snapshot
+        future.set_result(division_snapshot)
+        return division_snapshot
+
+    def apply_games(self, scores):
+        with self.lock:
+            for division_snapshot in self.snapshots.values():
+                division_snapshot.apply_games(scores)
+            self.loading = {}
+            self.generation += 1
+
+    def invalidate(self, d_id=None):
+        """
+        Drops a division's snapshot, or every snapshot.
+        """
+        with self.lock:
+            if d_id is None:
+                self.snapshots = {}
+            else:
+                self.snapshots.pop(d_id, None)
+            self.loading = {}
+            self.generation += 1
+
+
+class DataLoader:
+    """
+    Represents the background query runner for pages.
+
+    Runs queries on a worker thread and hands their results back to the Tk
+    thread through after(). Results for widgets that were cancelled or
+    destroyed in the meantime are dropped.
+    """
+
+    def __init__(self, controller, workers=1):
+        self.controller = controller
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+        self.finished = queue.Queue()
+        self.jobs = {}
+        self.polling = False
+
+    def submit(self, owner, query, callback, retry=True):
+        """
+        Runs query(cur) in the background and then callback(result) on the Tk thread.
+
+        Queries that write must pass retry=False, only reads are repeated after a lost connection.
+        """
+        future = self.executor.submit(self.run, query, retry)
+        self.jobs[future] = (owner, callback)
+        future.add_done_callback(self.finished.put)
+        if not self.polling:
+            self.polling = True
+            self.controller.after(loader_poll_ms, self.poll)
+        return future
+
+    def run(self, query, retry):
+        try:
+            with self.controller.cursor() as cur:
+                return query(cur)
+        except pymysql.err.OperationalError as e:
+            # Reads are safe to repeat once on a fresh connection
+            if not retry or e.args[0] not in connection_lost_errors:
+                raise
+            with self.controller.cursor() as cur:
+                return query(cur)
+
+    def discard(self, future):
+        future.cancel()
+        self.jobs.pop(future, None)
+
+    def cancel(self, widget):
+        """
+        Discards the jobs of a widget and of all widgets inside it.
+        """
+        path = str(widget)
+        for future, (owner, _) in list(self.jobs.items()):
+            owner_path = str(owner)
+            if owner_path == path or owner_path.startswith(path + "."):
+                self.discard(future)
+
+    def poll(self):
+        while True:
+            try:
+                future = self.finished.get_nowait()
+            except queue.Empty:
+                break
+
+            job = self.jobs.pop(future, None)
+            if job is None or future.cancelled():
+                continue
+            owner, callback = job
+            if not owner.winfo_exists():
+                continue
+
+            error = future.exception()
+            if error is not None:
+                messagebox.showerror("Error", f"{error}")
+            else:
+                callback(future.result())
+
+        if self.jobs:
+            self.controller.after(loader_poll_ms, self.poll)
+        else:
+            self.polling = False
+
+
+class Page(ttk.Frame):
+    """
+    Represents a page of the application.
+
+    A page is made of sections, each reading some tables. A section's query
+    runs in the background and its results are shown once they arrive.
+    Loading a page re-queries only the sections that read the given tables
+    and updates their widgets in place.
+    """
+
+    # Controller ids that identify the page's content
+    state = ()
+
+    def __init__(self, parent, controller):
+        ttk.Frame.__init__(self, parent)
+        self.controller = controller
+        self.sections = []
+        self.pending = {}
+        self.stale_tables = set()
+        self.placeholder = ttk.Label(self, text="Loading...")
+        # When the sections now loading started, the page's load time is recorded once all are shown
+        self.load_started = None
+
+    def add_section(self, tables, query, show):
+        """
+        Adds a section reading tables, whose query(cur) result is passed to show.
+        """
+        self.sections.append((set(tables), query, show))
+        self.load_section(len(self.sections) - 1)
+
+    def load(self, tables=None):
+        for index, (section_tables, _, _) in enumerate(self.sections):
+            if tables is None or section_tables & tables:
+                self.load_section(index)
+        self.stale_tables = set()
+
+    def load_section(self, index):
+        _, query, show = self.sections[index]
+        if not self.pending:
+            self.load_started = time.perf_counter()
+        if index in self.pending:
+            self.controller.loader.discard(self.pending[index])
+        self.pending[index] = \
+            self.controller.loader.submit(self, query, lambda result: self.show_section(index, show, result))
+        self.placeholder.place(relx=0.5, rely=0.5, anchor="center")
+        self.placeholder.lift()
+
+    def show_section(self, index, show, result):
+        del self.pending[index]
+        show(result)
+        if not self.pending:
+            self.placeholder.place_forget()
+            self.controller.recorder.record("page", self.__class__.__name__, time.perf_counter() - self.load_started)
+
+    def cancel(self):
+        """
+        Drops the page's pending queries, its sections reload when it is shown again.
+        """
+        for index in self.pending:
+            self.stale_tables |= self.sections[index][0]
+        self.pending = {}
+        self.controller.loader.cancel(self)
+        self.placeholder.place_forget()
 
 
 class LoginPage(ttk.Frame):
@@ -95,18 +846,31 @@ class LoginPage(ttk.Frame):
         form.place(relx=0.5, rely=0.4, anchor="center")
 
     def attempt_login(self):
+        user = self.username.get()
+        password = self.password.get()
+
+        # Autocommit keeps pooled connections from reading stale snapshots,
+        # writes that span statements open their own transaction
+        def connect():
+            return pymysql.connect(host=host, user=user,
+                                   password=password,
+                                   db=db_name, charset='utf8mb4',
+                                   cursorclass=pymysql.cursors.DictCursor,
+                                   autocommit=True)
+
         try:
-            cnx = pymysql.connect(host=host, user=self.username.get(),
-                                  password=self.password.get(),
-                                  db=db_name, charset='utf8mb4',
-                                  cursorclass=pymysql.cursors.DictCursor)
-            self.controller.cnx = cnx
+            self.controller.pool = pool.ConnectionPool(connect)
+            self.controller.schema.load()
+            self.controller.load_search()
+            self.controller.loader.submit(self.controller, self.controller.rating_engine, lambda _: None)
+            self.controller.watch_connection()
+            self.controller.watch_divisions()
             self.controller.next_frame(Homepage)
         except pymysql.err.OperationalError:
             messagebox.showerror("Error", "Incorrect login info, please try again.")
 
 
-class Homepage(ttk.Frame):
+class Homepage(Page):
     """
     Represents the application homepage.
 
@@ -114,8 +878,7 @@ class Homepage(ttk.Frame):
     """
 
     def __init__(self, parent, controller):
-        ttk.Frame.__init__(self, parent)
-        self.controller = controller
+        Page.__init__(self, parent, controller)
 
         label = ttk.Label(self, text="Homepage", font=controller.title_font)
         label.pack(side="top", fill="x", padx=10, pady=10)
@@ -140,7 +903,7 @@ class Header(ttk.Frame):
     """
     Represents a page header.
 
-    Titles the page and offers back and homepage buttons.
+    Titles the page and offers back, forward and homepage buttons.
     """
 
     def __init__(self, parent, controller, title):
@@ -151,25 +914,177 @@ class Header(ttk.Frame):
         button = ttk.Button(self, text="Go to the homepage",
                             command=lambda: controller.next_frame(Homepage))
         button.pack(side="right")
-        button = ttk.Button(self, text="Go back",
-                            command=lambda: controller.next_frame(controller.last_frame))
+        button = ttk.Button(self, text="Go forward",
+                            command=lambda: controller.go_forward())
         button.pack(side="right", padx=5)
+        button = ttk.Button(self, text="Go back",
+                            command=lambda: controller.go_back())
+        button.pack(side="right")
 
 
-def valid_date(date):
-    try:
-        datetime.datetime.strptime(date, '%Y-%m-%d')
-        return True
-    except ValueError:
-        return False
+class ButtonGrid(ttk.Frame):
+    """
+    Represents a grid of selection buttons.
 
+    Reuses its existing buttons when it is filled with new items.
+    """
 
-def valid_time(time):
-    try:
-        datetime.datetime.strptime(time, '%H:%M:%S')
-        return True
-    except ValueError:
-        return False
+    def __init__(self, parent, columns=3):
+        ttk.Frame.__init__(self, parent)
+        self.columns = columns
+        self.buttons = []
+        self.rows = 0
+        for x in range(columns):
+            self.grid_columnconfigure(x, weight=1)
+
+    def set_items(self, items):
+        """
+        Shows the given (text, command) pairs, one button each.
+        """
+        count = 0
+        for text, command in items:
+            if count < len(self.buttons):
+                self.buttons[count].configure(text=text, command=command)
+            else:
+                button = ttk.Button(self, text=text, command=command)
+                button.grid(row=math.trunc(count / self.columns), column=count % self.columns, sticky="nsew")
+                self.buttons.append(button)
+            count += 1
+
+        for button in self.buttons[count:]:
+            button.destroy()
+        del self.buttons[count:]
+
+        rows = math.ceil(count / self.columns)
+        for y in range(max(rows, self.rows)):
+            self.grid_rowconfigure(y, weight=1 if y < rows else 0)
+        self.rows = rows
+
+
+class VirtualGrid(ttk.Frame):
+    """
+    Represents a scrollable grid of selection buttons over a paged row source.
+
+    Only the buttons for the visible grid rows exist and are reused while scrolling.
+    Rows are fetched in the background a page at a time with
+    fetch_page(cur, after_id, limit) as the user scrolls towards the end of
+    the loaded rows.
+    """
+
+    def __init__(self, parent, controller, fetch_page, describe, columns=3, row_height=60):
+        ttk.Frame.__init__(self, parent)
+        self.controller = controller
+        self.fetch_page = fetch_page
+        self.describe = describe
+        self.columns = columns
+        self.row_height = row_height
+
+        self.rows = []
+        self.exhausted = True
+        self.fetching = None
+        self.top = 0
+        self.visible_rows = 1
+
+        self.button_frame = ttk.Frame(self)
+        self.button_frame.pack(side="left", fill="both", expand=True)
+        for x in range(columns):
+            self.button_frame.grid_columnconfigure(x, weight=1)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.scrollbar.pack(side="right", fill="y")
+        self.buttons = []
+
+        self.button_frame.bind("<Configure>", self.resize)
+        self.bind_wheel(self.button_frame)
+
+    def bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", lambda event: self.scroll(-1 if event.delta > 0 else 1))
+        widget.bind("<Button-4>", lambda event: self.scroll(-1))
+        widget.bind("<Button-5>", lambda event: self.scroll(1))
+
+    def fetch_first(self, cur):
+        return self.fetch_page(cur, 0, grid_page_size)
+
+    def reset(self, rows):
+        """
+        Shows a freshly fetched first page of rows.
+        """
+        self.rows = []
+        self.fetching = None
+        self.top = 0
+        self.extend(0, rows)
+
+    def last_id(self):
+        return self.rows[-1].id if self.rows else 0
+
+    def fetch_more(self):
+        if self.exhausted or (self.fetching is not None and not self.fetching.done()):
+            return
+        after_id = self.last_id()
+        self.fetching = self.controller.loader.submit(
+            self, lambda cur: self.fetch_page(cur, after_id, grid_page_size),
+            lambda rows: self.extend(after_id, rows))
+
+    def extend(self, after_id, rows):
+        # A page can arrive twice if it was requested again while being handed over
+        if after_id != self.last_id():
+            return
+        self.rows.extend(rows)
+        self.exhausted = len(rows) < grid_page_size
+        self.render()
+
+    def total_rows(self):
+        return math.ceil(len(self.rows) / self.columns)
+
+    def resize(self, event):
+        visible_rows = max(1, event.height // self.row_height)
+        if visible_rows == self.visible_rows and self.buttons:
+            return
+        self.visible_rows = visible_rows
+
+        while len(self.buttons) < visible_rows * self.columns:
+            button = ttk.Button(self.button_frame)
+            self.bind_wheel(button)
+            self.buttons.append(button)
+        for button in self.buttons[visible_rows * self.columns:]:
+            button.destroy()
+        del self.buttons[visible_rows * self.columns:]
+
+        for y in range(visible_rows):
+            self.button_frame.grid_rowconfigure(y, weight=1)
+        self.render()
+
+    def scroll(self, rows):
+        self.top += rows
+        self.render()
+
+    def yview(self, *args):
+        if args[0] == "moveto":
+            self.top = round(float(args[1]) * self.total_rows())
+        elif args[0] == "scroll":
+            step = int(args[1])
+            if args[2] == "pages":
+                step *= self.visible_rows
+            self.top += step
+        self.render()
+
+    def render(self):
+        # Start fetching the next page once the rows below the visible ones run low
+        if self.top + 2 * self.visible_rows >= self.total_rows():
+            self.fetch_more()
+        self.top = max(0, min(self.top, self.total_rows() - self.visible_rows))
+
+        start = self.top * self.columns
+        for count, button in enumerate(self.buttons):
+            index = start + count
+            if index < len(self.rows):
+                text, command = self.describe(self.rows[index])
+                button.configure(text=text, command=command)
+                button.grid(row=math.trunc(count / self.columns), column=count % self.columns, sticky="nsew")
+            else:
+                button.grid_remove()
+
+        total = max(self.total_rows(), 1)
+        self.scrollbar.set(self.top / total, min(self.top + self.visible_rows, total) / total)
 
 
 class Form(ttk.Frame):
@@ -179,18 +1094,19 @@ class Form(ttk.Frame):
     Offers user input to all columns associated with a table.
     """
 
+    # Parameterized statements by (kind, table, columns), built once and shared by all forms
+    statements = {}
+
     def __init__(self, parent, controller, table_name):
         ttk.Frame.__init__(self, parent)
+        self.table_name = table_name
 
-        cur = controller.cnx.cursor()
-        cur.callproc("get_columns_from_table", (table_name, db_name,))
-        self.column_data = cur.fetchall()
-        cur.close()
+        self.column_data = controller.schema.columns(table_name)
 
         entries = {}
         for row in self.column_data:
             section = ttk.Frame(self)
-            if row["COLUMN_KEY"] != "PRI":
+            if row["COLUMN_KEY"] != "PRI" and row["COLUMN_NAME"] not in derived_columns:
                 field = row["COLUMN_NAME"]
                 data_type = row["DATA_TYPE"]
                 is_nullable = row["IS_NULLABLE"] == 'YES'
@@ -204,6 +1120,8 @@ class Form(ttk.Frame):
                 label.pack(side=tk.LEFT)
                 entry.pack(side=tk.RIGHT, expand=tk.YES, fill=tk.X)
                 entries[field] = entry
+                if field in search_columns:
+                    TypeAhead(entry, controller, search_columns[field])
         self.entries = entries
 
     def valid_entries(self):
@@ -212,26 +1130,8 @@ class Form(ttk.Frame):
             field = row["COLUMN_NAME"]
             if field in self.entries:
 
-                data_type = row["DATA_TYPE"]
-                is_nullable = row["IS_NULLABLE"] == 'YES'
                 value = self.entries[field].get()
-
-                input_requirement = ''
-                if value == '':
-                    if not is_nullable:
-                        input_requirement = "is not nullable"
-                elif data_type == 'int':
-                    is_int = value.isdigit()
-                    if not is_int:
-                        input_requirement = "requires integer input"
-                elif data_type == 'date':
-                    is_date = valid_date(value)
-                    if not is_date:
-                        input_requirement = "requires date input (YYYY-MM-DD)"
-                elif data_type == 'time':
-                    is_time = valid_time(value)
-                    if not is_time:
-                        input_requirement = "requires time input (HH:MM:SS)"
+                input_requirement = validation.input_requirement(row, value)
 
                 if input_requirement != '':
                     messagebox.showerror("Error", f"{field} {input_requirement}, please edit and try again.")
@@ -239,6 +1139,122 @@ class Form(ttk.Frame):
 
         return True
 
+    def clear(self):
+        for entry in self.entries.values():
+            if entry.instate(["!disabled"]):
+                entry.delete(0, tk.END)
+
+    def values(self, fields):
+        # An empty entry is NULL
+        return [self.entries[field].get() or None for field in fields]
+
+    def insert_statement(self, fields):
+        key = ("insert", self.table_name, fields)
+        if key not in self.statements:
+            self.statements[key] = \
+                f"INSERT INTO {self.table_name} ({', '.join(fields)}) VALUES ({', '.join(['%s'] * len(fields))})"
+        return self.statements[key]
+
+    def update_statement(self, fields):
+        key = ("update", self.table_name, fields)
+        if key not in self.statements:
+            assignments = ", ".join(f"{field} = %s" for field in fields)
+            self.statements[key] = f"UPDATE {self.table_name} SET {assignments} WHERE id = %s"
+        return self.statements[key]
+
+
+class TypeAhead:
+    """
+    Represents type-ahead suggestions for a foreign key entry.
+
+    Typing a name, school or phone number lists matching rows from the search index, picking one enters its id
+    or, given on_pick, passes its id to on_pick.
+    """
+
+    def __init__(self, entry, controller, kind, on_pick=None):
+        self.entry = entry
+        self.controller = controller
+        self.kind = kind
+        self.on_pick = on_pick
+        self.matches = []
+        self.popup = None
+        self.listbox = None
+
+        entry.bind("<KeyRelease>", self.suggest, add="+")
+        entry.bind("<Down>", lambda event: self.focus_list(), add="+")
+        entry.bind("<Escape>", lambda event: self.hide(), add="+")
+        entry.bind("<FocusOut>", lambda event: entry.after(100, self.hide_unfocused), add="+")
+
+    def suggest(self, event):
+        if event.keysym in ("Down", "Up", "Escape", "Return", "Tab"):
+            return
+        text = self.entry.get().strip()
+        index = self.controller.search
+        if index is None or text == '' or text.isdigit():
+            self.hide()
+            return
+
+        self.matches = index.search(text, kind=self.kind, limit=typeahead_limit)
+        if not self.matches:
+            self.hide()
+            return
+        self.show([index.label(match) for match in self.matches])
+
+    def show(self, labels):
+        if self.popup is None:
+            self.popup = tk.Toplevel(self.entry)
+            self.popup.wm_overrideredirect(True)
+            self.listbox = tk.Listbox(self.popup, activestyle="dotbox", exportselection=False)
+            self.listbox.pack(fill="both", expand=True)
+            self.listbox.bind("<Return>", lambda event: self.pick())
+            self.listbox.bind("<Double-Button-1>", lambda event: self.pick())
+            self.listbox.bind("<Escape>", lambda event: self.cancel())
+            self.listbox.bind("<FocusOut>", lambda event: self.entry.after(100, self.hide_unfocused))
+
+        self.listbox.delete(0, tk.END)
+        for label in labels:
+            self.listbox.insert(tk.END, label)
+        self.listbox.configure(height=len(labels))
+        self.listbox.update_idletasks()
+        x = self.entry.winfo_rootx()
+        y = self.entry.winfo_rooty() + self.entry.winfo_height()
+        self.popup.geometry(f"{self.entry.winfo_width()}x{self.listbox.winfo_reqheight()}+{x}+{y}")
+        self.popup.deiconify()
+        self.popup.lift()
+
+    def focus_list(self):
+        if self.popup is not None and self.popup.winfo_viewable():
+            self.listbox.focus_set()
+            self.listbox.selection_clear(0, tk.END)
+            self.listbox.selection_set(0)
+            self.listbox.activate(0)
+
+    def pick(self):
+        selection = self.listbox.curselection()
+        if not selection:
+            self.cancel()
+        elif self.on_pick is not None:
+            self.hide()
+            self.entry.delete(0, tk.END)
+            self.on_pick(self.matches[selection[0]].id)
+        else:
+            self.entry.delete(0, tk.END)
+            self.entry.insert(0, self.matches[selection[0]].id)
+            self.cancel()
+
+    def cancel(self):
+        self.hide()
+        self.entry.focus_set()
+
+    def hide_unfocused(self):
+        focus = self.entry.focus_get()
+        if focus is not self.entry and focus is not self.listbox:
+            self.hide()
+
+    def hide(self):
+        if self.popup is not None:
+            self.popup.withdraw()
+
 
 class CreateForm(ttk.Frame):
     """
@@ -262,23 +1278,59 @@ class CreateForm(ttk.Frame):
     def create(self):
 
         if self.form.valid_entries():
-            columns = []
-            values = []
-            for field, entry in self.form.entries.items():
-                columns.append(field)
-                values.append(f"'{entry.get()}'")
-
-            sql = f"INSERT INTO {self.table_name} ({', '.join(columns)}) VALUES ({', '.join(values)})"
+            fields = tuple(self.form.entries)
+            sql = self.form.insert_statement(fields)
 
             try:
-                cur = self.controller.cnx.cursor()
-                cur.execute(sql)
-                self.controller.cnx.commit()
-                self.controller.refresh()
+                with self.controller.cursor() as cur:
+                    cur.execute(sql, self.form.values(fields))
+                    cur.connection.commit()
+                    row_id = cur.lastrowid
+                self.controller.update_search(self.table_name, row_id,
+                                              {field: entry.get() for field, entry in self.form.entries.items()})
+                self.form.clear()
+                self.controller.refresh(self.table_name)
             except Exception as e:
                 messagebox.showerror("Error", f"{e.args[0]}: {e.args[1]}")
 
 
+class ImportButton(ttk.Button):
+    """
+    Represents a bulk import button.
+
+    Imports the rows of a chosen CSV or JSON file in the background and reports the rows it skipped.
+    """
+
+    def __init__(self, parent, controller, table_name, defaults=None):
+        ttk.Button.__init__(self, parent, text=f"Import {table_name} rows from file",
+                            command=lambda: self.choose_file())
+        self.controller = controller
+        self.table_name = table_name
+        self.defaults = defaults
+
+    def choose_file(self):
+        path = filedialog.askopenfilename(title=f"Import {self.table_name} rows",
+                                          filetypes=[("CSV or JSON", "*.csv *.json *.jsonl"), ("All files", "*")])
+        if not path:
+            return
+        columns = self.controller.schema.columns(self.table_name)
+
+        def import_file(cur):
+            rows_importer = importer.Importer(cur, self.table_name, columns, self.defaults)
+            return rows_importer.import_rows(importer.read_rows(path))
+
+        # The import outlives its page, so the controller owns it
+        self.controller.loader.submit(self.controller, import_file, self.finish, retry=False)
+
+    def finish(self, report):
+        self.controller.update_search(self.table_name)
+        self.controller.refresh(self.table_name)
+        if report.errors:
+            messagebox.showwarning("Import", report.summary())
+        else:
+            messagebox.showinfo("Import", report.summary())
+
+
 class UpdateForm(ttk.Frame):
     """
     Represents an update form.
@@ -293,22 +1345,10 @@ class UpdateForm(ttk.Frame):
         self.table_name = table_name
         self.entity_id = entity_id
 
-        sql = f"SELECT * FROM {self.table_name} WHERE id={self.entity_id}"
-
-        cur = self.controller.cnx.cursor()
-        cur.execute(sql)
-        rows = cur.fetchall()
-        entity = rows[0]
-        cur.close()
-
         self.form = Form(parent=self, controller=controller, table_name=table_name)
         self.form.pack()
-
-        for field, entry in self.form.entries.items():
-            text = ''
-            if entity[field]:
-                text = entity[field]
-            entry.insert(0, text)
+        # The entries' text as last loaded, only entries changed since are written
+        self.loaded = None
 
         button1 = ttk.Button(self, text=f"Update {table_name}",
                              command=lambda: self.update())
@@ -317,43 +1357,63 @@ class UpdateForm(ttk.Frame):
                              command=lambda: self.delete())
         button2.pack()
 
-    def update(self):
+    def fetch(self, cur):
+        sql = f"SELECT * FROM {self.table_name} WHERE id = %s"
 
-        if self.form.valid_entries():
-            col_val_pairings = []
-            for field, entry in self.form.entries.items():
+        cur.execute(sql, (self.entity_id,))
+        rows = cur.fetchall()
+        return self.controller.entities.load(model.entity_types[self.table_name], rows[0])
 
-                if entry.get() == '':
-                    col_val_pairings.append(f"{field} = NULL")
-                else:
-                    col_val_pairings.append(f"{field} = '{entry.get()}'")
+    def show(self, entity):
+        self.loaded = {}
+        for field, entry in self.form.entries.items():
+            value = getattr(entity, field)
+            text = '' if value is None else str(value)
+            entry.delete(0, tk.END)
+            entry.insert(0, text)
+            self.loaded[field] = text
 
-            sql = f"UPDATE {self.table_name} SET {', '.join(col_val_pairings)} WHERE id={self.entity_id}"
+    def update(self):
+        if self.loaded is None:
+            return
+        # Unchanged columns are left alone, so their triggers do not fire and nothing is written for no changes
+        fields = tuple(field for field, entry in self.form.entries.items() if entry.get() != self.loaded[field])
+        if not fields:
+            return
+
+        if self.form.valid_entries():
+            sql = self.form.update_statement(fields)
 
             try:
-                cur = self.controller.cnx.cursor()
-                cur.execute(sql)
-                self.controller.cnx.commit()
-                cur.close()
-                self.controller.refresh()
+                with self.controller.cursor() as cur:
+                    cur.execute(sql, self.form.values(fields) + [self.entity_id])
+                    # A winner entered by hand, as for a forfeit, moves on in its bracket like a played one
+                    if self.table_name == "match_data" and "winner_id_FK" in fields:
+                        bracket.advance_bracket(cur, self.entity_id)
+                    cur.connection.commit()
+                self.loaded.update({field: self.form.entries[field].get() for field in fields})
+                self.controller.update_search(self.table_name, self.entity_id,
+                                              {field: entry.get() for field, entry in self.form.entries.items()})
+                self.controller.refresh(self.table_name)
             except Exception as e:
                 messagebox.showerror("Error", f"{e.args[0]}: {e.args[1]}")
 
     def delete(self):
 
-        sql = f"DELETE FROM {self.table_name} WHERE id={self.entity_id}"
+        sql = f"DELETE FROM {self.table_name} WHERE id = %s"
 
         try:
-            cur = self.controller.cnx.cursor()
-            cur.execute(sql)
-            self.controller.cnx.commit()
-            cur.close()
-            self.controller.next_frame(self.controller.last_frame)
+            with self.controller.cursor() as cur:
+                cur.execute(sql, (self.entity_id,))
+                cur.connection.commit()
+            self.controller.entities.forget(model.entity_types[self.table_name], self.entity_id)
+            self.controller.update_search(self.table_name, self.entity_id)
+            self.controller.close_frame(self.table_name)
         except Exception as e:
             messagebox.showerror("Error", f"{e.args[0]}: {e.args[1]}")
 
 
-class Tournaments(ttk.Frame):
+class Tournaments(Page):
     """
     Represents the tournaments view.
 
@@ -361,8 +1421,7 @@ class Tournaments(ttk.Frame):
     """
 
     def __init__(self, parent, controller):
-        ttk.Frame.__init__(self, parent)
-        self.controller = controller
+        Page.__init__(self, parent, controller)
         header = Header(parent=self, controller=controller, title="Tournaments")
         header.pack(fill="x", pady=10, padx=10)
 
@@ -370,51 +1429,43 @@ class Tournaments(ttk.Frame):
         create_tournament = CreateForm(parent=self, controller=controller, table_name="tournament")
         create_tournament.pack(fill="x", pady=10, padx=10)
 
-        # Request all tournament information
-        cur = controller.cnx.cursor()
-        cur.callproc("view_all_tournaments")
-        tournaments = cur.fetchall()
-        cur.close()
-
         # Setup Tournament Grid
-        tournament_grid = ttk.Frame(self)
-        tournament_grid.grid_columnconfigure(0, weight=1)
-        tournament_grid.grid_columnconfigure(1, weight=1)
-        tournament_grid.grid_columnconfigure(2, weight=1)
-        for y in range(math.ceil(len(tournaments) / 3)):
-            tournament_grid.grid_rowconfigure(y, weight=1)
-
-        # Add tournaments to grid
-        count = 0
-        for tournament in tournaments:
-            name = tournament["name"]
-            date = tournament["date"]
-            address = tournament["address"]
-            button_text = f"{name}\n" \
-                          f"{date}\n" \
-                          f"{address}"
-            button = ttk.Button(tournament_grid, text=button_text,
-                                command=lambda to_id=tournament["id"]: self.select_tournament(to_id))
-            button.grid(row=math.trunc(count / 3), column=count % 3, sticky="nsew")
-            count += 1
-
-        tournament_grid.pack(fill="both", expand=True, pady=10, padx=10)
+        self.tournament_grid = \
+            VirtualGrid(self, controller, fetch_page=self.fetch_tournaments, describe=self.describe_tournament)
+        self.tournament_grid.pack(fill="both", expand=True, pady=10, padx=10)
+        self.add_section(("tournament",), self.tournament_grid.fetch_first, self.tournament_grid.reset)
+
+    def fetch_tournaments(self, cur, after_id, limit):
+        # Request a page of tournament information
+        cur.callproc("view_tournaments_page", (after_id, limit))
+        return self.controller.entities.load_all(model.Tournament, cur.fetchall())
+
+    def describe_tournament(self, tournament):
+        name = tournament.name
+        date = tournament.date
+        address = tournament.address
+        button_text = f"{name}\n" \
+                      f"{date}\n" \
+                      f"{address}"
+        return button_text, lambda: self.select_tournament(tournament.id)
 
     def select_tournament(self, to_id):
         self.controller.to_id = to_id
         self.controller.next_frame(Tournament)
 
 
-class Tournament(ttk.Frame):
+class Tournament(Page):
     """
     Represents a specific tournament view.
 
     Presents tournament data, offers tournament deletion/editing, and division selection.
     """
 
+    state = ("to_id",)
+
     def __init__(self, parent, controller):
-        ttk.Frame.__init__(self, parent)
-        self.controller = controller
+        Page.__init__(self, parent, controller)
+        self.to_id = controller.to_id
 
         header = Header(parent=self, controller=controller, title=f"Tournament {controller.to_id}")
         header.pack(fill="x", pady=10, padx=10)
@@ -423,29 +1474,11 @@ class Tournament(ttk.Frame):
         update_tournament = \
             UpdateForm(parent=self, controller=controller, table_name="tournament", entity_id=controller.to_id)
         update_tournament.pack(fill="x", pady=10, padx=10)
+        self.add_section(("tournament",), update_tournament.fetch, update_tournament.show)
 
-        # Request tournament's divisions
-        cur = controller.cnx.cursor()
-        cur.callproc("view_all_tournament_divisions", (controller.to_id,))
-        divisions = cur.fetchall()
-        cur.close()
-
-        division_grid = ttk.Frame(self)
-        division_grid.grid_columnconfigure(0, weight=1)
-        division_grid.grid_columnconfigure(1, weight=1)
-        division_grid.grid_columnconfigure(2, weight=1)
-        for y in range(math.ceil(len(divisions) / 3)):
-            division_grid.grid_rowconfigure(y, weight=1)
-
-        count = 0
-        for division in divisions:
-            name = division["name"]
-            button_text = f"{name}\n"
-            button = ttk.Button(division_grid, text=button_text,
-                                command=lambda d_id=division["id"]: self.select_division(d_id))
-            button.grid(row=math.trunc(count / 3), column=count % 3, sticky="nsew")
-            count += 1
-        division_grid.pack(fill="both", expand=True, pady=10, padx=10)
+        self.division_grid = ButtonGrid(self)
+        self.division_grid.pack(fill="both", expand=True, pady=10, padx=10)
+        self.add_section(("division",), self.fetch_divisions, self.show_divisions)
 
         # Setup new division form
         create_division = CreateForm(parent=self, controller=controller, table_name="division")
@@ -453,12 +1486,95 @@ class Tournament(ttk.Frame):
         create_division.form.entries["tournament_id_FK"].insert(0, controller.to_id)
         create_division.form.entries["tournament_id_FK"].config(state="disabled")
 
+        export_button = ttk.Button(self, text="Export results",
+                                   command=lambda: controller.export_results(self.to_id))
+        export_button.pack(pady=5)
+
+        courts = TournamentCourts(parent=self, controller=controller)
+        courts.pack(fill="x", pady=10, padx=10)
+
+    def fetch_divisions(self, cur):
+        # Request tournament's divisions
+        cur.callproc("view_all_tournament_divisions", (self.to_id,))
+        return self.controller.entities.load_all(model.Division, cur.fetchall())
+
+    def show_divisions(self, divisions):
+        items = []
+        for division in divisions:
+            name = division.name
+            button_text = f"{name}\n"
+            items.append((button_text, lambda d_id=division.id: self.select_division(d_id)))
+        self.division_grid.set_items(items)
+
     def select_division(self, d_id):
         self.controller.d_id = d_id
         self.controller.next_frame(Division)
 
 
-class Division(ttk.Frame):
+class TournamentCourts(ttk.Frame):
+    """
+    Represents the court scheduler for a tournament.
+
+    Assigns the undecided matches of every division to courts and start times in one transaction.
+    """
+
+    def __init__(self, parent, controller):
+        ttk.Frame.__init__(self, parent)
+        self.controller = controller
+        self.to_id = controller.to_id
+
+        form = ttk.Frame(self)
+        self.entries = {}
+        for field, label_text, default in (("courts", "courts (int): ", "4"),
+                                           ("rest", "rest minutes (int): ", "10"),
+                                           ("start", "start (HH:MM, optional): ", "")):
+            section = ttk.Frame(form)
+            label = ttk.Label(section, width=22, anchor='w', text=label_text)
+            entry = ttk.Entry(section)
+            entry.insert(0, default)
+            section.pack(side=tk.TOP, fill=tk.X, padx=5, pady=5)
+            label.pack(side=tk.LEFT)
+            entry.pack(side=tk.RIGHT, expand=tk.YES, fill=tk.X)
+            self.entries[field] = entry
+        form.pack()
+
+        button = ttk.Button(self, text="Assign courts", command=lambda: self.assign())
+        button.pack(pady=5)
+
+    def assign(self):
+        courts = self.entries["courts"].get()
+        rest = self.entries["rest"].get()
+        if not courts.isdigit() or int(courts) < 1:
+            messagebox.showerror("Error", "courts requires a positive integer, please edit and try again.")
+            return
+        if not rest.isdigit():
+            messagebox.showerror("Error", "rest minutes requires an integer, please edit and try again.")
+            return
+        start_text = self.entries["start"].get().strip()
+        start_time = None
+        if start_text:
+            try:
+                start_time = datetime.datetime.strptime(start_text, "%H:%M").time()
+            except ValueError:
+                messagebox.showerror("Error", "start requires a time as HH:MM, please edit and try again.")
+                return
+
+        def assign_courts(_):
+            with self.controller.transaction() as cur:
+                return schedule.schedule_courts(cur, self.to_id, int(courts), int(rest), start_time)
+
+        # The write outlives its page, so the controller owns it
+        self.controller.loader.submit(self.controller, assign_courts, lambda result: self.report(result, courts),
+                                      retry=False)
+
+    def report(self, result, courts):
+        count, end = result
+        self.controller.refresh("match_data")
+        messagebox.showinfo("Assign courts",
+                            f"Assigned {count} matches to {courts} courts, the last should end at {end:%H:%M}.")
+
+
+class Division(Page):
     """
     Represents a specific division view.
 
@@ -466,9 +1582,11 @@ class Division(ttk.Frame):
     Offers division deletion/editing and division team/match creation.
     """
 
+    state = ("d_id",)
+
     def __init__(self, parent, controller):
-        ttk.Frame.__init__(self, parent)
-        self.controller = controller
+        Page.__init__(self, parent, controller)
+        self.d_id = controller.d_id
 
         header = Header(parent=self, controller=controller, title=f"Division {controller.d_id}")
         header.pack(fill="x", pady=10, padx=10)
@@ -477,6 +1595,7 @@ class Division(ttk.Frame):
         update_division = \
             UpdateForm(parent=self, controller=controller, table_name="division", entity_id=controller.d_id)
         update_division.pack(fill="x", pady=10, padx=10)
+        self.add_section(("division",), self.fetch_division, update_division.show)
 
         # Setup tabbing
         notebook = ttk.Notebook(self)
@@ -485,13 +1604,35 @@ class Division(ttk.Frame):
         # Teams tab
         teams_tab = DivisionTeams(parent=notebook, controller=controller)
         teams_tab.pack(fill='both', expand=True)
+        self.add_section(("team", "ratings"), teams_tab.team_grid.fetch_first, teams_tab.team_grid.reset)
 
         # Matches tab
         matches_tab = DivisionMatches(parent=notebook, controller=controller)
         matches_tab.pack(fill='both', expand=True)
+        self.add_section(("team", "match_data"), matches_tab.fetch, matches_tab.show)
+
+        # Standings tab
+        standings_tab = DivisionStandings(parent=notebook, controller=controller)
+        standings_tab.pack(fill='both', expand=True)
+        self.add_section(("team", "match_data", "game_data"), standings_tab.fetch, standings_tab.show)
+
+        # Schedule tab
+        schedule_tab = DivisionSchedule(parent=notebook, controller=controller)
+        schedule_tab.pack(fill='both', expand=True)
+
+        # Bracket tab
+        bracket_tab = DivisionBracket(parent=notebook, controller=controller)
+        bracket_tab.pack(fill='both', expand=True)
+        self.add_section(("team", "bracket_match"), bracket_tab.fetch, bracket_tab.show)
 
         notebook.add(teams_tab, text='Teams')
         notebook.add(matches_tab, text='Matches')
+        notebook.add(standings_tab, text='Standings')
+        notebook.add(schedule_tab, text='Schedule')
+        notebook.add(bracket_tab, text='Bracket')
+
+    def fetch_division(self, cur):
+        return self.controller.snapshots.get(cur, self.d_id).division
 
 
 class DivisionMatches(ttk.Frame):
@@ -504,61 +1645,342 @@ class DivisionMatches(ttk.Frame):
     def __init__(self, parent, controller):
         ttk.Frame.__init__(self, parent)
         self.controller = controller
+        self.d_id = controller.d_id
 
-        cur = controller.cnx.cursor()
-        cur.callproc("view_all_division_teams", (controller.d_id,))
-        teams = cur.fetchall()
-        cur.close()
+        self.match_grid = ButtonGrid(self)
+        self.match_grid.pack(fill="both", expand=True, pady=10, padx=10)
 
+        create_team = CreateForm(parent=self, controller=controller, table_name="match_data")
+        create_team.pack(fill="x", pady=10, padx=10)
+        create_team.form.entries["division_id_FK"].insert(0, controller.d_id)
+        create_team.form.entries["division_id_FK"].config(state="disabled")
+
+    def fetch(self, cur):
+        division_snapshot = self.controller.snapshots.get(cur, self.d_id)
+        return division_snapshot.teams, list(division_snapshot.matches.values())
+
+    def show(self, result):
+        teams, matches = result
         team_id_to_name = {}
 
         for team in teams:
-            team_id = team["id"]
-            name = team["name"]
+            team_id = team.id
+            name = team.name
             team_id_to_name[team_id] = name
 
-        cur = controller.cnx.cursor()
-        cur.callproc("view_all_division_matches", (controller.d_id,))
-        matches = cur.fetchall()
-        cur.close()
-
-        match_grid = ttk.Frame(self)
-        match_grid.grid_columnconfigure(0, weight=1)
-        match_grid.grid_columnconfigure(1, weight=1)
-        match_grid.grid_columnconfigure(2, weight=1)
-        for y in range(math.ceil(len(matches) / 3)):
-            match_grid.grid_rowconfigure(y, weight=1)
-
-        count = 0
+        items = []
         for match in matches:
-            team1_id = match["team1_id_FK"]
-            team2_id = match["team2_id_FK"]
+            team1_id = match.team1_id_FK
+            team2_id = match.team2_id_FK
             button_text = f"{team_id_to_name[team1_id]} vs. {team_id_to_name[team2_id]}"
-            button = ttk.Button(match_grid, text=button_text, command=lambda m_id=match["id"]: self.select_match(m_id))
-            button.grid(row=math.trunc(count / 3), column=count % 3, sticky="nsew")
-            count += 1
-        match_grid.pack(fill="both", expand=True, pady=10, padx=10)
-
-        create_team = CreateForm(parent=self, controller=controller, table_name="match_data")
-        create_team.pack(fill="x", pady=10, padx=10)
-        create_team.form.entries["division_id_FK"].insert(0, controller.d_id)
-        create_team.form.entries["division_id_FK"].config(state="disabled")
+            if match.court is not None and match.start_time is not None:
+                # Start times read offline are text, the time of day is in the same place
+                button_text += f"\nCourt {match.court}, {str(match.start_time)[11:16]}"
+            items.append((button_text, lambda m_id=match.id: self.select_match(m_id)))
+        self.match_grid.set_items(items)
 
     def select_match(self, m_id):
         self.controller.m_id = m_id
         self.controller.next_frame(Match)
 
 
-class Match(ttk.Frame):
+class DivisionStandings(ttk.Frame):
     """
-    Represents the match view.
+    Represents the standings view for a division.
+
+    Presents each team's wins, losses, game and point differentials in standings order.
+    """
+
+    columns = (("rank", "Rank", 50), ("team", "Team", 200), ("wins", "Wins", 60), ("losses", "Losses", 60),
+               ("games", "Games +/-", 80), ("points", "Points +/-", 80))
+
+    def __init__(self, parent, controller):
+        ttk.Frame.__init__(self, parent)
+        self.controller = controller
+        self.d_id = controller.d_id
+
+        self.table = ttk.Treeview(self, columns=[name for name, _, _ in self.columns], show="headings")
+        for name, text, width in self.columns:
+            self.table.heading(name, text=text)
+            self.table.column(name, width=width, anchor="w" if name == "team" else "center")
+        self.table.pack(fill="both", expand=True, pady=10, padx=10)
+
+    def fetch(self, cur):
+        # Loaded standings already hold every recorded game score
+        division_standings = self.controller.standings.get(self.d_id)
+        if division_standings is not None:
+            return division_standings
+
+        division_snapshot = self.controller.snapshots.get(cur, self.d_id)
+        return standings.Standings(division_snapshot.teams, division_snapshot.matches.values(),
+                                   division_snapshot.games.values())
+
+    def show(self, division_standings):
+        division_standings = self.controller.standings.setdefault(self.d_id, division_standings)
+
+        self.table.delete(*self.table.get_children())
+        for rank, record in enumerate(division_standings.ranking(), start=1):
+            self.table.insert("", tk.END, values=(rank, record.name, record.wins, record.losses,
+                                                  f"{record.game_differential:+d}",
+                                                  f"{record.point_differential:+d}"))
+
+
+class PerformancePanel(tk.Toplevel):
+    """
+    Represents the performance panel.
+
+    Presents the calls and timings of every procedure, statement and page, slowest in total first.
+    """
+
+    columns = (("kind", "Kind", 80), ("name", "Name", 320), ("calls", "Calls", 60), ("total_ms", "Total ms", 80),
+               ("mean_ms", "Mean ms", 70), ("p95_ms", "p95 ms", 70), ("max_ms", "Max ms", 70), ("rows", "Rows", 70))
+
+    def __init__(self, controller):
+        tk.Toplevel.__init__(self, controller)
+        self.controller = controller
+        self.title("Performance")
+        self.geometry("900x400")
+
+        buttons = ttk.Frame(self)
+        ttk.Button(buttons, text="Save as JSON...", command=self.dump).pack(side="left", padx=5)
+        ttk.Button(buttons, text="Reset", command=self.reset).pack(side="left", padx=5)
+        buttons.pack(side="bottom", pady=5)
+        self.cache_stats = ttk.Label(self)
+        self.cache_stats.pack(side="bottom")
+
+        self.table = ttk.Treeview(self, columns=[name for name, _, _ in self.columns], show="headings")
+        for name, text, width in self.columns:
+            self.table.heading(name, text=text)
+            self.table.column(name, width=width, anchor="w" if name == "name" else "center")
+        self.table.pack(fill="both", expand=True, pady=10, padx=10)
+        self.show()
+
+    def show(self):
+        if not self.winfo_exists():
+            return
+        self.table.delete(*self.table.get_children())
+        for row in self.controller.recorder.stats():
+            self.table.insert("", tk.END, values=[row[name] if row[name] is not None else ""
+                                                  for name, _, _ in self.columns])
+        results = self.controller.results.stats()
+        hit_rate = f", {results['hit_rate']:.0%} hit rate" if results["hit_rate"] is not None else ""
+        self.cache_stats.config(text=f"Result cache: {results['entries']} entries, {results['hits']} hits, "
+                                     f"{results['misses']} misses{hit_rate}")
+        self.after(stats_refresh_ms, self.show)
+
+    def dump(self):
+        path = filedialog.asksaveasfilename(parent=self, title="Save timings", defaultextension=".json",
+                                            filetypes=[("JSON", "*.json")])
+        if path:
+            count = self.controller.recorder.dump(path)
+            messagebox.showinfo("Performance", f"Saved {count} timings to {path}.", parent=self)
+
+    def reset(self):
+        self.controller.recorder.reset()
+        self.table.delete(*self.table.get_children())
+
+
+class DivisionSchedule(ttk.Frame):
+    """
+    Represents the schedule generator for a division.
+
+    Creates a round robin, or pool play, of the division's teams in one transaction.
+    """
+
+    def __init__(self, parent, controller):
+        ttk.Frame.__init__(self, parent)
+        self.controller = controller
+        self.d_id = controller.d_id
+
+        form = ttk.Frame(self)
+        self.entries = {}
+        for field, default in (("pools", "1"), ("play_to", "21"), ("hard_cap", "25"), ("best_of", "3")):
+            section = ttk.Frame(form)
+            label = ttk.Label(section, width=22, anchor='w', text=f"{field} (int): ")
+            entry = ttk.Entry(section)
+            entry.insert(0, default)
+            section.pack(side=tk.TOP, fill=tk.X, padx=5, pady=5)
+            label.pack(side=tk.LEFT)
+            entry.pack(side=tk.RIGHT, expand=tk.YES, fill=tk.X)
+            self.entries[field] = entry
+        form.pack()
+
+        button = ttk.Button(self, text="Generate schedule", command=lambda: self.generate())
+        button.pack(pady=5)
+
+    def generate(self):
+        values = {}
+        for field, entry in self.entries.items():
+            value = entry.get()
+            if value == '' and field == "hard_cap":
+                values[field] = None
+            elif not value.isdigit() or int(value) < 1:
+                messagebox.showerror("Error", f"{field} requires a positive integer, please edit and try again.")
+                return
+            else:
+                values[field] = int(value)
+
+        def plan(cur):
+            teams = self.controller.snapshots.get(cur, self.d_id).team_ids
+            if values["pools"] > 1:
+                return schedule.pool_play(teams, values["pools"])
+            return schedule.round_robin(teams)
+
+        self.controller.loader.submit(self, plan, lambda rounds: self.confirm(rounds, values))
+
+    def confirm(self, rounds, values):
+        match_count = sum(len(pairs) for pairs in rounds)
+        if match_count == 0:
+            messagebox.showerror("Error", "The division needs at least two teams to schedule matches.")
+            return
+        if not messagebox.askyesno("Generate schedule", f"Create {match_count} matches in {len(rounds)} rounds?"):
+            return
+
+        def create(_):
+            with self.controller.transaction() as cur:
+                return schedule.create_matches(cur, self.d_id, rounds, values["play_to"], values["hard_cap"],
+                                               values["best_of"])
+
+        # The write outlives its page, so the controller owns it
+        self.controller.loader.submit(self.controller, create, lambda _: self.controller.refresh("match_data"),
+                                      retry=False)
+
+
+class DivisionBracket(ttk.Frame):
+    """
+    Represents the elimination bracket view for a division.
 
-    Offers game info updating.
+    Presents the bracket's matches round by round and creates a single or double elimination bracket of the
+    division's teams, seeded by rating. Saved results move the winners on, no page reload needed.
     """
 
+    columns = (("round", "Round", 160), ("team1", "Team 1", 180), ("team2", "Team 2", 180), ("games", "Games", 70),
+               ("winner", "Winner", 180))
+
     def __init__(self, parent, controller):
         ttk.Frame.__init__(self, parent)
         self.controller = controller
+        self.d_id = controller.d_id
+        self.rows = []
+        self.match_ids = {}
+
+        self.table = ttk.Treeview(self, columns=[name for name, _, _ in self.columns], show="headings")
+        for name, text, width in self.columns:
+            self.table.heading(name, text=text)
+            self.table.column(name, width=width, anchor="center" if name == "games" else "w")
+        self.table.bind("<Double-1>", lambda _: self.select_match())
+        self.table.pack(fill="both", expand=True, pady=10, padx=10)
+
+        form = ttk.Frame(self)
+        self.entries = {}
+        for field, default in (("play_to", "21"), ("hard_cap", "25"), ("best_of", "3")):
+            section = ttk.Frame(form)
+            label = ttk.Label(section, width=22, anchor='w', text=f"{field} (int): ")
+            entry = ttk.Entry(section)
+            entry.insert(0, default)
+            section.pack(side=tk.TOP, fill=tk.X, padx=5, pady=5)
+            label.pack(side=tk.LEFT)
+            entry.pack(side=tk.RIGHT, expand=tk.YES, fill=tk.X)
+            self.entries[field] = entry
+        self.double = tk.BooleanVar(value=False)
+        ttk.Checkbutton(form, text="Double elimination", variable=self.double).pack(padx=5, pady=5)
+        form.pack()
+
+        button = ttk.Button(self, text="Create bracket", command=lambda: self.create())
+        button.pack(pady=5)
+
+    def fetch(self, cur):
+        division_snapshot = self.controller.snapshots.get(cur, self.d_id)
+        cur.callproc("get_division_bracket", (self.d_id,))
+        return division_snapshot.teams, cur.fetchall()
+
+    def show(self, result):
+        teams, rows = result
+        self.rows = rows
+        team_id_to_name = {team.id: team.name for team in teams}
+        rounds = max((row["round"] for row in rows if row["bracket"] == "W"), default=0)
+        double = any(row["bracket"] != "W" for row in rows)
+
+        def side(team_id, ready):
+            if team_id is not None:
+                return team_id_to_name.get(team_id, f"Team {team_id}")
+            return "Bye" if ready else "TBD"
+
+        self.table.delete(*self.table.get_children())
+        self.match_ids = {}
+        for row in rows:
+            # Bye against bye, from a bracket short of a power of two, is not a match at all
+            if row["decided"] and row["team1_id_FK"] is None and row["team2_id_FK"] is None:
+                continue
+            games = ""
+            if row["match_id_FK"] is not None:
+                games = f"{row['team1_games_won']}-{row['team2_games_won']}"
+                self.match_ids[str(row["id"])] = row["match_id_FK"]
+            winner = side(row["winner_id_FK"], False) if row["decided"] else ""
+            self.table.insert("", tk.END, iid=str(row["id"]),
+                              values=(bracket.round_name(row["bracket"], row["round"], rounds, double),
+                                      side(row["team1_id_FK"], row["team1_ready"]),
+                                      side(row["team2_id_FK"], row["team2_ready"]), games, winner))
+
+    def select_match(self):
+        selection = self.table.selection()
+        m_id = self.match_ids.get(selection[0]) if selection else None
+        if m_id is not None:
+            self.controller.m_id = m_id
+            self.controller.next_frame(Match)
+
+    def create(self):
+        values = {}
+        for field, entry in self.entries.items():
+            value = entry.get()
+            if value == '' and field == "hard_cap":
+                values[field] = None
+            elif not value.isdigit() or int(value) < 1:
+                messagebox.showerror("Error", f"{field} requires a positive integer, please edit and try again.")
+                return
+            else:
+                values[field] = int(value)
+        double = self.double.get()
+
+        def plan(cur):
+            teams = self.controller.snapshots.get(cur, self.d_id).teams
+            team_ids = bracket.seed_teams(teams, self.controller.rating_engine(cur))
+            return team_ids, bracket.bracket_matches(team_ids, double)
+
+        self.controller.loader.submit(self, plan, lambda result: self.confirm(*result, double, values))
+
+    def confirm(self, team_ids, matches, double, values):
+        question = (f"Create a {'double' if double else 'single'} elimination bracket of {len(team_ids)} teams, "
+                    f"seeded by rating?")
+        if self.rows:
+            question += " It replaces the division's bracket, whose matches are kept."
+        if not messagebox.askyesno("Create bracket", question):
+            return
+
+        def create(_):
+            with self.controller.transaction() as cur:
+                return bracket.create_bracket(cur, self.d_id, matches, values["play_to"], values["hard_cap"],
+                                              values["best_of"])
+
+        # The write outlives its page, so the controller owns it
+        self.controller.loader.submit(self.controller, create, lambda _: self.controller.refresh("bracket_match"),
+                                      retry=False)
+
+
+class Match(Page):
+    """
+    Represents the match view.
+
+    Offers game info updating, one game at a time or all games at once.
+    """
+
+    state = ("m_id",)
+
+    def __init__(self, parent, controller):
+        Page.__init__(self, parent, controller)
+        self.m_id = controller.m_id
+        self.d_id = controller.d_id
+
         header = Header(parent=self, controller=controller, title=f"Match {controller.m_id}")
         header.pack(fill="x", pady=10, padx=10)
 
@@ -566,28 +1988,69 @@ class Match(ttk.Frame):
         update_match = \
             UpdateForm(parent=self, controller=controller, table_name="match_data", entity_id=controller.m_id)
         update_match.pack(fill="x", pady=10, padx=10)
-
-        # Request all game information for a match
-        cur = controller.cnx.cursor()
-        cur.callproc("view_all_match_games", (controller.m_id,))
-        games = cur.fetchall()
-        cur.close()
+        self.update_match = update_match
+        self.add_section(("match_data",), self.fetch_match, update_match.show)
 
         # Setup Game Grid
-        game_grid = ttk.Frame(self)
-        game_grid.grid_columnconfigure(0, weight=1)
-        game_grid.grid_columnconfigure(1, weight=1)
-        game_grid.grid_columnconfigure(2, weight=1)
+        self.game_grid = ttk.Frame(self)
+        self.game_grid.grid_columnconfigure(0, weight=1)
+        self.game_grid.grid_columnconfigure(1, weight=1)
+        self.game_grid.grid_columnconfigure(2, weight=1)
+        self.game_grid.pack(fill="both", expand=True, pady=10, padx=10)
+        self.game_ids = []
+        self.game_entries = []
+        self.add_section(("game_data",), self.fetch_games, self.show_games)
+
+        save_button = ttk.Button(self, text="Save all games", command=lambda: self.save_games())
+        save_button.pack(pady=5)
+
+    def division_snapshot(self, cur):
+        # The division's snapshot holds the match, unless the match was opened from outside its division
+        if self.d_id is None:
+            return None
+        division_snapshot = self.controller.snapshots.get(cur, self.d_id)
+        return division_snapshot if self.m_id in division_snapshot.matches else None
+
+    def fetch_match(self, cur):
+        division_snapshot = self.division_snapshot(cur)
+        if division_snapshot is None:
+            return self.update_match.fetch(cur)
+        return division_snapshot.matches[self.m_id]
+
+    def fetch_games(self, cur):
+        division_snapshot = self.division_snapshot(cur)
+        if division_snapshot is None:
+            cur.callproc("view_all_match_games", (self.m_id,))
+            return self.controller.entities.load_all(model.Game, cur.fetchall())
+        return list(division_snapshot.match_games[self.m_id])
+
+    def show_games(self, games):
+        # Games are only added or removed with their match, so the grid is normally reused
+        game_ids = [game.id for game in games]
+        if game_ids != self.game_ids:
+            self.build_game_grid(games)
+
+        for game, (team1_entry, team2_entry) in zip(games, self.game_entries):
+            for entry, score in ((team1_entry, game.team1_score), (team2_entry, game.team2_score)):
+                entry.delete(0, tk.END)
+                if score is not None:
+                    entry.insert(0, score)
+
+    def build_game_grid(self, games):
+        for child in self.game_grid.winfo_children():
+            child.destroy()
         for y in range(math.ceil(len(games) / 3)):
-            game_grid.grid_rowconfigure(y, weight=1)
+            self.game_grid.grid_rowconfigure(y, weight=1)
 
-        # Add players to grid
+        # Add games to grid
+        self.game_ids = []
+        self.game_entries = []
         count = 0
         for game in games:
-            game_frame = ttk.Frame(game_grid)
+            game_frame = ttk.Frame(self.game_grid)
             game_frame['borderwidth'] = 5
             game_frame['relief'] = 'sunken'
-            header = ttk.Label(game_frame, text=f"Game {count + 1}", font=controller.title_font)
+            header = ttk.Label(game_frame, text=f"Game {count + 1}", font=self.controller.title_font)
             header.pack(padx=5, pady=5)
 
             team1_label = ttk.Label(game_frame, text="Team 1 Score:")
@@ -601,24 +2064,63 @@ class Match(ttk.Frame):
             team2_entry.pack()
 
             button = ttk.Button(game_frame, text="Update Score",
-                                command=lambda g_id=game["id"], t1_score=team1_entry.get(), t2_score=team2_entry.get():
-                                self.update_game(g_id, t1_score, t2_score))
+                                command=lambda g_id=game.id, t1_entry=team1_entry, t2_entry=team2_entry:
+                                self.update_game(g_id, t1_entry.get(), t2_entry.get()))
             button.pack(padx=5, pady=5)
 
             game_frame.grid(row=math.trunc(count / 3), column=count % 3, sticky="nsew")
+            self.game_ids.append(game.id)
+            self.game_entries.append((team1_entry, team2_entry))
             count += 1
 
-        game_grid.pack(fill="both", expand=True, pady=10, padx=10)
-
     def update_game(self, g_id, t1_score, t2_score):
-        sql = f"UPDATE game_data SET team1_score = {t1_score}, team2_score = {t2_score} WHERE id={g_id}"
+        for score in (t1_score, t2_score):
+            if score != '' and not score.isdigit():
+                messagebox.showerror("Error", "Game scores require integer input, please edit and try again.")
+                return
+        scores = [(int(t1_score) if t1_score else None, int(t2_score) if t2_score else None, g_id)]
+
+        sql = "UPDATE game_data SET team1_score = %s, team2_score = %s WHERE id = %s"
+
+        try:
+            with self.controller.transaction() as cur:
+                cur.executemany(sql, scores)
+                created = bracket.advance_bracket(cur, self.m_id)
+            self.controller.record_games(scores)
+            # Matches added to a bracket reshape the division, other results only change scores
+            self.controller.refresh("bracket_match" if created else "game_data")
+            self.controller.rate_match(self.m_id)
+        except Exception as e:
+            messagebox.showerror("Error", f"{e.args[0]}: {e.args[1]}")
+
+    def save_games(self):
+        scores = []
+        count = 0
+        for g_id, (team1_entry, team2_entry) in zip(self.game_ids, self.game_entries):
+            count += 1
+            t1_score = team1_entry.get()
+            t2_score = team2_entry.get()
+            for score in (t1_score, t2_score):
+                if score != '' and not score.isdigit():
+                    messagebox.showerror("Error", f"Game {count} scores require integer input, "
+                                                  f"please edit and try again.")
+                    return
+            scores.append((int(t1_score) if t1_score else None, int(t2_score) if t2_score else None, g_id))
+
+        # The trigger's per-game winner check is skipped, the winner is computed once at the end
+        sql = "UPDATE game_data SET team1_score = %s, team2_score = %s WHERE id = %s"
 
         try:
-            cur = self.controller.cnx.cursor()
-            cur.execute(sql)
-            self.controller.cnx.commit()
-            cur.close()
-            self.controller.refresh()
+            with self.controller.transaction() as cur:
+                # A failed batch leaves the variable set, the pool clears it when the connection is returned
+                cur.execute("SET @skip_match_winner = 1")
+                cur.executemany(sql, scores)
+                cur.execute("SET @skip_match_winner = NULL")
+                cur.callproc("update_match_winner", (self.m_id,))
+                created = bracket.advance_bracket(cur, self.m_id)
+            self.controller.record_games(scores)
+            self.controller.refresh("bracket_match" if created else "game_data")
+            self.controller.rate_match(self.m_id)
         except Exception as e:
             messagebox.showerror("Error", f"{e.args[0]}: {e.args[1]}")
 
@@ -633,49 +2135,53 @@ class DivisionTeams(ttk.Frame):
     def __init__(self, parent, controller):
         ttk.Frame.__init__(self, parent)
         self.controller = controller
+        self.d_id = controller.d_id
 
-        cur = controller.cnx.cursor()
-        cur.callproc("view_all_division_teams", (controller.d_id,))
-        teams = cur.fetchall()
-        cur.close()
-
-        team_grid = ttk.Frame(self)
-        team_grid.grid_columnconfigure(0, weight=1)
-        team_grid.grid_columnconfigure(1, weight=1)
-        team_grid.grid_columnconfigure(2, weight=1)
-        for y in range(math.ceil(len(teams) / 3)):
-            team_grid.grid_rowconfigure(y, weight=1)
-
-        count = 0
-        for team in teams:
-            team_id = team["id"]
-            name = team["name"]
-            button_text = f"{name}"
-            button = ttk.Button(team_grid, text=button_text, command=lambda te_id=team_id: self.select_team(te_id))
-            button.grid(row=math.trunc(count / 3), column=count % 3, sticky="nsew")
-            count += 1
-        team_grid.pack(fill="both", expand=True, pady=10, padx=10)
+        self.team_grid = \
+            VirtualGrid(self, controller, fetch_page=self.fetch_teams, describe=self.describe_team, row_height=30)
+        self.team_grid.pack(fill="both", expand=True, pady=10, padx=10)
 
         create_team = CreateForm(parent=self, controller=controller, table_name="team")
         create_team.pack(fill="x", pady=10, padx=10)
         create_team.form.entries["division_id_FK"].insert(0, controller.d_id)
         create_team.form.entries["division_id_FK"].config(state="disabled")
 
+        # Imported teams without a division join this one
+        import_teams = ImportButton(parent=self, controller=controller, table_name="team",
+                                    defaults={"division_id_FK": controller.d_id})
+        import_teams.pack(pady=5)
+
+    def fetch_teams(self, cur, after_id, limit):
+        # Teams are described with the ratings, which are replayed once per session
+        self.controller.rating_engine(cur)
+        return self.controller.snapshots.get(cur, self.d_id).teams_page(after_id, limit)
+
+    def describe_team(self, team):
+        name = team.name
+        # The division's snapshot holds the team's players in memory
+        players = [self.controller.entities.get(model.Player, p_id) for p_id in team.player_ids]
+        players = " & ".join(player.name for player in players if player is not None)
+        rating = self.controller.ratings.team(team.player_ids)
+        button_text = f"{name} ({players}) {rating:.0f}" if players else f"{name} {rating:.0f}"
+        return button_text, lambda: self.select_team(team.id)
+
     def select_team(self, te_id):
         self.controller.te_id = te_id
         self.controller.next_frame(Team)
 
 
-class Team(ttk.Frame):
+class Team(Page):
     """
     Represents a specific team view.
 
     Presents team data and offers team deletion/editing.
     """
 
+    state = ("te_id",)
+
     def __init__(self, parent, controller):
-        ttk.Frame.__init__(self, parent)
-        self.controller = controller
+        Page.__init__(self, parent, controller)
+        self.te_id = controller.te_id
 
         header = Header(parent=self, controller=controller, title=f"Team {controller.te_id}")
         header.pack(fill="x", pady=10, padx=10)
@@ -684,36 +2190,39 @@ class Team(ttk.Frame):
         update_team = \
             UpdateForm(parent=self, controller=controller, table_name="team", entity_id=controller.te_id)
         update_team.pack(fill="x", pady=10, padx=10)
-
-        # Request tournament's divisions
-        cur = controller.cnx.cursor()
-        cur.callproc("view_all_team_players", (controller.te_id,))
-        players = cur.fetchall()
-        cur.close()
-
-        player_grid = ttk.Frame(self)
-        player_grid.grid_columnconfigure(0, weight=1)
-        player_grid.grid_columnconfigure(1, weight=1)
-        player_grid.grid_columnconfigure(2, weight=1)
-        for y in range(math.ceil(len(players) / 3)):
-            player_grid.grid_rowconfigure(y, weight=1)
-
-        count = 0
+        self.add_section(("team",), update_team.fetch, update_team.show)
+
+        self.rating_label = ttk.Label(self, text="Rating:")
+        self.rating_label.pack(pady=5)
+
+        self.player_grid = ButtonGrid(self)
+        self.player_grid.pack(fill="both", expand=True, pady=10, padx=10)
+        self.add_section(("team", "player", "ratings"), self.fetch_players, self.show_players)
+
+    def fetch_players(self, cur):
+        # Request team's players
+        cur.callproc("view_all_team_players", (self.te_id,))
+        players = self.controller.entities.load_all(model.Player, cur.fetchall())
+        return players, self.controller.rating_engine(cur)
+
+    def show_players(self, result):
+        players, engine = result
+        if players:
+            self.rating_label.config(text=f"Rating: {engine.team([player.id for player in players]):.0f}")
+        items = []
         for player in players:
-            name = player["name"]
-            button_text = f"{name}\n"
-            button = ttk.Button(player_grid, text=button_text,
-                                command=lambda p_id=player["id"]: self.select_player(p_id))
-            button.grid(row=math.trunc(count / 3), column=count % 3, sticky="nsew")
-            count += 1
-        player_grid.pack(fill="both", expand=True, pady=10, padx=10)
+            name = player.name
+            rating, matches = engine.player(player.id)
+            button_text = f"{name}\n{rating:.0f} ({matches} matches)"
+            items.append((button_text, lambda p_id=player.id: self.select_player(p_id)))
+        self.player_grid.set_items(items)
 
     def select_player(self, p_id):
         self.controller.p_id = p_id
         self.controller.next_frame(Player)
 
 
-class Players(ttk.Frame):
+class Players(Page):
     """
     Represents the players view.
 
@@ -721,60 +2230,61 @@ class Players(ttk.Frame):
     """
 
     def __init__(self, parent, controller):
-        ttk.Frame.__init__(self, parent)
-        self.controller = controller
+        Page.__init__(self, parent, controller)
         header = Header(parent=self, controller=controller, title="Players")
         header.pack(fill="x", pady=10, padx=10)
 
         # Setup new player form
         create_player = CreateForm(parent=self, controller=controller, table_name="player")
         create_player.pack(fill="x", pady=10, padx=10)
-
-        # Request all player information
-        cur = controller.cnx.cursor()
-        cur.callproc("view_all_players")
-        players = cur.fetchall()
-        cur.close()
+        import_players = ImportButton(parent=self, controller=controller, table_name="player")
+        import_players.pack(pady=5)
+
+        # Setup player search
+        search_section = ttk.Frame(self)
+        search_label = ttk.Label(search_section, width=22, anchor='w', text="Find a player: ")
+        search_entry = ttk.Entry(search_section)
+        search_section.pack(fill="x", padx=15)
+        search_label.pack(side=tk.LEFT)
+        search_entry.pack(side=tk.RIGHT, expand=tk.YES, fill=tk.X)
+        TypeAhead(search_entry, controller, "player", on_pick=self.select_player)
 
         # Setup Player Grid
-        player_grid = ttk.Frame(self)
-        player_grid.grid_columnconfigure(0, weight=1)
-        player_grid.grid_columnconfigure(1, weight=1)
-        player_grid.grid_columnconfigure(2, weight=1)
-        for y in range(math.ceil(len(players) / 3)):
-            player_grid.grid_rowconfigure(y, weight=1)
-
-        # Add players to grid
-        count = 0
-        for player in players:
-            name = player["name"]
-            date = player["dob"]
-            phone = player["phone_number"]
-            button_text = f"{name}\n" \
-                          f"{date}\n" \
-                          f"{phone}"
-            button = ttk.Button(player_grid, text=button_text,
-                                command=lambda p_id=player["id"]: self.select_player(p_id))
-            button.grid(row=math.trunc(count / 3), column=count % 3, sticky="nsew")
-            count += 1
-
-        player_grid.pack(fill="both", expand=True, pady=10, padx=10)
+        self.player_grid = VirtualGrid(self, controller, fetch_page=self.fetch_players, describe=self.describe_player)
+        self.player_grid.pack(fill="both", expand=True, pady=10, padx=10)
+        self.add_section(("player",), self.player_grid.fetch_first, self.player_grid.reset)
+
+    def fetch_players(self, cur, after_id, limit):
+        # Request a page of player information
+        cur.callproc("view_players_page", (after_id, limit))
+        return self.controller.entities.load_all(model.Player, cur.fetchall())
+
+    def describe_player(self, player):
+        name = player.name
+        date = player.dob
+        phone = player.phone_number
+        button_text = f"{name}\n" \
+                      f"{date}\n" \
+                      f"{phone}"
+        return button_text, lambda: self.select_player(player.id)
 
     def select_player(self, p_id):
         self.controller.p_id = p_id
         self.controller.next_frame(Player)
 
 
-class Player(ttk.Frame):
+class Player(Page):
     """
     Represents a specific player view.
 
     Presents player data and offers player deletion/editing.
     """
 
+    state = ("p_id",)
+
     def __init__(self, parent, controller):
-        ttk.Frame.__init__(self, parent)
-        self.controller = controller
+        Page.__init__(self, parent, controller)
+        self.p_id = controller.p_id
 
         header = Header(parent=self, controller=controller, title=f"Player {controller.p_id}")
         header.pack(fill="x", pady=10, padx=10)
@@ -783,9 +2293,21 @@ class Player(ttk.Frame):
         update_player = \
             UpdateForm(parent=self, controller=controller, table_name="player", entity_id=controller.p_id)
         update_player.pack(fill="x", pady=10, padx=10)
+        self.add_section(("player",), update_player.fetch, update_player.show)
 
+        self.rating_label = ttk.Label(self, text="Rating:")
+        self.rating_label.pack(pady=5)
+        self.add_section(("ratings",), self.fetch_rating, self.show_rating)
 
-class Schools(ttk.Frame):
+    def fetch_rating(self, cur):
+        return self.controller.rating_engine(cur).player(self.p_id)
+
+    def show_rating(self, result):
+        rating, matches = result
+        self.rating_label.config(text=f"Rating: {rating:.0f} ({matches} rated matches)")
+
+
+class Schools(Page):
     """
     Represents the schools view.
 
@@ -793,42 +2315,32 @@ class Schools(ttk.Frame):
     """
 
     def __init__(self, parent, controller):
-        ttk.Frame.__init__(self, parent)
-        self.controller = controller
+        Page.__init__(self, parent, controller)
         header = Header(parent=self, controller=controller, title="Schools")
         header.pack(fill="x", pady=10, padx=10)
 
         # Setup new tournament form
         create_tournament = CreateForm(parent=self, controller=controller, table_name="school")
         create_tournament.pack(fill="x", pady=10, padx=10)
-
-        # Request all tournament information
-        cur = controller.cnx.cursor()
-        cur.callproc("view_all_schools")
-        schools = cur.fetchall()
-        cur.close()
-
-        # Setup Tournament Grid
-        school_grid = ttk.Frame(self)
-        school_grid.grid_columnconfigure(0, weight=1)
-        school_grid.grid_columnconfigure(1, weight=1)
-        school_grid.grid_columnconfigure(2, weight=1)
-        for y in range(math.ceil(len(schools) / 3)):
-            school_grid.grid_rowconfigure(y, weight=1)
-
-        # Add tournaments to grid
-        count = 0
-        for school in schools:
-            name = school["name"]
-            address = school["address"]
-            button_text = f"{name}\n" \
-                          f"{address}"
-            button = ttk.Button(school_grid, text=button_text,
-                                command=lambda s_id=school["id"]: self.select_school(s_id))
-            button.grid(row=math.trunc(count / 3), column=count % 3, sticky="nsew")
-            count += 1
-
-        school_grid.pack(fill="both", expand=True, pady=10, padx=10)
+        import_schools = ImportButton(parent=self, controller=controller, table_name="school")
+        import_schools.pack(pady=5)
+
+        # Setup School Grid
+        self.school_grid = VirtualGrid(self, controller, fetch_page=self.fetch_schools, describe=self.describe_school)
+        self.school_grid.pack(fill="both", expand=True, pady=10, padx=10)
+        self.add_section(("school",), self.school_grid.fetch_first, self.school_grid.reset)
+
+    def fetch_schools(self, cur, after_id, limit):
+        # Request a page of school information
+        cur.callproc("view_schools_page", (after_id, limit))
+        return self.controller.entities.load_all(model.School, cur.fetchall())
+
+    def describe_school(self, school):
+        name = school.name
+        address = school.address
+        button_text = f"{name}\n" \
+                      f"{address}"
+        return button_text, lambda: self.select_school(school.id)
 
     def select_school(self, s_id):
 
@@ -836,16 +2348,18 @@ class Schools(ttk.Frame):
         self.controller.next_frame(School)
 
 
-class School(ttk.Frame):
+class School(Page):
     """
     Represents a specific school view.
 
     Presents school data and offers school deletion/editing.
     """
 
+    state = ("s_id",)
+
     def __init__(self, parent, controller):
-        ttk.Frame.__init__(self, parent)
-        self.controller = controller
+        Page.__init__(self, parent, controller)
+        self.s_id = controller.s_id
 
         header = Header(parent=self, controller=controller, title=f"School {controller.s_id}")
         header.pack(fill="x", pady=10, padx=10)
@@ -854,29 +2368,24 @@ class School(ttk.Frame):
         update_school = \
             UpdateForm(parent=self, controller=controller, table_name="school", entity_id=controller.s_id)
         update_school.pack(fill="x", pady=10, padx=10)
+        self.add_section(("school",), update_school.fetch, update_school.show)
 
-        # Request tournament's divisions
-        cur = controller.cnx.cursor()
-        cur.callproc("get_players_from_school", (controller.s_id,))
-        players = cur.fetchall()
-        cur.close()
-
-        player_grid = ttk.Frame(self)
-        player_grid.grid_columnconfigure(0, weight=1)
-        player_grid.grid_columnconfigure(1, weight=1)
-        player_grid.grid_columnconfigure(2, weight=1)
-        for y in range(math.ceil(len(players) / 3)):
-            player_grid.grid_rowconfigure(y, weight=1)
+        self.player_grid = ButtonGrid(self)
+        self.player_grid.pack(fill="both", expand=True, pady=10, padx=10)
+        self.add_section(("player",), self.fetch_players, self.show_players)
 
-        count = 0
+    def fetch_players(self, cur):
+        # Request school's players
+        cur.callproc("get_players_from_school", (self.s_id,))
+        return self.controller.entities.load_all(model.Player, cur.fetchall())
+
+    def show_players(self, players):
+        items = []
         for player in players:
-            name = player["name"]
+            name = player.name
             button_text = f"{name}\n"
-            button = ttk.Button(player_grid, text=button_text,
-                                command=lambda p_id=player["id"]: self.select_player(p_id))
-            button.grid(row=math.trunc(count / 3), column=count % 3, sticky="nsew")
-            count += 1
-        player_grid.pack(fill="both", expand=True, pady=10, padx=10)
+            items.append((button_text, lambda p_id=player.id: self.select_player(p_id)))
+        self.player_grid.set_items(items)
 
     def select_player(self, p_id):
         self.controller.p_id = p_id
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+Schema migrations.
+
+Brings an existing tm database up to the current schema by running the
+numbered SQL files in back_end/migrations that it has not run yet, in
+order, recording each in the schema_migration table. A database without
+that table is taken to predate every migration. Databases made from
+create.sql or dump.sql already record the migrations they include:
+
+    python3 migrate.py --user USER
+    python3 migrate.py --user USER --list
+"""
+import argparse
+import getpass
+import os
+import re
+
+import pymysql
+
+# Directory of the migration files, named NNNN_name.sql
+migrations_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "back_end", "migrations")
+
+create_migration_table = """
+CREATE TABLE IF NOT EXISTS schema_migration (
+    version INT PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    applied_at DATETIME NOT NULL
+)"""
+
+
+def migrations(path=migrations_path):
+    """
+    Returns the (version, name, file path) of every migration file, in version order.
+    """
+    found = []
+    for file_name in os.listdir(path):
+        match = re.fullmatch(r"(\d+)_(\w+)\.sql", file_name)
+        if match:
+            found.append((int(match.group(1)), match.group(2), os.path.join(path, file_name)))
+    found.sort()
+    return found
+
+
+def split_statements(text):
+    """
+    Returns the statements of a SQL script, following its DELIMITER lines as the mysql client does.
+    """
+    statements = []
+    delimiter = ";"
+    lines = []
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped.upper().startswith("DELIMITER "):
+            delimiter = stripped.split()[1]
+            continue
+        if not lines and (not stripped or stripped.startswith("--")):
+            continue
+        lines.append(line)
+        if stripped.endswith(delimiter):
+            lines[-1] = line.rstrip()[:-len(delimiter)]
+            statement = "\n".join(lines).strip()
+            if statement:
+                statements.append(statement)
+            lines = []
+    if "\n".join(lines).strip():
+        statements.append("\n".join(lines).strip())
+    return statements
+
+
+def applied_versions(cur):
+    cur.execute(create_migration_table)
+    cur.execute("SELECT version FROM schema_migration")
+    return {row["version"] for row in cur.fetchall()}
+
+
+def migrate(cnx, path=migrations_path, report=print):
+    """
+    Runs the migrations the database has not run, returns their versions.
+
+    MySQL commits schema changes as it makes them, so a migration that
+    fails part way is not rolled back: fix the cause, undo or finish its
+    changes by hand and run again.
+    """
+    with cnx.cursor(pymysql.cursors.DictCursor) as cur:
+        applied = applied_versions(cur)
+        ran = []
+        for version, name, file_path in migrations(path):
+            if version in applied:
+                continue
+            report(f"Applying {version:04d} {name}")
+            with open(file_path, encoding="utf-8") as file:
+                for statement in split_statements(file.read()):
+                    cur.execute(statement)
+            cur.execute("INSERT INTO schema_migration (version, name, applied_at) VALUES (%s, %s, NOW())",
+                        (version, name))
+            cnx.commit()
+            ran.append(version)
+        return ran
+
+
+def migrate_command():
+    from main import host, db_name
+
+    parser = argparse.ArgumentParser(description="Apply schema migrations to the tm database.")
+    parser.add_argument("--user", required=True)
+    parser.add_argument("--list", action="store_true", help="list the migrations and whether they ran, only")
+    args = parser.parse_args()
+
+    cnx = pymysql.connect(host=host, user=args.user, password=getpass.getpass(),
+                          db=db_name, charset='utf8mb4')
+    try:
+        if args.list:
+            with cnx.cursor(pymysql.cursors.DictCursor) as cur:
+                applied = applied_versions(cur)
+            for version, name, _ in migrations():
+                print(f"{version:04d} {name}: {'applied' if version in applied else 'pending'}")
+            return
+        ran = migrate(cnx)
+    finally:
+        cnx.close()
+    print(f"Applied {len(ran)} migrations." if ran else "The database is up to date.")
+
+
+if __name__ == "__main__":
+    migrate_command()
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+Domain model.
+
+Compact entity types for the database's tables, free of any Tk code, and an
+identity map that keeps a single in-memory entity per row.
+"""
+import threading
+import weakref
+
+
+class Entity:
+    """
+    A row of a table, with one attribute per column.
+
+    Columns can also be read by name with entity[column], as from a cursor row.
+    """
+
+    __slots__ = ("__weakref__",)
+
+    table_name = None
+    columns = ()
+
+    def __init__(self, **values):
+        for column in self.columns:
+            setattr(self, column, values.get(column))
+
+    def update(self, row):
+        for column in self.columns:
+            if column in row:
+                setattr(self, column, row[column])
+
+    def __getitem__(self, column):
+        if column not in self.columns:
+            raise KeyError(column)
+        return getattr(self, column)
+
+    def as_row(self):
+        return {column: getattr(self, column) for column in self.columns}
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.id})"
+
+
+class Tournament(Entity):
+    __slots__ = columns = ("id", "name", "date", "time", "address")
+    table_name = "tournament"
+
+
+class Division(Entity):
+    __slots__ = columns = ("id", "name", "description", "max_teams", "tournament_id_FK")
+    table_name = "division"
+
+
+class School(Entity):
+    __slots__ = columns = ("id", "name", "address")
+    table_name = "school"
+
+
+class Player(Entity):
+    __slots__ = columns = ("id", "name", "dob", "phone_number", "school_id_FK")
+    table_name = "player"
+
+
+class Team(Entity):
+    __slots__ = columns = ("id", "name", "division_id_FK", "player1_id_FK", "player2_id_FK")
+    table_name = "team"
+
+    @property
+    def player_ids(self):
+        return self.player1_id_FK, self.player2_id_FK
+
+
+class Match(Entity):
+    __slots__ = columns = ("id", "play_to", "hard_cap", "best_of", "team1_id_FK", "team2_id_FK", "winner_id_FK",
+                           "division_id_FK", "team1_games_won", "team2_games_won", "court", "start_time")
+    table_name = "match_data"
+
+
+class Game(Entity):
+    __slots__ = columns = ("id", "team1_score", "team2_score", "match_id_FK")
+    table_name = "game_data"
+
+
+entity_types = {entity_type.table_name: entity_type
+                for entity_type in (Tournament, Division, School, Player, Team, Match, Game)}
+
+
+class IdentityMap:
+    """
+    Represents the entities in memory, at most one per row.
+
+    Loading a row that is already in memory updates that entity in place, so
+    every page holding it sees the change. Entities no page holds any more
+    are dropped.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entities = weakref.WeakValueDictionary()
+
+    def __len__(self):
+        return len(self.entities)
+
+    def get(self, entity_type, entity_id):
+        return self.entities.get((entity_type, entity_id))
+
+    def load(self, entity_type, row):
+        """
+        Returns the entity for a cursor row, creating it or updating the one in memory.
+        """
+        key = (entity_type, row["id"])
+        with self.lock:
+            entity = self.entities.get(key)
+            if entity is None:
+                entity = entity_type(**row)
+                self.entities[key] = entity
+            else:
+                entity.update(row)
+        return entity
+
+    def load_all(self, entity_type, rows):
+        return [self.load(entity_type, row) for row in rows]
+
+    def forget(self, entity_type, entity_id):
+        """
+        Drops a deleted row's entity, a row loaded with the same id later gets a new entity.
+        """
+        with self.lock:
+            self.entities.pop((entity_type, entity_id), None)
@@ -0,0 +1,843 @@
+# -*- coding: utf-8 -*-
+"""
+Offline store.
+
+A local SQLite mirror of the tm schema for venues with an unreliable
+network. It answers the same stored procedure calls as MySQL and keeps the
+game triggers' tallies, through connection and cursor objects shaped like
+PyMySQL's, so pages run on it unchanged.
+
+While offline, updates are applied locally and written in the same SQLite
+transaction to a durable outbox. Once MySQL is reachable again the outbox
+is replayed in batches. game_data and match_data updates carry the rows
+they changed, and are skipped as conflicts when MySQL's rows have changed
+since the mirror was taken. Creating and deleting rows needs MySQL, as ids
+handed out offline could clash with ids handed out by the database.
+
+The mirror is copied whole once per session and then kept current by
+division: only divisions whose version counter moved are read again.
+
+Everything here runs on SQLite alone: a LocalStore opened without an
+outbox stands in for the MySQL side.
+"""
+import contextlib
+import datetime
+import decimal
+import json
+import re
+import sqlite3
+import threading
+
+# Outbox entries replayed per MySQL transaction, and rows read per fetch while mirroring
+replay_batch_size = 100
+mirror_batch_size = 1000
+
+# Tables mirrored, in dump order, with (column, data type, key, nullable) per column
+tables = {
+    "bracket_match": (("id", "int", "PRI", "NO"), ("division_id_FK", "int", "MUL", "NO"),
+                      ("bracket", "char", "", "NO"), ("round", "int", "", "NO"), ("position", "int", "", "NO"),
+                      ("play_to", "int", "", "NO"), ("hard_cap", "int", "", "YES"), ("best_of", "int", "", "NO"),
+                      ("team1_id_FK", "int", "MUL", "YES"), ("team2_id_FK", "int", "MUL", "YES"),
+                      ("team1_ready", "tinyint", "", "NO"), ("team2_ready", "tinyint", "", "NO"),
+                      ("match_id_FK", "int", "UNI", "YES"),
+                      ("decided", "tinyint", "", "NO"), ("placed", "tinyint", "", "NO"),
+                      ("winner_id_FK", "int", "MUL", "YES"), ("loser_id_FK", "int", "MUL", "YES"),
+                      ("winner_to", "int", "MUL", "YES"), ("winner_side", "int", "", "YES"),
+                      ("loser_to", "int", "MUL", "YES"), ("loser_side", "int", "", "YES")),
+    "division": (("id", "int", "PRI", "NO"), ("name", "varchar", "", "NO"), ("description", "varchar", "", "YES"),
+                 ("max_teams", "int", "", "YES"), ("tournament_id_FK", "int", "MUL", "NO")),
+    "game_data": (("id", "int", "PRI", "NO"), ("team1_score", "int", "", "YES"), ("team2_score", "int", "", "YES"),
+                  ("match_id_FK", "int", "MUL", "NO")),
+    "match_data": (("id", "int", "PRI", "NO"), ("play_to", "int", "", "NO"), ("hard_cap", "int", "", "YES"),
+                   ("best_of", "int", "", "NO"), ("team1_id_FK", "int", "MUL", "NO"),
+                   ("team2_id_FK", "int", "MUL", "NO"), ("winner_id_FK", "int", "MUL", "YES"),
+                   ("division_id_FK", "int", "MUL", "NO"), ("team1_games_won", "int", "", "NO"),
+                   ("team2_games_won", "int", "", "NO"), ("court", "int", "", "YES"),
+                   ("start_time", "datetime", "", "YES")),
+    "player": (("id", "int", "PRI", "NO"), ("name", "varchar", "", "NO"), ("dob", "date", "", "YES"),
+               ("phone_number", "varchar", "", "YES"), ("school_id_FK", "int", "MUL", "YES")),
+    "school": (("id", "int", "PRI", "NO"), ("name", "varchar", "", "NO"), ("address", "varchar", "", "NO")),
+    "team": (("id", "int", "PRI", "NO"), ("name", "varchar", "", "NO"), ("division_id_FK", "int", "MUL", "NO"),
+             ("player1_id_FK", "int", "MUL", "NO"), ("player2_id_FK", "int", "MUL", "NO")),
+    "tournament": (("id", "int", "PRI", "NO"), ("name", "varchar", "", "NO"), ("date", "date", "", "NO"),
+                   ("time", "time", "", "NO"), ("address", "varchar", "", "NO")),
+}
+
+# Tables whose offline updates are checked against the database's rows on replay
+conflict_tables = {"game_data", "match_data"}
+
+# Columns the triggers maintain, which are not compared for conflicts
+derived_columns = {"team1_games_won", "team2_games_won", "winner_id_FK"}
+
+# Tables copied whole on every mirror, they hold a few rows per tournament
+catalog_tables = ("tournament", "division", "school")
+
+# Tables copied per division when the division's version moved, each with the query reading a set of divisions' rows
+division_tables = {
+    "game_data": "SELECT gd.* FROM game_data AS gd JOIN match_data AS md ON md.id = gd.match_id_FK "
+                 "WHERE md.division_id_FK IN ({})",
+    "match_data": "SELECT * FROM match_data WHERE division_id_FK IN ({})",
+    "team": "SELECT * FROM team WHERE division_id_FK IN ({})",
+    "bracket_match": "SELECT * FROM bracket_match WHERE division_id_FK IN ({})",
+}
+
+# Procedures that write, and are queued while offline like any other write
+write_procedures = {"update_match_winner", "backfill_match_tallies", "advance_bracket"}
+
+store_schema = """
+CREATE TABLE IF NOT EXISTS session_variable (name TEXT PRIMARY KEY, value);
+CREATE TABLE IF NOT EXISTS store_info (name TEXT PRIMARY KEY, value);
+CREATE TABLE IF NOT EXISTS schema_column (TABLE_NAME TEXT, ORDINAL_POSITION INTEGER, COLUMN_NAME TEXT,
+                                          DATA_TYPE TEXT, COLUMN_KEY TEXT, IS_NULLABLE TEXT);
+CREATE TABLE IF NOT EXISTS game_number (n INTEGER PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS outbox (id INTEGER PRIMARY KEY AUTOINCREMENT, kind TEXT NOT NULL, statement TEXT NOT NULL,
+                                   args TEXT NOT NULL, table_name TEXT, base_rows TEXT, result_rows TEXT,
+                                   queued_at TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS division_version (division_id_FK INTEGER PRIMARY KEY, version INTEGER NOT NULL DEFAULT 0);
+CREATE TABLE IF NOT EXISTS mirrored_version (division_id_FK INTEGER PRIMARY KEY, version INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS conflict (id INTEGER PRIMARY KEY AUTOINCREMENT, statement TEXT NOT NULL, args TEXT NOT NULL,
+                                     table_name TEXT, base_rows TEXT, result_rows TEXT, server_rows TEXT,
+                                     detected_at TEXT NOT NULL);
+
+DROP TRIGGER IF EXISTS bump_division_on_insert_match;
+CREATE TRIGGER bump_division_on_insert_match AFTER INSERT ON match_data
+BEGIN
+    INSERT INTO division_version VALUES (NEW.division_id_FK, 1)
+    ON CONFLICT (division_id_FK) DO UPDATE SET version = version + 1;
+END;
+
+DROP TRIGGER IF EXISTS bump_division_on_update_match;
+CREATE TRIGGER bump_division_on_update_match AFTER UPDATE ON match_data
+BEGIN
+    INSERT INTO division_version SELECT DISTINCT division_id, 1 FROM (SELECT NEW.division_id_FK AS division_id
+                                                                      UNION SELECT OLD.division_id_FK) WHERE true
+    ON CONFLICT (division_id_FK) DO UPDATE SET version = version + 1;
+END;
+
+DROP TRIGGER IF EXISTS bump_division_on_delete_match;
+CREATE TRIGGER bump_division_on_delete_match AFTER DELETE ON match_data
+BEGIN
+    INSERT INTO division_version VALUES (OLD.division_id_FK, 1)
+    ON CONFLICT (division_id_FK) DO UPDATE SET version = version + 1;
+END;
+
+DROP TRIGGER IF EXISTS bump_division_on_insert_team;
+CREATE TRIGGER bump_division_on_insert_team AFTER INSERT ON team
+BEGIN
+    INSERT INTO division_version VALUES (NEW.division_id_FK, 1)
+    ON CONFLICT (division_id_FK) DO UPDATE SET version = version + 1;
+END;
+
+DROP TRIGGER IF EXISTS bump_division_on_update_team;
+CREATE TRIGGER bump_division_on_update_team AFTER UPDATE ON team
+BEGIN
+    INSERT INTO division_version SELECT DISTINCT division_id, 1 FROM (SELECT NEW.division_id_FK AS division_id
+                                                                      UNION SELECT OLD.division_id_FK) WHERE true
+    ON CONFLICT (division_id_FK) DO UPDATE SET version = version + 1;
+END;
+
+DROP TRIGGER IF EXISTS bump_division_on_delete_team;
+CREATE TRIGGER bump_division_on_delete_team AFTER DELETE ON team
+BEGIN
+    INSERT INTO division_version VALUES (OLD.division_id_FK, 1)
+    ON CONFLICT (division_id_FK) DO UPDATE SET version = version + 1;
+END;
+
+-- Every game score change bumps its division, even one that leaves the match tallies alone
+DROP TRIGGER IF EXISTS bump_division_on_change_game;
+CREATE TRIGGER bump_division_on_change_game AFTER UPDATE ON game_data
+BEGIN
+    INSERT INTO division_version SELECT division_id_FK, 1 FROM match_data WHERE id = NEW.match_id_FK
+    ON CONFLICT (division_id_FK) DO UPDATE SET version = version + 1;
+END;
+
+DROP TRIGGER IF EXISTS create_games_on_new_match;
+CREATE TRIGGER create_games_on_new_match AFTER INSERT ON match_data
+WHEN (SELECT value FROM session_variable WHERE name = 'skip_create_games') IS NULL
+BEGIN
+    INSERT INTO game_data (team1_score, team2_score, match_id_FK)
+    SELECT 0, 0, NEW.id FROM game_number WHERE n <= NEW.best_of;
+END;
+
+DROP TRIGGER IF EXISTS update_match_on_update_game;
+CREATE TRIGGER update_match_on_update_game AFTER UPDATE ON game_data
+WHEN OLD.match_id_FK <> NEW.match_id_FK
+    OR IFNULL((OLD.team1_score > OLD.team2_score) - (OLD.team1_score < OLD.team2_score), 0)
+       <> IFNULL((NEW.team1_score > NEW.team2_score) - (NEW.team1_score < NEW.team2_score), 0)
+BEGIN
+    UPDATE match_data
+    SET team1_games_won = team1_games_won - IFNULL(OLD.team1_score > OLD.team2_score, 0),
+        team2_games_won = team2_games_won - IFNULL(OLD.team2_score > OLD.team1_score, 0)
+    WHERE id = OLD.match_id_FK;
+
+    UPDATE match_data
+    SET team1_games_won = team1_games_won + IFNULL(NEW.team1_score > NEW.team2_score, 0),
+        team2_games_won = team2_games_won + IFNULL(NEW.team2_score > NEW.team1_score, 0)
+    WHERE id = NEW.match_id_FK;
+
+    UPDATE match_data
+    SET winner_id_FK = CASE
+        WHEN team1_games_won > best_of / 2 THEN team1_id_FK
+        WHEN team2_games_won > best_of / 2 THEN team2_id_FK
+        WHEN winner_id_FK = team1_id_FK AND team1_games_won < team2_games_won THEN NULL
+        WHEN winner_id_FK = team2_id_FK AND team2_games_won < team1_games_won THEN NULL
+        ELSE winner_id_FK
+    END
+    WHERE id IN (OLD.match_id_FK, NEW.match_id_FK)
+        AND (SELECT value FROM session_variable WHERE name = 'skip_match_winner') IS NULL;
+END;
+
+DROP TRIGGER IF EXISTS tally_match_on_insert_game;
+CREATE TRIGGER tally_match_on_insert_game AFTER INSERT ON game_data
+WHEN NEW.team1_score <> NEW.team2_score
+BEGIN
+    UPDATE match_data
+    SET team1_games_won = team1_games_won + (NEW.team1_score > NEW.team2_score),
+        team2_games_won = team2_games_won + (NEW.team2_score > NEW.team1_score),
+        winner_id_FK = CASE
+            WHEN (SELECT value FROM session_variable WHERE name = 'skip_match_winner') IS NOT NULL THEN winner_id_FK
+            WHEN team1_games_won + (NEW.team1_score > NEW.team2_score) > best_of / 2 THEN team1_id_FK
+            WHEN team2_games_won + (NEW.team2_score > NEW.team1_score) > best_of / 2 THEN team2_id_FK
+            WHEN winner_id_FK = team1_id_FK AND team1_games_won + (NEW.team1_score > NEW.team2_score)
+                < team2_games_won + (NEW.team2_score > NEW.team1_score) THEN NULL
+            WHEN winner_id_FK = team2_id_FK AND team2_games_won + (NEW.team2_score > NEW.team1_score)
+                < team1_games_won + (NEW.team1_score > NEW.team2_score) THEN NULL
+            ELSE winner_id_FK
+        END
+    WHERE id = NEW.match_id_FK;
+END;
+
+DROP TRIGGER IF EXISTS tally_match_on_delete_game;
+CREATE TRIGGER tally_match_on_delete_game AFTER DELETE ON game_data
+WHEN OLD.team1_score <> OLD.team2_score
+BEGIN
+    UPDATE match_data
+    SET team1_games_won = team1_games_won - (OLD.team1_score > OLD.team2_score),
+        team2_games_won = team2_games_won - (OLD.team2_score > OLD.team1_score),
+        winner_id_FK = CASE
+            WHEN (SELECT value FROM session_variable WHERE name = 'skip_match_winner') IS NOT NULL THEN winner_id_FK
+            WHEN team1_games_won - (OLD.team1_score > OLD.team2_score) > best_of / 2 THEN team1_id_FK
+            WHEN team2_games_won - (OLD.team2_score > OLD.team1_score) > best_of / 2 THEN team2_id_FK
+            WHEN winner_id_FK = team1_id_FK AND team1_games_won - (OLD.team1_score > OLD.team2_score)
+                < team2_games_won - (OLD.team2_score > OLD.team1_score) THEN NULL
+            WHEN winner_id_FK = team2_id_FK AND team2_games_won - (OLD.team2_score > OLD.team1_score)
+                < team1_games_won - (OLD.team1_score > OLD.team2_score) THEN NULL
+            ELSE winner_id_FK
+        END
+    WHERE id = OLD.match_id_FK;
+END;
+"""
+
+# A match's winner from its games won, a winner entered by hand standing unless the games went against it
+kept_winner = ("CASE WHEN team1_games_won > best_of / 2 THEN team1_id_FK "
+               "WHEN team2_games_won > best_of / 2 THEN team2_id_FK "
+               "WHEN winner_id_FK = team1_id_FK AND team1_games_won < team2_games_won THEN NULL "
+               "WHEN winner_id_FK = team2_id_FK AND team2_games_won < team1_games_won THEN NULL "
+               "ELSE winner_id_FK END")
+
+# The stored procedures, as their parameter names and SELECT or UPDATE statements in SQLite
+procedures = {
+    "get_columns_from_table": (("tab_name", "db_name"), (
+        "SELECT COLUMN_NAME, DATA_TYPE, COLUMN_KEY, IS_NULLABLE FROM schema_column WHERE TABLE_NAME = :tab_name "
+        "ORDER BY ORDINAL_POSITION",)),
+    "get_columns_from_schema": (("db_name",), (
+        "SELECT TABLE_NAME, COLUMN_NAME, DATA_TYPE, COLUMN_KEY, IS_NULLABLE FROM schema_column "
+        "ORDER BY TABLE_NAME, ORDINAL_POSITION",)),
+    "get_search_entries": ((), (
+        "SELECT 'school' as kind, id, name, NULL as school_id, NULL as phone_number, "
+        "NULL as player1_id, NULL as player2_id FROM school "
+        "UNION ALL SELECT 'player', id, name, school_id_FK, phone_number, NULL, NULL FROM player "
+        "UNION ALL SELECT 'team', id, name, NULL, NULL, player1_id_FK, player2_id_FK FROM team",)),
+    "view_all_schools": ((), ("SELECT * FROM school",)),
+    "view_schools_page": (("after_id", "page_limit"), (
+        "SELECT * FROM school WHERE id > :after_id ORDER BY id LIMIT :page_limit",)),
+    "view_specific_school": (("s_id",), ("SELECT * FROM school WHERE id = :s_id",)),
+    "get_players_from_school": (("s_id",), ("SELECT * FROM player WHERE school_id_FK = :s_id",)),
+    "view_all_players": ((), ("SELECT * FROM player",)),
+    "view_players_page": (("after_id", "page_limit"), (
+        "SELECT * FROM player WHERE id > :after_id ORDER BY id LIMIT :page_limit",)),
+    "view_specific_player": (("p_id",), ("SELECT * FROM player WHERE id = :p_id",)),
+    "view_all_team_players": (("te_id",), (
+        "SELECT * FROM player WHERE id IN (SELECT player1_id_FK FROM team WHERE id = :te_id "
+        "UNION SELECT player2_id_FK FROM team WHERE id = :te_id)",)),
+    "view_all_tournaments": ((), ("SELECT * FROM tournament",)),
+    "view_tournaments_page": (("after_id", "page_limit"), (
+        "SELECT * FROM tournament WHERE id > :after_id ORDER BY id LIMIT :page_limit",)),
+    "view_specific_tournament": (("to_id",), ("SELECT * FROM tournament WHERE id = :to_id",)),
+    "export_tournament_results": (("to_id",), (
+        "SELECT tn.id as tournament_id, tn.name as tournament, tn.date, tn.time, tn.address, "
+        "dv.id as division_id, dv.name as division, md.id as match_id, md.play_to, md.hard_cap, md.best_of, "
+        "t1.name as team1, t2.name as team2, w.name as winner, md.team1_games_won, md.team2_games_won, "
+        "gd.id as game_id, gd.team1_score, gd.team2_score "
+        "FROM tournament as tn JOIN division as dv ON dv.tournament_id_FK = tn.id "
+        "JOIN match_data as md ON md.division_id_FK = dv.id "
+        "JOIN team as t1 ON t1.id = md.team1_id_FK JOIN team as t2 ON t2.id = md.team2_id_FK "
+        "LEFT JOIN team as w ON w.id = md.winner_id_FK LEFT JOIN game_data as gd ON gd.match_id_FK = md.id "
+        "WHERE :to_id IS NULL OR tn.id = :to_id ORDER BY tn.id, dv.id, md.id, gd.id",)),
+    "view_all_tournament_divisions": (("to_id",), ("SELECT * FROM division WHERE tournament_id_FK = :to_id",)),
+    "view_specific_division": (("d_id",), ("SELECT * FROM division WHERE id = :d_id",)),
+    "get_division_snapshot": (("d_id",), (
+        "SELECT * FROM division WHERE id = :d_id",
+        "SELECT * FROM team WHERE division_id_FK = :d_id ORDER BY id",
+        "SELECT DISTINCT p.* FROM player as p JOIN team as t ON p.id IN (t.player1_id_FK, t.player2_id_FK) "
+        "WHERE t.division_id_FK = :d_id",
+        "SELECT * FROM match_data WHERE division_id_FK = :d_id ORDER BY id",
+        "SELECT gd.* FROM game_data as gd JOIN match_data as md ON md.id = gd.match_id_FK "
+        "WHERE md.division_id_FK = :d_id ORDER BY gd.match_id_FK, gd.id")),
+    "get_division_versions": ((), ("SELECT division_id_FK, version FROM division_version",)),
+    "view_all_division_teams": (("d_id",), ("SELECT * FROM team WHERE division_id_FK = :d_id",)),
+    "view_division_teams_page": (("d_id", "after_id", "page_limit"), (
+        "SELECT * FROM team WHERE division_id_FK = :d_id AND id > :after_id ORDER BY id LIMIT :page_limit",)),
+    "view_all_division_matches": (("d_id",), ("SELECT * FROM match_data WHERE division_id_FK = :d_id",)),
+    "view_specific_match": (("m_id",), ("SELECT * FROM match_data WHERE id = :m_id",)),
+    "update_match_winner": (("m_id",), (
+        "UPDATE match_data SET winner_id_FK = " + kept_winner + " WHERE id = :m_id",)),
+    "backfill_match_tallies": ((), (
+        "UPDATE match_data SET "
+        "team1_games_won = (SELECT COUNT(*) FROM game_data WHERE match_id_FK = match_data.id "
+        "AND team1_score > team2_score), "
+        "team2_games_won = (SELECT COUNT(*) FROM game_data WHERE match_id_FK = match_data.id "
+        "AND team2_score > team1_score)",
+        "UPDATE match_data SET winner_id_FK = " + kept_winner)),
+    "get_rating_history": ((), (
+        "SELECT md.id, md.team1_id_FK, md.team2_id_FK, md.winner_id_FK, md.team1_games_won, md.team2_games_won, "
+        "t1.player1_id_FK as team1_player1, t1.player2_id_FK as team1_player2, "
+        "t2.player1_id_FK as team2_player1, t2.player2_id_FK as team2_player2 "
+        "FROM match_data as md JOIN division as dv ON dv.id = md.division_id_FK "
+        "JOIN tournament as tn ON tn.id = dv.tournament_id_FK "
+        "JOIN team as t1 ON t1.id = md.team1_id_FK JOIN team as t2 ON t2.id = md.team2_id_FK "
+        "WHERE md.winner_id_FK IS NOT NULL ORDER BY tn.date, tn.time, tn.id, md.id",)),
+    "get_match_rating": (("m_id",), (
+        "SELECT md.id, md.team1_id_FK, md.team2_id_FK, md.winner_id_FK, md.team1_games_won, md.team2_games_won, "
+        "t1.player1_id_FK as team1_player1, t1.player2_id_FK as team1_player2, "
+        "t2.player1_id_FK as team2_player1, t2.player2_id_FK as team2_player2 "
+        "FROM match_data as md JOIN team as t1 ON t1.id = md.team1_id_FK "
+        "JOIN team as t2 ON t2.id = md.team2_id_FK WHERE md.id = :m_id",)),
+    "get_tournament_matches": (("to_id",), (
+        "SELECT md.*, t1.player1_id_FK as team1_player1, t1.player2_id_FK as team1_player2, "
+        "t2.player1_id_FK as team2_player1, t2.player2_id_FK as team2_player2 "
+        "FROM match_data as md JOIN division as dv ON dv.id = md.division_id_FK "
+        "JOIN team as t1 ON t1.id = md.team1_id_FK JOIN team as t2 ON t2.id = md.team2_id_FK "
+        "WHERE dv.tournament_id_FK = :to_id ORDER BY md.id",)),
+    "get_match_length_history": ((), (
+        "SELECT md.play_to, md.hard_cap, AVG(gd.team1_score + gd.team2_score) as points "
+        "FROM game_data as gd JOIN match_data as md ON md.id = gd.match_id_FK "
+        "WHERE md.winner_id_FK IS NOT NULL AND gd.team1_score <> gd.team2_score GROUP BY md.play_to, md.hard_cap",
+        "SELECT best_of, AVG(team1_games_won + team2_games_won) as games FROM match_data "
+        "WHERE winner_id_FK IS NOT NULL GROUP BY best_of")),
+    "get_division_bracket": (("d_id",), (
+        "SELECT bm.*, md.team1_games_won, md.team2_games_won FROM bracket_match as bm "
+        "LEFT JOIN match_data as md ON md.id = bm.match_id_FK WHERE bm.division_id_FK = :d_id ORDER BY bm.id",)),
+    # Bracket matches are created on the database once the queued results reach it
+    "advance_bracket": (("m_id",), ()),
+    "view_all_match_games": (("m_id",), ("SELECT * FROM game_data WHERE match_id_FK = :m_id",)),
+    "view_all_division_games": (("d_id",), (
+        "SELECT gd.* FROM game_data as gd JOIN match_data as md ON md.id = gd.match_id_FK "
+        "WHERE md.division_id_FK = :d_id",)),
+    "view_specific_game": (("g_id",), ("SELECT * FROM game_data WHERE id = :g_id",)),
+}
+
+
+class OfflineError(Exception):
+    """
+    A statement the store can not run, with (code, message) args like PyMySQL's errors.
+    """
+
+    def __str__(self):
+        return f"{self.args[0]}: {self.args[1]}"
+
+
+def plain(value):
+    """
+    Returns a database value as a SQLite and JSON friendly value, dates and times as MySQL shows them.
+    """
+    if isinstance(value, datetime.timedelta):
+        minutes, seconds = divmod(int(value.total_seconds()), 60)
+        hours, minutes = divmod(minutes, 60)
+        return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+    if isinstance(value, datetime.datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    return value
+
+
+def plain_rows(rows, columns=None):
+    return [{column: plain(value) for column, value in row.items() if columns is None or column in columns}
+            for row in rows]
+
+
+class LocalStore:
+    """
+    Represents the local SQLite database.
+
+    With outbox=True, updates are queued for MySQL and creating or deleting
+    rows is refused. Without it, the store behaves as a plain database.
+    """
+
+    def __init__(self, path, outbox=True):
+        self.outbox = outbox
+        self.lock = threading.RLock()
+        self.db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode = WAL")
+        self.db.execute("PRAGMA synchronous = FULL")
+        for table_name, columns in tables.items():
+            definitions = []
+            for name, data_type, key, nullable in columns:
+                sqlite_type = "INTEGER" if data_type in ("int", "tinyint") else "TEXT"
+                if key == "PRI":
+                    definitions.append(f"{name} INTEGER PRIMARY KEY AUTOINCREMENT")
+                else:
+                    default = " DEFAULT 0" if name in derived_columns and nullable == "NO" else ""
+                    definitions.append(f"{name} {sqlite_type}{' NOT NULL' if nullable == 'NO' else ''}{default}")
+            self.db.execute(f"CREATE TABLE IF NOT EXISTS {table_name} ({', '.join(definitions)})")
+            # Stores made before a column was added get it, nullable columns need no default
+            existing = {row["name"] for row in self.db.execute(f"PRAGMA table_info({table_name})")}
+            for (name, _, _, _), definition in zip(columns, definitions):
+                if name not in existing:
+                    self.db.execute(f"ALTER TABLE {table_name} ADD COLUMN {definition}")
+            # Foreign keys are indexed, as MySQL does
+            for name, _, key, _ in columns:
+                if key == "MUL":
+                    self.db.execute(f"CREATE INDEX IF NOT EXISTS {table_name}_{name} ON {table_name} ({name})")
+        self.db.executescript(store_schema)
+        self.db.executemany("INSERT OR IGNORE INTO game_number (n) VALUES (?)", [(n,) for n in range(1, 100)])
+        if self.db.execute("SELECT COUNT(*) FROM schema_column").fetchone()[0] == 0:
+            self.db.executemany("INSERT INTO schema_column VALUES (?, ?, ?, ?, ?, ?)",
+                                [(table_name, position, *column) for table_name, columns in tables.items()
+                                 for position, column in enumerate(columns, start=1)])
+
+    def close(self):
+        self.db.close()
+
+    @contextlib.contextmanager
+    def connection(self):
+        """
+        Yields a connection to the store, other threads wait until it is returned.
+        """
+        with self.lock:
+            cnx = LocalConnection(self)
+            try:
+                yield cnx
+            finally:
+                if self.db.in_transaction:
+                    self.db.execute("ROLLBACK")
+
+    def mirrored(self):
+        with self.lock:
+            return self.db.execute("SELECT value FROM store_info WHERE name = 'mirrored_at'").fetchone() is not None
+
+    def pending(self):
+        """
+        Returns the number of queued writes.
+        """
+        with self.lock:
+            return self.db.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+
+    def mirror(self, server_cur, db_name, full=True):
+        """
+        Copies the database's rows into the store, returns False instead while queued writes remain.
+
+        A full mirror copies every table. Otherwise only divisions whose
+        version moved since they were copied are copied again, with their
+        teams, matches, games and bracket, and players newer than the newest
+        one here are added. Edits to players already here come with the next
+        full mirror. Rows are read in batches, so an unbuffered server_cur
+        never holds a whole table.
+        """
+        server_cur.callproc("get_division_versions")
+        versions = {row["division_id_FK"]: row["version"] for row in server_cur.fetchall()}
+        while server_cur.nextset():
+            pass
+        if full:
+            server_cur.callproc("get_columns_from_schema", (db_name,))
+            columns = server_cur.fetchall()
+            while server_cur.nextset():
+                pass
+
+        with self.lock:
+            if self.pending():
+                return False
+            full = full or not self.mirrored()
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                if full:
+                    self.db.execute("DELETE FROM schema_column")
+                    self.db.executemany("INSERT INTO schema_column VALUES (?, ?, ?, ?, ?, ?)",
+                                        [(column["TABLE_NAME"], position, column["COLUMN_NAME"], column["DATA_TYPE"],
+                                          column["COLUMN_KEY"], column["IS_NULLABLE"])
+                                         for position, column in enumerate(columns, start=1)])
+                    for table_name in tables:
+                        self.db.execute(f"DELETE FROM {table_name}")
+                    self.db.execute("DELETE FROM mirrored_version")
+                copied = dict(self.db.execute("SELECT division_id_FK, version FROM mirrored_version").fetchall())
+
+                # Rows arrive with the triggers' tallies, so games go in before their matches and no games are made
+                self.db.execute("INSERT OR REPLACE INTO session_variable VALUES ('skip_create_games', 1)")
+                for table_name in catalog_tables:
+                    self.db.execute(f"DELETE FROM {table_name}")
+                    self.copy_rows(server_cur, table_name, f"SELECT * FROM {table_name}")
+                newest_player = self.db.execute("SELECT IFNULL(MAX(id), 0) FROM player").fetchone()[0]
+                self.copy_rows(server_cur, "player", "SELECT * FROM player WHERE id > %s", (newest_player,))
+
+                # Divisions copied before their version was first bumped are at version 0
+                d_ids = {row[0] for row in self.db.execute("SELECT id FROM division")}
+                changed = sorted(d_id for d_id in d_ids if copied.get(d_id) != versions.get(d_id, 0))
+                dropped = changed + [d_id for d_id in copied if d_id not in d_ids]
+                for start in range(0, len(dropped), mirror_batch_size):
+                    batch = dropped[start:start + mirror_batch_size]
+                    marks = ", ".join("?" * len(batch))
+                    self.db.execute(f"DELETE FROM game_data WHERE match_id_FK IN "
+                                    f"(SELECT id FROM match_data WHERE division_id_FK IN ({marks}))", batch)
+                    for table_name in ("match_data", "team", "bracket_match"):
+                        self.db.execute(f"DELETE FROM {table_name} WHERE division_id_FK IN ({marks})", batch)
+                    self.db.execute(f"DELETE FROM mirrored_version WHERE division_id_FK IN ({marks})", batch)
+                for start in range(0, len(changed), mirror_batch_size):
+                    batch = changed[start:start + mirror_batch_size]
+                    for table_name, query in division_tables.items():
+                        self.copy_rows(server_cur, table_name, query.format(", ".join(["%s"] * len(batch))), batch)
+                self.db.executemany("INSERT INTO mirrored_version VALUES (?, ?)",
+                                    [(d_id, versions.get(d_id, 0)) for d_id in changed])
+
+                self.db.execute("DELETE FROM session_variable")
+                self.db.execute("INSERT OR REPLACE INTO store_info VALUES ('mirrored_at', ?)",
+                                (datetime.datetime.now().isoformat(),))
+                self.db.execute("COMMIT")
+            except BaseException:
+                self.db.execute("ROLLBACK")
+                raise
+        return True
+
+    def copy_rows(self, server_cur, table_name, query, args=None):
+        """
+        Copies the rows a query reads from the database into a table, a batch at a time.
+        """
+        names = [column[0] for column in tables[table_name]]
+        insert = f"INSERT OR REPLACE INTO {table_name} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})"
+        server_cur.execute(query, args)
+        while True:
+            rows = server_cur.fetchmany(mirror_batch_size)
+            if not rows:
+                return
+            self.db.executemany(insert, [tuple(plain(row[name]) for name in names) for row in rows])
+
+    def replay(self, server_cur, batch_size=replay_batch_size, report=None):
+        """
+        Applies the queued writes to the database in order, returns a ReplayReport.
+        """
+        if report is None:
+            report = ReplayReport()
+        server = server_cur.connection
+        while True:
+            with self.lock:
+                entries = self.db.execute("SELECT * FROM outbox ORDER BY id LIMIT ?", (batch_size,)).fetchall()
+            if not entries:
+                return report
+
+            conflicts = []
+            server.begin()
+            try:
+                for entry in entries:
+                    try:
+                        conflict = self.apply(server_cur, entry, report)
+                    except Exception as e:
+                        # A lost connection ends the replay, a write the database refuses is set aside
+                        if not getattr(server, "open", True):
+                            raise
+                        conflict = (None, f"{entry['statement']} was refused: {e}")
+                    if conflict is not None:
+                        server_rows, message = conflict
+                        conflicts.append((entry, server_rows))
+                        report.conflicts.append(message)
+                server.commit()
+            except BaseException:
+                server.rollback()
+                raise
+
+            with self.lock:
+                self.db.execute("BEGIN IMMEDIATE")
+                for entry, server_rows in conflicts:
+                    self.db.execute("INSERT INTO conflict (statement, args, table_name, base_rows, result_rows, "
+                                    "server_rows, detected_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                    (entry["statement"], entry["args"], entry["table_name"], entry["base_rows"],
+                                     entry["result_rows"], json.dumps(server_rows),
+                                     datetime.datetime.now().isoformat()))
+                self.db.execute("DELETE FROM outbox WHERE id <= ?", (entries[-1]["id"],))
+                self.db.execute("COMMIT")
+
+    def apply(self, server_cur, entry, report):
+        """
+        Replays one queued write, returns (database rows, message) instead when the database changed since.
+        """
+        args = json.loads(entry["args"])
+        if entry["kind"] == "callproc":
+            server_cur.callproc(entry["statement"], args)
+            while server_cur.nextset():
+                pass
+            report.applied += 1
+            return None
+
+        if entry["base_rows"] is not None:
+            base_rows = json.loads(entry["base_rows"])
+            result_rows = json.loads(entry["result_rows"])
+            server_rows = self.server_rows(server_cur, entry["table_name"], base_rows)
+            if server_rows == result_rows:
+                # Applied by an earlier replay that stopped before clearing its entries
+                report.skipped += 1
+                return None
+            if server_rows != base_rows:
+                return server_rows, conflict_message(entry, base_rows, result_rows, server_rows)
+        server_cur.execute(entry["statement"], args or None)
+        report.applied += 1
+        return None
+
+    @staticmethod
+    def server_rows(server_cur, table_name, base_rows):
+        # The database's current values of the columns an offline update was checked on
+        if not base_rows:
+            return []
+        ids = [row["id"] for row in base_rows]
+        server_cur.execute(f"SELECT * FROM {table_name} WHERE id IN ({', '.join(['%s'] * len(ids))}) ORDER BY id",
+                           ids)
+        return plain_rows(server_cur.fetchall(), base_rows[0].keys())
+
+    def run(self, cnx, sql, args):
+        """
+        Runs one statement written for MySQL, returns (rows, lastrowid, rowcount).
+        """
+        match = re.match(r"\s*SET\s+@(\w+)\s*=\s*(.+?)\s*;?\s*$", sql, re.I | re.S)
+        if match:
+            name, value = match.groups()
+            self.queue(cnx, "execute", sql, args, lambda: self.set_variable(name, value, args))
+            return [], None, 0
+
+        statement = sqlite_statement(sql)
+        params = [plain(arg) for arg in args] if args is not None else []
+        verb = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else ""
+        if verb not in ("INSERT", "UPDATE", "DELETE", "REPLACE"):
+            cursor = self.db.execute(statement, params)
+            rows = [dict(row) for row in cursor.fetchall()]
+            return rows, cursor.lastrowid, len(rows)
+
+        if self.outbox and verb != "UPDATE":
+            raise OfflineError("Offline", "Creating and deleting rows needs the database connection, "
+                                          "please try again once it is back.")
+
+        table_name, where, where_params = update_target(statement, params) if verb == "UPDATE" else (None, None, None)
+        checked = self.outbox and table_name in conflict_tables and where is not None
+        base_rows = self.checked_rows(table_name, where, where_params) if checked else None
+
+        def apply():
+            cursor = self.db.execute(statement, params)
+            if verb == "INSERT" and cursor.rowcount > 0:
+                # MySQL reports the first id of a multi-row insert, SQLite the last
+                return cursor.lastrowid - cursor.rowcount + 1, cursor.rowcount
+            return cursor.lastrowid, cursor.rowcount
+
+        lastrowid, rowcount = self.queue(cnx, "execute", sql, args, apply, table_name, base_rows)
+        return [], lastrowid, rowcount
+
+    def call(self, cnx, name, args):
+        """
+        Runs a stored procedure, returns its result sets.
+        """
+        if name not in procedures:
+            raise OfflineError("Offline", f"{name} is not available offline.")
+        names, statements = procedures[name]
+        params = {param: plain(arg) for param, arg in zip(names, args or ())}
+        if name in write_procedures:
+            self.queue(cnx, "callproc", name, args, lambda: [self.db.execute(statement, params)
+                                                             for statement in statements])
+            return []
+        return [[dict(row) for row in self.db.execute(statement, params).fetchall()] for statement in statements]
+
+    def queue(self, cnx, kind, statement, args, apply, table_name=None, base_rows=None):
+        """
+        Applies a write and, with an outbox, queues it in the same transaction.
+        """
+        self.db.execute("SAVEPOINT queued_write")
+        try:
+            result = apply()
+            if self.outbox:
+                result_rows = None
+                if base_rows is not None:
+                    result_rows = self.checked_rows(table_name, "id IN ({})".format(", ".join("?" * len(base_rows))),
+                                                    [row["id"] for row in base_rows])
+                self.db.execute("INSERT INTO outbox (kind, statement, args, table_name, base_rows, result_rows, "
+                                "queued_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                (kind, statement, json.dumps([plain(arg) for arg in args or ()]), table_name,
+                                 None if base_rows is None else json.dumps(base_rows),
+                                 None if result_rows is None else json.dumps(result_rows),
+                                 datetime.datetime.now().isoformat()))
+            self.db.execute("RELEASE queued_write")
+        except BaseException:
+            self.db.execute("ROLLBACK TO queued_write")
+            self.db.execute("RELEASE queued_write")
+            raise
+        return result
+
+    def checked_rows(self, table_name, where, params):
+        columns = [column[0] for column in tables[table_name] if column[0] not in derived_columns]
+        rows = self.db.execute(f"SELECT {', '.join(columns)} FROM {table_name} WHERE {where} ORDER BY id", params)
+        return [dict(row) for row in rows.fetchall()]
+
+    def set_variable(self, name, value, args):
+        value = self.db.execute(f"SELECT {sqlite_statement(value)}", [plain(arg) for arg in args or ()]).fetchone()[0]
+        if value is None:
+            self.db.execute("DELETE FROM session_variable WHERE name = ?", (name,))
+        else:
+            self.db.execute("INSERT OR REPLACE INTO session_variable VALUES (?, ?)", (name, value))
+
+
+def sqlite_statement(sql):
+    # MySQL's format placeholders become SQLite's
+    return sql.replace("%s", "?")
+
+
+def update_target(statement, params):
+    """
+    Returns an UPDATE's table, WHERE clause and the parameters of the WHERE clause.
+    """
+    match = re.match(r"\s*UPDATE\s+(\w+)\s+SET\s+.*\s+WHERE\s+(.+?)\s*;?\s*$", statement, re.I | re.S)
+    if match is None:
+        match = re.match(r"\s*UPDATE\s+(\w+)\s+SET\s+", statement, re.I)
+        return match.group(1) if match else None, None, None
+    table_name, where = match.groups()
+    where_count = where.count("?")
+    return table_name, where, params[len(params) - where_count:] if where_count else []
+
+
+def conflict_message(entry, base_rows, result_rows, server_rows):
+    changed = []
+    for base, result, server in zip(base_rows, result_rows, server_rows + [None] * len(base_rows)):
+        if server is None:
+            changed.append(f"{entry['table_name']} {base['id']} was deleted")
+        else:
+            columns = [column for column in base if base[column] != server[column]]
+            values = ", ".join(f"{column} {server[column]}, not {result[column]}" for column in columns)
+            changed.append(f"{entry['table_name']} {base['id']} now has {values}")
+    return "; ".join(changed)
+
+
+class ReplayReport:
+    """
+    The outcome of a replay: writes applied, writes already applied and conflict messages.
+    """
+
+    def __init__(self):
+        self.applied = 0
+        self.skipped = 0
+        self.conflicts = []
+
+    def summary(self, max_conflicts=10):
+        lines = [f"Synced {self.applied} offline changes, {len(self.conflicts)} could not be applied."]
+        lines += self.conflicts[:max_conflicts]
+        if len(self.conflicts) > max_conflicts:
+            lines.append(f"... and {len(self.conflicts) - max_conflicts} more.")
+        return "\n".join(lines)
+
+
+class LocalConnection:
+    """
+    A connection to the store, shaped like a PyMySQL connection.
+    """
+
+    open = True
+
+    def __init__(self, store):
+        self.store = store
+
+    def cursor(self, cursor_class=None):
+        return LocalCursor(self)
+
+    def begin(self):
+        self.store.db.execute("BEGIN")
+
+    def commit(self):
+        if self.store.db.in_transaction:
+            self.store.db.execute("COMMIT")
+
+    def rollback(self):
+        if self.store.db.in_transaction:
+            self.store.db.execute("ROLLBACK")
+
+    def ping(self, reconnect=False):
+        return True
+
+    def close(self):
+        pass
+
+
+class LocalCursor:
+    """
+    A cursor on the store, shaped like a PyMySQL DictCursor.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.result_sets = []
+        self.rows = []
+        self.position = 0
+        self.lastrowid = None
+        self.rowcount = -1
+
+    def execute(self, query, args=None):
+        if isinstance(args, (str, int, float)) or args is None:
+            args = None if args is None else [args]
+        try:
+            rows, self.lastrowid, self.rowcount = self.connection.store.run(self.connection, query, list(args)
+                                                                            if args is not None else None)
+        except sqlite3.Error as e:
+            raise OfflineError(e.__class__.__name__, f"{e}") from e
+        self.show([rows])
+        return self.rowcount
+
+    def executemany(self, query, args):
+        count = 0
+        for row_args in args:
+            count += self.execute(query, row_args)
+        self.rowcount = count
+        return count
+
+    def callproc(self, procname, args=()):
+        try:
+            self.show(self.connection.store.call(self.connection, procname, list(args)))
+            self.rowcount = len(self.rows)
+        except sqlite3.Error as e:
+            raise OfflineError(e.__class__.__name__, f"{e}") from e
+        return args
+
+    def show(self, result_sets):
+        self.result_sets = list(result_sets) or [[]]
+        self.rows = self.result_sets.pop(0)
+        self.position = 0
+
+    def nextset(self):
+        if not self.result_sets:
+            return None
+        self.rows = self.result_sets.pop(0)
+        self.position = 0
+        return True
+
+    def fetchone(self):
+        if self.position >= len(self.rows):
+            return None
+        self.position += 1
+        return self.rows[self.position - 1]
+
+    def fetchmany(self, size=1):
+        rows = self.rows[self.position:self.position + size]
+        self.position += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self.rows[self.position:]
+        self.position = len(self.rows)
+        return rows
+
+    def close(self):
+        self.result_sets = []
+        self.rows = []
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+Database connection pool.
+
+Hands each thread its own connection, shared by the Tk thread and the
+background workers, and caps the connections open at once. Connections
+left idle are pinged before reuse and closed after a while, and a
+connection returned by a failed write is rolled back and has the session
+variables of bulk writes cleared.
+"""
+import contextlib
+import threading
+import time
+
+# Connections open at once
+pool_size = 4
+
+# Seconds before an idle connection is closed, and before it is pinged on checkout
+pool_idle_timeout = 300
+pool_ping_after = 30
+
+# Session variables bulk writes set around their statements, cleared again when a failed write leaves them set
+session_variables = ("skip_match_winner", "skip_create_games")
+
+
+class ConnectionPool:
+    """
+    Represents a pool of database connections.
+
+    Each thread checks out its own connection, and nested checkouts on a
+    thread reuse it. Connections idle for a while are pinged on checkout
+    and reconnect if the server dropped them, and connections idle for
+    longer than idle_timeout are closed. connect is any callable returning
+    a new connection, so the pool can run against a stand-in.
+    """
+
+    def __init__(self, connect, size=pool_size, idle_timeout=pool_idle_timeout,
+                 ping_after=pool_ping_after, clock=time.monotonic):
+        self.connect = connect
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.ping_after = ping_after
+        self.clock = clock
+
+        self.condition = threading.Condition()
+        self.idle = []
+        self.checked_out = 0
+        self.local = threading.local()
+
+    @contextlib.contextmanager
+    def connection(self):
+        cnx = getattr(self.local, "cnx", None)
+        if cnx is not None:
+            yield cnx
+            return
+
+        cnx = self.checkout()
+        self.local.cnx = cnx
+        try:
+            yield cnx
+        except Exception:
+            self.rollback(cnx)
+            raise
+        finally:
+            self.local.cnx = None
+            self.checkin(cnx)
+
+    def checkout(self):
+        with self.condition:
+            self.evict()
+            while not self.idle and self.checked_out >= self.size:
+                self.condition.wait()
+            self.checked_out += 1
+            cnx, returned_at = self.idle.pop() if self.idle else (None, None)
+
+        try:
+            if cnx is None:
+                cnx = self.connect()
+            elif self.clock() - returned_at > self.ping_after:
+                cnx.ping(reconnect=True)
+        except Exception:
+            with self.condition:
+                self.checked_out -= 1
+                self.condition.notify()
+            raise
+        return cnx
+
+    def checkin(self, cnx):
+        with self.condition:
+            self.checked_out -= 1
+            # A connection the server dropped mid-query is replaced on next checkout
+            if getattr(cnx, "open", True):
+                self.idle.append((cnx, self.clock()))
+            self.condition.notify()
+
+    def evict(self):
+        now = self.clock()
+        idle = []
+        for cnx, returned_at in self.idle:
+            if now - returned_at > self.idle_timeout:
+                self.close_connection(cnx)
+            else:
+                idle.append((cnx, returned_at))
+        self.idle = idle
+
+    def close(self):
+        with self.condition:
+            for cnx, _ in self.idle:
+                self.close_connection(cnx)
+            self.idle = []
+
+    @staticmethod
+    def rollback(cnx):
+        # A write that failed part way may have left session variables set for the connection's next user
+        try:
+            cnx.rollback()
+            with cnx.cursor() as cur:
+                cur.execute("SET " + ", ".join(f"@{name} = NULL" for name in session_variables))
+        except Exception:
+            pass
+
+    @staticmethod
+    def close_connection(cnx):
+        try:
+            cnx.close()
+        except Exception:
+            pass
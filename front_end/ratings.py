@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+Player and team ratings.
+
+Elo ratings computed by replaying every decided match in the order its
+tournament was played. A team's strength is the mean of its players'
+ratings, and both players move by the match's rating change, scored by the
+share of games each side won. Matches that share no player do not affect
+each other, so the history is split into rounds of independent matches and
+each round is rated with a few NumPy array operations.
+"""
+import numpy as np
+
+# Rating of a player without rated matches
+initial_rating = 1500.0
+
+# Largest rating change of a match, and the rating difference at which the stronger side is expected to win 10 to 1
+k_factor = 32.0
+rating_scale = 400.0
+
+player_columns = ("team1_player1", "team1_player2", "team2_player1", "team2_player2")
+
+
+def match_score(row):
+    """
+    Returns team 1's score in a decided match, the share of the games it won.
+    """
+    games = row["team1_games_won"] + row["team2_games_won"]
+    if not games:
+        return 1.0 if row["winner_id_FK"] == row["team1_id_FK"] else 0.0
+    return row["team1_games_won"] / games
+
+
+def match_rounds(players, player_count):
+    """
+    Returns each match's round, the one after the latest round any of its players played in.
+
+    players holds the four player indexes of each match, in the order the matches were played.
+    """
+    last_round = [-1] * player_count
+    rounds = []
+    for indexes in players.tolist():
+        match_round = max(last_round[index] for index in indexes) + 1
+        for index in indexes:
+            last_round[index] = match_round
+        rounds.append(match_round)
+    return np.array(rounds, dtype=np.int64)
+
+
+class RatingEngine:
+    """
+    Represents the ratings of every player who played a decided match.
+
+    Matches decided after the history was replayed are rated on top with record.
+    """
+
+    def __init__(self):
+        self.player_indexes = {}
+        self.ratings = np.empty(0)
+        self.matches_played = np.empty(0, dtype=np.int64)
+        # (winner, team 1 games won, team 2 games won) of every rated match by match id
+        self.results = {}
+        # Matches rated with record rather than in the replay
+        self.recorded = set()
+
+    @classmethod
+    def load(cls, cur):
+        """
+        Replays the match history read on cur.
+        """
+        cur.callproc("get_rating_history")
+        engine = cls()
+        engine.replay(cur.fetchall())
+        return engine
+
+    def indexes(self, p_ids):
+        """
+        Returns the players' indexes into the rating arrays, adding unrated players.
+        """
+        p_ids = np.asarray(p_ids, dtype=np.int64)
+        unique, inverse = np.unique(p_ids, return_inverse=True)
+        known = self.player_indexes
+        unique_indexes = np.empty(len(unique), dtype=np.int64)
+        added = 0
+        for position, p_id in enumerate(unique.tolist()):
+            index = known.get(p_id)
+            if index is None:
+                index = known[p_id] = len(known)
+                added += 1
+            unique_indexes[position] = index
+        if added:
+            self.ratings = np.concatenate((self.ratings, np.full(added, initial_rating)))
+            self.matches_played = np.concatenate((self.matches_played, np.zeros(added, dtype=np.int64)))
+        return unique_indexes[inverse].reshape(p_ids.shape)
+
+    def replay(self, rows):
+        """
+        Rates decided matches in the order given, a round of independent matches at a time.
+        """
+        if not rows:
+            return
+        players = self.indexes([[row[column] for column in player_columns] for row in rows])
+        scores = np.array([match_score(row) for row in rows])
+        rounds = match_rounds(players, len(self.player_indexes))
+
+        order = np.argsort(rounds, kind="stable")
+        bounds = np.flatnonzero(np.diff(rounds[order])) + 1
+        for round_matches in np.split(order, bounds):
+            self.rate(players[round_matches], scores[round_matches])
+        for row in rows:
+            self.results[row["id"]] = (row["winner_id_FK"], row["team1_games_won"], row["team2_games_won"])
+
+    def rate(self, players, scores):
+        """
+        Applies the rating changes of matches that share no player.
+        """
+        ratings = self.ratings
+        team1 = (ratings[players[:, 0]] + ratings[players[:, 1]]) / 2
+        team2 = (ratings[players[:, 2]] + ratings[players[:, 3]]) / 2
+        expected = 1 / (1 + 10 ** ((team2 - team1) / rating_scale))
+        change = k_factor * (scores - expected)
+        # A team listing the same player twice moves that player twice
+        np.add.at(ratings, players[:, 0], change)
+        np.add.at(ratings, players[:, 1], change)
+        np.add.at(ratings, players[:, 2], -change)
+        np.add.at(ratings, players[:, 3], -change)
+        np.add.at(self.matches_played, players.ravel(), 1)
+
+    def record(self, row):
+        """
+        Rates a match read with get_match_rating once it is decided.
+
+        Returns False if the match was rated with another result, the history must then be replayed again.
+        """
+        result = (row["winner_id_FK"], row["team1_games_won"], row["team2_games_won"])
+        rated = self.results.get(row["id"])
+        if rated is not None:
+            return rated == result
+        if row["winner_id_FK"] is None:
+            return True
+        self.rate(self.indexes([[row[column] for column in player_columns]]), np.array([match_score(row)]))
+        self.results[row["id"]] = result
+        self.recorded.add(row["id"])
+        return True
+
+    def player(self, p_id):
+        """
+        Returns a player's rating and rated matches.
+        """
+        index = self.player_indexes.get(p_id)
+        if index is None:
+            return initial_rating, 0
+        return float(self.ratings[index]), int(self.matches_played[index])
+
+    def team(self, p_ids):
+        """
+        Returns the rating of a team of the given players.
+        """
+        return sum(self.player(p_id)[0] for p_id in p_ids) / len(p_ids)
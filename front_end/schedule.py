@@ -0,0 +1,300 @@
+# -*- coding: utf-8 -*-
+"""
+Match schedule generation.
+
+Builds round-robin and pool play schedules for a division as rounds of
+(team1, team2) pairs and writes them to the database in bulk. Assigns the
+matches of a tournament's divisions to courts and start times, from their
+expected lengths.
+"""
+import datetime
+import heapq
+import math
+import random
+import time
+
+# Seconds a rally takes, minutes between the games of a match and before each match
+seconds_per_point = 30
+game_break_minutes = 2
+match_setup_minutes = 5
+
+# Start times are whole slots of this many minutes after the first start
+slot_minutes = 5
+
+# Waiting matches a free court looks through, in priority order
+placement_window = 64
+
+
+def round_robin(teams):
+    """
+    Pairs every team with every other team once, in rounds where each team plays at most once.
+
+    Uses the circle method: one team stays fixed while the others rotate
+    around it. With an odd number of teams one team sits out each round.
+    Each pair's team1 side goes to the team that has had it least so far.
+    """
+    teams = list(teams)
+    if len(teams) % 2:
+        teams.append(None)
+    count = len(teams)
+    team1_count = {team: 0 for team in teams}
+
+    rounds = []
+    for _ in range(count - 1):
+        pairs = []
+        for i in range(count // 2):
+            team1 = teams[i]
+            team2 = teams[count - 1 - i]
+            if team1 is None or team2 is None:
+                continue
+            if team1_count[team2] < team1_count[team1]:
+                team1, team2 = team2, team1
+            team1_count[team1] += 1
+            pairs.append((team1, team2))
+        rounds.append(pairs)
+        teams = [teams[0], teams[-1]] + teams[1:-1]
+    return rounds
+
+
+def split_pools(teams, pool_count):
+    """
+    Splits seeded teams into pools in snake order, so each pool gets a similar spread of seeds.
+    """
+    pools = [[] for _ in range(pool_count)]
+    for seed, team in enumerate(teams):
+        lap, position = divmod(seed, pool_count)
+        if lap % 2:
+            position = pool_count - 1 - position
+        pools[position].append(team)
+    return [pool for pool in pools if pool]
+
+
+def pool_play(teams, pool_count):
+    """
+    Schedules a round robin within each pool, with the pools playing their rounds side by side.
+    """
+    pool_rounds = [round_robin(pool) for pool in split_pools(teams, pool_count)]
+
+    rounds = []
+    for round_number in range(max((len(pool) for pool in pool_rounds), default=0)):
+        pairs = []
+        for pool in pool_rounds:
+            if round_number < len(pool):
+                pairs.extend(pool[round_number])
+        rounds.append(pairs)
+    return rounds
+
+
+def create_matches(cur, d_id, rounds, play_to, hard_cap, best_of):
+    """
+    Inserts the scheduled matches of a division and their games, round by round.
+
+    Runs on a cursor inside a transaction. Matches and games are written with
+    multi-row inserts, bypassing the per-match game trigger. Returns the new
+    match ids in schedule order.
+    """
+    pairs = [pair for pairs in rounds for pair in pairs]
+    if not pairs:
+        return []
+
+    # Left set by a failed insert, the variable is cleared when the connection goes back to the pool
+    cur.execute("SET @skip_create_games = 1")
+    # One statement takes consecutive ids, lastrowid being the first, where executemany may split the rows
+    cur.execute("INSERT INTO match_data (play_to, hard_cap, best_of, team1_id_FK, team2_id_FK, division_id_FK) "
+                "VALUES " + ", ".join(["(%s, %s, %s, %s, %s, %s)"] * len(pairs)),
+                [arg for team1, team2 in pairs for arg in (play_to, hard_cap, best_of, team1, team2, d_id)])
+    first_id = cur.lastrowid
+    cur.execute("SET @skip_create_games = NULL")
+    match_ids = list(range(first_id, first_id + len(pairs)))
+
+    cur.executemany("INSERT INTO game_data (team1_score, team2_score, match_id_FK) VALUES (%s, %s, %s)",
+                    [(0, 0, m_id) for m_id in match_ids for _ in range(best_of)])
+    return match_ids
+
+
+class LengthModel:
+    """
+    Represents the expected length of matches, from the games of decided matches.
+
+    A match lasts its expected games of its expected points each. Formats
+    without decided matches to go by are estimated from their rules.
+    """
+
+    def __init__(self, game_points=None, match_games=None):
+        # Mean points of a game by (play_to, hard_cap), and mean games of a match by best_of
+        self.game_points = game_points or {}
+        self.match_games = match_games or {}
+
+    @classmethod
+    def load(cls, cur):
+        cur.callproc("get_match_length_history")
+        game_points = {(row["play_to"], row["hard_cap"]): float(row["points"]) for row in cur.fetchall()}
+        cur.nextset()
+        match_games = {row["best_of"]: float(row["games"]) for row in cur.fetchall()}
+        return cls(game_points, match_games)
+
+    def points(self, play_to, hard_cap):
+        points = self.game_points.get((play_to, hard_cap))
+        if points is None:
+            # The losing side scores about two thirds of the winning side's points
+            points = play_to * 5 / 3
+            if hard_cap:
+                points = min(points, 2 * hard_cap - 1)
+        return points
+
+    def games(self, best_of):
+        games = self.match_games.get(best_of)
+        if games is None:
+            games = (best_of // 2 + 1 + best_of) / 2
+        return games
+
+    def minutes(self, play_to, hard_cap, best_of):
+        """
+        Returns a match's expected minutes on court, rounded up to whole time slots.
+        """
+        games = self.games(best_of)
+        minutes = games * self.points(play_to, hard_cap) * seconds_per_point / 60 + \
+            max(games - 1, 0) * game_break_minutes + match_setup_minutes
+        return math.ceil(minutes / slot_minutes) * slot_minutes
+
+
+def court_rounds(players):
+    """
+    Returns each match's round, the one after the latest round any of its players plays in.
+    """
+    last_round = {}
+    rounds = []
+    for match_players in players:
+        match_round = max(last_round.get(p_id, -1) for p_id in match_players) + 1
+        for p_id in match_players:
+            last_round[p_id] = match_round
+        rounds.append(match_round)
+    return rounds
+
+
+def place_matches(order, players, minutes, court_count, rest_minutes):
+    """
+    Places matches on courts in priority order, each court taking the first waiting match whose players are free.
+
+    Returns the (court, start minute) of every match, the minute the last
+    match ends and the sum of the minutes all matches end.
+    """
+    courts = [(0, court) for court in range(1, court_count + 1)]
+    heapq.heapify(courts)
+    ready = {}
+    waiting = list(order)
+    placed = [None] * len(players)
+    last_end = 0
+    total_end = 0
+    while waiting:
+        free, court = heapq.heappop(courts)
+        # The court idles until the players of the match that can start soonest are free
+        chosen = 0
+        soonest = None
+        for position in range(min(len(waiting), placement_window)):
+            match_players = players[waiting[position]]
+            start = max(ready.get(p_id, 0) for p_id in match_players) if match_players else 0
+            if soonest is None or start < soonest:
+                chosen = position
+                soonest = start
+            if start <= free:
+                break
+
+        index = waiting.pop(chosen)
+        start = max(free, soonest)
+        end = start + minutes[index]
+        placed[index] = (court, start)
+        for p_id in players[index]:
+            ready[p_id] = end + rest_minutes
+        heapq.heappush(courts, (end, court))
+        last_end = max(last_end, end)
+        total_end += end
+    return placed, last_end, total_end
+
+
+def assign_courts(players, minutes, court_count, rest_minutes=0, search_seconds=0.5, seed=0):
+    """
+    Assigns matches to courts and start minutes, so no player plays two matches at once or rests too little.
+
+    players holds each match's player ids and minutes its expected length.
+    A greedy placement in round order is improved by local search for up
+    to search_seconds, moving late matches ahead in the order and keeping
+    orders that finish sooner. Returns the (court, start minute) of every
+    match and the minute the last match ends.
+    """
+    if not players:
+        return [], 0
+    rest_minutes = math.ceil(rest_minutes / slot_minutes) * slot_minutes
+    rounds = court_rounds(players)
+    order = sorted(range(len(players)), key=lambda index: (rounds[index], -minutes[index], index))
+    placed, last_end, total_end = place_matches(order, players, minutes, court_count, rest_minutes)
+
+    generator = random.Random(seed)
+    deadline = time.perf_counter() + search_seconds
+    while time.perf_counter() < deadline:
+        candidate = list(order)
+        if generator.random() < 0.5:
+            # One of the matches that end last goes ahead of some earlier matches
+            late = [position for position, index in enumerate(candidate)
+                    if placed[index][1] + minutes[index] == last_end]
+            position = generator.choice(late)
+            target = max(0, position - generator.randint(1, placement_window))
+            candidate.insert(target, candidate.pop(position))
+        else:
+            position = generator.randrange(len(candidate))
+            other = min(len(candidate) - 1, position + generator.randint(1, placement_window))
+            candidate[position], candidate[other] = candidate[other], candidate[position]
+
+        candidate_placed, candidate_end, candidate_total = \
+            place_matches(candidate, players, minutes, court_count, rest_minutes)
+        if (candidate_end, candidate_total) <= (last_end, total_end):
+            order, placed, last_end, total_end = candidate, candidate_placed, candidate_end, candidate_total
+    return placed, last_end
+
+
+def tournament_start(tournament):
+    date, start_time = tournament["date"], tournament["time"]
+    # The offline store returns dates and times as MySQL shows them
+    if isinstance(date, str):
+        date = datetime.date.fromisoformat(date)
+    if isinstance(start_time, str):
+        hours, minutes, seconds = (int(part) for part in start_time.split(":"))
+        start_time = datetime.timedelta(hours=hours, minutes=minutes, seconds=seconds)
+    return datetime.datetime.combine(date, datetime.time()) + start_time
+
+
+def schedule_courts(cur, to_id, court_count, rest_minutes, start_time=None, search_seconds=0.5):
+    """
+    Assigns the undecided matches of a tournament's divisions to courts and start times, and saves them.
+
+    Runs on a cursor inside a transaction. Starts at start_time on the
+    tournament's date, or when the tournament starts. Returns the number of
+    matches scheduled and the time the last one is expected to end.
+    """
+    cur.callproc("view_specific_tournament", (to_id,))
+    tournament = cur.fetchone()
+    while cur.nextset():
+        pass
+    if tournament is None:
+        raise LookupError(f"Tournament {to_id} no longer exists.")
+    start = tournament_start(tournament)
+    if start_time is not None:
+        start = datetime.datetime.combine(start.date(), start_time)
+
+    length_model = LengthModel.load(cur)
+    while cur.nextset():
+        pass
+    cur.callproc("get_tournament_matches", (to_id,))
+    matches = [match for match in cur.fetchall() if match["winner_id_FK"] is None]
+    while cur.nextset():
+        pass
+
+    players = [(match["team1_player1"], match["team1_player2"], match["team2_player1"], match["team2_player2"])
+               for match in matches]
+    minutes = [length_model.minutes(match["play_to"], match["hard_cap"], match["best_of"]) for match in matches]
+    placed, last_end = assign_courts(players, minutes, court_count, rest_minutes, search_seconds)
+
+    cur.executemany("UPDATE match_data SET court = %s, start_time = %s WHERE id = %s",
+                    [(court, start + datetime.timedelta(minutes=start_minute), match["id"])
+                     for match, (court, start_minute) in zip(matches, placed)])
+    return len(matches), start + datetime.timedelta(minutes=last_end)
@@ -0,0 +1,457 @@
+# -*- coding: utf-8 -*-
+"""
+Live scoreboard server.
+
+A read-only asyncio HTTP server for spectators' phones, with the
+tournaments, division standings and match scores as JSON and as a small
+web page kept live with server-sent events. Every response comes from an
+in-memory copy of the database: one background task polls the divisions'
+change counters and reloads only the divisions that changed, so the
+database load is the same for one viewer or a thousand.
+
+    python3 scoreboard.py serve --user USER --port 8080
+    python3 scoreboard.py loadtest http://127.0.0.1:8080/api/divisions/1 --clients 1000
+
+With --sqlite PATH instead of --user the server reads a local SQLite copy
+of the schema, without a MySQL server.
+"""
+import argparse
+import asyncio
+import collections
+import getpass
+import json
+import re
+import statistics
+import sys
+import time
+import urllib.parse
+import zlib
+
+import model
+import offline
+import pymysql
+from snapshot import DivisionSnapshot
+from standings import Standings
+
+# Seconds between polls of the divisions' change counters, and between reloads of the tournament list
+refresh_interval = 2
+catalog_interval = 30
+
+# Seconds between comments on an idle event stream, which keep proxies from closing it
+keepalive_interval = 15
+
+# Largest request head read, and seconds an idle keep-alive connection stays open
+max_request_bytes = 8192
+idle_timeout = 60
+
+page = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><meta name="viewport" content="width=device-width, initial-scale=1">
+<title>Scoreboard</title>
+<style>
+body { font-family: Helvetica, sans-serif; margin: 1em; }
+table { border-collapse: collapse; width: 100%; margin-bottom: 1em; }
+td, th { border-bottom: 1px solid #ccc; padding: 0.3em; text-align: center; }
+td:nth-child(2), th:nth-child(2) { text-align: left; }
+.won { font-weight: bold; }
+</style></head>
+<body><div id="content">Loading...</div>
+<script>
+const content = document.getElementById("content");
+const entities = {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"};
+const escape = text => String(text ?? "").replace(/[&<>"]/g, c => entities[c]);
+const path = location.pathname.split("/").filter(Boolean);
+
+function showTournaments(tournaments) {
+  content.innerHTML = "<h1>Tournaments</h1>" + tournaments.map(t =>
+    `<h2>${escape(t.name)}</h2><p>${escape(t.date)} ${escape(t.time)}, ${escape(t.address)}</p><ul>` +
+    t.divisions.map(d => `<li><a href="/divisions/${d.id}">${escape(d.name)}</a></li>`).join("") + "</ul>").join("");
+}
+
+function showDivision(division) {
+  const standings = division.standings.map(r => `<tr><td>${r.rank}</td><td>${escape(r.team)}</td><td>${r.wins}</td>` +
+    `<td>${r.losses}</td><td>${r.game_differential}</td><td>${r.point_differential}</td></tr>`).join("");
+  const matches = division.matches.map(m => `<tr><td>${m.id}</td>` +
+    `<td><span class="${m.winner === m.team1 ? "won" : ""}">${escape(m.team1)}</span> vs ` +
+    `<span class="${m.winner === m.team2 ? "won" : ""}">${escape(m.team2)}</span></td>` +
+    `<td>${m.team1_games_won} - ${m.team2_games_won}</td>` +
+    `<td>${m.games.map(g => g.join("-")).join(", ")}</td></tr>`).join("");
+  content.innerHTML = `<p><a href="/">All tournaments</a></p><h1>${escape(division.name)}</h1>` +
+    "<h2>Standings</h2><table><tr><th>#</th><th>Team</th><th>W</th><th>L</th><th>Games</th><th>Points</th></tr>" +
+    standings + "</table><h2>Matches</h2><table><tr><th>Match</th><th>Teams</th><th>Games</th><th>Scores</th></tr>" +
+    matches + "</table>";
+}
+
+if (path[0] === "divisions" && path[1]) {
+  new EventSource(`/api/divisions/${path[1]}/events`).onmessage = event => showDivision(JSON.parse(event.data));
+} else {
+  fetch("/api/tournaments").then(response => response.json()).then(showTournaments);
+}
+</script></body></html>
+"""
+
+
+class Document:
+    """
+    A rendered response body, with its ETag.
+    """
+
+    __slots__ = ("body", "etag", "content_type")
+
+    def __init__(self, body, content_type="application/json"):
+        self.body = body
+        self.etag = f'"{zlib.crc32(body):08x}"'
+        self.content_type = content_type
+
+
+def json_document(value):
+    # Dates and times are shown as MySQL shows them
+    return Document(json.dumps(value, default=str, separators=(",", ":")).encode())
+
+
+class ScoreboardCache:
+    """
+    Represents the in-memory copy of the database every viewer reads.
+
+    Reads run on a worker thread over one connection, and documents are
+    rendered once per change and then served as they are.
+    """
+
+    def __init__(self, connect):
+        self.connect = connect
+        self.cnx = None
+        self.entities = model.IdentityMap()
+        self.documents = {"/": Document(page.encode(), "text/html; charset=utf-8")}
+        self.versions = {}
+        self.division_ids = set()
+        self.catalog_loaded_at = None
+        # Set and replaced whenever a division's document changes, event streams wait on it
+        self.division_events = collections.defaultdict(asyncio.Event)
+        self.queries = 0
+        self.refreshed_at = None
+
+    def cursor(self):
+        if self.cnx is None:
+            self.cnx = self.connect()
+        return self.cnx.cursor()
+
+    def read(self, catalog_due):
+        """
+        Reads what changed since the last read, returns the new documents by path.
+        """
+        documents = {}
+        cur = self.cursor()
+        try:
+            if catalog_due:
+                documents.update(self.read_catalog(cur))
+            cur.callproc("get_division_versions")
+            versions = {row["division_id_FK"]: row["version"] for row in cur.fetchall()}
+            self.queries += 1
+            # Divisions without teams or matches yet have no counter
+            changed = [d_id for d_id in sorted(self.division_ids) if f"/api/divisions/{d_id}" not in self.documents
+                       or versions.get(d_id) != self.versions.get(d_id)]
+            for d_id in changed:
+                documents[f"/api/divisions/{d_id}"] = self.read_division(cur, d_id, versions.get(d_id, 0))
+            self.versions = versions
+        finally:
+            cur.close()
+        return documents
+
+    def read_catalog(self, cur):
+        cur.callproc("view_all_tournaments")
+        tournaments = [dict(row, divisions=[]) for row in cur.fetchall()]
+        cur.execute("SELECT id, name, description, tournament_id_FK FROM division ORDER BY id")
+        divisions = cur.fetchall()
+        self.queries += 2
+
+        by_id = {tournament["id"]: tournament for tournament in tournaments}
+        for division in divisions:
+            if division["tournament_id_FK"] in by_id:
+                by_id[division["tournament_id_FK"]]["divisions"].append({"id": division["id"],
+                                                                          "name": division["name"]})
+        self.division_ids = {division["id"] for division in divisions}
+
+        documents = {"/api/tournaments": json_document(tournaments)}
+        for tournament in tournaments:
+            documents[f"/api/tournaments/{tournament['id']}"] = json_document(tournament)
+        return documents
+
+    def read_division(self, cur, d_id, version):
+        try:
+            division_snapshot = DivisionSnapshot.load(cur, d_id, self.entities)
+        except LookupError:
+            return None
+        finally:
+            self.queries += 1
+        team_names = {team.id: team.name for team in division_snapshot.teams}
+        division_standings = Standings(division_snapshot.teams, division_snapshot.matches.values(),
+                                       division_snapshot.games.values())
+        division = division_snapshot.division
+        return json_document({
+            "id": division.id, "name": division.name, "description": division.description,
+            "tournament_id": division.tournament_id_FK, "version": version,
+            "standings": [{"rank": rank, "team": record.name, "wins": record.wins, "losses": record.losses,
+                           "game_differential": record.game_differential,
+                           "point_differential": record.point_differential}
+                          for rank, record in enumerate(division_standings.ranking(), start=1)],
+            "matches": [{"id": match.id, "team1": team_names.get(match.team1_id_FK),
+                         "team2": team_names.get(match.team2_id_FK), "winner": team_names.get(match.winner_id_FK),
+                         "best_of": match.best_of, "team1_games_won": match.team1_games_won,
+                         "team2_games_won": match.team2_games_won,
+                         "games": [[game.team1_score, game.team2_score]
+                                   for game in division_snapshot.match_games[match.id]]}
+                        for match in division_snapshot.matches.values()],
+        })
+
+    async def refresh(self):
+        """
+        Keeps the documents current, reading from the database on a worker thread.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            catalog_due = self.catalog_loaded_at is None or time.monotonic() - self.catalog_loaded_at > catalog_interval
+            try:
+                documents = await loop.run_in_executor(None, self.read, catalog_due)
+            except (pymysql.err.MySQLError, offline.OfflineError, OSError) as e:
+                print(f"Refresh failed, retrying: {e}", file=sys.stderr)
+                self.close()
+            else:
+                if catalog_due:
+                    self.catalog_loaded_at = time.monotonic()
+                self.publish(documents)
+                self.refreshed_at = time.time()
+            await asyncio.sleep(refresh_interval)
+
+    def publish(self, documents):
+        for path, document in documents.items():
+            if document is None:
+                self.documents.pop(path, None)
+            else:
+                previous = self.documents.get(path)
+                self.documents[path] = document
+                if previous is not None and previous.etag == document.etag:
+                    continue
+            match = re.fullmatch(r"/api/divisions/(\d+)", path)
+            if match:
+                self.division_events.pop(int(match.group(1)), asyncio.Event()).set()
+
+    def close(self):
+        if self.cnx is not None:
+            try:
+                self.cnx.close()
+            except Exception:
+                pass
+            self.cnx = None
+
+
+class ScoreboardServer:
+    """
+    Represents the HTTP server, answering every request from the cache.
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.requests = 0
+        self.streams = 0
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), idle_timeout)
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError):
+                    return
+                lines = head.decode("latin-1").split("\r\n")
+                parts = lines[0].split()
+                if len(parts) != 3:
+                    return
+                method, target, version = parts
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                self.requests += 1
+
+                path = urllib.parse.urlsplit(target).path.rstrip("/") or "/"
+                if method not in ("GET", "HEAD"):
+                    await self.respond(writer, "405 Method Not Allowed", None, keep_alive)
+                    continue
+                match = re.fullmatch(r"/api/divisions/(\d+)/events", path)
+                if match:
+                    await self.stream(writer, int(match.group(1)))
+                    return
+                await self.respond(writer, "200 OK", self.document(path), keep_alive, method == "HEAD",
+                                   headers.get("if-none-match"))
+                if not keep_alive:
+                    return
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def document(self, path):
+        if path == "/api/status":
+            return json_document({"requests": self.requests, "streams": self.streams,
+                                  "database_queries": self.cache.queries, "refreshed_at": self.cache.refreshed_at})
+        if re.fullmatch(r"/(tournaments|divisions)/\d+", path):
+            path = "/"
+        return self.cache.documents.get(path)
+
+    async def respond(self, writer, status, document, keep_alive, head_only=False, if_none_match=None):
+        if document is None and status == "200 OK":
+            status = "404 Not Found"
+        if document is not None and if_none_match == document.etag:
+            status = "304 Not Modified"
+        body = document.body if document is not None and status == "200 OK" else b""
+        headers = [f"HTTP/1.1 {status}", f"Content-Length: {len(body)}", "Cache-Control: no-cache",
+                   "Access-Control-Allow-Origin: *", f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        if document is not None:
+            headers += [f"Content-Type: {document.content_type}", f"ETag: {document.etag}"]
+        writer.write(("\r\n".join(headers) + "\r\n\r\n").encode() + (b"" if head_only else body))
+        await writer.drain()
+
+    async def stream(self, writer, d_id):
+        """
+        Sends a division's document now and again whenever it changes, as server-sent events.
+        """
+        path = f"/api/divisions/{d_id}"
+        if path not in self.cache.documents:
+            await self.respond(writer, "404 Not Found", None, False)
+            return
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n"
+                     b"Access-Control-Allow-Origin: *\r\nConnection: close\r\n\r\n")
+        self.streams += 1
+        try:
+            while True:
+                event = self.cache.division_events[d_id]
+                document = self.cache.documents.get(path)
+                if document is None:
+                    return
+                writer.write(b"data: " + document.body + b"\n\n")
+                await writer.drain()
+                while not event.is_set():
+                    try:
+                        await asyncio.wait_for(event.wait(), keepalive_interval)
+                    except asyncio.TimeoutError:
+                        writer.write(b": keep-alive\n\n")
+                        await writer.drain()
+        finally:
+            self.streams -= 1
+
+
+async def serve(connect, host, port):
+    cache = ScoreboardCache(connect)
+    server = ScoreboardServer(cache)
+    refresh = asyncio.ensure_future(cache.refresh())
+    listener = await asyncio.start_server(server.handle, host, port, limit=max_request_bytes)
+    print(f"Serving the scoreboard on http://{host}:{port}/", file=sys.stderr)
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        refresh.cancel()
+        cache.close()
+
+
+async def load_test(url, clients, requests, streams):
+    """
+    Sends requests GETs over clients keep-alive connections while streams event streams stay open.
+    """
+    parts = urllib.parse.urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    target = parts.path or "/"
+    request = f"GET {target} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode()
+    latencies = []
+    failures = 0
+
+    async def client(count):
+        nonlocal failures
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+        except OSError:
+            failures += count
+            return
+        try:
+            for _ in range(count):
+                start = time.perf_counter()
+                writer.write(request)
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = int(re.search(rb"Content-Length: (\d+)", head).group(1))
+                await reader.readexactly(length)
+                latencies.append(time.perf_counter() - start)
+        except (OSError, asyncio.IncompleteReadError):
+            failures += 1
+        finally:
+            writer.close()
+
+    async def listener():
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+        except OSError:
+            return
+        match = re.fullmatch(r"(/api/divisions/\d+).*", target)
+        writer.write(f"GET {match.group(1) if match else target}/events HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+        try:
+            while await reader.read(65536):
+                pass
+        except OSError:
+            pass
+
+    listeners = [asyncio.ensure_future(listener()) for _ in range(streams)]
+    start = time.perf_counter()
+    per_client, extra = divmod(requests, clients)
+    await asyncio.gather(*(client(per_client + (index < extra)) for index in range(clients)))
+    elapsed = time.perf_counter() - start
+    for task in listeners:
+        task.cancel()
+
+    latencies.sort()
+    return {"url": url, "clients": clients, "streams": streams, "requests": len(latencies), "failures": failures,
+            "seconds": round(elapsed, 3), "requests_per_second": round(len(latencies) / elapsed, 1),
+            "median_ms": round(statistics.median(latencies) * 1000, 3) if latencies else None,
+            "p99_ms": round(latencies[int(0.99 * (len(latencies) - 1))] * 1000, 3) if latencies else None}
+
+
+def scoreboard_command():
+    from main import host, db_name
+
+    parser = argparse.ArgumentParser(description="Serve live scores to spectators, or load test the server.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve_parser = commands.add_parser("serve")
+    backend = serve_parser.add_mutually_exclusive_group(required=True)
+    backend.add_argument("--user", help="MySQL user")
+    backend.add_argument("--sqlite", metavar="PATH", help="read a SQLite copy of the schema instead of MySQL")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="address to listen on, 0.0.0.0 for every network")
+    serve_parser.add_argument("--port", type=int, default=8080)
+    test_parser = commands.add_parser("loadtest")
+    test_parser.add_argument("url")
+    test_parser.add_argument("--clients", type=int, default=100, help="concurrent keep-alive connections")
+    test_parser.add_argument("--requests", type=int, default=10000)
+    test_parser.add_argument("--streams", type=int, default=0, help="event streams held open meanwhile")
+    args = parser.parse_args()
+
+    if args.command == "loadtest":
+        result = asyncio.run(load_test(args.url, args.clients, args.requests, args.streams))
+        json.dump(result, sys.stdout, indent=2)
+        print()
+        return
+
+    if args.user is not None:
+        password = getpass.getpass()
+
+        def connect():
+            return pymysql.connect(host=host, user=args.user, password=password, db=db_name, charset='utf8mb4',
+                                   cursorclass=pymysql.cursors.DictCursor, autocommit=True)
+    else:
+        store = offline.LocalStore(args.sqlite, outbox=False)
+
+        def connect():
+            return offline.LocalConnection(store)
+    try:
+        asyncio.run(serve(connect, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    scoreboard_command()
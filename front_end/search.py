@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""
+Player, team and school search.
+
+An in-memory index over names, school names and phone numbers, loaded
+with one get_search_entries call and then kept current as rows are
+created, updated and deleted. Queries match word prefixes first and fall
+back to trigram similarity for misspellings.
+"""
+import bisect
+import collections
+import heapq
+import re
+
+# Share of trigrams a fuzzy match must have in common with the query
+min_similarity = 0.3
+
+# Tables with indexed rows, and tables whose deletes cascade to indexed rows
+indexed_tables = {"school", "player", "team"}
+cascading_tables = {"tournament", "division"}
+
+
+def words(text):
+    """
+    Returns the lowercase words of a text, with phone numbers also as one run of digits.
+    """
+    if not text:
+        return []
+    text = str(text).lower()
+    found = re.findall(r"[a-z0-9]+", text)
+    digits = re.sub(r"[^0-9]", "", text)
+    if len(found) > 1 and len(digits) >= 7:
+        found.append(digits)
+    return found
+
+
+def trigrams(word):
+    word = f"  {word} "
+    return {word[i:i + 3] for i in range(len(word) - 2)}
+
+
+class Entry:
+    """
+    An indexed player, team or school.
+    """
+
+    __slots__ = ("kind", "id", "name", "school_id", "phone", "player_ids")
+
+    def __init__(self, kind, row_id, name, school_id=None, phone=None, player_ids=()):
+        self.kind = kind
+        self.id = row_id
+        self.name = name
+        self.school_id = school_id
+        self.phone = phone
+        self.player_ids = tuple(player_ids)
+
+    @property
+    def key(self):
+        return self.kind, self.id
+
+
+class SearchIndex:
+    """
+    The search index of a session.
+    """
+
+    def __init__(self, rows=()):
+        self.entries = {}
+        self.entry_words = {}
+        # Sorted distinct words, the entries each word appears in and the words each trigram appears in
+        self.words = []
+        self.word_entries = collections.defaultdict(set)
+        self.trigram_words = collections.defaultdict(set)
+        for row in rows:
+            self.add(self.entry_from_row(row))
+
+    @classmethod
+    def load(cls, cur):
+        cur.callproc("get_search_entries")
+        return cls(cur.fetchall())
+
+    @staticmethod
+    def entry_from_row(row):
+        return Entry(row["kind"], row["id"], row["name"], row["school_id"], row["phone_number"],
+                     [p_id for p_id in (row["player1_id"], row["player2_id"]) if p_id is not None])
+
+    def searchable_words(self, entry):
+        found = words(entry.name) + words(entry.phone)
+        school = self.entries.get(("school", entry.school_id))
+        if school is not None:
+            found += words(school.name)
+        return set(found)
+
+    def add(self, entry):
+        self.remove(entry.kind, entry.id)
+        self.entries[entry.key] = entry
+        entry_words = self.searchable_words(entry)
+        self.entry_words[entry.key] = entry_words
+        for word in entry_words:
+            if not self.word_entries[word]:
+                bisect.insort(self.words, word)
+                # Numbers are only matched by prefix
+                if not word.isdigit():
+                    for trigram in trigrams(word):
+                        self.trigram_words[trigram].add(word)
+            self.word_entries[word].add(entry.key)
+
+    def remove(self, kind, row_id):
+        key = (kind, row_id)
+        if key not in self.entries:
+            return
+        del self.entries[key]
+        for word in self.entry_words.pop(key):
+            self.word_entries[word].discard(key)
+            if not self.word_entries[word]:
+                del self.word_entries[word]
+                del self.words[bisect.bisect_left(self.words, word)]
+                if not word.isdigit():
+                    for trigram in trigrams(word):
+                        self.trigram_words[trigram].discard(word)
+
+    def record(self, table_name, row_id, values):
+        """
+        Indexes a created or updated row from its column values.
+        """
+        if table_name == "player":
+            self.add(Entry("player", row_id, values.get("name"), as_id(values.get("school_id_FK")),
+                           values.get("phone_number")))
+        elif table_name == "team":
+            self.add(Entry("team", row_id, values.get("name"),
+                           player_ids=[as_id(values.get(field)) for field in ("player1_id_FK", "player2_id_FK")]))
+        elif table_name == "school":
+            self.add(Entry("school", row_id, values.get("name")))
+            # A school's players are found by its name too
+            for entry in list(self.entries.values()):
+                if entry.kind == "player" and entry.school_id == row_id:
+                    self.add(entry)
+
+    def label(self, entry):
+        """
+        Returns the text a search result is shown with.
+        """
+        details = []
+        if entry.kind == "player":
+            school = self.entries.get(("school", entry.school_id))
+            details = [school.name if school is not None else None, entry.phone]
+        elif entry.kind == "team":
+            details = [" & ".join(self.entries[("player", p_id)].name for p_id in entry.player_ids
+                                  if ("player", p_id) in self.entries)]
+        details = [detail for detail in details if detail]
+        return f"{entry.name} ({', '.join(details)})" if details else f"{entry.name}"
+
+    def prefixed_words(self, query_word):
+        index = bisect.bisect_left(self.words, query_word)
+        while index < len(self.words) and self.words[index].startswith(query_word):
+            yield self.words[index]
+            index += 1
+
+    def similar_words(self, query_word):
+        """
+        Returns the indexed words like a query word: 1 for words it starts, else the share of trigrams in common.
+        """
+        similar = {word: 1.0 for word in self.prefixed_words(query_word)}
+        if query_word.isdigit():
+            return similar
+
+        query_trigrams = trigrams(query_word)
+        shared = collections.Counter()
+        for trigram in query_trigrams:
+            shared.update(self.trigram_words.get(trigram, ()))
+        for word, count in shared.items():
+            if word not in similar:
+                similarity = count / (len(query_trigrams) + len(trigrams(word)) - count)
+                if similarity >= min_similarity:
+                    similar[word] = similarity
+        return similar
+
+    def search(self, text, kind=None, limit=10):
+        """
+        Returns up to limit entries like every word of text, prefix matches first and then the closest fuzzy matches.
+        """
+        query_words = words(text)
+        if not query_words:
+            return []
+        # A partly typed phone number is looked up as one run of digits
+        if all(query_word.isdigit() for query_word in query_words):
+            query_words = ["".join(query_words)]
+        query_words = set(query_words)
+
+        # Every query word starts a word of the entry, a single word is matched in word order until limit
+        if len(query_words) == 1:
+            matched = {}
+            for word in self.prefixed_words(next(iter(query_words))):
+                for key in self.word_entries[word]:
+                    if len(matched) == limit:
+                        break
+                    if kind is None or key[0] == kind:
+                        matched.setdefault(key, None)
+            results = [self.entries[key] for key in matched]
+        else:
+            matched = None
+            for query_word in query_words:
+                keys = set()
+                for word in self.prefixed_words(query_word):
+                    keys.update(self.word_entries[word])
+                matched = keys if matched is None else matched & keys
+            if kind is not None:
+                matched = {key for key in matched if key[0] == kind}
+            results = heapq.nsmallest(limit, (self.entries[key] for key in matched),
+                                      key=lambda entry: (len(entry.name), entry.name))
+        if len(results) == limit or all(query_word.isdigit() for query_word in query_words):
+            return results
+
+        # Every query word is like a word of the entry, an entry scores its best word for each
+        scores = None
+        for query_word in query_words:
+            word_scores = {}
+            for word, similarity in self.similar_words(query_word).items():
+                for key in self.word_entries[word]:
+                    if (kind is None or key[0] == kind) and word_scores.get(key, 0) < similarity:
+                        word_scores[key] = similarity
+            if scores is None:
+                scores = word_scores
+            else:
+                scores = {key: scores[key] + similarity for key, similarity in word_scores.items() if key in scores}
+
+        fuzzy = heapq.nsmallest(limit - len(results), (key for key in scores if key not in matched),
+                                key=lambda key: (-scores[key], self.entries[key].name))
+        return results + [self.entries[key] for key in fuzzy]
+
+
+def as_id(value):
+    return int(value) if value not in (None, '') else None
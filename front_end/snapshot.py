@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Division snapshots.
+
+A snapshot is a division with its teams, their players, its matches and
+their games, read with one get_division_snapshot call and kept in memory
+for the division's pages to share.
+"""
+import bisect
+import collections
+
+import model
+from standings import game_winner, match_winner
+
+
+class DivisionSnapshot:
+    """
+    The in-memory graph of a division's entities.
+    """
+
+    def __init__(self, division, teams, players, matches, games):
+        self.division = division
+        self.teams = teams
+        self.team_ids = [team.id for team in teams]
+        self.players = {player.id: player for player in players}
+        self.matches = {match.id: match for match in matches}
+        self.games = {game.id: game for game in games}
+        self.match_games = collections.defaultdict(list)
+        for game in games:
+            self.match_games[game.match_id_FK].append(game)
+
+    @classmethod
+    def load(cls, cur, d_id, entities):
+        """
+        Reads a division on cur, its rows become entities of the entities identity map.
+        """
+        cur.callproc("get_division_snapshot", (d_id,))
+        result_sets = [cur.fetchall()]
+        for _ in range(4):
+            cur.nextset()
+            result_sets.append(cur.fetchall())
+        division, teams, players, matches, games = result_sets
+        if not division:
+            raise LookupError(f"Division {d_id} no longer exists.")
+        return cls(entities.load(model.Division, division[0]), entities.load_all(model.Team, teams),
+                   entities.load_all(model.Player, players), entities.load_all(model.Match, matches),
+                   entities.load_all(model.Game, games))
+
+    def teams_page(self, after_id, limit):
+        """
+        Returns up to limit teams ordered by id, starting after after_id.
+        """
+        start = bisect.bisect_right(self.team_ids, after_id)
+        return self.teams[start:start + limit]
+
+    def team_players(self, team):
+        return [self.players[p_id] for p_id in team.player_ids if p_id in self.players]
+
+    def apply_games(self, scores):
+        """
+        Applies committed (team1_score, team2_score, game id) changes, and the match tallies they change.
+        """
+        matches = set()
+        for team1_score, team2_score, g_id in scores:
+            game = self.games.get(g_id)
+            if game is not None:
+                game.team1_score = team1_score
+                game.team2_score = team2_score
+                matches.add(game.match_id_FK)
+
+        # Mirrors the game triggers' tallies and the update_match_winner procedure
+        for m_id in matches:
+            match = self.matches[m_id]
+            won = collections.Counter(game_winner(game.team1_score, game.team2_score)
+                                      for game in self.match_games[m_id])
+            match.team1_games_won = won[1]
+            match.team2_games_won = won[2]
+            match.winner_id_FK = match_winner(match.team1_id_FK, match.team2_id_FK, match.best_of, won[1], won[2],
+                                              match.winner_id_FK)
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+Division standings.
+
+Standings are built once from a division's team, match and game entities, then
+kept current by applying single game score changes as deltas.
+"""
+import collections
+import itertools
+
+
+class TeamRecord:
+    """
+    A team's match and game record within a division.
+    """
+
+    def __init__(self, te_id, name):
+        self.te_id = te_id
+        self.name = name
+        self.wins = 0
+        self.losses = 0
+        self.games_won = 0
+        self.games_lost = 0
+        self.points_for = 0
+        self.points_against = 0
+
+    @property
+    def game_differential(self):
+        return self.games_won - self.games_lost
+
+    @property
+    def point_differential(self):
+        return self.points_for - self.points_against
+
+
+class MatchTally:
+    """
+    The games won by each side of a match, and the winner they decide.
+    """
+
+    def __init__(self, team1, team2, best_of):
+        self.team1 = team1
+        self.team2 = team2
+        self.best_of = best_of
+        self.team1_games_won = 0
+        self.team2_games_won = 0
+        self.winner = None
+
+    def decided_winner(self):
+        return match_winner(self.team1, self.team2, self.best_of, self.team1_games_won, self.team2_games_won)
+
+
+def game_winner(team1_score, team2_score):
+    """
+    Returns 1 or 2 for the side that won a game, or None for an unplayed or tied game.
+    """
+    if team1_score is None or team2_score is None or team1_score == team2_score:
+        return None
+    return 1 if team1_score > team2_score else 2
+
+
+def match_winner(team1, team2, best_of, team1_games_won, team2_games_won, recorded=None):
+    """
+    Returns the team that has won the majority of a match's games, as the update_match_winner procedure does.
+
+    Without a majority the recorded winner, entered by hand for a forfeit or retirement, stands unless it has won
+    fewer games than the other team.
+    """
+    if team1_games_won > best_of // 2:
+        return team1
+    if team2_games_won > best_of // 2:
+        return team2
+    if recorded == team1 and team1_games_won >= team2_games_won:
+        return team1
+    if recorded == team2 and team2_games_won >= team1_games_won:
+        return team2
+    return None
+
+
+class Standings:
+    """
+    The standings of a division.
+
+    Ranks teams by match wins, then head-to-head wins among the tied teams,
+    then game differential, then point differential.
+    """
+
+    def __init__(self, teams, matches, games):
+        self.records = {team.id: TeamRecord(team.id, team.name) for team in teams}
+        self.matches = {}
+        self.games = {}
+        # (winner, loser) -> matches won
+        self.head_to_head = collections.Counter()
+
+        for match in matches:
+            self.matches[match.id] = MatchTally(match.team1_id_FK, match.team2_id_FK, match.best_of)
+        # A full load is every game applied to empty records
+        for game in games:
+            if game.match_id_FK in self.matches:
+                self.games[game.id] = (game.match_id_FK, None, None)
+                self.apply_game(game.id, game.team1_score, game.team2_score)
+
+    def record(self, te_id):
+        if te_id not in self.records:
+            self.records[te_id] = TeamRecord(te_id, f"Team {te_id}")
+        return self.records[te_id]
+
+    def apply_games(self, scores):
+        """
+        Applies committed (team1_score, team2_score, game id) changes.
+        """
+        for team1_score, team2_score, g_id in scores:
+            self.apply_game(g_id, team1_score, team2_score)
+
+    def apply_game(self, g_id, team1_score, team2_score):
+        """
+        Applies one game's new scores, games of other divisions are ignored.
+        """
+        if g_id not in self.games:
+            return
+        m_id, old_team1_score, old_team2_score = self.games[g_id]
+        match = self.matches[m_id]
+        self.count_game(match, old_team1_score, old_team2_score, -1)
+        self.games[g_id] = (m_id, team1_score, team2_score)
+        self.count_game(match, team1_score, team2_score, 1)
+        self.settle(match)
+
+    def count_game(self, match, team1_score, team2_score, sign):
+        team1 = self.record(match.team1)
+        team2 = self.record(match.team2)
+        team1.points_for += sign * (team1_score or 0)
+        team1.points_against += sign * (team2_score or 0)
+        team2.points_for += sign * (team2_score or 0)
+        team2.points_against += sign * (team1_score or 0)
+
+        winner = game_winner(team1_score, team2_score)
+        if winner == 1:
+            match.team1_games_won += sign
+            team1.games_won += sign
+            team2.games_lost += sign
+        elif winner == 2:
+            match.team2_games_won += sign
+            team2.games_won += sign
+            team1.games_lost += sign
+
+    def settle(self, match):
+        # Moves the match win when the games won change who has won the match
+        winner = match.decided_winner()
+        if winner == match.winner:
+            return
+        for te_id, sign in ((match.winner, -1), (winner, 1)):
+            if te_id is not None:
+                loser = match.team2 if te_id == match.team1 else match.team1
+                self.record(te_id).wins += sign
+                self.record(loser).losses += sign
+                self.head_to_head[(te_id, loser)] += sign
+        match.winner = winner
+
+    def ranking(self):
+        """
+        Returns the team records in standings order.
+        """
+        records = sorted(self.records.values(), key=lambda record: -record.wins)
+        ranked = []
+        for _, group in itertools.groupby(records, key=lambda record: record.wins):
+            group = list(group)
+            tied = {record.te_id for record in group}
+            head_to_head = {record.te_id: sum(self.head_to_head[(record.te_id, other)] for other in tied)
+                            for record in group}
+            group.sort(key=lambda record: (-head_to_head[record.te_id], -record.game_differential,
+                                           -record.point_differential, record.name))
+            ranked.extend(group)
+        return ranked
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+Tests that the migrations bring the original schema's routines up to queries.sql, without a MySQL server.
+"""
+import os
+import re
+
+import migrate
+
+back_end = os.path.dirname(migrate.migrations_path)
+
+# Procedures of the original dump that no later change touched, so no migration defines them
+original_routines = {
+    "get_columns_from_table", "get_players_from_school", "view_all_division_matches", "view_all_division_teams",
+    "view_all_match_games", "view_all_players", "view_all_schools", "view_all_tournament_divisions",
+    "view_all_tournaments", "view_specific_division", "view_specific_game", "view_specific_match",
+    "view_specific_player", "view_specific_school", "view_specific_tournament",
+}
+
+
+def routines(text):
+    """
+    Returns the procedures and triggers a script creates by name, with their whitespace-normalized definitions.
+    """
+    statements = migrate.split_statements(text)
+    found = {}
+    for statement in statements:
+        match = re.match(r"create\s+(?:procedure|trigger)\s+(\w+)", statement, re.I)
+        if match:
+            found[match.group(1)] = " ".join(statement.split())
+    return found
+
+
+def read(*parts):
+    with open(os.path.join(back_end, *parts), encoding="utf-8") as file:
+        return file.read()
+
+
+def test_migrations_leave_every_routine_as_queries_defines_it():
+    migrated = {}
+    for _, _, file_path in migrate.migrations():
+        with open(file_path, encoding="utf-8") as file:
+            migrated.update(routines(file.read()))
+
+    for name, definition in routines(read("queries.sql")).items():
+        if name in original_routines:
+            assert name not in migrated, name
+        else:
+            assert migrated.get(name) == definition, name
+
+
+def test_migrations_are_numbered_in_order():
+    versions = [version for version, _, _ in migrate.migrations()]
+    assert versions == list(range(1, len(versions) + 1))
+
+
+def test_fresh_schemas_record_every_migration():
+    expected = {(version, name) for version, name, _ in migrate.migrations()}
+    create = re.search(r"INSERT INTO schema_migration .*?;", read("create.sql"), re.S).group(0)
+    dump = re.search(r"INSERT INTO `schema_migration` VALUES .*?;", read("dump.sql")).group(0)
+    assert {(int(version), name) for version, name in re.findall(r"\((\d+), '(\w+)'", create)} == expected
+    assert {(int(version), name) for version, name in re.findall(r"\((\d+),'(\w+)'", dump)} == expected
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the domain model's entities and identity map.
+"""
+import gc
+
+import pytest
+
+import model
+
+
+def team_row(name="Aces", **values):
+    return dict({"id": 1, "name": name, "division_id_FK": 1, "player1_id_FK": 1, "player2_id_FK": 2}, **values)
+
+
+def test_load_returns_one_entity_per_row():
+    entities = model.IdentityMap()
+
+    team = entities.load(model.Team, team_row())
+    teams = entities.load_all(model.Team, [team_row(), team_row("Blocks", id=2)])
+
+    assert teams[0] is team
+    assert teams[1] is not team
+    assert entities.get(model.Team, 1) is team
+    # Ids are per table
+    assert entities.get(model.Player, 1) is None
+    assert len(entities) == 2
+
+
+def test_loading_a_row_again_updates_its_entity_in_place():
+    entities = model.IdentityMap()
+    team = entities.load(model.Team, team_row())
+
+    entities.load(model.Team, team_row("Smashers", player2_id_FK=3))
+    # Columns the row leaves out keep their values
+    entities.load(model.Team, {"id": 1, "division_id_FK": 2})
+
+    assert (team.name, team.player_ids, team.division_id_FK) == ("Smashers", (1, 3), 2)
+    assert team["name"] == "Smashers"
+
+
+def test_forgotten_rows_get_a_new_entity():
+    entities = model.IdentityMap()
+    team = entities.load(model.Team, team_row())
+
+    entities.forget(model.Team, 1)
+    entities.forget(model.Team, 1)
+
+    assert entities.get(model.Team, 1) is None
+    loaded = entities.load(model.Team, team_row("Blocks"))
+    assert loaded is not team
+    assert team.name == "Aces"
+
+
+def test_entities_no_one_holds_are_dropped():
+    entities = model.IdentityMap()
+    team = entities.load(model.Team, team_row())
+    entities.load(model.Team, team_row("Blocks", id=2))
+    gc.collect()
+
+    assert len(entities) == 1
+    assert entities.get(model.Team, 1) is team
+    assert entities.get(model.Team, 2) is None
+
+
+def test_entities_only_hold_their_columns():
+    team = model.Team(ranking=3, **team_row())
+
+    assert team.as_row() == team_row()
+    assert not hasattr(team, "ranking")
+    assert not hasattr(team, "__dict__")
+    with pytest.raises(AttributeError):
+        team.ranking = 3
+    with pytest.raises(KeyError):
+        team["ranking"]
+
+
+def test_every_table_has_its_entity_type():
+    assert set(model.entity_types) == {"tournament", "division", "school", "player", "team", "match_data", "game_data"}
+    for table_name, entity_type in model.entity_types.items():
+        assert entity_type.table_name == table_name
+        assert entity_type.__slots__ == entity_type.columns
+        assert repr(entity_type(id=7)) == f"{entity_type.__name__}(7)"
@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the offline store, against SQLite files standing in for both the laptop and the database.
+"""
+import pytest
+
+import offline
+
+update_game = "UPDATE game_data SET team1_score = %s, team2_score = %s WHERE id = %s"
+
+
+class Crash(Exception):
+    """
+    The laptop going down at an awkward moment.
+    """
+
+
+class ServerConnection:
+    """
+    A database connection on a SQLite store without an outbox, counting its transactions.
+
+    drop_after ends the connection after that many statements, crash_on_commit
+    raises once the database has committed, before the laptop hears of it.
+    """
+
+    def __init__(self, store, drop_after=None, crash_on_commit=False):
+        self.local = offline.LocalConnection(store)
+        self.drop_after = drop_after
+        self.crash_on_commit = crash_on_commit
+        self.open = True
+        self.statements = 0
+        self.transactions = 0
+
+    def cursor(self):
+        return ServerCursor(self)
+
+    def begin(self):
+        self.transactions += 1
+        self.local.begin()
+
+    def commit(self):
+        self.local.commit()
+        if self.crash_on_commit:
+            raise Crash()
+
+    def rollback(self):
+        self.local.rollback()
+
+
+class ServerCursor:
+    """
+    A cursor on a ServerConnection.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.cur = connection.local.cursor()
+
+    def run(self, method, *args):
+        self.connection.statements += 1
+        if self.connection.drop_after is not None and self.connection.statements > self.connection.drop_after:
+            self.connection.open = False
+            raise ConnectionError("Lost connection to the database")
+        return method(*args)
+
+    def execute(self, query, args=None):
+        return self.run(self.cur.execute, query, args)
+
+    def callproc(self, procname, args=()):
+        return self.run(self.cur.callproc, procname, args)
+
+    def __getattr__(self, name):
+        return getattr(self.cur, name)
+
+
+@pytest.fixture
+def server(tmp_path):
+    store = offline.LocalStore(str(tmp_path / "server.db"), outbox=False)
+    cur = offline.LocalConnection(store).cursor()
+    cur.execute("INSERT INTO tournament (name, date, time, address) VALUES ('Open', '2026-10-18', '09:00:00', 'Hall')")
+    cur.execute("INSERT INTO division (name, tournament_id_FK) VALUES ('Mixed', 1)")
+    cur.executemany("INSERT INTO player (name) VALUES (%s)", [("Ann",), ("Bo",), ("Cy",), ("Di",)])
+    cur.executemany("INSERT INTO team (name, division_id_FK, player1_id_FK, player2_id_FK) VALUES (%s, 1, %s, %s)",
+                    [("Aces", 1, 2), ("Blocks", 3, 4)])
+    # The insert trigger makes the match's three games
+    cur.execute("INSERT INTO match_data (play_to, best_of, team1_id_FK, team2_id_FK, division_id_FK) "
+                "VALUES (21, 3, 1, 2, 1)")
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def store(tmp_path, server):
+    store = offline.LocalStore(str(tmp_path / "offline.db"))
+    assert store.mirror(ServerConnection(server).cursor(), "tm")
+    yield store
+    store.close()
+
+
+def server_row(server, query, args=None):
+    cur = offline.LocalConnection(server).cursor()
+    cur.execute(query, args)
+    return cur.fetchone()
+
+
+def test_replay_applies_queued_updates_in_batches(server, store):
+    with store.connection() as cnx:
+        cur = cnx.cursor()
+        cur.execute(update_game, (21, 15, 1))
+        cur.execute(update_game, (18, 21, 2))
+        cur.execute(update_game, (21, 19, 3))
+    assert store.pending() == 3
+
+    connection = ServerConnection(server)
+    report = store.replay(connection.cursor(), batch_size=2)
+
+    assert (report.applied, report.skipped, report.conflicts) == (3, 0, [])
+    assert connection.transactions == 2
+    assert store.pending() == 0
+    match = server_row(server, "SELECT * FROM match_data WHERE id = 1")
+    assert (match["team1_games_won"], match["team2_games_won"], match["winner_id_FK"]) == (2, 1, 1)
+
+
+def test_conflicting_game_edit_is_set_aside(server, store):
+    with store.connection() as cnx:
+        cnx.cursor().execute(update_game, (21, 10, 1))
+    offline.LocalConnection(server).cursor().execute(update_game, (15, 21, 1))
+
+    report = store.replay(ServerConnection(server).cursor())
+
+    assert report.applied == 0
+    assert len(report.conflicts) == 1
+    assert store.pending() == 0
+    game = server_row(server, "SELECT * FROM game_data WHERE id = 1")
+    assert (game["team1_score"], game["team2_score"]) == (15, 21)
+    conflict = store.db.execute("SELECT * FROM conflict").fetchone()
+    assert conflict["table_name"] == "game_data"
+    assert '"team1_score": 15' in conflict["server_rows"]
+
+
+def test_queued_writes_survive_a_crash_before_replay(tmp_path, server, store):
+    with store.connection() as cnx:
+        cnx.cursor().execute(update_game, (21, 12, 1))
+    # Nothing but the SQLite file outlives the crash
+    store.close()
+
+    reopened = offline.LocalStore(str(tmp_path / "offline.db"))
+    try:
+        assert reopened.pending() == 1
+        game = reopened.db.execute("SELECT * FROM game_data WHERE id = 1").fetchone()
+        assert (game["team1_score"], game["team2_score"]) == (21, 12)
+
+        report = reopened.replay(ServerConnection(server).cursor())
+        assert (report.applied, report.conflicts) == (1, [])
+    finally:
+        reopened.close()
+    game = server_row(server, "SELECT * FROM game_data WHERE id = 1")
+    assert (game["team1_score"], game["team2_score"]) == (21, 12)
+
+
+def test_replay_after_a_crash_past_the_commit_skips_applied_writes(tmp_path, server, store):
+    with store.connection() as cnx:
+        cnx.cursor().execute(update_game, (21, 12, 1))
+    with pytest.raises(Crash):
+        store.replay(ServerConnection(server, crash_on_commit=True).cursor())
+    store.close()
+
+    reopened = offline.LocalStore(str(tmp_path / "offline.db"))
+    try:
+        assert reopened.pending() == 1
+        report = reopened.replay(ServerConnection(server).cursor())
+        assert (report.applied, report.skipped, report.conflicts) == (0, 1, [])
+        assert reopened.pending() == 0
+    finally:
+        reopened.close()
+
+
+def test_lost_connection_keeps_the_batch_queued(server, store):
+    with store.connection() as cnx:
+        cur = cnx.cursor()
+        cur.execute(update_game, (21, 15, 1))
+        cur.execute(update_game, (21, 16, 2))
+
+    # Each update reads the database's rows before it is applied
+    with pytest.raises(ConnectionError):
+        store.replay(ServerConnection(server, drop_after=3).cursor())
+
+    assert store.pending() == 2
+    game = server_row(server, "SELECT * FROM game_data WHERE id = 1")
+    assert (game["team1_score"], game["team2_score"]) == (0, 0)
+
+
+@pytest.mark.parametrize("statement, args", [
+    ("INSERT INTO player (name) VALUES (%s)", ("Ed",)),
+    ("DELETE FROM game_data WHERE id = %s", (1,)),
+])
+def test_offline_inserts_and_deletes_are_refused(store, statement, args):
+    with store.connection() as cnx:
+        with pytest.raises(offline.OfflineError):
+            cnx.cursor().execute(statement, args)
+
+    assert store.pending() == 0
+    assert store.db.execute("SELECT COUNT(*) FROM player").fetchone()[0] == 4
+    assert store.db.execute("SELECT COUNT(*) FROM game_data").fetchone()[0] == 3
+
+
+def test_mirror_waits_for_queued_writes(server, store):
+    with store.connection() as cnx:
+        cnx.cursor().execute(update_game, (21, 15, 1))
+
+    assert not store.mirror(ServerConnection(server).cursor(), "tm", full=False)
+    assert store.db.execute("SELECT team1_score FROM game_data WHERE id = 1").fetchone()[0] == 21
+
+
+def test_mirror_copies_only_changed_divisions(server, store):
+    cur = offline.LocalConnection(server).cursor()
+    cur.execute("INSERT INTO division (name, tournament_id_FK) VALUES ('Open', 1)")
+    cur.execute("INSERT INTO player (name) VALUES ('Ed')")
+    cur.execute(update_game, (21, 3, 1))
+
+    connection = ServerConnection(server)
+    assert store.mirror(connection.cursor(), "tm", full=False)
+
+    copied = {tuple(row) for row in store.db.execute("SELECT * FROM mirrored_version")}
+    assert copied == {(1, server_row(server, "SELECT version FROM division_version")["version"]), (2, 0)}
+    assert store.db.execute("SELECT team1_score FROM game_data WHERE id = 1").fetchone()[0] == 21
+    assert store.db.execute("SELECT name FROM player WHERE id = 5").fetchone()[0] == "Ed"
+
+    # Nothing moved, so no division is read again
+    connection = ServerConnection(server)
+    assert store.mirror(connection.cursor(), "tm", full=False)
+    assert connection.statements == 1 + len(offline.catalog_tables) + 1
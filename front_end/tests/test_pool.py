@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the connection pool, over stand-in connections and a hand-moved clock.
+"""
+import threading
+
+import pytest
+
+import pool
+
+
+class Clock:
+    """
+    A clock that only moves when told to.
+    """
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class Connection:
+    """
+    A stand-in connection recording what the pool does with it.
+    """
+
+    def __init__(self):
+        self.open = True
+        self.pings = []
+        self.rollbacks = 0
+        self.closed = False
+        self.statements = []
+
+    def ping(self, reconnect=False):
+        self.pings.append(reconnect)
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+    def cursor(self):
+        return Cursor(self)
+
+
+class Cursor:
+    """
+    A stand-in cursor adding its statements to its connection's.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, query, args=None):
+        self.connection.statements.append(query)
+
+
+class Connector:
+    """
+    Makes stand-in connections, or raises the given error once.
+    """
+
+    def __init__(self):
+        self.made = []
+        self.error = None
+
+    def __call__(self):
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+        self.made.append(Connection())
+        return self.made[-1]
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def connect():
+    return Connector()
+
+
+def test_checkout_waits_for_a_connection_at_size(connect, clock):
+    connections = pool.ConnectionPool(connect, size=1, clock=clock)
+    first = connections.checkout()
+    taken = threading.Event()
+    second = []
+
+    def take():
+        second.append(connections.checkout())
+        taken.set()
+
+    thread = threading.Thread(target=take)
+    thread.start()
+    try:
+        assert not taken.wait(0.1)
+        connections.checkin(first)
+        assert taken.wait(5)
+    finally:
+        thread.join(5)
+
+    # The waiting thread is handed the returned connection rather than a new one
+    assert second == [first]
+    assert len(connect.made) == 1
+    assert connections.checked_out == 1
+
+
+def test_connections_idle_past_ping_after_are_pinged(connect, clock):
+    connections = pool.ConnectionPool(connect, ping_after=30, clock=clock)
+    cnx = connections.checkout()
+    connections.checkin(cnx)
+
+    clock.now = 30
+    connections.checkin(connections.checkout())
+    assert cnx.pings == []
+
+    clock.now = 61
+    assert connections.checkout() is cnx
+    assert cnx.pings == [True]
+
+
+def test_connections_idle_past_idle_timeout_are_closed(connect, clock):
+    connections = pool.ConnectionPool(connect, idle_timeout=300, clock=clock)
+    old = connections.checkout()
+    connections.checkin(old)
+
+    clock.now = 301
+    new = connections.checkout()
+
+    assert old.closed
+    assert new is not old and not new.closed
+    assert connections.idle == []
+
+
+def test_dropped_connections_are_not_reused(connect, clock):
+    connections = pool.ConnectionPool(connect, clock=clock)
+    cnx = connections.checkout()
+    cnx.open = False
+    connections.checkin(cnx)
+
+    assert connections.idle == []
+    assert connections.checkout() is not cnx
+
+
+def test_failed_connect_returns_its_slot(connect, clock):
+    connections = pool.ConnectionPool(connect, size=1, clock=clock)
+    connect.error = ConnectionError("Can't connect to MySQL server")
+
+    with pytest.raises(ConnectionError):
+        connections.checkout()
+
+    assert connections.checked_out == 0
+    # The slot is free again, so this does not wait
+    connections.checkout()
+    assert connections.checked_out == 1
+
+
+def test_failed_ping_returns_its_slot(connect, clock):
+    connections = pool.ConnectionPool(connect, size=1, ping_after=30, clock=clock)
+    cnx = connections.checkout()
+    connections.checkin(cnx)
+
+    def ping(reconnect=False):
+        raise ConnectionError("Lost connection to MySQL server")
+
+    cnx.ping = ping
+    clock.now = 31
+    with pytest.raises(ConnectionError):
+        connections.checkout()
+
+    assert connections.checked_out == 0
+
+
+def test_nested_connections_on_a_thread_share_one(connect, clock):
+    connections = pool.ConnectionPool(connect, clock=clock)
+
+    with connections.connection() as outer:
+        with connections.connection() as inner:
+            assert inner is outer
+        assert connections.checked_out == 1
+
+    assert connections.checked_out == 0
+    assert connections.idle == [(outer, 0)]
+
+
+def test_failed_write_rolls_back_and_clears_session_variables(connect, clock):
+    connections = pool.ConnectionPool(connect, clock=clock)
+
+    with pytest.raises(ValueError):
+        with connections.connection() as cnx:
+            with cnx.cursor() as cur:
+                cur.execute("SET @skip_match_winner = 1")
+            raise ValueError("Batch failed")
+
+    assert cnx.rollbacks == 1
+    assert cnx.statements[-1] == "SET @skip_match_winner = NULL, @skip_create_games = NULL"
+    # The connection goes back to the pool for its next user
+    assert connections.idle == [(cnx, 0)]
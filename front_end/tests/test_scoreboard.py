@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the scoreboard server, over a cache reading a SQLite copy of the schema.
+"""
+import asyncio
+import json
+import re
+
+import pytest
+
+import offline
+import scoreboard
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = offline.LocalStore(str(tmp_path / "scoreboard.db"), outbox=False)
+    cur = offline.LocalConnection(store).cursor()
+    cur.execute("INSERT INTO tournament (name, date, time, address) VALUES ('Open', '2026-10-18', '09:00:00', 'Hall')")
+    cur.execute("INSERT INTO division (name, tournament_id_FK) VALUES ('Mixed', 1)")
+    cur.executemany("INSERT INTO player (name) VALUES (%s)", [("Ann",), ("Bo",), ("Cy",), ("Di",)])
+    cur.executemany("INSERT INTO team (name, division_id_FK, player1_id_FK, player2_id_FK) VALUES (%s, 1, %s, %s)",
+                    [("Aces", 1, 2), ("Blocks", 3, 4)])
+    cur.execute("INSERT INTO match_data (play_to, best_of, team1_id_FK, team2_id_FK, division_id_FK) "
+                "VALUES (21, 3, 1, 2, 1)")
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def cache(store):
+    cache = scoreboard.ScoreboardCache(lambda: offline.LocalConnection(store))
+    cache.publish(cache.read(True))
+    yield cache
+    cache.close()
+
+
+def execute(store, query, args=None):
+    offline.LocalConnection(store).cursor().execute(query, args)
+
+
+def division(cache, d_id=1):
+    return json.loads(cache.documents[f"/api/divisions/{d_id}"].body)
+
+
+async def serving(cache, client):
+    """
+    Runs client(host, port) against a scoreboard server on a free port.
+    """
+    server = scoreboard.ScoreboardServer(cache)
+    listener = await asyncio.start_server(server.handle, "127.0.0.1", 0, limit=scoreboard.max_request_bytes)
+    host, port = listener.sockets[0].getsockname()[:2]
+    async with listener:
+        return await client(host, port)
+
+
+async def response(reader, head_only=False):
+    head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+    status = head.split("\r\n", 1)[0].split(" ", 1)[1]
+    headers = dict(line.split(": ", 1) for line in head.split("\r\n")[1:] if line)
+    return status, headers, b"" if head_only else await reader.readexactly(int(headers["Content-Length"]))
+
+
+async def event(reader):
+    while True:
+        line = await asyncio.wait_for(reader.readline(), 5)
+        if line.startswith(b"data: "):
+            return json.loads(line[len(b"data: "):])
+
+
+def test_team_changes_reload_the_division(store, cache):
+    execute(store, "UPDATE team SET name = 'Smashers' WHERE id = 1")
+    execute(store, "INSERT INTO team (name, division_id_FK, player1_id_FK, player2_id_FK) VALUES ('Cards', 1, 1, 3)")
+
+    documents = cache.read(False)
+    cache.publish(documents)
+
+    assert list(documents) == ["/api/divisions/1"]
+    assert {record["team"] for record in division(cache)["standings"]} == {"Smashers", "Blocks", "Cards"}
+    assert division(cache)["matches"][0]["team1"] == "Smashers"
+
+
+def test_unchanged_divisions_are_not_read_again(cache):
+    queries = cache.queries
+    assert cache.read(False) == {}
+    assert cache.queries == queries + 1
+
+
+def test_requests_are_answered_with_etags(cache):
+    async def client(host, port):
+        reader, writer = await asyncio.open_connection(host, port)
+        results = []
+        try:
+            # One keep-alive connection for every request
+            for request in ("GET /api/divisions/1 HTTP/1.1", "GET /api/divisions/1 HTTP/1.1\r\nIf-None-Match: {etag}",
+                            "HEAD /api/tournaments HTTP/1.1", "GET /api/divisions/9 HTTP/1.1",
+                            "POST /api/divisions/1 HTTP/1.1"):
+                etag = results[0][1]["ETag"] if results else ""
+                writer.write((request.format(etag=etag) + "\r\nHost: test\r\n\r\n").encode())
+                await writer.drain()
+                results.append(await response(reader, request.startswith("HEAD")))
+        finally:
+            writer.close()
+        return results
+
+    results = asyncio.run(serving(cache, client))
+
+    status, headers, body = results[0]
+    assert status == "200 OK"
+    assert headers["ETag"] == cache.documents["/api/divisions/1"].etag
+    assert json.loads(body)["name"] == "Mixed"
+    assert results[1][0] == "304 Not Modified" and results[1][2] == b""
+    assert [result[0] for result in results[2:]] == ["200 OK", "404 Not Found", "405 Method Not Allowed"]
+    # HEAD sends the length of the body it leaves out
+    assert int(results[2][1]["Content-Length"]) == len(cache.documents["/api/tournaments"].body)
+
+
+def test_streams_receive_published_changes(store, cache):
+    async def client(host, port):
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            writer.write(b"GET /api/divisions/1/events HTTP/1.1\r\nHost: test\r\n\r\n")
+            head = await reader.readuntil(b"\r\n\r\n")
+            first = await event(reader)
+
+            # A publish that leaves the document as it was wakes no stream
+            cache.publish({"/api/divisions/1": cache.documents["/api/divisions/1"]})
+            execute(store, "UPDATE game_data SET team1_score = 21, team2_score = 17 WHERE id = 1")
+            cache.publish(cache.read(False))
+            second = await event(reader)
+        finally:
+            writer.close()
+        return head, first, second
+
+    head, first, second = asyncio.run(serving(cache, client))
+
+    assert b"Content-Type: text/event-stream" in head
+    assert first["matches"][0]["games"][0] == [0, 0]
+    assert second["matches"][0]["games"][0] == [21, 17]
+    assert second["version"] > first["version"]
+
+
+def test_load_test_against_the_server(cache):
+    async def client(host, port):
+        return await scoreboard.load_test(f"http://{host}:{port}/api/divisions/1", clients=20, requests=400,
+                                          streams=5)
+
+    result = asyncio.run(serving(cache, client))
+
+    assert result["failures"] == 0
+    assert result["requests"] == 400
+    assert re.fullmatch(r"\d+(\.\d+)?", str(result["median_ms"]))
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+Column input rules.
+
+Checks text input against a column's metadata row from get_columns_from_schema.
+"""
+import datetime
+
+
+def valid_date(date):
+    try:
+        datetime.datetime.strptime(date, '%Y-%m-%d')
+        return True
+    except ValueError:
+        return False
+
+
+def valid_time(time):
+    try:
+        datetime.datetime.strptime(time, '%H:%M:%S')
+        return True
+    except ValueError:
+        return False
+
+
+def input_requirement(column, value):
+    """
+    Returns the requirement a column's text value breaks, or '' if the value is valid.
+    """
+    data_type = column["DATA_TYPE"]
+    is_nullable = column["IS_NULLABLE"] == 'YES'
+
+    input_requirement = ''
+    if value == '':
+        if not is_nullable:
+            input_requirement = "is not nullable"
+    elif data_type == 'int':
+        is_int = value.isdigit()
+        if not is_int:
+            input_requirement = "requires integer input"
+    elif data_type == 'date':
+        is_date = valid_date(value)
+        if not is_date:
+            input_requirement = "requires date input (YYYY-MM-DD)"
+    elif data_type == 'time':
+        is_time = valid_time(value)
+        if not is_time:
+            input_requirement = "requires time input (HH:MM:SS)"
+    return input_requirement